@@ -5,10 +5,47 @@ import path from 'path';
 
 const execAsync = promisify(exec);
 
+interface WorkbookResult {
+  period: string;
+  key: string;
+  cache_file: string;
+  output_file: string;
+  cached: boolean;
+  stdout: string;
+}
+
+// 같은 기간의 동시 요청은 실행 중인 Python 1개의 결과를 함께 사용
+const inflight = new Map<string, Promise<WorkbookResult>>();
+
+/**
+ * item_workbook_cache.py 실행 (입력 CSV/FX/코드가 그대로면 캐시된 워크북 경로만 반환)
+ * 마지막 출력 줄이 결과 JSON
+ */
+async function lookupOrBuild(period: string): Promise<WorkbookResult> {
+  const scriptPath = path.join(process.cwd(), 'item_workbook_cache.py');
+  const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
+  const command = `${pythonCommand} "${scriptPath}" --period ${period}`;
+
+  console.log(`[API] 실행 명령어: ${command}`);
+
+  const { stdout, stderr } = await execAsync(command, {
+    cwd: process.cwd(),
+    maxBuffer: 10 * 1024 * 1024, // 10MB
+  });
+
+  if (stderr && !stderr.includes('[OK]') && !stderr.includes('[INFO]') && !stderr.includes('[WARN]')) {
+    throw Object.assign(new Error('Excel 파일 생성 중 오류가 발생했습니다.'), { details: stderr });
+  }
+
+  const lines = stdout.trim().split(/\r?\n/);
+  return { ...JSON.parse(lines[lines.length - 1]), stdout };
+}
+
 /**
  * 아이템별 원가율 Excel 파일 생성 API
  * 
- * Python 스크립트를 실행하여 지정된 기간의 아이템별 원가율 Excel 파일을 생성합니다.
+ * 지정된 기간의 아이템별 원가율 Excel 파일을 반환합니다.
+ * 입력(원가 CSV, FX.csv, 생성 코드)이 바뀌지 않았으면 캐시된 워크북을 그대로 쓰고, 바뀌었으면 새로 생성합니다.
  * 
  * 사용 예시:
  * GET /api/generate-item-cost-rate-csv?period=26SS
@@ -39,56 +76,27 @@ export async function GET(request: NextRequest) {
 
     console.log(`[API] 아이템별 원가율 Excel 파일 생성 요청: 기간=${periodUpper}`);
 
-    // Python 스크립트 경로
-    const scriptPath = path.join(process.cwd(), 'generate_item_cost_rate_csv.py');
-    
-    // Python 실행 명령어
-    const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
-    const command = `${pythonCommand} "${scriptPath}" --period ${periodUpper}`;
-
-    console.log(`[API] 실행 명령어: ${command}`);
-
-    // Python 스크립트 실행
-    const { stdout, stderr } = await execAsync(command, {
-      cwd: process.cwd(),
-      maxBuffer: 10 * 1024 * 1024, // 10MB
-    });
-
-    if (stderr && !stderr.includes('[OK]') && !stderr.includes('[INFO]') && !stderr.includes('[WARN]')) {
-      console.error('[API] Python 스크립트 실행 오류:', stderr);
-      return NextResponse.json(
-        { error: 'Excel 파일 생성 중 오류가 발생했습니다.', details: stderr },
-        { status: 500 }
-      );
+    let pending = inflight.get(periodUpper);
+    if (!pending) {
+      pending = lookupOrBuild(periodUpper).finally(() => inflight.delete(periodUpper));
+      inflight.set(periodUpper, pending);
     }
+    const result = await pending;
 
-    console.log('[API] Python 스크립트 실행 완료');
-    console.log('[API] 출력:', stdout);
-
-    // 출력 파일 경로 결정
-    let seasonFolder = '';
-    if (periodUpper.includes('26SS') || periodUpper.includes('26S')) {
-      seasonFolder = '26SS';
-    } else if (periodUpper.includes('25SS') || periodUpper.includes('25S')) {
-      seasonFolder = '25S';
-    } else if (periodUpper.includes('25FW') || periodUpper.includes('25F')) {
-      seasonFolder = '25FW';
-    } else if (periodUpper.includes('24SS') || periodUpper.includes('24S')) {
-      seasonFolder = '24S';
-    } else if (periodUpper.includes('24FW') || periodUpper.includes('24F')) {
-      seasonFolder = '24FW';
-    } else {
-      seasonFolder = periodUpper;
-    }
+    console.log(`[API] ${result.cached ? '캐시 사용' : 'Excel 생성 완료'}: ${result.cache_file}`);
 
-    const outputFile = `COST RAW/${seasonFolder}/item_cost_rate_${periodUpper}.xlsx`;
+    // public 기준 경로 (예: COST RAW/25FW/item_cost_rate_25FW.xlsx)
+    const outputFile = result.output_file.replace(/^public\//, '');
 
     return NextResponse.json({
       success: true,
-      message: `아이템별 원가율 Excel 파일이 생성되었습니다.`,
+      message: result.cached
+        ? `아이템별 원가율 Excel 파일이 최신입니다. (캐시 사용)`
+        : `아이템별 원가율 Excel 파일이 생성되었습니다.`,
       period: periodUpper,
       outputFile: outputFile,
-      stdout: stdout,
+      cached: result.cached,
+      stdout: result.stdout,
     });
   } catch (error: any) {
     console.error('[API] Excel 파일 생성 오류:', error);
@@ -102,7 +110,7 @@ export async function GET(request: NextRequest) {
     }
 
     return NextResponse.json(
-      { error: 'Excel 파일 생성 중 오류가 발생했습니다.', details: error.message },
+      { error: 'Excel 파일 생성 중 오류가 발생했습니다.', details: error.details ?? error.message },
       { status: 500 }
     );
   }
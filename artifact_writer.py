@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+생성 파일(CSV/JSON) 저장 모듈 - 내용이 같으면 건너뛰고, 바뀌었으면 원자적으로 교체
+
+public/COST RAW 아래 원가 CSV, FX_NON.csv, SUMMARY JSON, 인사이트 CSV를 파일에 바로 쓰지 않고
+메모리에서 먼저 만든 뒤, 기존 파일과 내용 해시(sha256)가 같으면 쓰지 않고
+다르면 같은 폴더의 임시 파일에 쓴 다음 이름 바꾸기(os.replace)로 교체합니다.
+
+- 내용이 같은 파일은 수정시각도 그대로 → git diff, Vercel 재배포, Parquet 재저장(cost_raw_store)이 생기지 않음
+- 대시보드/다른 작업이 쓰는 중인 반쯤 쓴 파일을 읽지 않음 (교체는 한 번에)
+- 저장 결과(변경/변경 없음)는 프로세스 전체에서 집계 → auto_update_dashboard.py가 모든 생성 작업 후
+  변경된 파일이 없으면 Git 커밋/푸시와 Vercel 배포를 건너뜀
+  (generate_summary_26ss.py --jobs처럼 하위 프로세스에서 저장한 파일은 그 프로세스에서만 집계)
+
+사용 예:
+    from artifact_writer import write_csv, write_json, write_label
+
+    changed = write_csv(df, output_path, lineterminator='\\n')
+    print(f"[OK] {output_path} {write_label(changed)}")
+    write_json(summary, output_file)
+
+    reset_write_stats()
+    ...
+    stats = write_stats()   # {'changed': [...], 'unchanged': [...]}
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from build_manifest import file_digest
+
+# 프로세스 내 저장 결과: 경로 → 내용이 바뀌었는지 (한 실행에서 여러 번 저장하면 한 번이라도 바뀌었으면 True)
+_WRITE_RESULTS: Dict[str, bool] = {}
+_write_lock = threading.Lock()
+
+# 새 파일 권한 계산용 umask (os.umask는 읽으면서 바꾸므로 스레드에서 쓰기 전에 import 시 1번만 읽음)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+# ============================================
+# 저장
+# ============================================
+def _display_path(path: str) -> str:
+    return os.path.relpath(path).replace(os.sep, '/')
+
+
+def _record_result(path: str, changed: bool):
+    key = _display_path(path)
+    with _write_lock:
+        _WRITE_RESULTS[key] = _WRITE_RESULTS.get(key, False) or changed
+
+
+def _file_mode(path: str) -> int:
+    """교체 후 파일 권한: 기존 파일 권한 유지, 새 파일은 open()으로 만든 것과 같은 0o666 & ~umask"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def write_bytes(data: bytes, path: str) -> bool:
+    """
+    내용이 바뀐 경우에만 임시 파일 → os.replace로 저장
+    (mkstemp 임시 파일은 0600이므로 교체 전에 기존 파일/기본 권한으로 맞춤 - public 파일이 owner 전용이 되지 않도록)
+
+    Returns:
+        파일을 새로 썼으면 True, 기존 파일과 내용이 같아 건너뛰었으면 False
+    """
+    if hashlib.sha256(data).hexdigest() == file_digest(path):
+        _record_result(path, False)
+        return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _record_result(path, True)
+    return True
+
+
+def write_text(text: str, path: str, encoding: str = 'utf-8') -> bool:
+    """문자열을 encoding으로 저장 (utf-8-sig면 BOM 포함)"""
+    return write_bytes(text.encode(encoding), path)
+
+
+def write_csv(df: pd.DataFrame, path: str, encoding: str = 'utf-8-sig', **to_csv_kwargs) -> bool:
+    """
+    df.to_csv(path, index=False, encoding=encoding, ...)와 같은 내용으로 저장
+
+    Args:
+        to_csv_kwargs: to_csv 인자 그대로 (lineterminator 등, 지정하지 않으면 index=False)
+    """
+    to_csv_kwargs.setdefault('index', False)
+    return write_text(df.to_csv(**to_csv_kwargs), path, encoding)
+
+
+def write_json(obj: Any, path: str) -> bool:
+    """json.dump(obj, f, ensure_ascii=False, indent=2)와 같은 내용으로 저장 (UTF-8, BOM 없음)"""
+    return write_text(json.dumps(obj, ensure_ascii=False, indent=2), path, 'utf-8')
+
+
+def write_label(changed: bool) -> str:
+    """저장 결과 로그 문구"""
+    return '저장 완료' if changed else '변경 없음 (기존 파일 유지)'
+
+
+# ============================================
+# 집계
+# ============================================
+def reset_write_stats():
+    """저장 결과 집계 초기화 (실행 시작 시)"""
+    with _write_lock:
+        _WRITE_RESULTS.clear()
+
+
+def write_stats() -> Dict[str, List[str]]:
+    """이번 실행에서 저장한 파일 목록: {'changed': [...], 'unchanged': [...]} (경로 정렬)"""
+    with _write_lock:
+        results = dict(_WRITE_RESULTS)
+    return {
+        'changed': sorted(path for path, changed in results.items() if changed),
+        'unchanged': sorted(path for path, changed in results.items() if not changed),
+    }
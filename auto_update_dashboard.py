@@ -9,18 +9,61 @@
 3. 인사이트 CSV 생성 (26SS만, 규칙 기반)
 4. 이메일 알림 전송
 
+생성 스크립트(sql_to_csv_with_fx.py, generate_summary_26ss.py 등)는 단계마다 python을 새로 띄우지 않고
+이 프로세스에서 함수로 직접 호출합니다. pandas import, FX.csv 환율 인덱스, 방금 저장한 COST RAW CSV의
+파싱 결과를 모든 단계가 공유합니다.
+
+생성 단계는 auto_update_config.json(시즌, 브랜드, is_non_season, generate_insights)으로 만든
+작업 그래프(task_graph.py)로 실행합니다. 선행 작업이 끝난 시즌/브랜드 작업부터 동시에 실행하고
+(동시 실행 수: 설정의 max_workers), 실패한 작업은 그 작업에 의존하는 작업만 건너뜁니다.
+
+    sql_to_csv ─┬─ summary:<시즌>:<브랜드> ── insights:<시즌>:<브랜드>
+                └─ (25FW) summary:25FW:X ── insights_kids:25FW
+    fx_non ── non_csv:<시즌> ── summary:<시즌>_NON:<브랜드> ── insights:<시즌>_NON:<브랜드>
+
+SUMMARY JSON과 인사이트 CSV는 입력(원가 CSV, FX 파일, 생성 코드)의 내용 해시를 출력 폴더별
+cache/build_manifest/<출력 폴더 경로>.json에 기록하고, 다음 실행에서 입력이 그대로면 다시 만들지 않습니다.
+생성 파일은 artifact_writer.py로 내용이 바뀐 경우에만 저장합니다. Git 커밋/푸시와 Vercel 배포는
+마지막으로 배포에 성공한 데이터 파일 해시(publish_manifest.py, cache/published_artifacts.json)와
+비교해 바뀐 파일이 있을 때만 실행하고, 바뀐 시즌/브랜드를 로그와 알림에 남깁니다.
+
+배포 방식 (auto_update_config.json의 deploy_mode):
+    full       vercel --prod (Vercel에서 Next.js 빌드, 기본값)
+    data_only  마지막 로컬 빌드 이후 코드(public/COST RAW 밖)가 그대로면 바뀐 데이터 파일만
+               .vercel/output/static에 반영해 vercel deploy --prebuilt (Next.js 빌드 생략),
+               코드가 바뀌었으면 vercel build --prod로 로컬 빌드 후 같은 방식으로 배포
+               (Git 연동 자동 배포가 켜져 있으면 푸시할 때 전체 빌드가 따로 실행되므로 꺼 두고 사용)
+
+단계별 소요 시간/CPU/최대 메모리/행 수/기록 크기는 run_metrics.py로 계측해 logs/run_reports/에
+JSON 보고서로 저장하고(logs/run_history.jsonl에 날짜별 이력 누적), 이메일/Teams 알림에 단계별 표로 보냅니다.
+
 사용 방법:
     python auto_update_dashboard.py
+    python auto_update_dashboard.py --force   # 입력 변경과 관계없이 모두 다시 생성
 """
 
+import argparse
+import importlib
 import json
 import os
 import sys
 import subprocess
 import logging
+import shutil
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from artifact_writer import reset_write_stats, write_stats
+from cost_raw_store import clear_frame_cache
+from build_manifest import changed_inputs, input_fingerprint, record_outputs
+from publish_manifest import changed_paths, changed_scopes, current_artifacts, diff_artifacts, \
+    format_scopes, load_published, record_published
+from run_metrics import annotate, finished_spans, format_step_table, load_history, span, start_run, \
+    summarize, write_run_report
+from task_graph import DEFAULT_MAX_WORKERS, STATUS_LABELS, STATUS_SUCCESS, Task, TaskResult, \
+    format_report, run_in_process, run_task_graph
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -31,23 +74,32 @@ try:
 except ImportError:
     requests = None
 
-# 로깅 설정
+# 로깅 설정 (로그 파일은 main()에서 setup_logging으로 생성 - import만 해서는 파일을 만들지 않음)
 LOG_DIR = Path('logs')
-LOG_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOG_DIR / f"auto_update_{datetime.now().strftime('%Y%m%d')}.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 
+def setup_logging():
+    """로그 파일 + 콘솔 출력 설정 (실행할 때 1번)"""
+    LOG_DIR.mkdir(exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE, encoding='utf-8'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+# 배포 방식 (auto_update_config.json의 deploy_mode)
+DEPLOY_MODE_FULL = 'full'
+DEPLOY_MODE_DATA_ONLY = 'data_only'
+VERCEL_OUTPUT_DIR = Path('.vercel') / 'output'
+DATA_PATHSPEC = 'public/COST RAW'
+
+
 def load_config() -> Dict:
     """설정 파일 로드"""
     config_path = Path('auto_update_config.json')
@@ -171,88 +223,38 @@ def run_sql_to_csv():
     logger.info("=" * 60)
     
     try:
-        result = subprocess.run(
-            ['python', 'sql_to_csv_with_fx.py'],
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        from sql_to_csv_with_fx import main as sql_to_csv_main
+        ok, stdout, stderr = run_in_process(sql_to_csv_main, [])
         
-        if result.returncode == 0:
+        if ok:
             logger.info("SQL → CSV 생성 완료")
-            logger.info(result.stdout)
+            logger.info(stdout)
             return True
         else:
-            logger.error(f"SQL → CSV 생성 실패: {result.stderr}")
+            logger.error(f"SQL → CSV 생성 실패: {stderr}")
             return False
     except Exception as e:
         logger.error(f"SQL → CSV 생성 중 오류: {e}")
         return False
 
 
-def generate_summary_25fw(brands: List[str]):
-    """25FW 브랜드별 SUMMARY JSON 생성"""
-    logger.info("=" * 60)
-    logger.info("[2] 25FW SUMMARY JSON 생성 시작")
-    logger.info("=" * 60)
-    
-    # generate_summary_26ss.py를 사용하되 25FW로 실행
-    # 또는 별도 스크립트 사용
-    success_count = 0
-    
-    for brand in brands:
-        logger.info(f"\n25FW 브랜드 {brand} 처리 중...")
-        
-        try:
-            # generate_summary_26ss.py를 25FW로 사용
-            result = subprocess.run(
-                ['python', 'generate_summary_26ss.py', '--season', '25FW', '--brand', brand],
-                capture_output=True,
-                text=True,
-                encoding='utf-8'
-            )
-            
-            if result.returncode == 0:
-                logger.info(f"25FW 브랜드 {brand} SUMMARY 생성 완료")
-                success_count += 1
-            else:
-                logger.error(f"25FW 브랜드 {brand} SUMMARY 생성 실패: {result.stderr}")
-        except Exception as e:
-            logger.error(f"25FW 브랜드 {brand} 처리 중 오류: {e}")
-    
-    logger.info(f"\n25FW SUMMARY 생성 완료: {success_count}/{len(brands)}")
-    return success_count == len(brands)
-
-
-def generate_summary_26ss(brands: List[str], season: str = '26SS'):
-    """시즌별 브랜드 SUMMARY JSON 생성 (25SS, 26SS, 26FW 등)"""
-    logger.info("=" * 60)
-    logger.info(f"[3] {season} SUMMARY JSON 생성 시작")
-    logger.info("=" * 60)
-    
-    success_count = 0
+def generate_brand_summary(season: str, brand: str) -> bool:
+    """시즌 브랜드 1개 SUMMARY JSON 생성"""
+    logger.info(f"\n{season} 브랜드 {brand} 처리 중...")
     
-    for brand in brands:
-        logger.info(f"\n{season} 브랜드 {brand} 처리 중...")
+    try:
+        from generate_summary_26ss import generate_summary
+        ok, _, stderr = run_in_process(generate_summary, season, [brand])
         
-        try:
-            result = subprocess.run(
-                ['python', 'generate_summary_26ss.py', '--season', season, '--brand', brand],
-                capture_output=True,
-                text=True,
-                encoding='utf-8'
-            )
-            
-            if result.returncode == 0:
-                logger.info(f"{season} 브랜드 {brand} SUMMARY 생성 완료")
-                success_count += 1
-            else:
-                logger.error(f"{season} 브랜드 {brand} SUMMARY 생성 실패: {result.stderr}")
-        except Exception as e:
-            logger.error(f"{season} 브랜드 {brand} 처리 중 오류: {e}")
-    
-    logger.info(f"\n{season} SUMMARY 생성 완료: {success_count}/{len(brands)}")
-    return success_count == len(brands)
+        if ok:
+            logger.info(f"{season} 브랜드 {brand} SUMMARY 생성 완료")
+            return True
+        else:
+            logger.error(f"{season} 브랜드 {brand} SUMMARY 생성 실패: {stderr}")
+            return False
+    except Exception as e:
+        logger.error(f"{season} 브랜드 {brand} 처리 중 오류: {e}")
+        return False
 
 
 def generate_insights_for_season(season: str, brands: List[str]):
@@ -262,27 +264,37 @@ def generate_insights_for_season(season: str, brands: List[str]):
     logger.info("=" * 60)
     
     try:
-        result = subprocess.run(
-            ['python', 'generate_insights_rule_based.py', '--season', season, '--brands'] + brands,
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        from generate_insights_rule_based import main as insights_main
+        ok, stdout, stderr = run_in_process(insights_main, ['--season', season, '--brands'] + brands)
         
-        if result.returncode == 0:
+        if ok:
             logger.info(f"{season} 인사이트 CSV 생성 완료")
-            logger.info(result.stdout)
+            logger.info(stdout)
             return True
         else:
-            logger.error(f"{season} 인사이트 CSV 생성 실패: {result.stderr}")
+            logger.error(f"{season} 인사이트 CSV 생성 실패: {stderr}")
             return False
     except Exception as e:
         logger.error(f"{season} 인사이트 CSV 생성 중 오류: {e}")
         return False
 
-def generate_insights_26ss(brands: List[str]):
-    """26SS 브랜드별 인사이트 CSV 생성 (규칙 기반) - 하위 호환성 유지"""
-    return generate_insights_for_season('26SS', brands)
+
+def generate_kids_insights(season: str) -> bool:
+    """DISCOVERY-KIDS 인사이트만 별도 생성 (DISCOVERY 인사이트는 건드리지 않음)"""
+    logger.info(f"{season} DISCOVERY-KIDS 인사이트 생성 (DISCOVERY 인사이트는 건드리지 않음)")
+    try:
+        from generate_insights_rule_based import main as insights_main
+        ok, stdout, stderr = run_in_process(insights_main, ['--season', season, '--kids-only'])
+        if ok:
+            logger.info(f"{season} DISCOVERY-KIDS 인사이트 생성 완료")
+            logger.info(stdout)
+            return True
+        else:
+            logger.error(f"{season} DISCOVERY-KIDS 인사이트 생성 실패: {stderr}")
+            return False
+    except Exception as e:
+        logger.error(f"{season} DISCOVERY-KIDS 인사이트 생성 중 오류: {e}")
+        return False
 
 
 def generate_non_csv(season: str):
@@ -292,19 +304,15 @@ def generate_non_csv(season: str):
     logger.info("=" * 60)
     
     try:
-        result = subprocess.run(
-            ['python', 'generate_mlb_non_csv.py', '--season', season],
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        from generate_mlb_non_csv import main as non_csv_main
+        ok, stdout, stderr = run_in_process(non_csv_main, ['--season', season])
         
-        if result.returncode == 0:
+        if ok:
             logger.info(f"{season} NON 시즌 CSV 생성 완료")
-            logger.info(result.stdout)
+            logger.info(stdout)
             return True
         else:
-            logger.error(f"{season} NON 시즌 CSV 생성 실패: {result.stderr}")
+            logger.error(f"{season} NON 시즌 CSV 생성 실패: {stderr}")
             return False
     except Exception as e:
         logger.error(f"{season} NON 시즌 CSV 생성 중 오류: {e}")
@@ -312,60 +320,187 @@ def generate_non_csv(season: str):
 
 
 def generate_non_fx_csv():
-    """NON 시즌 환율 CSV 생성 (한 번만 실행)"""
+    """NON 시즌 환율 CSV 생성 (한 번만 실행, 이어지는 NON 시즌 CSV 생성이 같은 추출을 재사용)"""
     logger.info("=" * 60)
     logger.info("[NON 환율 CSV 생성] FX_NON.csv 생성 시작")
     logger.info("=" * 60)
     
     try:
-        result = subprocess.run(
-            ['python', 'generate_fx_non_csv.py'],
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        from generate_fx_non_csv import main as fx_non_main
+        ok, stdout, stderr = run_in_process(fx_non_main, ['--refresh'])
         
-        if result.returncode == 0:
+        if ok:
             logger.info("FX_NON.csv 생성 완료")
-            logger.info(result.stdout)
+            logger.info(stdout)
             return True
         else:
-            logger.error(f"FX_NON.csv 생성 실패: {result.stderr}")
+            logger.error(f"FX_NON.csv 생성 실패: {stderr}")
             return False
     except Exception as e:
         logger.error(f"FX_NON.csv 생성 중 오류: {e}")
         return False
 
 
-def generate_summary_non(season: str, brands: List[str]):
-    """NON 시즌 브랜드별 SUMMARY JSON 생성"""
-    logger.info("=" * 60)
-    logger.info(f"[NON SUMMARY 생성] {season} 시즌 SUMMARY JSON 생성 시작")
-    logger.info("=" * 60)
+def generate_non_brand_summary(season: str, brand: str) -> bool:
+    """NON 시즌 브랜드 1개 SUMMARY JSON 생성"""
+    logger.info(f"\n{season} NON 브랜드 {brand} 처리 중...")
+    
+    try:
+        from generate_summary_mlb_non import generate_summary
+        ok, _, stderr = run_in_process(generate_summary, season, brand)
+        
+        if ok:
+            logger.info(f"{season} NON 브랜드 {brand} SUMMARY 생성 완료")
+            return True
+        else:
+            logger.error(f"{season} NON 브랜드 {brand} SUMMARY 생성 실패: {stderr}")
+            return False
+    except Exception as e:
+        logger.error(f"{season} NON 브랜드 {brand} 처리 중 오류: {e}")
+        return False
+
+
+def run_if_changed(label: str, targets: Callable[[], Tuple[List[str], List[str]]],
+                   build: Callable[[], bool], force: bool = False) -> bool:
+    """
+    입력 지문(build_manifest.py)이 기록과 같으면 건너뛰고, 다르면 생성 후 지문 기록
+    
+    Args:
+        label: 로그용 작업 설명
+        targets: (입력 파일, 출력 파일) 목록을 돌려주는 함수
+        build: 생성 함수 (성공 여부 반환)
+        force: True면 지문과 관계없이 다시 생성
+    """
+    try:
+        inputs, outputs = targets()
+        fingerprint = input_fingerprint(inputs)
+        changed = changed_inputs(outputs, inputs, fingerprint)
+    except Exception as e:
+        logger.warning(f"{label}: 입력 지문 확인 실패, 다시 생성합니다: {e}")
+        return build()
+    
+    if changed == [] and not force:
+        logger.info(f"[변경 없음] {label} 건너뜀")
+        annotate(up_to_date=True)
+        return True
+    if changed:
+        logger.info(f"[입력 변경] {label}: {', '.join(changed)}")
+    
+    ok = build()
+    if ok:
+        record_outputs(outputs, inputs, fingerprint)
+    return ok
+
+
+def measured(step: str, func: Callable[[], bool], **attrs) -> Callable[[], bool]:
+    """작업 함수를 run_metrics span으로 감싸기 (False 반환도 실패로 기록)"""
+    def run() -> bool:
+        with span(step, **attrs) as current:
+            ok = func()
+            if not ok:
+                current.fail()
+            return ok
+    return run
+
+
+def generator_targets(module_name: str, func_name: str, *args, **kwargs) -> Callable[[], Tuple[List[str], List[str]]]:
+    """생성 스크립트의 summary_targets/insight_targets 호출 함수 (실행할 때 import)"""
+    def targets() -> Tuple[List[str], List[str]]:
+        return getattr(importlib.import_module(module_name), func_name)(*args, **kwargs)
+    return targets
+
+
+def build_task_graph(seasons: Dict, force: bool = False) -> List[Task]:
+    """
+    auto_update_config.json의 시즌 설정으로 생성 작업 그래프 구성
+    
+    - 일반 시즌 SUMMARY: SQL → CSV 이후 브랜드별 실행
+    - NON 시즌: FX_NON.csv → 시즌별 NON CSV → 브랜드별 SUMMARY
+    - 인사이트: 같은 시즌/브랜드 SUMMARY 이후 (25FW는 exclude_insights_for 제외,
+      DISCOVERY-KIDS 인사이트는 X SUMMARY 이후 별도 실행)
+    - SUMMARY/인사이트는 입력(CSV, FX, 코드)이 지난번과 같으면 건너뜀 (force=True면 모두 생성)
+    - 모든 작업은 작업 종류 이름의 span(run_metrics.py)으로 시즌/브랜드별 계측
+    """
+    def incremental(label: str, targets: Callable, build: Callable[[], bool]) -> Callable[[], bool]:
+        return lambda: run_if_changed(label, targets, build, force)
     
-    success_count = 0
+    tasks = [Task('sql_to_csv', 'SQL → CSV 생성', measured('sql_to_csv', run_sql_to_csv))]
+    non_seasons = {key: cfg for key, cfg in seasons.items() if cfg.get('is_non_season', False)}
+    regular_seasons = {key: cfg for key, cfg in seasons.items() if not cfg.get('is_non_season', False)}
     
-    for brand in brands:
-        logger.info(f"\n{season} NON 브랜드 {brand} 처리 중...")
+    # NON 시즌 (환율 CSV는 한 번만 생성)
+    if non_seasons:
+        tasks.append(Task('fx_non', 'NON 시즌 환율 CSV 생성', measured('fx_non', generate_non_fx_csv)))
+    
+    for season_key, season_config in non_seasons.items():
+        brands = season_config.get('brands', [])
+        # 시즌 코드 추출 (25FW_NON -> 25FW)
+        base_season = season_key.replace('_NON', '')
+        non_csv = f'non_csv:{base_season}'
+        tasks.append(Task(non_csv, f'{season_key} CSV 생성', measured(
+            'non_csv', lambda s=base_season: generate_non_csv(s), season=base_season,
+        ), deps=('fx_non',)))
         
-        try:
-            result = subprocess.run(
-                ['python', 'generate_summary_mlb_non.py', '--season', season, '--brand', brand],
-                capture_output=True,
-                text=True,
-                encoding='utf-8'
-            )
+        for brand in brands:
+            summary = f'summary:{season_key}:{brand}'
+            label = f'{season_key} 브랜드 {brand} SUMMARY 생성'
+            tasks.append(Task(summary, label, measured('summary_non', incremental(
+                label,
+                generator_targets('generate_summary_mlb_non', 'summary_targets', base_season, brand),
+                lambda s=base_season, b=brand: generate_non_brand_summary(s, b),
+            ), season=season_key, brand=brand), deps=(non_csv,)))
             
-            if result.returncode == 0:
-                logger.info(f"{season} NON 브랜드 {brand} SUMMARY 생성 완료")
-                success_count += 1
-            else:
-                logger.error(f"{season} NON 브랜드 {brand} SUMMARY 생성 실패: {result.stderr}")
-        except Exception as e:
-            logger.error(f"{season} NON 브랜드 {brand} 처리 중 오류: {e}")
+            if season_config.get('generate_insights', False):
+                label = f'{season_key} 브랜드 {brand} 인사이트 생성'
+                tasks.append(Task(f'insights:{season_key}:{brand}', label, measured('insights', incremental(
+                    label,
+                    generator_targets('generate_insights_rule_based', 'insight_targets', season_key, brand),
+                    lambda s=season_key, b=brand: generate_insights_for_season(s, [b]),
+                ), season=season_key, brand=brand), deps=(summary,)))
+    
+    # 일반 시즌 (25FW, 25SS, 26SS, 26FW 및 새 시즌 모두 generate_summary_26ss.py 사용)
+    for season_key, season_config in regular_seasons.items():
+        brands = season_config.get('brands', [])
+        for brand in brands:
+            label = f'{season_key} 브랜드 {brand} SUMMARY 생성'
+            tasks.append(Task(f'summary:{season_key}:{brand}', label, measured('summary', incremental(
+                label,
+                generator_targets('generate_summary_26ss', 'summary_targets', season_key, brand),
+                lambda s=season_key, b=brand: generate_brand_summary(s, b),
+            ), season=season_key, brand=brand), deps=('sql_to_csv',)))
+        
+        if not season_config.get('generate_insights', False):
+            continue
+        
+        # 25FW의 경우 M, I, X 제외 (하지만 DISCOVERY-KIDS는 별도 생성)
+        exclude_brands = season_config.get('exclude_insights_for', []) if season_key == '25FW' else []
+        for brand in brands:
+            if brand in exclude_brands:
+                continue
+            label = f'{season_key} 브랜드 {brand} 인사이트 생성'
+            tasks.append(Task(f'insights:{season_key}:{brand}', label, measured('insights', incremental(
+                label,
+                generator_targets('generate_insights_rule_based', 'insight_targets', season_key, brand),
+                lambda s=season_key, b=brand: generate_insights_for_season(s, [b]),
+            ), season=season_key, brand=brand), deps=(f'summary:{season_key}:{brand}',)))
+        
+        if season_key == '25FW' and 'X' in brands:
+            label = f'{season_key} DISCOVERY-KIDS 인사이트 생성'
+            tasks.append(Task(f'insights_kids:{season_key}', label, measured('insights_kids', incremental(
+                label,
+                generator_targets('generate_insights_rule_based', 'insight_targets', season_key, kids_only=True),
+                lambda s=season_key: generate_kids_insights(s),
+            ), season=season_key, brand='X'), deps=(f'summary:{season_key}:X',)))
     
-    logger.info(f"\n{season} NON SUMMARY 생성 완료: {success_count}/{len(brands)}")
-    return success_count == len(brands)
+    return tasks
+
+
+def log_task_result(task: Task, result: TaskResult):
+    """작업 완료/건너뜀 로그"""
+    if result.status == STATUS_SUCCESS:
+        logger.info(f"[작업 완료] {task.name} ({result.duration:.1f}초)")
+    else:
+        logger.warning(f"[작업 {STATUS_LABELS[result.status]}] {task.name}: {result.error}")
 
 
 def git_commit_and_push(config: Dict) -> bool:
@@ -529,6 +664,91 @@ def deploy_to_vercel(config: Dict) -> bool:
         return False
 
 
+def code_revision() -> Optional[str]:
+    """데이터 폴더(public/COST RAW) 밖을 마지막으로 바꾼 커밋 (Git 저장소가 아니면 None)"""
+    try:
+        result = subprocess.run(
+            ['git', 'log', '-1', '--format=%H', '--', '.', f':(exclude){DATA_PATHSPEC}'],
+            capture_output=True,
+            text=True,
+            encoding='utf-8'
+        )
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def deploy_to_vercel_prebuilt(changes: Dict[str, List[str]], code_rev: Optional[str],
+                              build_rev: Optional[str]) -> bool:
+    """
+    Vercel 데이터만 배포 (deploy_mode: data_only)
+    
+    대시보드는 public/COST RAW 파일을 정적 파일로 읽으므로, 마지막 로컬 빌드(.vercel/output) 이후
+    코드가 바뀌지 않았으면 바뀐 데이터 파일만 빌드 결과의 static 폴더에 반영해 그대로 올립니다.
+    API 라우트가 서버에서 직접 읽는 파일은 마지막 빌드 시점 내용입니다.
+    
+    Args:
+        changes: publish_manifest.diff_artifacts 결과 (마지막 배포 대비 추가/수정/삭제)
+        code_rev: 현재 코드 커밋 (code_revision)
+        build_rev: .vercel/output을 만든 코드 커밋 (게시 기록)
+    """
+    logger.info("=" * 60)
+    logger.info("[6] Vercel 배포 시작 (data_only)")
+    logger.info("=" * 60)
+    
+    static_dir = VERCEL_OUTPUT_DIR / 'static'
+    try:
+        if code_rev and code_rev == build_rev and static_dir.exists():
+            for path in changes['added'] + changes['modified']:
+                target = static_dir / os.path.relpath(path, 'public')
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(path, target)
+            for path in changes['removed']:
+                target = static_dir / os.path.relpath(path, 'public')
+                if target.exists():
+                    target.unlink()
+            logger.info(f"[데이터만 배포] 빌드 결과에 파일 {len(changed_paths(changes))}개 반영 (Next.js 빌드 생략)")
+        else:
+            logger.info("코드가 바뀌었거나 로컬 빌드 결과가 없어 vercel build --prod 실행 중...")
+            result = subprocess.run(
+                ['vercel', 'build', '--prod'],
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                cwd=Path.cwd()
+            )
+            if result.returncode != 0:
+                logger.error(f"Vercel 로컬 빌드 실패: {result.stderr}")
+                return False
+        
+        logger.info("Vercel 프로덕션 배포 실행 중 (--prebuilt)...")
+        result = subprocess.run(
+            ['vercel', 'deploy', '--prebuilt', '--prod', '--yes'],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            cwd=Path.cwd()
+        )
+        
+        if result.returncode == 0:
+            logger.info(result.stdout)
+            logger.info("=" * 60)
+            logger.info("[6] Vercel 배포 완료 (data_only)")
+            logger.info("=" * 60)
+            return True
+        logger.error(f"Vercel 배포 실패: {result.stderr}")
+        return False
+    
+    except FileNotFoundError:
+        logger.warning("Vercel CLI가 설치되어 있지 않습니다. 배포를 건너뜁니다.")
+        return False
+    except Exception as e:
+        logger.error(f"Vercel 배포 중 오류 발생: {e}", exc_info=True)
+        return False
+
+
 def verify_files(config: Dict) -> bool:
     """생성된 파일 확인"""
     logger.info("=" * 60)
@@ -608,9 +828,17 @@ def verify_files(config: Dict) -> bool:
     return all_ok
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """메인 함수"""
+    parser = argparse.ArgumentParser(description='매일 자동 대시보드 업데이트')
+    parser.add_argument('--force', action='store_true',
+                        help='입력이 바뀌지 않은 SUMMARY/인사이트도 모두 다시 생성')
+    args = parser.parse_args(argv)
+    
+    setup_logging()
     start_time = datetime.now()
+    start_run()
+    reset_write_stats()
     logger.info("=" * 60)
     logger.info("자동 대시보드 업데이트 시작")
     logger.info(f"시작 시간: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -629,143 +857,77 @@ def main():
     
     success = True
     error_messages = []
+    artifacts = {'changed': [], 'unchanged': []}
+    publish_summary = '확인 안 함 (생성 작업 실패)'
+    publish_scopes = {}
     
     try:
-        # 1. SQL → CSV 생성
-        if not run_sql_to_csv():
-            success = False
-            error_messages.append("SQL → CSV 생성 실패")
-        
-        # NON 시즌과 일반 시즌 분리
-        non_seasons = {}
-        regular_seasons = {}
-        
-        for season_key, season_config in seasons.items():
-            if season_config.get('is_non_season', False):
-                non_seasons[season_key] = season_config
-            else:
-                regular_seasons[season_key] = season_config
+        # 1~4. SQL → CSV, NON 시즌, SUMMARY, 인사이트 생성 (작업 그래프로 병렬 실행)
+        tasks = build_task_graph(seasons, force=args.force)
+        max_workers = config.get('max_workers', DEFAULT_MAX_WORKERS)
+        logger.info(f"생성 작업 {len(tasks)}개 실행 (동시 실행: {max_workers})")
         
-        # 2. NON 시즌 처리 (환율 CSV는 한 번만 생성)
-        if non_seasons:
-            logger.info("=" * 60)
-            logger.info("[NON 시즌 처리 시작]")
-            logger.info("=" * 60)
-            
-            # 2-1. NON 시즌 환율 CSV 생성 (한 번만)
-            if not generate_non_fx_csv():
+        graph_start = time.perf_counter()
+        results = run_task_graph(tasks, max_workers=max_workers, on_finish=log_task_result)
+        wall_time = time.perf_counter() - graph_start
+        clear_frame_cache()  # 생성 단계끼리 공유하던 COST RAW DataFrame 해제
+        
+        logger.info("=" * 60)
+        for line in format_report(tasks, results, wall_time):
+            logger.info(line)
+        logger.info("=" * 60)
+        
+        for task in tasks:
+            result = results[task.name]
+            if result.status != STATUS_SUCCESS:
                 success = False
-                error_messages.append("NON 시즌 환율 CSV 생성 실패")
-            
-            # 2-2. 각 NON 시즌별 처리
-            for season_key, season_config in non_seasons.items():
-                brands = season_config.get('brands', [])
-                
-                # 시즌 코드 추출 (25FW_NON -> 25FW)
-                base_season = season_key.replace('_NON', '')
-                
-                # NON 시즌 CSV 생성
-                if not generate_non_csv(base_season):
-                    success = False
-                    error_messages.append(f"{season_key} CSV 생성 실패")
-                
-                # NON 시즌 SUMMARY 생성
-                if not generate_summary_non(base_season, brands):
-                    success = False
-                    error_messages.append(f"{season_key} SUMMARY 생성 실패")
-                
-                # NON 시즌 인사이트 생성 (설정된 경우)
-                if season_config.get('generate_insights', False):
-                    logger.info(f"{season_key} 인사이트 생성 (규칙 기반)")
-                    if not generate_insights_for_season(season_key, brands):
-                        success = False
-                        error_messages.append(f"{season_key} 인사이트 생성 실패")
-        
-        # 3. 일반 시즌 처리
-        for season_key, season_config in regular_seasons.items():
-            brands = season_config.get('brands', [])
-            
-            if season_key == '25FW':
-                if not generate_summary_25fw(brands):
-                    success = False
-                    error_messages.append(f"{season_key} SUMMARY 생성 실패")
-            elif season_key == '25SS':
-                # 25SS는 generate_summary_26ss.py 사용
-                logger.info(f"{season_key} 시즌 처리 (generate_summary_26ss.py 사용)")
-                if not generate_summary_26ss(brands, '25SS'):
-                    success = False
-                    error_messages.append(f"{season_key} SUMMARY 생성 실패")
-            elif season_key == '26SS':
-                if not generate_summary_26ss(brands, '26SS'):
-                    success = False
-                    error_messages.append(f"{season_key} SUMMARY 생성 실패")
-            elif season_key == '26FW':
-                # 26FW는 generate_summary_26ss.py 사용
-                logger.info(f"{season_key} 시즌 처리 (generate_summary_26ss.py 사용)")
-                if not generate_summary_26ss(brands, '26FW'):
-                    success = False
-                    error_messages.append(f"{season_key} SUMMARY 생성 실패")
-            else:
-                # 새로운 시즌은 generate_summary_26ss.py 사용
-                logger.info(f"{season_key} 시즌 처리 (generate_summary_26ss.py 사용)")
-                if not generate_summary_26ss(brands, season_key):
-                    success = False
-                    error_messages.append(f"{season_key} SUMMARY 생성 실패")
-            
-            # 4. 인사이트 생성 (설정된 시즌만)
-            if season_config.get('generate_insights', False):
-                # 25FW의 경우 M, I, X 제외 (하지만 DISCOVERY-KIDS는 별도 생성)
-                if season_key == '25FW':
-                    exclude_brands = season_config.get('exclude_insights_for', [])
-                    filtered_brands = [b for b in brands if b not in exclude_brands]
-                    if filtered_brands:
-                        logger.info(f"{season_key} 인사이트 생성 (제외 브랜드: {', '.join(exclude_brands)})")
-                        if not generate_insights_for_season(season_key, filtered_brands):
-                            success = False
-                            error_messages.append(f"{season_key} 인사이트 생성 실패")
-                    else:
-                        logger.info(f"{season_key} 인사이트 생성할 브랜드가 없습니다 (모두 제외됨)")
-                    
-                    # DISCOVERY-KIDS 인사이트만 별도 생성 (DISCOVERY 인사이트는 건드리지 않음)
-                    logger.info(f"{season_key} DISCOVERY-KIDS 인사이트 생성 (DISCOVERY 인사이트는 건드리지 않음)")
-                    try:
-                        result = subprocess.run(
-                            ['python', 'generate_insights_rule_based.py', '--season', season_key, '--kids-only'],
-                            capture_output=True,
-                            text=True,
-                            encoding='utf-8'
-                        )
-                        if result.returncode == 0:
-                            logger.info(f"{season_key} DISCOVERY-KIDS 인사이트 생성 완료")
-                            logger.info(result.stdout)
-                        else:
-                            logger.error(f"{season_key} DISCOVERY-KIDS 인사이트 생성 실패: {result.stderr}")
-                            success = False
-                            error_messages.append(f"{season_key} DISCOVERY-KIDS 인사이트 생성 실패")
-                    except Exception as e:
-                        logger.error(f"{season_key} DISCOVERY-KIDS 인사이트 생성 중 오류: {e}")
-                        success = False
-                        error_messages.append(f"{season_key} DISCOVERY-KIDS 인사이트 생성 중 오류")
-                else:
-                    # 25SS, 26SS, 26FW 등 모든 브랜드 처리
-                    logger.info(f"{season_key} 인사이트 생성 (규칙 기반)")
-                    if not generate_insights_for_season(season_key, brands):
-                        success = False
-                        error_messages.append(f"{season_key} 인사이트 생성 실패")
+                error_messages.append(f"{task.label} {STATUS_LABELS[result.status]}")
+        
+        # 생성 파일 저장 결과 (artifact_writer: 내용이 같으면 저장하지 않음)
+        artifacts = write_stats()
+        logger.info(f"생성 파일: 변경 {len(artifacts['changed'])}개, 변경 없음 {len(artifacts['unchanged'])}개")
+        for path in artifacts['changed']:
+            logger.info(f"  [변경] {path}")
         
         # 5. 파일 검증
-        verify_files(config)
+        measured('verify', lambda: verify_files(config))()
         
-        # 6. Git 커밋 및 푸시 (성공한 경우만)
+        # 6~7. Git 커밋/푸시, Vercel 배포 (성공한 경우만, 마지막 배포와 다른 데이터 파일이 있을 때만)
         if success:
-            if not git_commit_and_push(config):
-                logger.warning("Git 커밋/푸시 실패했지만 계속 진행합니다.")
-                # Git 실패는 전체 실패로 처리하지 않음 (선택사항)
+            published = load_published()
+            current = current_artifacts()
+            changes = diff_artifacts(current, published.get('artifacts', {}))
+            publish_paths = changed_paths(changes)
+            publish_scopes = changed_scopes(publish_paths)
             
-            # 7. Vercel 배포 (Git 푸시 성공한 경우)
-            if not deploy_to_vercel(config):
-                logger.warning("Vercel 배포 실패했지만 계속 진행합니다.")
-                # 배포 실패는 전체 실패로 처리하지 않음
+            if not publish_paths:
+                publish_summary = '없음 (마지막 배포와 같음, Git/배포 생략)'
+                logger.info("[변경 없음] 마지막 배포와 데이터 파일이 같아 Git 커밋/푸시와 Vercel 배포를 건너뜁니다.")
+            else:
+                publish_summary = (f"{len(publish_paths)}개 (추가 {len(changes['added'])}, 수정 {len(changes['modified'])}, "
+                                   f"삭제 {len(changes['removed'])}) - {format_scopes(publish_scopes)}")
+                logger.info(f"[배포 대상] {publish_summary}")
+                
+                pushed = measured('git_push', lambda: git_commit_and_push(config))()
+                if not pushed:
+                    logger.warning("Git 커밋/푸시 실패했지만 계속 진행합니다.")
+                    # Git 실패는 전체 실패로 처리하지 않음 (선택사항)
+                
+                # 7. Vercel 배포
+                deploy_mode = config.get('deploy_mode', DEPLOY_MODE_FULL)
+                code_rev = code_revision() if deploy_mode == DEPLOY_MODE_DATA_ONLY else None
+                if deploy_mode == DEPLOY_MODE_DATA_ONLY:
+                    deploy = lambda: deploy_to_vercel_prebuilt(changes, code_rev, published.get('build_rev'))
+                else:
+                    deploy = lambda: deploy_to_vercel(config)
+                deployed = measured('deploy', deploy, mode=deploy_mode)()
+                if not deployed:
+                    logger.warning("Vercel 배포 실패했지만 계속 진행합니다.")
+                    # 배포 실패는 전체 실패로 처리하지 않음
+                
+                # 푸시와 배포가 모두 성공해야 게시 기록 갱신 (실패하면 다음 실행에서 다시 시도)
+                if pushed and deployed:
+                    record_published(current, code_rev)
         
     except Exception as e:
         success = False
@@ -785,6 +947,25 @@ def main():
     logger.info(f"소요 시간: {duration:.1f}초")
     logger.info("=" * 60)
     
+    # 실행 보고서 (logs/run_reports/, logs/run_history.jsonl)
+    previous_runs = load_history(limit=1)
+    previous_run = previous_runs[-1] if previous_runs else None
+    steps = summarize(finished_spans())
+    try:
+        report_file = write_run_report('success' if success else 'failed',
+                                       {'error_messages': error_messages,
+                                        'artifacts_changed': artifacts['changed'],
+                                        'artifacts_unchanged': len(artifacts['unchanged']),
+                                        'published_scopes': publish_scopes})
+        logger.info(f"실행 보고서 저장: {report_file}")
+    except OSError as e:
+        report_file = None
+        logger.warning(f"실행 보고서 저장 실패: {e}")
+    step_table = format_step_table(steps, previous_run)
+    logger.info("[단계별 계측]")
+    for line in step_table:
+        logger.info(f"  {line}")
+    
     # 이메일 알림 (완료/실패)
     if success:
         subject = "[대시보드 자동 업데이트] 완료"
@@ -793,8 +974,14 @@ def main():
 시작 시간: {start_time.strftime('%Y-%m-%d %H:%M:%S')}
 종료 시간: {end_time.strftime('%Y-%m-%d %H:%M:%S')}
 소요 시간: {duration:.1f}초
+생성 파일: 변경 {len(artifacts['changed'])}개, 변경 없음 {len(artifacts['unchanged'])}개
+배포 대상: {publish_summary}
+
+단계별 계측:
+{chr(10).join(step_table)}
 
 로그 파일: {LOG_FILE}
+실행 보고서: {report_file}
 """
     else:
         subject = "[대시보드 자동 업데이트] 실패"
@@ -807,7 +994,11 @@ def main():
 오류 내용:
 {chr(10).join(error_messages)}
 
+단계별 계측:
+{chr(10).join(step_table)}
+
 로그 파일: {LOG_FILE}
+실행 보고서: {report_file}
 """
     
     send_email(config, subject, body, is_error=not success)
@@ -836,6 +1027,7 @@ def main():
     
     if not success:
         teams_message += f"\n\n**오류 내용:**\n```\n{chr(10).join(error_messages)}\n```"
+    teams_message += "\n\n**단계별 계측:**\n\n" + "\n".join(format_step_table(steps, previous_run, markdown=True))
     
     send_teams_message(config, teams_title, teams_message, is_error=not success)
     
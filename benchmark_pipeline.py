@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+파이프라인 단계별 벤치마크 스크립트
+
+Snowflake 없이 합성 데이터(synthetic_cost_data.py)로 일일 업데이트 파이프라인의 각 단계를 실행하고
+소요 시간을 측정합니다. 같은 행 수/시즌/시드면 같은 데이터로 측정하므로 커밋 간 결과를 비교할 수 있습니다.
+
+측정 단계:
+    extract               (--extract) 로컬 웨어하우스에서 SQL_QUERY 전체 추출 (extract_with_store)
+    currency_conversion   process_currency_conversion (sql_to_csv_with_fx.py)
+    format_mlb_fw         format_data_like_mlb_fw
+    save_csv              save_csv_by_brand_season (CSV + Parquet 저장)
+    summary_kpi           generate_summary (generate_summary_26ss.py, 전체 브랜드)
+    item_aggregate        aggregate_by_item (generate_item_cost_rate_csv.py, 전체 브랜드)
+    excel                 create_excel_file
+    insights              규칙 기반 인사이트 생성 (generate_insights_rule_based.py)
+
+- 단계 시간은 run_metrics span으로 측정하고, 반복 실행의 최소/중앙값을 기록
+- 모든 단계는 임시 작업 폴더(public/COST RAW/...)에서 실행 (저장소 파일은 건드리지 않음)
+- --extract: 같은 분포의 원천 테이블로 로컬 웨어하우스(warehouse.py, DuckDB)를 만들고 추출 결과를
+  이후 단계 입력으로 사용 (웨어하우스 생성 시간은 측정에서 제외)
+- 결과는 logs/benchmarks/bench_<행수>_<시각>_<커밋>.json으로 저장 (커밋, 패키지 버전 포함)
+
+KPI 마이크로 벤치마크 (--kpi-csv): 실제 원가 CSV 1개로 SUMMARY KPI 계산만 반복 측정
+    tag_usd_loop          이전 calculate_season_kpi 방식 - (전체 + 카테고리) × 기간마다 필터 후 파이썬 루프로 TAG_USD 합계
+    tag_usd_column        같은 합계를 (기간, 카테고리) groupby 1회 컬럼 합계로
+    summary_kpi           중분류 통합 + calculate_summary (kpi_engine, JSON 생성 제외 전체 KPI)
+    결과는 logs/benchmarks/kpi_<행수>_<시각>_<커밋>.json
+
+아이템 Excel 벤치마크 (--excel-period): 실제 원가 CSV(전체 브랜드)로 item_cost_rate_<기간>.xlsx 생성만 반복 측정
+    excel                 create_excel_file (시트 3개, 임시 폴더에 저장) - 소요 시간과 최대 메모리(tracemalloc)
+    결과는 logs/benchmarks/excel_<아이템수>_<시각>_<커밋>.json
+
+사용 방법:
+    python benchmark_pipeline.py                                  # 10만 행, 3회 반복
+    python benchmark_pipeline.py --rows 1000 100000 1000000 --repeat 1
+    python benchmark_pipeline.py --rows 100000 --extract                         # 추출 단계 포함
+    python benchmark_pipeline.py --rows 100000 --compare logs/benchmarks/bench_100000_....json
+    python benchmark_pipeline.py --kpi-csv "public/COST RAW/26SS/M_26S.csv" --repeat 20
+    python benchmark_pipeline.py --excel-period 25FW --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from run_metrics import display_width, finished_spans, span, start_run, summarize
+from synthetic_cost_data import DEFAULT_SEASONS, DEFAULT_SEED, make_fx_frame, make_query_frame, \
+    working_directory, write_fx_file
+
+# ============================================
+# 벤치마크 설정
+# ============================================
+DEFAULT_ROWS = [100000]
+DEFAULT_REPEAT = 3
+DEFAULT_PERIODS = ['25FW']       # SUMMARY/아이템/인사이트를 만들 분석 기간
+RESULT_DIR = os.path.join('logs', 'benchmarks')
+
+BRANDS = ['M', 'I', 'X', 'ST', 'V']
+
+# 단계 이름 → 측정에 사용하는 span 이름
+STAGE_SPANS = {
+    'extract': 'bench.extract',
+    'currency_conversion': 'bench.currency_conversion',
+    'format_mlb_fw': 'bench.format_mlb_fw',
+    'save_csv': 'bench.save_csv',
+    'summary_kpi': 'bench.summary_kpi',
+    'item_aggregate': 'item.aggregate',
+    'excel': 'item.excel',
+    'insights': 'bench.insights',
+}
+
+# KPI 마이크로 벤치마크 단계
+KPI_STAGES = ['tag_usd_loop', 'tag_usd_column', 'summary_kpi']
+DEFAULT_KPI_REPEAT = 20
+DEFAULT_EXCEL_REPEAT = 5
+
+# 이전 결과 대비 느려진 단계 표시 기준
+SLOWER_RATIO = 1.10
+SLOWER_MIN_SECONDS = 0.05        # 짧은 단계의 흔들림 제외
+
+
+# ============================================
+# 실행
+# ============================================
+def run_pipeline_once(raw: Optional[pd.DataFrame], df_fx: pd.DataFrame, periods: Sequence[str],
+                      warehouse_path: Optional[str] = None) -> Dict[str, float]:
+    """
+    현재 작업 폴더에서 파이프라인 1회 실행 후 단계별 소요 시간(초) 반환
+
+    warehouse_path가 있으면 raw 대신 로컬 웨어하우스에서 추출한 결과로 시작합니다.
+    """
+    from cost_extract_store import extract_with_store
+    from cost_raw_store import clear_frame_cache
+    from generate_insights_rule_based import main as insights_main
+    from generate_item_cost_rate_csv import main as item_main
+    from generate_summary_26ss import generate_summary
+    from sql_to_csv_with_fx import CATEGORY_COLUMNS, EXTRACT_BRANDS, EXTRACT_SEASONS, SQL_QUERY, \
+        format_data_like_mlb_fw, process_currency_conversion, save_csv_by_brand_season
+    from warehouse import LocalConnection
+
+    shutil.rmtree('public', ignore_errors=True)
+    shutil.rmtree('cache', ignore_errors=True)
+    clear_frame_cache()
+    write_fx_file(df_fx)
+
+    start_run()
+    if warehouse_path:
+        with span('bench.extract'):
+            conn = LocalConnection(warehouse_path)
+            try:
+                raw = extract_with_store(conn, SQL_QUERY, EXTRACT_BRANDS, EXTRACT_SEASONS, full=True,
+                                         category_columns=CATEGORY_COLUMNS)
+            finally:
+                conn.close()
+    with span('bench.currency_conversion'):
+        df = process_currency_conversion(raw, df_fx)
+    with span('bench.format_mlb_fw'):
+        df = format_data_like_mlb_fw(df, df_fx)
+    with span('bench.save_csv'):
+        save_csv_by_brand_season(df, df_fx)
+    for period in periods:
+        with span('bench.summary_kpi', season=period):
+            generate_summary(period, BRANDS)
+        with span('bench.item_cost_rate', season=period):
+            item_main(['--period', period])
+        with span('bench.insights', season=period):
+            insights_main(['--season', period, '--brands'] + BRANDS)
+
+    steps = summarize(finished_spans())
+    return {stage: steps[name]['wall'] if name in steps else None for stage, name in STAGE_SPANS.items()}
+
+
+def run_benchmark(rows: int, seasons: Sequence[str], periods: Sequence[str], repeat: int,
+                  seed: int = DEFAULT_SEED, verbose: bool = False, keep_workdir: bool = False,
+                  extract: bool = False) -> dict:
+    """행 수 1개에 대해 repeat회 실행한 결과 (extract: 로컬 웨어하우스 추출 단계 포함)"""
+    df_fx = make_fx_frame(seasons, seed)
+    workdir = tempfile.mkdtemp(prefix='cost_bench_')
+    raw, warehouse_path = None, None
+    if extract:
+        from warehouse import seed_local_warehouse
+
+        warehouse_path = os.path.join(workdir, 'warehouse.duckdb')
+        seed_local_warehouse(warehouse_path, rows, seasons, seed)
+    else:
+        raw = make_query_frame(rows, seasons, seed)
+
+    runs: List[Dict[str, float]] = []
+    try:
+        with working_directory(workdir):
+            for i in range(repeat):
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output) if not verbose else contextlib.nullcontext():
+                    runs.append(run_pipeline_once(raw, df_fx, periods, warehouse_path))
+                total = sum(value for value in runs[-1].values() if value is not None)
+                print(f"[INFO] rows={rows:,} 실행 {i + 1}/{repeat}: {total:.2f}초")
+    finally:
+        if keep_workdir:
+            print(f"[INFO] 작업 폴더 유지: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    stages = {}
+    for stage in STAGE_SPANS:
+        if stage == 'extract' and not extract:
+            continue
+        values = [run[stage] for run in runs if run[stage] is not None]
+        if not values:
+            print(f"[WARN] {stage} 단계가 실행되지 않았습니다.")
+            continue
+        stages[stage] = {
+            'min': round(min(values), 4),
+            'median': round(statistics.median(values), 4),
+            'runs': [round(value, 4) for value in values],
+        }
+    return {'rows': rows, 'stages': stages}
+
+
+# ============================================
+# KPI 마이크로 벤치마크
+# ============================================
+def _timings(values: List[float]) -> dict:
+    return {
+        'min': round(min(values), 6),
+        'median': round(statistics.median(values), 6),
+        'runs': [round(value, 6) for value in values],
+    }
+
+
+def run_kpi_benchmark(csv_path: str, repeat: int) -> dict:
+    """
+    원가 CSV 1개(예: M_26S.csv)로 SUMMARY KPI 계산 단계만 repeat회 측정
+
+    tag_usd_loop/tag_usd_column은 같은 (기간, 카테고리)별 TAG_USD 합계를 구하며, 결과가 다르면 경고합니다.
+    """
+    from cost_schema import COL_CATEGORY, COL_SEASON, COL_TAG_USD, SUMMARY_COLUMNS, merge_acc_categories, \
+        normalize_season_column, read_cost_frame
+    from generate_summary_26ss import calculate_summary, resolve_season
+
+    # 파일명의 시즌 코드로 전년/당년 결정 (M_26S.csv → 26S / 25S)
+    season = os.path.splitext(os.path.basename(csv_path))[0].split('_')[1]
+    _, season_code, prev_season_code = resolve_season(season)
+    source = read_cost_frame(csv_path, SUMMARY_COLUMNS)
+    source[COL_CATEGORY] = merge_acc_categories(source[COL_CATEGORY])
+    period = normalize_season_column(source[COL_SEASON])
+    periods = [prev_season_code, season_code]
+    categories = list(source[COL_CATEGORY].dropna().unique())
+
+    def tag_usd_loop() -> Dict[tuple, float]:
+        sums = {}
+        for category in [None] + categories:
+            in_category = source[COL_CATEGORY] == category if category is not None else None
+            df_cat = source[in_category] if category is not None else source
+            period_cat = period[in_category] if category is not None else period
+            for code in periods:
+                total = 0
+                for tag_usd in df_cat[period_cat == code][COL_TAG_USD]:
+                    total += tag_usd or 0
+                sums[(code, category)] = total
+        return sums
+
+    def tag_usd_column() -> Dict[tuple, float]:
+        by_cell = source[COL_TAG_USD].astype('float64').groupby([period, source[COL_CATEGORY]]).sum()
+        by_period = by_cell.groupby(level=0).sum()
+        sums = {(code, None): float(by_period.get(code, 0)) for code in periods}
+        sums.update({(code, category): float(by_cell.get((code, category), 0))
+                     for category in categories for code in periods})
+        return sums
+
+    def summary_kpi():
+        df = source.copy()
+        df[COL_CATEGORY] = merge_acc_categories(df[COL_CATEGORY])
+        with contextlib.redirect_stdout(io.StringIO()):
+            calculate_summary(df, season_code, prev_season_code)
+
+    loop_sums, column_sums = tag_usd_loop(), tag_usd_column()
+    mismatched = [key for key in loop_sums if not np.isclose(loop_sums[key], column_sums[key])]
+    if mismatched:
+        print(f"[WARN] TAG_USD 합계 불일치 {len(mismatched)}건: {mismatched[:3]}")
+
+    stages = {}
+    for stage, func in zip(KPI_STAGES, [tag_usd_loop, tag_usd_column, summary_kpi]):
+        func()  # 워밍업
+        values = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            values.append(time.perf_counter() - started)
+        stages[stage] = _timings(values)
+    return {'rows': len(source), 'kind': 'kpi', 'file': csv_path, 'stages': stages}
+
+
+# ============================================
+# 아이템 Excel 벤치마크
+# ============================================
+def run_excel_benchmark(period: str, repeat: int) -> Optional[dict]:
+    """
+    현재 폴더의 원가 CSV(전체 브랜드)로 아이템별 원가율 Excel 생성만 repeat회 측정
+
+    아이템 집계는 1번만 하고, 매번 임시 폴더에 저장합니다. 최대 메모리는 시간 측정과 별도로 1회 더 실행해
+    tracemalloc으로 잰 값입니다 (파이썬 할당, tracemalloc이 켜져 있으면 실행이 몇 배 느려짐).
+    """
+    from generate_item_cost_rate_csv import create_excel_file, load_item_table
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_all = load_item_table(period)
+    if df_all is None:
+        print(f"[ERROR] {period} 아이템 데이터가 없습니다.")
+        return None
+
+    def build():
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_excel_file(df_all, output_file, period)
+
+    values = []
+    with tempfile.TemporaryDirectory(prefix='excel_bench_') as workdir:
+        output_file = os.path.join(workdir, f'item_cost_rate_{period}.xlsx')
+        build()  # 워밍업
+        for _ in range(repeat):
+            started = time.perf_counter()
+            build()
+            values.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            build()
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+        file_size = os.path.getsize(output_file)
+
+    return {
+        'rows': len(df_all), 'kind': 'excel', 'period': period,
+        'brands': sorted(df_all['브랜드'].unique().tolist()),
+        'peak_mb': round(peak, 1), 'file_bytes': file_size,
+        'stages': {'excel': _timings(values)},
+    }
+
+
+# ============================================
+# 결과 저장/비교
+# ============================================
+def git_revision() -> str:
+    """현재 커밋 (수정된 파일이 있으면 -dirty)"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment_info() -> dict:
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_result(result: dict, result_dir: str = RESULT_DIR) -> str:
+    os.makedirs(result_dir, exist_ok=True)
+    path = os.path.join(
+        result_dir,
+        f"{result.get('kind', 'bench')}_{result['rows']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{result['commit']}.json",
+    )
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def format_result(result: dict, baseline: Optional[dict] = None) -> List[str]:
+    """단계별 결과 표 (baseline이 있으면 중앙값 비율 표시, 10% 이상이면서 0.05초 이상 느려지면 ▲)"""
+    headers = ['단계', '최소(초)', '중앙값(초)'] + (['이전(초)', '비율'] if baseline else [])
+    rows = []
+    total = 0.0
+    for stage, timing in result['stages'].items():
+        total += timing['median']
+        row = [stage, f"{timing['min']:.3f}", f"{timing['median']:.3f}"]
+        base = (baseline or {}).get('stages', {}).get(stage)
+        if baseline:
+            if base and base['median']:
+                ratio = timing['median'] / base['median']
+                slower = ratio >= SLOWER_RATIO and timing['median'] - base['median'] >= SLOWER_MIN_SECONDS
+                row += [f"{base['median']:.3f}", f"{ratio:.2f}x" + (' ▲' if slower else '')]
+            else:
+                row += ['-', '-']
+        rows.append(row)
+    rows.append(['합계', '', f"{total:.3f}"] + (['', ''] if baseline else []))
+
+    widths = [max(display_width(cell) for cell in column) for column in zip(headers, *rows)]
+    lines = [f"rows={result['rows']:,}  commit={result['commit']}"
+             + (f"  (비교: {baseline['commit']})" if baseline else '')]
+    for row in [headers] + rows:
+        cells = [row[0] + ' ' * (widths[0] - display_width(row[0]))]
+        cells += [' ' * (width - display_width(cell)) + cell for cell, width in zip(row[1:], widths[1:])]
+        lines.append('  ' + '  '.join(cells).rstrip())
+    return lines
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='파이프라인 단계별 벤치마크 (합성 데이터)')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS,
+                        help='조회 결과 행 수 목록 (예: 1000 100000 1000000)')
+    parser.add_argument('--seasons', nargs='+', default=DEFAULT_SEASONS,
+                        help=f"합성 데이터 시즌 코드 (기본: {' '.join(DEFAULT_SEASONS)})")
+    parser.add_argument('--periods', nargs='+', default=DEFAULT_PERIODS,
+                        help=f"SUMMARY/아이템/인사이트 분석 기간 (기본: {' '.join(DEFAULT_PERIODS)})")
+    parser.add_argument('--repeat', type=int, default=None,
+                        help=f'반복 횟수 (기본: {DEFAULT_REPEAT}, --kpi-csv는 {DEFAULT_KPI_REPEAT}, '
+                             f'--excel-period는 {DEFAULT_EXCEL_REPEAT})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='합성 데이터 시드')
+    parser.add_argument('--compare', type=str, nargs='+', default=[],
+                        help='비교할 이전 결과 JSON (행 수가 같은 결과와 비교)')
+    parser.add_argument('--extract', action='store_true',
+                        help='로컬 웨어하우스(DuckDB)에서 추출하는 단계 포함 (pip install duckdb)')
+    parser.add_argument('--no-save', action='store_true', help='결과 파일 저장 안 함')
+    parser.add_argument('--verbose', action='store_true', help='생성 스크립트 출력 표시')
+    parser.add_argument('--keep-workdir', action='store_true', help='임시 작업 폴더 유지')
+    parser.add_argument('--kpi-csv', type=str, default=None,
+                        help='SUMMARY KPI 마이크로 벤치마크에 쓸 원가 CSV (예: "public/COST RAW/26SS/M_26S.csv")')
+    parser.add_argument('--excel-period', type=str, default=None,
+                        help='아이템 Excel 벤치마크 기간 (예: 25FW, 현재 폴더의 원가 CSV 사용)')
+    args = parser.parse_args(argv)
+
+    baselines = {}
+    for path in args.compare:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        baselines[baseline['rows']] = baseline
+
+    commit = git_revision()
+    env = environment_info()
+    if args.kpi_csv:
+        repeat = args.repeat or DEFAULT_KPI_REPEAT
+        print("F&F Cost Dashboard - SUMMARY KPI 마이크로 벤치마크")
+        print("=" * 60)
+        print(f"커밋: {commit}, Python {env['python']}, pandas {env['pandas']}")
+        print(f"파일: {args.kpi_csv}, 반복: {repeat}")
+        result = run_kpi_benchmark(args.kpi_csv, repeat)
+        result.update({
+            'commit': commit,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'config': {'repeat': repeat},
+            'environment': env,
+        })
+        print()
+        for line in format_result(result, baselines.get(result['rows'])):
+            print(line)
+        loop, column = result['stages']['tag_usd_loop']['median'], result['stages']['tag_usd_column']['median']
+        if column > 0:
+            print(f"[INFO] TAG_USD 합계: 파이썬 루프 대비 컬럼 합계 {loop / column:.1f}배 빠름")
+        if not args.no_save:
+            print(f"[OK] 결과 저장: {save_result(result)}")
+        return
+
+    if args.excel_period:
+        repeat = args.repeat or DEFAULT_EXCEL_REPEAT
+        period = args.excel_period.upper()
+        print("F&F Cost Dashboard - 아이템 Excel 벤치마크")
+        print("=" * 60)
+        print(f"커밋: {commit}, Python {env['python']}, pandas {env['pandas']}")
+        print(f"기간: {period}, 반복: {repeat}")
+        result = run_excel_benchmark(period, repeat)
+        if result is None:
+            return
+        result.update({
+            'commit': commit,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'config': {'repeat': repeat},
+            'environment': env,
+        })
+        print()
+        for line in format_result(result, baselines.get(result['rows'])):
+            print(line)
+        print(f"[INFO] 브랜드 {', '.join(result['brands'])}: 최대 메모리 {result['peak_mb']:.1f}MB, "
+              f"파일 {result['file_bytes'] / 1024:.0f}KB")
+        if not args.no_save:
+            print(f"[OK] 결과 저장: {save_result(result)}")
+        return
+
+    args.repeat = args.repeat or DEFAULT_REPEAT
+    print("F&F Cost Dashboard - 파이프라인 벤치마크")
+    print("=" * 60)
+    print(f"커밋: {commit}, Python {env['python']}, pandas {env['pandas']}, CPU {env['cpu_count']}")
+    print(f"시즌: {' '.join(args.seasons)}, 분석 기간: {' '.join(args.periods)}, 반복: {args.repeat}")
+
+    for rows in args.rows:
+        result = run_benchmark(rows, args.seasons, args.periods, args.repeat, args.seed,
+                               verbose=args.verbose, keep_workdir=args.keep_workdir, extract=args.extract)
+        result.update({
+            'commit': commit,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'config': {'seasons': list(args.seasons), 'periods': list(args.periods),
+                       'repeat': args.repeat, 'seed': args.seed, 'extract': args.extract},
+            'environment': env,
+        })
+        print()
+        for line in format_result(result, baselines.get(rows)):
+            print(line)
+        if not args.no_save:
+            print(f"[OK] 결과 저장: {save_result(result)}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+출력 파일 입력 지문(fingerprint) 매니페스트 모듈
+
+summary_*.json, *_insight_*.csv 같은 출력 파일마다 "어떤 입력으로 만들었는지"를 기록해 두고,
+입력(원가 CSV, FX 파일, 생성 스크립트 코드)의 내용이 그대로면 다시 만들지 않도록 하는 모듈입니다.
+(make처럼 동작하되 수정시각이 아니라 내용 해시로 비교)
+
+저장 위치:
+    cache/build_manifest/<출력 폴더 상대경로, / → __>.json
+    (예: public/COST RAW/26SS/ 출력 → cache/build_manifest/public__COST RAW__26SS.json)
+    {
+        "summary_26s_m.json": {
+            "inputs": {"public/COST RAW/26SS/M_26S.csv": "<sha256>", "generate_summary_26ss.py": "<sha256>", ...}
+        }
+    }
+
+- 입력 파일이 없으면 'missing'으로 기록 (없던 입력이 생기면 다시 생성)
+- 출력 파일이 하나라도 없으면 항상 다시 생성
+- 같은 폴더의 매니페스트를 여러 작업이 동시에 갱신해도 되도록 잠금 후 원자적으로 저장
+- 빌드 기록이라 git 무시 대상인 cache/에 저장 (public/에 두면 매일 커밋되고 정적 파일로 배포됨)
+
+사용 예:
+    from build_manifest import is_up_to_date, record_outputs
+
+    if not is_up_to_date(outputs, inputs):
+        generate(...)
+        record_outputs(outputs, inputs)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MANIFEST_DIR = os.path.join('cache', 'build_manifest')
+# 이전 저장 위치 (출력 폴더 안) - 기록할 때 남아 있으면 삭제
+LEGACY_MANIFEST_FILENAME = '.build_manifest.json'
+MISSING_DIGEST = 'missing'
+
+# 해시 계산 결과 캐시: 절대경로 → ((크기, 수정시각), sha256)
+_DIGEST_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_manifest_lock = threading.Lock()
+
+
+# ============================================
+# 입력 지문
+# ============================================
+def file_digest(path: str) -> str:
+    """파일 내용 sha256 (없으면 'missing', 같은 파일은 프로세스에서 한 번만 계산)"""
+    abs_path = os.path.abspath(path)
+    try:
+        stat = os.stat(abs_path)
+    except OSError:
+        return MISSING_DIGEST
+
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _DIGEST_CACHE.get(abs_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(abs_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    _DIGEST_CACHE[abs_path] = (key, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _display_path(path: str) -> str:
+    return os.path.relpath(path).replace(os.sep, '/')
+
+
+def input_fingerprint(inputs: Sequence[str]) -> Dict[str, str]:
+    """입력 파일 경로 → 내용 해시"""
+    return {_display_path(path): file_digest(path) for path in inputs}
+
+
+# ============================================
+# 매니페스트 읽기/쓰기
+# ============================================
+def _manifest_path(output: str) -> str:
+    """
+    출력 폴더별 매니페스트 경로 (public/COST RAW/26SS/x.json → cache/build_manifest/public__COST RAW__26SS.json)
+
+    폴더 이름만 쓰면 다른 위치의 같은 이름 폴더(예: 다른 26SS)가 매니페스트를 공유하므로
+    실행 위치 기준 상대경로 전체로 이름을 만듭니다.
+    """
+    folder = os.path.dirname(os.path.abspath(output))
+    try:
+        rel = os.path.relpath(folder)
+    except ValueError:
+        rel = folder  # 다른 드라이브 (Windows)
+    name = rel.replace(os.sep, '/').replace(':', '').strip('/').replace('/', '__')
+    return os.path.join(MANIFEST_DIR, f"{name if name != '.' else '_root'}.json")
+
+
+def _load_manifest(manifest_path: str) -> Dict[str, dict]:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def changed_inputs(outputs: Sequence[str], inputs: Sequence[str],
+                   fingerprint: Optional[Dict[str, str]] = None) -> Optional[List[str]]:
+    """
+    기록된 지문과 달라진 입력 목록
+
+    Returns:
+        달라진 입력 경로 목록 (빈 목록이면 최신), 출력이 없거나 기록이 없으면 None
+    """
+    fingerprint = fingerprint if fingerprint is not None else input_fingerprint(inputs)
+    changed = set()
+    for output in outputs:
+        if not os.path.exists(output):
+            return None
+        entry = _load_manifest(_manifest_path(output)).get(os.path.basename(output))
+        if not entry:
+            return None
+        recorded = entry.get('inputs', {})
+        changed.update(path for path in set(fingerprint) | set(recorded)
+                       if fingerprint.get(path) != recorded.get(path))
+    return sorted(changed)
+
+
+def is_up_to_date(outputs: Sequence[str], inputs: Sequence[str]) -> bool:
+    """모든 출력이 있고, 기록된 입력 지문이 현재 입력과 같으면 True"""
+    return changed_inputs(outputs, inputs) == []
+
+
+def record_outputs(outputs: Sequence[str], inputs: Sequence[str],
+                   fingerprint: Optional[Dict[str, str]] = None):
+    """
+    출력 파일을 만든 입력 지문 기록 (존재하는 출력만)
+
+    생성 전에 계산한 fingerprint를 넘기면 생성 중 입력이 바뀐 경우 다음 실행에서 다시 생성합니다.
+    """
+    fingerprint = fingerprint if fingerprint is not None else input_fingerprint(inputs)
+    by_manifest: Dict[str, List[str]] = {}
+    for output in outputs:
+        if os.path.exists(output):
+            by_manifest.setdefault(_manifest_path(output), []).append(os.path.basename(output))
+            legacy_path = os.path.join(os.path.dirname(os.path.abspath(output)), LEGACY_MANIFEST_FILENAME)
+            if os.path.exists(legacy_path):
+                os.remove(legacy_path)
+
+    with _manifest_lock:
+        for manifest_path, names in by_manifest.items():
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            manifest = _load_manifest(manifest_path)
+            for name in names:
+                manifest[name] = {'inputs': fingerprint}
+            tmp_path = manifest_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(sorted(manifest.items())), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, manifest_path)
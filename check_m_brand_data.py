@@ -1,7 +1,9 @@
-import snowflake.connector
 import pandas as pd
 from datetime import date
 
+from snowflake_query import fetch_dataframe
+from warehouse import connect_warehouse, describe_warehouse
+
 # Snowflake 연결 설정
 SNOWFLAKE_CONFIG = {
     'account': 'cixxjbf-wp67697',
@@ -14,19 +16,12 @@ SNOWFLAKE_CONFIG = {
 }
 
 def connect_to_database():
-    """Snowflake에 연결"""
+    """Snowflake(또는 COST_WAREHOUSE로 선택한 웨어하우스)에 연결"""
     try:
-        conn = snowflake.connector.connect(
-            account=SNOWFLAKE_CONFIG['account'],
-            user=SNOWFLAKE_CONFIG['username'],
-            password=SNOWFLAKE_CONFIG['password'],
-            warehouse=SNOWFLAKE_CONFIG['warehouse'],
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-        )
+        conn = connect_warehouse(SNOWFLAKE_CONFIG)
         return conn
     except Exception as e:
-        print(f"[ERROR] Snowflake 연결 실패: {e}")
+        print(f"[ERROR] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 실패: {e}")
         return None
 
 def check_m_brand_data(season: str, period: str):
@@ -139,14 +134,7 @@ order by po_no, type1
         return
     
     try:
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        df = pd.DataFrame(rows, columns=columns)
-        cursor.close()
+        df = fetch_dataframe(conn, query)
         
         print(f"\n[INFO] 총 {len(df)}개 행 조회")
         
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+원가 견적 증분 추출 로컬 저장소
+
+sql_to_csv_with_fx.py의 SQL_QUERY는 매번 10개 시즌 × 5개 브랜드 전체를 다시 집계하지만,
+하루에 실제로 바뀌는 견적은 수백 건 수준입니다. 이 모듈은 추출 결과를 로컬 저장소
+(cache/cost_rows.arrow + cache/cost_extract.sqlite)에 보관하고, 변경된 견적만 다시 조회해
+upsert 합니다.
+
+동작 방식:
+1. 원가 상세(db_cost_dtl)를 읽지 않는 가벼운 상태 쿼리로 (PO, 원가견적번호)별
+   견적차수/승인상태/견적서제출일자와 SQL_QUERY가 붙이는 TAG/발주수량(dw_ord),
+   아이템명(db_prdt)/중분류(mst_prdt)를 조회
+2. 저장된 상태와 비교해 신규/변경/삭제된 견적 키를 찾음
+   (TAG/발주수량만 바뀐 PO도 상태가 바뀌므로 다음 실행에서 바로 재조회)
+3. 변경된 PO만 SQL_QUERY에 PO 조건을 붙여 재조회하고 (PO, 원가견적번호) 단위로 교체
+4. 저장소 전체를 SQL_QUERY와 같은 정렬 순서로 DataFrame으로 반환
+
+- 견적차수가 바뀌지 않은 채 원가 상세 행만 수정된 경우는 상태로 감지할 수 없으므로
+  FULL_REFRESH_DAYS마다 자동으로 전체 재추출 (안전장치)
+- SQL_QUERY 문구, 결과 컬럼, 상태 지문 형식(STATE_VERSION)이 바뀌면 자동으로 전체 재추출
+- --full 옵션으로 언제든 전체 재추출 가능
+
+사용 예:
+    from cost_extract_store import extract_with_store
+
+    df = extract_with_store(conn, SQL_QUERY, EXTRACT_BRANDS, EXTRACT_SEASONS, full=False,
+                            category_columns=CATEGORY_COLUMNS)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+from snowflake_query import arrow_to_frame, fetch_arrow_table
+
+# ============================================
+# 저장소 설정
+# ============================================
+STORE_DIR = 'cache'
+STORE_FILE = os.path.join(STORE_DIR, 'cost_extract.sqlite')  # 메타/견적 상태/워터마크
+ROWS_FILE = os.path.join(STORE_DIR, 'cost_rows.arrow')  # SQL_QUERY 결과 행 (Arrow 원본 타입 그대로)
+
+# 견적 상태로 감지할 수 없는 변경(확정 견적의 원가 상세 행 직접 수정)을 반영하기 위한 전체 재추출 주기
+FULL_REFRESH_DAYS = 7
+
+# 견적 상태 지문 형식 (바뀌면 저장된 상태와 비교할 수 없으므로 전체 재추출)
+STATE_VERSION = '2'
+
+# 변경 PO 재조회 시 IN 조건 한 번에 넣을 PO 수 (Snowflake 식 개수 제한 대비)
+DELTA_CHUNK_SIZE = 1000
+
+# SQL_QUERY 결과 컬럼 중 저장소 키로 사용하는 컬럼
+KEY_COLUMNS = ('PO', '원가견적번호')
+
+# SQL_QUERY의 order by (brd_cd, sesn desc, part_cd, po_no)와 동일한 정렬
+SORT_KEYS = [('브랜드', 'ascending'), ('시즌', 'descending'), ('스타일', 'ascending'), ('PO', 'ascending')]
+
+# SQL_QUERY 바깥 select의 where 절 시작 (변경 PO 조건을 덧붙이는 위치)
+OUTER_WHERE_ANCHOR = "from main\nwhere "
+
+QuoteKey = Tuple[str, str]
+
+
+# ============================================
+# 쿼리 생성
+# ============================================
+def _sql_list(values) -> str:
+    """문자열 목록을 SQL IN 조건용 리터럴로 변환"""
+    return ', '.join("'" + str(v).replace("'", "''") + "'" for v in values)
+
+
+def build_state_query(brands: List[str], seasons: List[str]) -> str:
+    """
+    견적 상태 쿼리 생성 (db_cost_mst + SQL_QUERY와 같은 TAG/발주수량/상품 조인, db_cost_dtl 조회 없음)
+
+    승인상태가 '확정'이 아닌 견적도 포함해야 확정 → 취소 같은 변경을 감지할 수 있습니다.
+    TAG(상품별 최소 tag_price)와 수량(PO별 ord_qty 합계)은 SQL_QUERY의 o1/o2와 같은 집계입니다.
+    """
+    return f"""
+select
+    a.brd_cd,
+    a.sesn,
+    a.po_no,
+    a.cost_quotation_no,
+    a.quotation_seq,
+    a.quotation_apv_stat_nm,
+    a.quotation_submit_dt,
+    p.item_nm,
+    s.vtext2,
+    o1.tag_price,
+    o2.po_qty_sum
+from prcs.db_cost_mst a
+left join prcs.db_prdt p on p.prdt_cd = a.brd_cd || a.sesn || a.part_cd
+left join sap_fnf.mst_prdt s on s.prdt_cd = p.prdt_cd
+left join (
+    select prdt_cd, min(tag_price) as tag_price
+    from prcs.dw_ord
+    where tag_price is not null
+    group by prdt_cd
+) o1 on o1.prdt_cd = p.prdt_cd
+left join (
+    select po_no, sum(ord_qty) as po_qty_sum
+    from prcs.dw_ord
+    group by po_no
+) o2 on o2.po_no = a.po_no
+where a.brd_cd in ({_sql_list(brands)})
+    and a.sesn in ({_sql_list(seasons)})
+"""
+
+
+def build_delta_query(base_query: str, po_nos: List[str]) -> str:
+    """SQL_QUERY 바깥 where 절에 PO 조건을 추가한 재조회 쿼리 생성"""
+    if OUTER_WHERE_ANCHOR not in base_query:
+        raise ValueError("SQL_QUERY에서 바깥 where 절을 찾을 수 없습니다.")
+    return base_query.replace(
+        OUTER_WHERE_ANCHOR,
+        f"{OUTER_WHERE_ANCHOR}po_no in ({_sql_list(po_nos)})\n    and ",
+        1
+    )
+
+
+def _query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def _state_value(value) -> str:
+    return '' if pd.isna(value) else str(value)
+
+
+def _quote_state(df_state: pd.DataFrame) -> Dict[QuoteKey, Tuple[str, str, str]]:
+    """
+    상태 쿼리 결과를 (PO, 원가견적번호) → (브랜드, 시즌, 상태 지문)으로 변환
+
+    한 견적에 여러 견적차수가 있을 수 있으므로 차수/승인상태/제출일자와
+    TAG/수량/아이템명/중분류를 모두 묶어 지문을 만듭니다.
+    """
+    df_state = df_state.copy()
+    df_state.columns = [c.lower() for c in df_state.columns]
+    part_columns = ['quotation_seq', 'quotation_apv_stat_nm', 'quotation_submit_dt',
+                    'tag_price', 'po_qty_sum', 'item_nm', 'vtext2']
+
+    states: Dict[QuoteKey, list] = {}
+    for brand, season, po_no, quotation_no, *values in zip(
+        df_state['brd_cd'], df_state['sesn'], df_state['po_no'], df_state['cost_quotation_no'],
+        *(df_state[col] for col in part_columns)
+    ):
+        entry = states.setdefault((str(po_no), str(quotation_no)), [brand, season, []])
+        entry[2].append('|'.join(_state_value(value) for value in values))
+
+    return {
+        key: (brand, season, hashlib.md5(';'.join(sorted(parts)).encode('utf-8')).hexdigest())
+        for key, (brand, season, parts) in states.items()
+    }
+
+
+# ============================================
+# SQLite 저장소
+# ============================================
+class CostExtractStore:
+    """
+    SQL_QUERY 결과 행과 견적 상태를 보관하는 로컬 저장소
+
+    결과 행은 Snowflake가 돌려준 Arrow 타입 그대로 Arrow 파일에 저장하고
+    (PO, 원가견적번호) 단위로 교체합니다. 저장소에서 만든 DataFrame과 직접 조회한 결과가
+    같은 arrow_to_frame 변환을 거치므로 같은 CSV를 만듭니다.
+    """
+
+    def __init__(self, path: str = STORE_FILE, rows_path: str = ROWS_FILE):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.rows_path = rows_path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            create table if not exists meta (
+                name text primary key,
+                value text
+            );
+            create table if not exists quote_state (
+                po_no text not null,
+                cost_quotation_no text not null,
+                brand text,
+                season text,
+                state_hash text,
+                primary key (po_no, cost_quotation_no)
+            );
+            drop table if exists watermark;
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    # ----- 메타 정보 -----
+    def get_meta(self, name: str) -> Optional[str]:
+        row = self.conn.execute("select value from meta where name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str):
+        self.conn.execute("insert or replace into meta (name, value) values (?, ?)", (name, value))
+
+    def get_columns(self) -> Optional[List[str]]:
+        value = self.get_meta('columns')
+        return json.loads(value) if value else None
+
+    def needs_full_refresh(self, query: str) -> Optional[str]:
+        """전체 재추출이 필요한 이유를 반환 (필요 없으면 None)"""
+        if self.get_columns() is None or not os.path.exists(self.rows_path):
+            return "저장소가 비어 있음"
+        if self.get_meta('query_hash') != _query_hash(query):
+            return "SQL_QUERY 변경"
+        if self.get_meta('state_version') != STATE_VERSION:
+            return "견적 상태 형식 변경"
+        last_full = self.get_meta('last_full_at')
+        if last_full is None or datetime.now() - datetime.fromisoformat(last_full) > timedelta(days=FULL_REFRESH_DAYS):
+            return f"마지막 전체 추출 후 {FULL_REFRESH_DAYS}일 경과"
+        return None
+
+    # ----- 행 저장/조회 -----
+    def _write_rows(self, table: pa.Table):
+        # 임시 파일에 쓴 뒤 교체 (중간에 실패해도 기존 저장소 유지)
+        tmp_path = self.rows_path + '.tmp'
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, self.rows_path)
+
+    def load_rows(self) -> pa.Table:
+        return feather.read_table(self.rows_path)
+
+    def replace_all(self, table: pa.Table, query: str):
+        """전체 추출 결과로 저장소를 교체"""
+        self._write_rows(table)
+        self.set_meta('columns', json.dumps(table.column_names, ensure_ascii=False))
+        self.set_meta('query_hash', _query_hash(query))
+        self.set_meta('state_version', STATE_VERSION)
+        self.set_meta('last_full_at', datetime.now().isoformat(timespec='seconds'))
+
+    def upsert(self, delta: pa.Table, changed_keys: Set[QuoteKey]) -> pa.Table:
+        """변경된 견적 키의 기존 행을 지우고 재조회한 행으로 교체한 뒤 저장된 전체 행을 반환"""
+        delta_keys = set(zip(*(_key_strings(delta, col) for col in KEY_COLUMNS))) if delta.num_rows else set()
+        remove_keys = changed_keys | delta_keys
+
+        current = self.load_rows()
+        if remove_keys and current.num_rows:
+            joined = pc.binary_join_element_wise(
+                *(pc.cast(current.column(col), pa.string()) for col in KEY_COLUMNS), '\x1f'
+            )
+            remove_set = pa.array(['\x1f'.join(key) for key in remove_keys], type=pa.string())
+            current = current.filter(pc.invert(pc.fill_null(pc.is_in(joined, value_set=remove_set), False)))
+
+        if delta.num_rows:
+            current = pa.concat_tables([current, delta.select(current.column_names)], promote_options='permissive')
+        if current.num_rows:
+            current = current.sort_by(SORT_KEYS)
+        self._write_rows(current)
+        return current
+
+    # ----- 견적 상태 -----
+    def get_quote_state(self) -> Dict[QuoteKey, str]:
+        return {
+            (po_no, quotation_no): state_hash
+            for po_no, quotation_no, state_hash in self.conn.execute(
+                "select po_no, cost_quotation_no, state_hash from quote_state"
+            )
+        }
+
+    def save_quote_state(self, states: Dict[QuoteKey, Tuple[str, str, str]]):
+        self.conn.execute("delete from quote_state")
+        self.conn.executemany(
+            "insert into quote_state (po_no, cost_quotation_no, brand, season, state_hash) values (?, ?, ?, ?, ?)",
+            [(key[0], key[1], brand, season, state_hash)
+             for key, (brand, season, state_hash) in states.items()]
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+
+# ============================================
+# 증분 추출
+# ============================================
+def _key_strings(table: pa.Table, column: str) -> List[str]:
+    """키 컬럼 값을 문자열 목록으로 변환 (견적 상태 키와 같은 형식)"""
+    return [str(value) for value in table.column(column).to_pylist()]
+
+
+def extract_with_store(conn, query: str, brands: List[str], seasons: List[str],
+                       full: bool = False, category_columns: Optional[Iterable[str]] = None,
+                       store_path: str = STORE_FILE, rows_path: str = ROWS_FILE) -> Optional[pd.DataFrame]:
+    """
+    로컬 저장소를 이용해 SQL_QUERY 결과를 반환 (변경된 견적만 Snowflake에서 재조회)
+
+    Args:
+        conn: Snowflake 연결
+        query: 기준 쿼리 (sql_to_csv_with_fx.SQL_QUERY)
+        brands: 쿼리 대상 브랜드 목록 (쿼리 where 절과 동일)
+        seasons: 쿼리 대상 시즌 목록 (쿼리 where 절과 동일)
+        full: True면 저장소를 무시하고 전체 재추출
+        category_columns: 결과 DataFrame에서 category로 변환할 코드 컬럼
+        store_path: SQLite 저장소 경로
+        rows_path: 결과 행 Arrow 파일 경로
+
+    Returns:
+        SQL_QUERY를 직접 실행한 것과 같은 DataFrame, 실패 시 None
+    """
+    store = CostExtractStore(store_path, rows_path)
+    try:
+        reason = "--full 옵션" if full else store.needs_full_refresh(query)
+
+        # 견적 상태는 전체/증분 모두 조회해 저장 (다음 실행의 비교 기준)
+        print("\n[INFO] 견적 상태 조회 중...")
+        states = _quote_state(arrow_to_frame(fetch_arrow_table(conn, build_state_query(brands, seasons))))
+        print(f"[OK] 견적 {len(states)}건 상태 조회 완료")
+
+        if reason:
+            print(f"\n[INFO] 전체 추출 실행 중... ({reason})")
+            table = fetch_arrow_table(conn, query)
+            store.replace_all(table, query)
+            store.save_quote_state(states)
+            store.commit()
+            print(f"[OK] {table.num_rows}개 행 추출, 로컬 저장소 갱신 완료: {store.rows_path}")
+            return arrow_to_frame(table, category_columns)
+
+        # 저장된 상태와 비교해 변경 견적 찾기
+        prev_states = store.get_quote_state()
+        new_keys = {key for key in states if key not in prev_states}
+        changed_keys = {key for key, state in states.items() if key in prev_states and prev_states[key] != state[2]}
+        removed_keys = {key for key in prev_states if key not in states}
+        print(f"[INFO] 증분 추출: 신규 {len(new_keys)}건, 상태 변경 {len(changed_keys)}건, 삭제 {len(removed_keys)}건")
+
+        # 변경된 PO만 재조회
+        refresh_keys = new_keys | changed_keys
+        po_nos = sorted({key[0] for key in refresh_keys})
+        columns = store.get_columns()
+        delta_tables = []
+        for start in range(0, len(po_nos), DELTA_CHUNK_SIZE):
+            delta = fetch_arrow_table(conn, build_delta_query(query, po_nos[start:start + DELTA_CHUNK_SIZE]))
+            if delta.column_names != columns:
+                # 결과 컬럼이 바뀌었으면 증분 결과를 신뢰할 수 없으므로 전체 재추출
+                print("[WARN] 쿼리 결과 컬럼이 저장소와 다릅니다. 전체 추출로 전환합니다.")
+                store.close()  # 아래 재귀 호출이 같은 파일을 다시 연결
+                return extract_with_store(conn, query, brands, seasons, full=True,
+                                          category_columns=category_columns,
+                                          store_path=store_path, rows_path=rows_path)
+            delta_tables.append(delta)
+
+        if delta_tables:
+            delta = pa.concat_tables(delta_tables, promote_options='permissive')
+        else:
+            delta = store.load_rows().slice(0, 0)
+
+        table = store.upsert(delta, refresh_keys | removed_keys)
+        store.save_quote_state(states)
+        store.commit()
+
+        print(f"[OK] {delta.num_rows}개 행 재조회, 로컬 저장소 기준 {table.num_rows}개 행")
+        return arrow_to_frame(table, category_columns)
+    except Exception as e:
+        print(f"[ERROR] 쿼리 실행 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+    finally:
+        store.close()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COST RAW Parquet 저장소 모듈
+
+public/COST RAW/<시즌폴더>/<브랜드>_<시즌>.csv 파일은 대시보드(Next.js)용으로 그대로 두고,
+같은 내용을 브랜드/시즌 파티션 Parquet 파일로 함께 저장해 파이썬 스크립트는 Parquet에서 읽도록 한 모듈입니다.
+매번 UTF-8 BOM CSV 텍스트를 다시 파싱하지 않고 타입이 정해진 컬럼을 바로 읽습니다.
+
+저장 위치:
+    cache/cost_raw/brand=<브랜드>/season=<시즌>/<CSV 파일명>.parquet
+    (예: public/COST RAW/25FW/X_25F_kids.csv → cache/cost_raw/brand=X/season=25F/X_25F_kids.parquet)
+
+- 스키마는 CSV를 pd.read_csv(thousands=',')로 읽은 결과와 같게 고정 - Parquet와 CSV 대체 경로 모두
+  같은 파싱(_parse_csv) 후 dtype을 적용하므로 Parquet가 최신인지와 관계없이 같은 값
+- 코드 컬럼(브랜드, 시즌, 발주통화, 중분류, 기간)은 dictionary 인코딩으로 저장
+- 원본 CSV의 크기/수정시각을 Parquet 메타데이터에 기록해, CSV가 바뀌었으면 CSV를 직접 읽음
+- 한 프로세스에서 이미 읽은(또는 저장하며 파싱한) 파일은 메모리에서 복사본을 반환
+  (auto_update_dashboard.py처럼 여러 단계를 한 프로세스에서 실행할 때 재파싱 방지,
+  최근에 쓴 MAX_CACHED_FRAMES개만 보관)
+- 읽은 행 수, 저장한 행 수/파일 크기는 현재 run_metrics span에 기록
+
+사용 예:
+    from cost_raw_store import read_cost_raw, sync_parquet
+
+    write_csv(df, csv_path, lineterminator='\\n')   # artifact_writer
+    sync_parquet(csv_path)
+
+    df = read_cost_raw(csv_path)
+
+전체 CSV를 Parquet로 다시 만들기:
+    python cost_raw_store.py
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from run_metrics import record, record_file
+
+# ============================================
+# 저장 설정
+# ============================================
+COST_RAW_DIR = os.path.join('public', 'COST RAW')
+PARQUET_ROOT = os.path.join('cache', 'cost_raw')
+
+# dictionary 인코딩으로 저장할 코드 컬럼
+CODE_COLUMNS = ['브랜드', '시즌', '발주통화', '중분류', '기간']
+
+# 대상 CSV 파일명: M_25F.csv, X_25F_kids.csv, M_25F_NON.csv, I_24SS.csv
+COST_RAW_FILE_PATTERN = re.compile(r'^(?P<brand>[A-Z]+)_(?P<season>\d{2}[A-Z]+)(?:_kids|_NON)?\.csv$')
+
+# Parquet 메타데이터 키 (원본 CSV 정보)
+SOURCE_METADATA_KEY = b'cost_raw_source'
+
+# 프로세스 내 파싱 결과 캐시: CSV 절대경로 → (CSV 크기/수정시각, 전체 컬럼 DataFrame), 최근 사용 순
+MAX_CACHED_FRAMES = 32
+_FRAME_CACHE: 'OrderedDict[str, Tuple[dict, pd.DataFrame]]' = OrderedDict()
+_frame_lock = threading.Lock()
+
+
+# ============================================
+# 경로
+# ============================================
+def parquet_path_for(csv_path: str) -> Optional[str]:
+    """COST RAW CSV 경로에 대응하는 Parquet 경로 (대상 파일이 아니면 None)"""
+    filename = os.path.basename(csv_path)
+    match = COST_RAW_FILE_PATTERN.match(filename)
+    if not match:
+        return None
+    return os.path.join(
+        PARQUET_ROOT,
+        f"brand={match.group('brand')}",
+        f"season={match.group('season')}",
+        filename[:-len('.csv')] + '.parquet',
+    )
+
+
+def _source_info(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _is_fresh(parquet_path: str, csv_path: str) -> bool:
+    """Parquet가 현재 CSV 내용으로 만들어진 것인지 확인"""
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        return json.loads(metadata[SOURCE_METADATA_KEY]) == _source_info(csv_path)
+    except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+        return False
+
+
+# ============================================
+# 프로세스 내 캐시
+# ============================================
+def _remember_frame(csv_path: str, source: dict, df: pd.DataFrame):
+    key = os.path.abspath(csv_path)
+    with _frame_lock:
+        _FRAME_CACHE[key] = (source, df)
+        _FRAME_CACHE.move_to_end(key)
+        while len(_FRAME_CACHE) > MAX_CACHED_FRAMES:
+            _FRAME_CACHE.popitem(last=False)
+
+
+def _cached_frame(csv_path: str) -> Optional[pd.DataFrame]:
+    """같은 CSV 내용으로 파싱해 둔 DataFrame (없거나 CSV가 바뀌었으면 None)"""
+    key = os.path.abspath(csv_path)
+    with _frame_lock:
+        entry = _FRAME_CACHE.get(key)
+        if entry is not None:
+            _FRAME_CACHE.move_to_end(key)
+    if entry is None:
+        return None
+    try:
+        if entry[0] == _source_info(csv_path):
+            return entry[1]
+    except OSError:
+        pass
+    return None
+
+
+def clear_frame_cache():
+    """프로세스 내 캐시 비우기"""
+    with _frame_lock:
+        _FRAME_CACHE.clear()
+
+
+def _parse_csv(csv_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """COST RAW CSV 파싱 (Parquet 저장과 CSV 대체 읽기 공통 - 천 단위 구분 쉼표가 있는 숫자도 숫자로)"""
+    return pd.read_csv(csv_path, encoding='utf-8-sig', usecols=columns, thousands=',')
+
+
+def _convert_dtypes(df: pd.DataFrame, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """이미 타입이 정해진 DataFrame에 dtype 적용"""
+    if not dtype:
+        return df
+    # 숫자로 저장되지 않은 컬럼(문자열 등)은 apply_schema 등 호출한 쪽에서 변환
+    convertible = {
+        col: col_type for col, col_type in dtype.items()
+        if col in df.columns and (col_type == 'str' or pd.api.types.is_numeric_dtype(df[col]))
+    }
+    return df.astype(convertible)
+
+
+# ============================================
+# 쓰기
+# ============================================
+def _frame_to_table(df: pd.DataFrame) -> pa.Table:
+    """read_csv 결과 DataFrame을 명시적 스키마(코드 컬럼 dictionary)의 Arrow 테이블로 변환"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        is_text = pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+        if field.name in CODE_COLUMNS and is_text:
+            fields.append(pa.field(field.name, pa.dictionary(pa.int32(), field.type)))
+        else:
+            fields.append(field)
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def sync_parquet(csv_path: str) -> Optional[str]:
+    """
+    방금 저장한 COST RAW CSV를 Parquet 파티션에도 저장
+
+    CSV를 _parse_csv로 다시 읽어 만든 DataFrame을 저장하므로, Parquet를 읽은 결과는 CSV를 읽은 결과와 같습니다.
+    빈 CSV 등 읽을 수 없는 파일은 기존 Parquet를 지워 읽는 쪽이 CSV를 그대로 쓰게 합니다.
+    CSV가 바뀌지 않았으면(artifact_writer가 같은 내용이라 쓰지 않은 경우) 기존 Parquet를 그대로 둡니다.
+
+    Returns:
+        저장한 Parquet 경로 (대상이 아니거나 실패하면 None)
+    """
+    parquet_path = parquet_path_for(csv_path)
+    if parquet_path is None:
+        return None
+    if _is_fresh(parquet_path, csv_path):
+        return parquet_path
+
+    source = _source_info(csv_path)
+    try:
+        df = _parse_csv(csv_path)
+        table = _frame_to_table(df)
+    except (pd.errors.EmptyDataError, pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        if os.path.exists(parquet_path):
+            os.remove(parquet_path)
+        print(f"[WARN] Parquet 저장 생략 ({csv_path}): {e}")
+        record_file(csv_path)
+        return None
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_METADATA_KEY] = json.dumps(source).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp_path = parquet_path + '.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, parquet_path)
+    _remember_frame(csv_path, source, df)
+    record(rows_out=len(df))
+    record_file(csv_path, parquet_path)
+    return parquet_path
+
+
+# ============================================
+# 읽기
+# ============================================
+def read_cost_raw(csv_path: str, categories: bool = False, columns: Optional[List[str]] = None,
+                  dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    COST RAW 데이터 읽기 (최신 Parquet가 있으면 Parquet, 없으면 CSV)
+
+    Args:
+        csv_path: COST RAW CSV 경로 (pd.read_csv에 넘기던 경로 그대로)
+        categories: True면 코드 컬럼을 category로 반환 (기본은 CSV와 같은 문자열)
+        columns: 읽을 컬럼 목록 (None이면 전체)
+        dtype: 컬럼별 타입 (CSV/Parquet 모두 읽은 뒤 적용)
+
+    Returns:
+        pd.read_csv(csv_path, encoding='utf-8-sig', thousands=',')와 같은 DataFrame
+        (호출한 쪽에서 수정해도 되는 복사본)
+    """
+    df = _read_cost_raw(csv_path, categories, columns, dtype)
+    record(rows_in=len(df))
+    return df
+
+
+def _read_cost_raw(csv_path: str, categories: bool, columns: Optional[List[str]],
+                   dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    cached = None if categories else _cached_frame(csv_path)
+    if cached is not None:
+        df = cached[columns] if columns is not None else cached
+        return _convert_dtypes(df.copy(), dtype)
+
+    parquet_path = parquet_path_for(csv_path)
+    if parquet_path is None or not _is_fresh(parquet_path, csv_path):
+        if columns is None:
+            source = _source_info(csv_path)
+            df = _parse_csv(csv_path)
+            _remember_frame(csv_path, source, df)
+            return _convert_dtypes(df.copy(), dtype)
+        return _convert_dtypes(_parse_csv(csv_path, columns), dtype)
+
+    table = pq.read_table(parquet_path, columns=columns)
+    if not categories:
+        fields = [
+            pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ]
+        table = table.cast(pa.schema(fields, metadata=table.schema.metadata))
+    df = table.to_pandas()
+    if columns is None and not categories:
+        _remember_frame(csv_path, _source_info(csv_path), df)
+        return _convert_dtypes(df.copy(), dtype)
+    return _convert_dtypes(df, dtype)
+
+
+# ============================================
+# 전체 재생성
+# ============================================
+def rebuild_all(root: str = COST_RAW_DIR) -> List[str]:
+    """COST RAW 폴더의 모든 대상 CSV를 Parquet로 다시 저장"""
+    written = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if not COST_RAW_FILE_PATTERN.match(filename):
+                continue
+            parquet_path = sync_parquet(os.path.join(dirpath, filename))
+            if parquet_path:
+                written.append(parquet_path)
+    return written
+
+
+if __name__ == '__main__':
+    paths = rebuild_all()
+    print(f"[OK] Parquet {len(paths)}개 저장 완료: {PARQUET_ROOT}")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COST RAW 원가 CSV 컬럼 스키마
+
+public/COST RAW/*/<브랜드>_<시즌>.csv (MLB FW 형식)와 *_NON.csv (합의납기일이 추가된 NON 형식)의
+컬럼 이름/타입/역할을 한 곳에 정의한 모듈입니다.
+집계 스크립트가 iloc[:, 7], iloc[:, 30] 같은 위치 대신 컬럼 이름으로 접근하고,
+숫자 변환(pd.to_numeric)과 결측치 처리는 읽을 때 한 번만 하도록 합니다.
+
+역할(role):
+- code: 브랜드/시즌/중분류 등 코드 문자열
+- text: 설명 문자열
+- date: 날짜 문자열 (원본 그대로 보관)
+- tag: TAG 가격 (결측치 유지)
+- qty: 수량 (결측치 → 0)
+- unit_cost: 단가 (결측치 → 0)
+- total: 총금액 (결측치 → 0)
+
+사용 예:
+    from cost_schema import COL_QTY, COL_TAG, read_cost_frame, SUMMARY_COLUMNS
+
+    df = read_cost_frame(csv_file, SUMMARY_COLUMNS)
+    tag_total = (df[COL_TAG] * df[COL_QTY]).sum()
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from cost_raw_store import read_cost_raw
+
+
+class ColumnSpec(NamedTuple):
+    """원가 CSV 컬럼 정의"""
+    name: str
+    dtype: str
+    role: str
+
+
+# ============================================
+# 컬럼 이름
+# ============================================
+COL_BRAND = '브랜드'
+COL_SEASON = '시즌'
+COL_STYLE = '스타일'
+COL_CATEGORY = '중분류'
+COL_ITEM = '아이템명'
+COL_PO = 'PO'
+COL_TAG = 'TAG'
+COL_QTY = '수량'
+COL_TAG_TOTAL = 'TAG_총금액'
+COL_TAG_USD = 'TAG_USD금액(전년환율)'
+COL_QUOTE_NO = '원가견적번호'
+COL_CURRENCY = '발주통화'
+COL_VENDOR = '제조업체'
+COL_QUOTE_DATE = '견적서제출일자'
+COL_DELIVERY_DATE = '합의납기일'
+
+# USD 단가
+COL_USD_MATERIAL = '(USD)_원자재'
+COL_USD_ARTWORK = '(USD)_아트웍'
+COL_USD_SUB_MATERIAL = '(USD)_부자재'
+COL_USD_TAG_LABEL = '(USD)_택/라벨'
+COL_USD_LABOR = '(USD) 공임'
+COL_USD_HQ_SUPPLY = '(USD)본사공급자재'
+COL_USD_MARGIN = '(USD)_정상마진'
+COL_USD_EXPENSE = '(USD)_경비'
+
+# KRW 단가
+COL_KRW_MATERIAL = '(KRW)_원자재'
+COL_KRW_ARTWORK = '(KRW)_아트웍'
+COL_KRW_SUB_MATERIAL = '(KRW)_부자재'
+COL_KRW_TAG_LABEL = '(KRW)_택/라벨'
+COL_KRW_LABOR = '(KRW)_공임'
+COL_KRW_HQ_SUPPLY = '(KRW)본사공급자재'
+COL_KRW_MARGIN = '(KRW)_정상마진'
+COL_KRW_EXPENSE = '(KRW)_경비'
+
+# USD 총금액 (단가×수량)
+COL_USD_MATERIAL_TOTAL = 'USD_재료계(원/부/택/본공)_총금액(단가×수량)'
+COL_USD_ARTWORK_TOTAL = 'USD_아트웍_총금액(단가×수량)'
+COL_USD_LABOR_TOTAL = 'USD_공임_총금액(단가×수량)'
+COL_USD_MARGIN_TOTAL = 'USD_정상마진_총금액(단가×수량)'
+COL_USD_EXPENSE_TOTAL = 'USD_경비_총금액(단가×수량)'
+
+# KRW 총금액 (단가×수량)
+COL_KRW_MATERIAL_TOTAL = 'KRW_재료계(원/부/택/본공)_총금액(단가×수량)'
+COL_KRW_ARTWORK_TOTAL = 'KRW_아트웍_총금액(단가×수량)'
+COL_KRW_LABOR_TOTAL = 'KRW_공임_총금액(단가×수량)'
+COL_KRW_MARGIN_TOTAL = 'KRW_정상마진_총금액(단가×수량)'
+COL_KRW_EXPENSE_TOTAL = 'KRW_경비_총금액(단가×수량)'
+
+
+# ============================================
+# 레이아웃
+# ============================================
+_HEAD_COLUMNS = [
+    ColumnSpec(COL_BRAND, 'str', 'code'),
+    ColumnSpec(COL_SEASON, 'str', 'code'),
+    ColumnSpec(COL_STYLE, 'str', 'code'),
+    ColumnSpec(COL_CATEGORY, 'str', 'code'),
+    ColumnSpec(COL_ITEM, 'str', 'text'),
+    ColumnSpec(COL_PO, 'str', 'code'),
+    ColumnSpec(COL_TAG, 'float64', 'tag'),
+    ColumnSpec(COL_QTY, 'float64', 'qty'),
+    ColumnSpec(COL_TAG_TOTAL, 'float64', 'tag'),
+    ColumnSpec(COL_TAG_USD, 'float64', 'tag'),
+    ColumnSpec(COL_QUOTE_NO, 'str', 'code'),
+    ColumnSpec(COL_CURRENCY, 'str', 'code'),
+    ColumnSpec(COL_VENDOR, 'str', 'text'),
+    ColumnSpec(COL_QUOTE_DATE, 'str', 'date'),
+]
+
+_COST_COLUMNS = [
+    ColumnSpec(name, 'float64', 'unit_cost') for name in [
+        COL_USD_MATERIAL, COL_USD_ARTWORK, COL_USD_SUB_MATERIAL, COL_USD_TAG_LABEL,
+        COL_USD_LABOR, COL_USD_HQ_SUPPLY, COL_USD_MARGIN, COL_USD_EXPENSE,
+        COL_KRW_MATERIAL, COL_KRW_ARTWORK, COL_KRW_SUB_MATERIAL, COL_KRW_TAG_LABEL,
+        COL_KRW_LABOR, COL_KRW_HQ_SUPPLY, COL_KRW_MARGIN, COL_KRW_EXPENSE,
+    ]
+] + [
+    ColumnSpec(name, 'float64', 'total') for name in [
+        COL_USD_MATERIAL_TOTAL, COL_USD_ARTWORK_TOTAL, COL_USD_LABOR_TOTAL,
+        COL_USD_MARGIN_TOTAL, COL_USD_EXPENSE_TOTAL,
+        COL_KRW_MATERIAL_TOTAL, COL_KRW_ARTWORK_TOTAL, COL_KRW_LABOR_TOTAL,
+        COL_KRW_MARGIN_TOTAL, COL_KRW_EXPENSE_TOTAL,
+    ]
+]
+
+# MLB FW 형식 (sql_to_csv_with_fx.py 출력, 40개 컬럼)
+MLB_FW_LAYOUT: List[ColumnSpec] = _HEAD_COLUMNS + _COST_COLUMNS
+
+# NON 형식 (generate_mlb_non_csv.py 출력, 견적서제출일자 뒤에 합의납기일 추가, 41개 컬럼)
+NON_LAYOUT: List[ColumnSpec] = _HEAD_COLUMNS + [ColumnSpec(COL_DELIVERY_DATE, 'str', 'date')] + _COST_COLUMNS
+
+# 결측치를 0으로 채우는 역할 (기존 집계 스크립트의 to_numeric(...).fillna(0)과 동일)
+ZERO_FILL_ROLES = {'qty', 'unit_cost', 'total'}
+
+_SPECS: Dict[str, ColumnSpec] = {spec.name: spec for spec in NON_LAYOUT}
+
+# 집계 스크립트별 사용 컬럼
+KRW_UNIT_COST_COLUMNS = [
+    COL_KRW_MATERIAL, COL_KRW_ARTWORK, COL_KRW_SUB_MATERIAL, COL_KRW_TAG_LABEL,
+    COL_KRW_LABOR, COL_KRW_HQ_SUPPLY, COL_KRW_MARGIN, COL_KRW_EXPENSE,
+]
+USD_TOTAL_COLUMNS = [
+    COL_USD_MATERIAL_TOTAL, COL_USD_ARTWORK_TOTAL, COL_USD_LABOR_TOTAL,
+    COL_USD_MARGIN_TOTAL, COL_USD_EXPENSE_TOTAL,
+]
+
+# generate_summary_26ss.py (시즌/카테고리 KPI)
+SUMMARY_COLUMNS = [COL_SEASON, COL_CATEGORY, COL_TAG, COL_QTY, COL_TAG_USD] \
+    + KRW_UNIT_COST_COLUMNS + USD_TOTAL_COLUMNS
+
+# generate_item_cost_rate_csv.py (아이템별 집계)
+ITEM_COLUMNS = [COL_SEASON, COL_CATEGORY, COL_ITEM, COL_TAG, COL_QTY] \
+    + KRW_UNIT_COST_COLUMNS + USD_TOTAL_COLUMNS
+
+
+def layout_for(columns: Sequence[str]) -> List[ColumnSpec]:
+    """헤더로 레이아웃 판별 (합의납기일이 있으면 NON 형식)"""
+    return NON_LAYOUT if COL_DELIVERY_DATE in columns else MLB_FW_LAYOUT
+
+
+# ============================================
+# 읽기
+# ============================================
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    스키마에 정의된 타입으로 변환하고 수량/단가/총금액 결측치를 0으로 채움
+
+    스키마에 없는 컬럼은 그대로 둡니다.
+    """
+    for col in df.columns:
+        spec = _SPECS.get(col)
+        if spec is None or spec.dtype != 'float64':
+            continue
+        values = df[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values.astype(str).str.replace(',', '').str.strip(), errors='coerce')
+        values = values.astype('float64')
+        if spec.role in ZERO_FILL_ROLES:
+            values = values.fillna(0)
+        df[col] = values
+    return df
+
+
+def read_cost_frame(csv_path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    원가 CSV를 스키마 타입으로 읽기 (필요한 컬럼만)
+
+    Args:
+        csv_path: COST RAW CSV 경로
+        columns: 읽을 컬럼 목록 (None이면 전체), 결과는 이 순서를 따름
+
+    Returns:
+        숫자 컬럼은 float64, 수량/단가/총금액 결측치는 0인 DataFrame
+    """
+    columns = list(columns) if columns is not None else None
+    dtype = {
+        name: spec.dtype for name, spec in _SPECS.items()
+        if columns is None or name in columns
+    }
+    df = read_cost_raw(csv_path, columns=columns, dtype=dtype)
+    if columns is not None:
+        df = df[columns]
+    return apply_schema(df)
+
+
+# ============================================
+# 값 정규화
+# ============================================
+# 용품 중분류 통합 대상 (SHOES/BAG/HEADWEAR/Acc_etc → Acc_etc)
+ACC_ETC_CATEGORY = 'Acc_etc'
+ACC_ETC_SOURCES = ['SHOES', 'BAG', 'HEADWEAR', 'ACC_ETC', 'ACC']
+
+
+def merge_acc_categories(categories: pd.Series) -> pd.Series:
+    """
+    중분류 통합 (컬럼 단위): SHOES/BAG/HEADWEAR/ACC_ETC/ACC(대소문자 무관)와 결측 → Acc_etc,
+    나머지는 앞뒤 공백만 제거
+    """
+    stripped = categories.astype(str).str.strip()
+    is_acc = categories.isna() | stripped.str.upper().isin(ACC_ETC_SOURCES)
+    return stripped.where(~is_acc, ACC_ETC_CATEGORY)
+
+
+def normalize_season_column(seasons: pd.Series) -> pd.Series:
+    """시즌 컬럼 정규화 (25SS → 25S, 25FW → 25F, 결측 → 빈 문자열) - 컬럼 단위 문자열 연산"""
+    s = seasons.astype(str).str.strip().str.upper()
+    s = s.where(~(s.str.endswith('SS') | s.str.endswith('FW')), s.str[:-1])
+    return s.where(seasons.notna(), '')
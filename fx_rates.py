@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FX.csv 환율 조회 공용 모듈
+
+sql_to_csv_with_fx.py, sql_to_csv_simple.py, generate_summary_26ss.py,
+generate_item_cost_rate_csv.py 에서 복사해 쓰던 get_exchange_rate 조회 로직을
+한 곳으로 모은 모듈입니다.
+
+- FX.csv를 한 번만 읽어 (브랜드, 시즌, FX카테고리) 해시 인덱스로 구성
+- 의류 환율 대체(fallback) 및 기본 환율 1300.0을 미리 계산
+- 단건 조회(get_rate)와 배열 조회(get_rates) 모두 키당 O(1)
+- 환율 누락 경고는 행마다가 아니라 고유 키당 한 번만 출력
+- FX_NON.csv (브랜드, 기간, 시즌) 환율도 파일당 한 번만 읽어 메모이즈
+- FX.csv DataFrame도 파일당 한 번만 읽어, 한 프로세스의 여러 단계가 같은 인덱스를 공유
+
+사용 예:
+    from fx_rates import fx_table_for
+
+    table = fx_table_for(df_fx)
+    rate = table.get_rate('M', '25S', '용품')
+    rates = table.get_rates(df['브랜드'], df['시즌'], df['FX카테고리'])
+"""
+
+import os
+import weakref
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+# FX 파일 경로
+FX_FILE = 'public/COST RAW/FX.csv'
+FX_NON_FILE = 'public/COST RAW/FX_NON.csv'
+
+# 환율을 찾지 못했을 때 사용하는 기본 환율
+DEFAULT_FX_RATE = 1300.0
+
+# 카테고리별 환율이 없을 때 대체로 사용하는 FX 카테고리
+FALLBACK_FX_CATEGORY = '의류'
+
+
+class FxRateTable:
+    """
+    (브랜드, 시즌, FX카테고리) → 환율 해시 인덱스
+
+    조회 규칙 (기존 get_exchange_rate와 동일):
+    1. FX.csv에서 (브랜드, 시즌, 카테고리)가 일치하는 첫 번째 행의 환율이 0보다 크면 사용
+    2. 카테고리가 의류가 아니면 같은 브랜드/시즌의 의류 환율(0보다 큰 경우) 사용
+    3. 그 외에는 기본 환율 1300.0 사용
+    """
+
+    def __init__(self, df_fx: Optional[pd.DataFrame], default_rate: float = DEFAULT_FX_RATE):
+        self.default_rate = default_rate
+        self.is_empty = df_fx is None or df_fx.empty
+        self._exact: Dict[Tuple[str, str, str], float] = {}
+        self._resolved: Dict[Tuple[str, str, str], Tuple[float, str]] = {}
+        self._warned: Set[Tuple[str, str, str]] = set()
+
+        if self.is_empty:
+            return
+
+        # 키별 첫 번째 행만 사용 (기존 filtered.iloc[0]과 동일)
+        df_first = df_fx.drop_duplicates(subset=['브랜드', '시즌', '카테고리'], keep='first')
+        rates = pd.to_numeric(df_first['환율'], errors='coerce')
+        for brand, season, category, rate in zip(df_first['브랜드'], df_first['시즌'], df_first['카테고리'], rates):
+            self._exact[(brand, season, category)] = float(rate)
+
+        # FX.csv에 존재하는 모든 키에 대해 대체 규칙까지 미리 계산
+        for key in self._exact:
+            self._resolved[key] = self._resolve(*key)
+
+    def _resolve(self, brand_code: str, season_code: str, fx_category: str) -> Tuple[float, str]:
+        """대체 규칙을 적용한 환율과 출처(exact/fallback/default) 반환"""
+        rate = self._exact.get((brand_code, season_code, fx_category))
+        if rate is not None and rate > 0:
+            return rate, 'exact'
+
+        if fx_category != FALLBACK_FX_CATEGORY:
+            rate = self._exact.get((brand_code, season_code, FALLBACK_FX_CATEGORY))
+            if rate is not None and rate > 0:
+                return rate, 'fallback'
+
+        return self.default_rate, 'default'
+
+    def get_rate(self, brand_code: str, season_code: str, fx_category: str = FALLBACK_FX_CATEGORY,
+                 verbose: bool = True) -> float:
+        """
+        단건 환율 조회
+
+        Args:
+            brand_code: 브랜드 코드 (M, I, X, V, ST)
+            season_code: FX.csv 시즌 코드 (25F, 24S 등)
+            fx_category: FX 카테고리 (의류, 슈즈, 용품)
+            verbose: 대체/기본 환율 사용 시 로그 출력 여부 (키당 1회)
+
+        Returns:
+            환율 값 (float)
+        """
+        key = (brand_code, season_code, fx_category)
+
+        if self.is_empty:
+            if verbose and not self._warned:
+                print(f"[WARN] FX 데이터가 없습니다. 기본 환율 {self.default_rate} 사용")
+            self._warned.add(key)
+            return self.default_rate
+
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._resolve(*key)
+            self._resolved[key] = resolved
+
+        rate, source = resolved
+        if verbose and source != 'exact' and key not in self._warned:
+            self._warned.add(key)
+            if source == 'fallback':
+                print(f"[INFO] 카테고리 '{fx_category}'에 대한 환율을 찾지 못해 의류 환율 사용: {rate} (브랜드={brand_code}, 시즌={season_code})")
+            else:
+                print(f"[WARN] 환율을 찾을 수 없습니다. 브랜드={brand_code}, 시즌={season_code}, 카테고리={fx_category}. 기본값 {self.default_rate} 사용")
+        return rate
+
+    def get_rates(self, brand_codes: Iterable, season_codes: Iterable, fx_categories: Iterable,
+                  verbose: bool = True) -> np.ndarray:
+        """
+        배열 환율 조회 (입력 배열과 같은 길이의 float 배열 반환)
+
+        고유 키별로 get_rate를 한 번만 호출한 뒤 factorize 코드로 펼칩니다.
+        """
+        keys = pd.MultiIndex.from_arrays([
+            np.asarray(brand_codes, dtype=object),
+            np.asarray(season_codes, dtype=object),
+            np.asarray(fx_categories, dtype=object),
+        ])
+        if len(keys) == 0:
+            return np.array([], dtype=float)
+
+        codes, uniques = pd.factorize(keys)
+        unique_rates = np.array(
+            [self.get_rate(brand, season, category, verbose=verbose) for brand, season, category in uniques],
+            dtype=float
+        )
+        return unique_rates[codes]
+
+
+class FxNonRateTable:
+    """
+    FX_NON.csv (브랜드, 기간, 시즌) → 환율 해시 인덱스
+
+    조회 규칙 (기존 load_fx_non_rate와 동일):
+    - (브랜드, 기간, 시즌)이 일치하는 첫 번째 행의 환율 사용
+    - 일치하는 행이 없거나 환율을 숫자로 변환할 수 없으면 0.0
+    """
+
+    def __init__(self, df_fx_non: Optional[pd.DataFrame]):
+        self._rates: Dict[Tuple[str, str, str], float] = {}
+
+        if df_fx_non is None or df_fx_non.empty:
+            return
+
+        df_first = df_fx_non.drop_duplicates(subset=['브랜드', '기간', '시즌'], keep='first')
+        for brand, period, season, rate in zip(df_first['브랜드'], df_first['기간'], df_first['시즌'], df_first['환율']):
+            try:
+                self._rates[(brand, period, season)] = float(rate)
+            except (TypeError, ValueError):
+                self._rates[(brand, period, season)] = 0.0
+
+    def get_rate(self, brand: str, period: str, season_code: Optional[str]) -> float:
+        """브랜드/기간/시즌별 환율 조회 (없으면 0.0)"""
+        if not season_code:
+            return 0.0
+        return self._rates.get((brand, period, season_code), 0.0)
+
+
+# ============================================
+# 테이블 캐시
+# ============================================
+# id(df_fx) → (df_fx 약한 참조, 인덱싱할 때의 shape, FxRateTable). DataFrame을 붙잡지 않아,
+# 버려진 FX DataFrame과 함께 항목도 지워짐 (장시간 실행/FX.csv 변경 후에도 커지지 않음)
+_TABLE_CACHE: Dict[int, Tuple[weakref.ref, Tuple[int, int], FxRateTable]] = {}
+_EMPTY_TABLE: Optional[FxRateTable] = None
+# 파일 절대경로 → (수정시각, 내용). 파일당 최신 1개만 보관
+_FRAME_CACHE: Dict[str, Tuple[float, pd.DataFrame]] = {}
+_NON_FILE_CACHE: Dict[str, Tuple[float, FxNonRateTable]] = {}
+
+
+def fx_table_for(df_fx: Optional[pd.DataFrame]) -> FxRateTable:
+    """
+    이미 로드된 FX DataFrame에 대한 인덱스를 반환 (같은 DataFrame이면 재사용)
+
+    인덱스는 DataFrame 객체(id)별로 처음 조회할 때 만들어 둡니다. 처음 조회한 뒤 같은 DataFrame의
+    환율 값을 그 자리에서 고치면 이전 인덱스가 그대로 반환되므로, 수정이 필요하면 df_fx.copy()를
+    고쳐서 넘기세요 (행/열 수가 바뀐 경우만 다시 인덱싱).
+    """
+    global _EMPTY_TABLE
+    if df_fx is None:
+        if _EMPTY_TABLE is None:
+            _EMPTY_TABLE = FxRateTable(None)
+        return _EMPTY_TABLE
+
+    key = id(df_fx)
+    cached = _TABLE_CACHE.get(key)
+    if cached is not None and cached[0]() is df_fx and cached[1] == df_fx.shape:
+        return cached[2]
+
+    table = FxRateTable(df_fx)
+    _TABLE_CACHE[key] = (weakref.ref(df_fx, lambda _, key=key: _TABLE_CACHE.pop(key, None)), df_fx.shape, table)
+    return table
+
+
+def load_fx_frame(fx_file: str = FX_FILE) -> pd.DataFrame:
+    """
+    FX.csv DataFrame 로드 (파일이 바뀌지 않았으면 같은 객체 재사용)
+
+    같은 객체를 돌려주므로 fx_table_for 인덱스도 함께 재사용됩니다. 반환값은 수정하지 마세요.
+    """
+    path, mtime = os.path.abspath(fx_file), os.path.getmtime(fx_file)
+    cached = _FRAME_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    df_fx = pd.read_csv(fx_file, encoding='utf-8-sig')
+    _FRAME_CACHE[path] = (mtime, df_fx)
+    return df_fx
+
+
+def load_fx_table(fx_file: str = FX_FILE) -> FxRateTable:
+    """FX.csv 파일에서 인덱스를 로드 (파일이 바뀌지 않았으면 재사용)"""
+    if not os.path.exists(fx_file):
+        print(f"[WARN] {fx_file} 파일이 없습니다. 기본 환율 {DEFAULT_FX_RATE} 사용")
+        return FxRateTable(None)
+
+    return fx_table_for(load_fx_frame(fx_file))
+
+
+def load_fx_non_table(fx_file: str = FX_NON_FILE) -> FxNonRateTable:
+    """FX_NON.csv 파일에서 인덱스를 로드 (파일이 바뀌지 않았으면 재사용, 없거나 읽기 실패 시 빈 테이블)"""
+    if not os.path.exists(fx_file):
+        return FxNonRateTable(None)
+
+    path, mtime = os.path.abspath(fx_file), os.path.getmtime(fx_file)
+    cached = _NON_FILE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        table = FxNonRateTable(pd.read_csv(fx_file, encoding='utf-8-sig'))
+    except Exception as e:
+        print(f"[ERROR] {fx_file} 파일 로드 실패: {e}")
+        table = FxNonRateTable(None)
+    _NON_FILE_CACHE[path] = (mtime, table)
+    return table
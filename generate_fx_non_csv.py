@@ -4,18 +4,24 @@
 MLB Non 시즌 환율 데이터 수집 및 FX_NON.csv 생성 스크립트
 
 사용 방법:
-    python generate_fx_non_csv.py
+    python generate_fx_non_csv.py            # NON 공용 추출 캐시가 있으면 재사용
+    python generate_fx_non_csv.py --refresh  # Snowflake에서 다시 조회
 
 기능:
 - 모든 기간(25S, 25F, 26S, 26F)에 대해 환율 계산
 - FX_NON.csv 파일 생성
+- 시즌별 쿼리 대신 NON 공용 추출(non_extract.py) 한 번으로 모든 기간을 계산
 """
 
+import argparse
 import pandas as pd
-import snowflake.connector
 import os
-from datetime import date
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional
+
+from artifact_writer import write_csv, write_label
+from non_extract import NON_EXTRACT_SEASONS, calculate_stor_periods, derive_stor_period_frame, load_non_extract
+from query_pool import DEFAULT_MAX_WORKERS
+from warehouse import connect_warehouse, describe_warehouse
 
 # ============================================
 # Snowflake 연결 설정
@@ -30,241 +36,18 @@ SNOWFLAKE_CONFIG = {
     'role': 'PUBLIC'
 }
 
-# ============================================
-# 기간 계산 함수 (generate_mlb_non_csv.py에서 복사)
-# ============================================
-def calculate_periods(season: str) -> Tuple[date, date, date, date]:
-    """시즌에 따른 전년/당년 기간 계산"""
-    season_upper = season.upper()
-    
-    if 'FW' in season_upper or (season_upper.endswith('F') and len(season) == 3):
-        # FW: 6/1 ~ 11/30
-        year_2digit = int(season[:2])
-        year = 2000 + year_2digit
-        prev_year = year - 1
-        curr_year = year
-        
-        prev_start = date(prev_year, 6, 1)
-        prev_end = date(prev_year, 11, 30)
-        curr_start = date(curr_year, 6, 1)
-        
-        today = date.today()
-        if today > date(curr_year, 11, 30):
-            curr_end = date(curr_year, 11, 30)
-        else:
-            curr_end = today
-            
-    elif 'SS' in season_upper or (season_upper.endswith('S') and len(season) == 3):
-        # SS: 12/1 ~ 다음해 5/31
-        # 예: 25S 당년 = 2024-12-01 ~ 2025-05-31, 전년 = 2023-12-01 ~ 2024-05-31
-        year_2digit = int(season[:2])
-        year = 2000 + year_2digit
-        
-        # 당년: (year-1)년 12/1 ~ year년 5/31
-        curr_start = date(year - 1, 12, 1)
-        curr_end_year = year
-        
-        # 전년: (year-2)년 12/1 ~ (year-1)년 5/31
-        prev_start = date(year - 2, 12, 1)
-        prev_end = date(year - 1, 5, 31)
-        
-        today = date.today()
-        if today > date(curr_end_year, 5, 31):
-            curr_end = date(curr_end_year, 5, 31)
-        else:
-            curr_end = today
-    else:
-        raise ValueError(f"지원하지 않는 시즌 형식: {season}")
-    
-    return prev_start, prev_end, curr_start, curr_end
-
-# ============================================
-# SQL 쿼리 생성 (generate_mlb_non_csv.py에서 복사)
-# ============================================
-def build_sql_query(prev_start: date, prev_end: date, curr_start: date, curr_end: date) -> str:
-    """SQL 쿼리 생성"""
-    prev_start_str = prev_start.strftime('%Y-%m-%d')
-    prev_end_str = prev_end.strftime('%Y-%m-%d')
-    curr_start_str = curr_start.strftime('%Y-%m-%d')
-    curr_end_str = curr_end.strftime('%Y-%m-%d')
-    
-    query = f"""
-with 
-stor_filtered as (
-    select 
-        po_no,
-        stor_dt,
-        qty,
-        case 
-            when stor_dt between date '{prev_start_str}' and date '{prev_end_str}' then '전년'
-            when stor_dt between date '{curr_start_str}' and date '{curr_end_str}' then '당년'
-        end as period_label
-    from prcs.dw_stor
-    where (stor_dt between date '{prev_start_str}' and date '{prev_end_str}')
-       or (stor_dt between date '{curr_start_str}' and date '{curr_end_str}')
-),
-stor_po as (
-    select distinct po_no, period_label
-    from stor_filtered
-),
-stor_sum as (
-    select 
-        po_no,
-        period_label,
-        sum(qty) as stor_qty_sum,
-        min(stor_dt) as first_stor_dt,
-        max(stor_dt) as last_stor_dt
-    from stor_filtered
-    group by po_no, period_label
-),
-main as (
-    select 
-        a.brd_cd,
-        a.sesn,
-        a.part_cd,
-        a.po_no,
-        a.cost_quotation_no,
-        a.quotation_apv_stat_nm,
-        a.tag_amt,
-        a.quotation_submit_dt,
-        b.type1,
-        b.type1_nm,
-        b.type2,
-        b.type2_nm,
-        b.type3,
-        a.mfac_compy_nm,
-        b.unit,
-        b.width,
-        b.currency,
-        b.mfac_offer_cons,
-        b.mfac_offer_cost,
-        b.mfac_offer_cost_amt,
-        b.mfac_offer_cost_amt_curr,
-        b.mfac_nego_cost,
-        b.mfac_nego_cost_amt,
-        b.mfac_nego_cost_amt_curr,
-        p.item_nm as item_nm,
-        s.vtext2 as vtext2,
-        o1.tag_price as tag_price,
-        o2.po_qty_sum as po_qty_sum,
-        sp.period_label as period_label,
-        ss.stor_qty_sum as stor_qty_sum,
-        ss.first_stor_dt as first_stor_dt,
-        ss.last_stor_dt as last_stor_dt
-    from prcs.db_cost_mst a
-    join prcs.db_cost_dtl b on a.po_no = b.po_no 
-        and a.quotation_seq = b.quotation_seq 
-        and a.quotation_apv_stat_nm = '확정'
-    inner join stor_po sp on sp.po_no = a.po_no
-    left join stor_sum ss on ss.po_no = a.po_no and ss.period_label = sp.period_label
-    left join prcs.db_prdt p on p.prdt_cd = a.brd_cd || a.sesn || a.part_cd
-    left join sap_fnf.mst_prdt s on s.prdt_cd = p.prdt_cd
-    left join (
-        select prdt_cd, min(tag_price) as tag_price
-        from prcs.dw_ord
-        where tag_price is not null
-        group by prdt_cd
-    ) o1 on o1.prdt_cd = p.prdt_cd
-    left join (
-        select po_no, sum(ord_qty) as po_qty_sum
-        from prcs.dw_ord
-        group by po_no
-    ) o2 on o2.po_no = a.po_no
-    where a.sesn like '%N%'
-      and a.brd_cd in ('M', 'I', 'X')
-      and b.currency in ('USD', 'KRW')
-)
-select 
-    period_label as "기간",
-    brd_cd as "브랜드",
-    sesn as "시즌",
-    part_cd as "스타일",
-    vtext2 as "중분류",
-    item_nm as "아이템명",
-    po_no as "PO",
-    tag_price as "TAG",
-    po_qty_sum as "발주수량",
-    stor_qty_sum as "입고수량",
-    first_stor_dt as "최초입고일",
-    last_stor_dt as "최종입고일",
-    cost_quotation_no as "원가견적번호",
-    currency as "발주통화",
-    mfac_compy_nm as "제조업체",
-    quotation_submit_dt as "견적서제출일자",
-    sum(case when type1 = 100 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_원자재",
-    sum(case when type1 = 200 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_아트웍",
-    sum(case when type1 = 300 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_부자재",
-    sum(case when type1 = 350 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_택/라벨",
-    sum(case when type1 = 400 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_공임",
-    sum(case when type1 = 700 then mfac_offer_cost_amt_curr else 0 end) as "(USD)본사공급자재",
-    sum(case when type1 = 500 and type2 = 'AAA' then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_정상마진",
-    sum(case when type1 = 500 and type2 <> 'AAA' then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_기타마진/경비",
-    sum(case when type1 = 100 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_원자재",
-    sum(case when type1 = 200 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_아트웍",
-    sum(case when type1 = 300 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_부자재",
-    sum(case when type1 = 350 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_택/라벨",
-    sum(case when type1 = 400 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_공임",
-    sum(case when type1 = 700 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_본사공급자재",
-    sum(case when type1 = 500 and type2 = 'AAA' then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_정상마진",
-    sum(case when type1 = 500 and type2 <> 'AAA' then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_기타마진/경비",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 in (100,300,350,700) then mfac_offer_cost_amt_curr else 0 end),0) as "USD_재료계(원/부/택/본공)_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 200 then mfac_offer_cost_amt_curr else 0 end),0) as "USD_아트웍_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 400 then mfac_offer_cost_amt_curr else 0 end),0) as "USD_공임_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and type2 = 'AAA' then mfac_offer_cost_amt_curr else 0 end),0) as "USD_정상마진_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and (type2 <> 'AAA' or type2 is null) then mfac_offer_cost_amt_curr else 0 end),0) as "USD_경비_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 in (100,300,350,700) then mfac_nego_cost_amt else 0 end),0) as "KRW_재료계(원/부/택/본공)_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 200 then mfac_nego_cost_amt else 0 end),0) as "KRW_아트웍_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 400 then mfac_nego_cost_amt else 0 end),0) as "KRW_공임_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and type2 = 'AAA' then mfac_nego_cost_amt else 0 end),0) as "KRW_정상마진_총금액(단가×수량)",
-    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and (type2 <> 'AAA' or type2 is null) then mfac_nego_cost_amt else 0 end),0) as "KRW_경비_총금액(단가×수량)"
-from main
-group by 
-    period_label, brd_cd, sesn, part_cd, vtext2, item_nm, po_no, tag_price, 
-    po_qty_sum, stor_qty_sum, first_stor_dt, last_stor_dt, 
-    cost_quotation_no, currency, mfac_compy_nm, quotation_submit_dt
-order by period_label desc, brd_cd, sesn desc, part_cd, po_no
-"""
-    return query
-
 # ============================================
 # Snowflake 연결
 # ============================================
 def connect_to_database():
-    """Snowflake에 연결"""
+    """Snowflake(또는 COST_WAREHOUSE로 선택한 웨어하우스)에 연결"""
     try:
-        conn = snowflake.connector.connect(
-            account=SNOWFLAKE_CONFIG['account'],
-            user=SNOWFLAKE_CONFIG['username'],
-            password=SNOWFLAKE_CONFIG['password'],
-            warehouse=SNOWFLAKE_CONFIG['warehouse'],
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-        )
+        conn = connect_warehouse(SNOWFLAKE_CONFIG)
         return conn
     except Exception as e:
-        print(f"[ERROR] Snowflake 연결 실패: {e}")
+        print(f"[ERROR] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 실패: {e}")
         return None
 
-# ============================================
-# SQL 쿼리 실행
-# ============================================
-def execute_query(conn, query: str) -> pd.DataFrame:
-    """SQL 쿼리 실행 및 결과를 DataFrame으로 반환"""
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        df = pd.DataFrame(rows, columns=columns)
-        cursor.close()
-        
-        return df
-    except Exception as e:
-        print(f"[ERROR] 쿼리 실행 실패: {e}")
-        return pd.DataFrame()
-
 # ============================================
 # FX.csv 파일 로드
 # ============================================
@@ -441,8 +224,14 @@ def calculate_exchange_rates(df: pd.DataFrame, season: str = None) -> Dict[str,
 # ============================================
 # 메인 함수
 # ============================================
-def main():
-    seasons = ['25S', '25F', '26S', '26F']
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='MLB Non 시즌 FX_NON.csv 생성')
+    parser.add_argument('--refresh', action='store_true', help='NON 공용 추출 캐시를 무시하고 다시 조회')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'동시에 실행할 Snowflake 쿼리 수 (기본: {DEFAULT_MAX_WORKERS})')
+    args = parser.parse_args(argv)
+    
+    seasons = NON_EXTRACT_SEASONS
     all_fx_data = []
     
     print("=" * 60)
@@ -456,15 +245,18 @@ def main():
         return
     
     try:
+        # 모든 시즌 기간을 합친 범위로 한 번만 조회 (generate_mlb_non_csv.py와 공유)
+        extract = load_non_extract(conn, seasons, refresh=args.refresh,
+                                   connect=connect_to_database, max_workers=args.max_concurrency)
+        
         for season in seasons:
             print(f"\n[{season}] 기간 처리 중...")
             
-            # 기간 계산
-            prev_start, prev_end, curr_start, curr_end = calculate_periods(season)
+            # 기간 계산 (당년 기간은 오늘까지)
+            prev_start, prev_end, curr_start, curr_end = calculate_stor_periods(season)
             
-            # SQL 쿼리 생성 및 실행
-            query = build_sql_query(prev_start, prev_end, curr_start, curr_end)
-            df = execute_query(conn, query)
+            # 입고일 기준 기간 구분
+            df = derive_stor_period_frame(extract, prev_start, prev_end, curr_start, curr_end)
             
             if df.empty:
                 print(f"[WARN] {season} 기간 데이터 없음")
@@ -493,8 +285,8 @@ def main():
         if all_fx_data:
             df_fx = pd.DataFrame(all_fx_data)
             output_path = 'public/COST RAW/FX_NON.csv'
-            df_fx.to_csv(output_path, index=False, encoding='utf-8-sig', lineterminator='\n')
-            print(f"\n[OK] FX_NON.csv 저장 완료: {output_path} ({len(df_fx)}개 행)")
+            changed = write_csv(df_fx, output_path, lineterminator='\n')
+            print(f"\n[OK] FX_NON.csv {write_label(changed)}: {output_path} ({len(df_fx)}개 행)")
         else:
             print("\n[WARN] 환율 데이터가 없습니다.")
         
@@ -505,7 +297,7 @@ def main():
     finally:
         if conn:
             conn.close()
-            print("\n[INFO] Snowflake 연결 종료")
+            print("\n[INFO] 데이터베이스 연결 종료")
 
 if __name__ == '__main__':
     main()
@@ -15,12 +15,19 @@ import os
 import argparse
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+from artifact_writer import write_label, write_text
+from fx_rates import load_fx_frame
+from run_metrics import record, record_file
 
 # FX 파일 경로
 FX_FILE = 'public/COST RAW/FX.csv'
 FX_NON_FILE = 'public/COST RAW/FX_NON.csv'
 
+# 결과에 영향을 주는 코드 파일 (바뀌면 증분 생성에서 다시 생성)
+SOURCE_FILES = ['generate_insights_rule_based.py', 'fx_rates.py']
+
 
 def load_fx_rates(brand_code: str, season_code: str, is_non_season: bool = False) -> Dict[str, float]:
     """FX.csv 또는 FX_NON.csv에서 환율 정보 로드"""
@@ -58,7 +65,7 @@ def load_fx_rates(brand_code: str, season_code: str, is_non_season: bool = False
     else:
         # 기존 FX.csv 로드
         try:
-            df_fx = pd.read_csv(FX_FILE, encoding='utf-8-sig')
+            df_fx = load_fx_frame(FX_FILE)
             
             # 카테고리는 '의류'로 고정
             filtered = df_fx[
@@ -338,12 +345,13 @@ def create_insights_csv(insights: Dict[str, Any], output_file: str):
                 else:
                     csv_lines.append(f"{key},,{value_str}")
         
-        # CSV 파일 저장
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
-            f.write('\n'.join(csv_lines))
+        # CSV 파일 저장 (내용이 같으면 기존 파일 유지)
+        changed = write_text('\n'.join(csv_lines), output_file, 'utf-8-sig')
+        record(rows_out=len(csv_lines) - 1)
+        if changed:
+            record_file(output_file)
         
-        print(f"[OK] 인사이트 CSV 저장 완료: {output_file}")
+        print(f"[OK] 인사이트 CSV {write_label(changed)}: {output_file}")
     except Exception as e:
         print(f"[ERROR] 인사이트 CSV 저장 실패: {output_file}, 오류: {e}")
         raise
@@ -547,17 +555,9 @@ def generate_insights_for_brand(brand_code: str, season: str, season_folder: str
     return True
 
 
-def main():
-    parser = argparse.ArgumentParser(description='규칙 기반 인사이트 생성 스크립트')
-    parser.add_argument('--season', type=str, required=True, help='시즌 코드 (예: 26SS)')
-    parser.add_argument('--brands', nargs='+', required=False, choices=['M', 'I', 'X', 'ST', 'V'],
-                       help='브랜드 코드 리스트 (예: M I X ST V)')
-    parser.add_argument('--kids-only', action='store_true',
-                       help='DISCOVERY-KIDS 인사이트만 생성 (DISCOVERY 인사이트는 건드리지 않음)')
-    
-    args = parser.parse_args()
-    
-    season = args.season.upper()
+def resolve_season_folder(season: str) -> Tuple[bool, str]:
+    """시즌 코드(예: 26SS, 25FW_NON) → (NON 시즌 여부, 시즌 폴더)"""
+    season = season.upper()
     
     # NON 시즌 감지
     is_non_season = '_NON' in season or season.endswith('_NON')
@@ -574,6 +574,52 @@ def main():
         season_folder = '26FW'
     else:
         season_folder = base_season
+    return is_non_season, season_folder
+
+
+def insight_targets(season: str, brand_code: str = 'X', kids_only: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    브랜드 인사이트 CSV의 (입력 파일, 출력 파일) 목록 (build_manifest 증분 생성용)
+    
+    generate_insights_for_brand / generate_kids_insights_only가 읽는 SUMMARY JSON과 환율 파일,
+    코드 파일을 입력으로 사용합니다.
+    """
+    season = season.upper()
+    is_non_season, season_folder = resolve_season_folder(season)
+    base_dir = f'public/COST RAW/{season_folder}'
+    code_dir = os.path.dirname(os.path.abspath(__file__))
+    code_files = [os.path.join(code_dir, name) for name in SOURCE_FILES]
+    
+    kids_summary = f'{base_dir}/summary_{season.lower()}_x_kids.json'
+    kids_output = f'{base_dir}/X_insight_{season.lower()}_kids.csv'
+    if kids_only:
+        return [kids_summary, FX_FILE] + code_files, [kids_output]
+    
+    if is_non_season:
+        inputs = [f'{base_dir}/summary_{season_folder.lower()}_{brand_code.lower()}_non.json', FX_NON_FILE]
+        outputs = [f'{base_dir}/{brand_code}_insight_{season_folder.lower()}_non.csv']
+        return inputs + code_files, outputs
+    
+    inputs = [f'{base_dir}/summary_{season.lower()}_{brand_code.lower()}.json', FX_FILE]
+    outputs = [f'{base_dir}/{brand_code}_insight_{season.lower()}.csv']
+    if brand_code == 'X' and os.path.exists(kids_summary):
+        inputs.append(kids_summary)
+        outputs.append(kids_output)
+    return inputs + code_files, outputs
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='규칙 기반 인사이트 생성 스크립트')
+    parser.add_argument('--season', type=str, required=True, help='시즌 코드 (예: 26SS)')
+    parser.add_argument('--brands', nargs='+', required=False, choices=['M', 'I', 'X', 'ST', 'V'],
+                       help='브랜드 코드 리스트 (예: M I X ST V)')
+    parser.add_argument('--kids-only', action='store_true',
+                       help='DISCOVERY-KIDS 인사이트만 생성 (DISCOVERY 인사이트는 건드리지 않음)')
+    
+    args = parser.parse_args(argv)
+    
+    season = args.season.upper()
+    is_non_season, season_folder = resolve_season_folder(season)
     
     print("=" * 60)
     print("규칙 기반 인사이트 생성 스크립트")
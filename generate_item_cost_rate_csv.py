@@ -11,6 +11,7 @@ F&F 원가 대시보드 - 아이템별 원가율 Excel 파일 생성 스크립
 이 스크립트는 지정된 기간의 모든 브랜드 CSV 파일을 읽어서
 아이템별 원가율 데이터를 Excel 파일로 생성합니다.
 각 브랜드별로 시트가 구분되어 있으며, 당년-전년 비교 데이터를 포함합니다.
+(항상 새로 생성 - 입력이 그대로면 캐시를 쓰는 조회/생성은 item_workbook_cache.py)
 
 핵심 원칙:
 - 원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨 (아트웍 제외!)
@@ -24,13 +25,31 @@ F&F 원가 대시보드 - 아이템별 원가율 Excel 파일 생성 스크립
 import pandas as pd
 import argparse
 import os
-from typing import Dict, Any, List
+from copy import copy
+from typing import Dict, Any, List, NamedTuple, Optional
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, NamedStyle, PatternFill, Border, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+
+from fx_rates import fx_table_for
+from cost_schema import (
+    COL_CATEGORY, COL_ITEM, COL_KRW_ARTWORK, COL_KRW_EXPENSE, COL_KRW_HQ_SUPPLY,
+    COL_KRW_LABOR, COL_KRW_MARGIN, COL_KRW_MATERIAL, COL_KRW_SUB_MATERIAL, COL_KRW_TAG_LABEL,
+    COL_QTY, COL_SEASON, COL_TAG, COL_USD_ARTWORK_TOTAL, COL_USD_EXPENSE_TOTAL,
+    COL_USD_LABOR_TOTAL, COL_USD_MARGIN_TOTAL, COL_USD_MATERIAL_TOTAL, ITEM_COLUMNS,
+    merge_acc_categories, normalize_season_column, read_cost_frame,
+)
+from run_metrics import record_file, span
 
 # FX 파일 경로
 FX_FILE = 'public/COST RAW/FX.csv'
 
+# 원가 CSV / 출력 Excel 폴더와 처리 브랜드 (BRAND_MAP 순서)
+COST_RAW_DIR = 'public/COST RAW'
+ITEM_BRANDS = ['M', 'I', 'X', 'ST', 'V']
+
 # 브랜드 코드 매핑
 BRAND_MAP = {
     'M': 'MLB',
@@ -66,35 +85,11 @@ def map_category_to_fx_category(category: str) -> str:
 # FX.csv에서 환율 조회
 def get_exchange_rate(df_fx: pd.DataFrame, brand_code: str, season_code: str, category: str = None) -> float:
     """FX.csv에서 특정 브랜드/시즌/카테고리의 환율 조회"""
-    if df_fx is None or df_fx.empty:
-        return 1300.0
-    
+    # 카테고리 매핑
     fx_category = map_category_to_fx_category(category) if category else '의류'
     
-    filtered = df_fx[
-        (df_fx['브랜드'] == brand_code) &
-        (df_fx['시즌'] == season_code) &
-        (df_fx['카테고리'] == fx_category)
-    ]
-    
-    if len(filtered) > 0:
-        rate = float(filtered.iloc[0]['환율'])
-        if rate > 0:
-            return rate
-    
-    # 기본값: 의류 환율 사용
-    if category and fx_category != '의류':
-        default = df_fx[
-            (df_fx['브랜드'] == brand_code) &
-            (df_fx['시즌'] == season_code) &
-            (df_fx['카테고리'] == '의류')
-        ]
-        if len(default) > 0:
-            rate = float(default.iloc[0]['환율'])
-            if rate > 0:
-                return rate
-    
-    return 1300.0
+    # FX.csv 해시 인덱스에서 조회 (의류 대체/기본값 포함, DataFrame당 1회 인덱싱)
+    return fx_table_for(df_fx).get_rate(brand_code, season_code, fx_category, verbose=False)
 
 # 전시즌 코드 계산
 def get_previous_season(season: str) -> str:
@@ -151,259 +146,205 @@ def get_season_folder(season: str) -> str:
     else:
         return season_upper
 
+# 기간 코드 → (시즌 코드, 전년 시즌 코드)
+SEASON_CODES = {
+    '26SS': ('26S', '25S'), '26S': ('26S', '25S'),
+    '25SS': ('25S', '24S'), '25S': ('25S', '24S'),
+    '25FW': ('25F', '24F'), '25F': ('25F', '24F'),
+    '24SS': ('24S', '23S'), '24S': ('24S', '23S'),
+    '24FW': ('24F', '23F'), '24F': ('24F', '23F'),
+}
+
+class ItemPeriod(NamedTuple):
+    period: str                 # 요청 기간 코드 (대문자, 예: 25FW)
+    season_folder: str          # public/COST RAW 아래 폴더 (예: 25FW)
+    season_code: str            # 당년 시즌 코드 (예: 25F)
+    prev_season_code: str       # 전년 시즌 코드 (예: 24F)
+    csv_files: Dict[str, str]   # 브랜드 → 원가 CSV 경로 (없는 파일 포함)
+    output_file: str            # public 아래 Excel 경로
+
+def resolve_item_period(period: str) -> ItemPeriod:
+    """기간 코드 → 시즌 폴더, 시즌 코드, 브랜드별 원가 CSV, 출력 Excel 경로"""
+    period = period.upper()
+    season_folder = get_season_folder(period)
+    if period in SEASON_CODES:
+        season_code, prev_season_code = SEASON_CODES[period]
+    else:
+        season_code = convert_season_format(period)
+        prev_season = get_previous_season(period)
+        prev_season_code = convert_season_format(prev_season) if prev_season else ''
+
+    # 파일명 결정 (FW는 시즌 코드, SS는 요청 기간 코드)
+    file_season = season_code if season_code in ['25F', '26F', '24F'] else period
+    folder = f'{COST_RAW_DIR}/{season_folder}'
+    csv_files = {brand: f'{folder}/{brand}_{file_season}.csv' for brand in ITEM_BRANDS}
+    return ItemPeriod(period, season_folder, season_code, prev_season_code, csv_files,
+                      f'{folder}/item_cost_rate_{period}.xlsx')
+
+# 아이템별 집계 측정값 (행 단위 금액, 전년/당년 구분 키)
+PREV_PERIOD = '전년'
+CURR_PERIOD = '당년'
+ITEM_MEASURES = {
+    'usd_material': COL_USD_MATERIAL_TOTAL,
+    'usd_artwork': COL_USD_ARTWORK_TOTAL,
+    'usd_labor': COL_USD_LABOR_TOTAL,
+    'usd_margin': COL_USD_MARGIN_TOTAL,
+    'usd_expense': COL_USD_EXPENSE_TOTAL,
+}
+ITEM_KRW_MEASURES = {
+    'krw_material': COL_KRW_MATERIAL,
+    'krw_sub': COL_KRW_SUB_MATERIAL,
+    'krw_hq': COL_KRW_HQ_SUPPLY,
+    'krw_tag_label': COL_KRW_TAG_LABEL,
+    'krw_artwork': COL_KRW_ARTWORK,
+    'krw_labor': COL_KRW_LABOR,
+    'krw_margin': COL_KRW_MARGIN,
+    'krw_expense': COL_KRW_EXPENSE,
+}
+# 해당 기간 데이터가 없는 아이템의 합계 (기존 빈 목록 합계와 같은 정수 0)
+EMPTY_ITEM_SUMS = dict.fromkeys(['qty', 'tag_krw', 'tag_usd', *ITEM_MEASURES, *ITEM_KRW_MEASURES], 0)
+
+def item_measures(df: pd.DataFrame, fx_rate: pd.Series) -> pd.DataFrame:
+    """
+    행 단위 금액 (아이템 집계 측정값)
+    
+    - TAG (KRW): TAG × 수량, TAG (USD): (TAG ÷ 환율) × 수량
+    - 원가 (USD): USD 총금액 컬럼 그대로
+    - 원가 (KRW): 항목별 단가 × 수량 (원부자재 4개 항목은 집계 후 합산)
+    """
+    qty = df[COL_QTY]
+    tag = df[COL_TAG].fillna(0)
+    measures = {
+        'qty': qty,
+        'tag_krw': tag * qty,
+        'tag_usd': (tag / fx_rate) * qty,
+    }
+    measures.update({name: df[column] for name, column in ITEM_MEASURES.items()})
+    measures.update({name: df[column] * qty for name, column in ITEM_KRW_MEASURES.items()})
+    return pd.DataFrame(measures).astype('float64')
+
+def period_item_values(sums: Dict[str, float]) -> Dict[str, float]:
+    """기간 합계 1개 → 평균 TAG, 항목별 평균단가/원가율 (USD, KRW)"""
+    qty = sums['qty']
+    
+    def per_unit(total):
+        return total / qty if qty > 0 else 0
+    
+    def rate(value, tag_excl_vat):
+        return (value / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
+    
+    values = {
+        'qty': qty,
+        'tag_krw_total': sums['tag_krw'],
+        'avg_tag_krw': per_unit(sums['tag_krw']),
+        'avg_tag_usd': per_unit(sums['tag_usd']),
+    }
+    
+    # 원가 (USD) - 총금액 컬럼 사용 / 원가 (KRW) - 원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨
+    usd = {item: per_unit(sums[f'usd_{item}']) for item in ['material', 'artwork', 'labor', 'margin', 'expense']}
+    krw = {'material': per_unit(sums['krw_material'] + sums['krw_sub'] + sums['krw_hq'] + sums['krw_tag_label'])}
+    krw.update({item: per_unit(sums[f'krw_{item}']) for item in ['artwork', 'labor', 'margin', 'expense']})
+    
+    for currency, costs, avg_tag in [('usd', usd, values['avg_tag_usd']), ('krw', krw, values['avg_tag_krw'])]:
+        values[f'avg_cost_{currency}'] = costs['material'] + costs['artwork'] + costs['labor'] + costs['margin'] + costs['expense']
+        
+        # 원가율 - 세부 항목별, 합계는 항목별 원가율의 합
+        tag_excl_vat = avg_tag / 1.1 if avg_tag > 0 else 0
+        rates = {item: rate(value, tag_excl_vat) for item, value in costs.items()}
+        values[f'cost_rate_{currency}'] = rates['material'] + rates['artwork'] + rates['labor'] + rates['margin'] + rates['expense']
+        for item in costs:
+            values[f'{item}_{currency}'] = costs[item]
+            values[f'cost_rate_{item}_{currency}'] = rates[item]
+    return values
+
 # 아이템별 집계 계산
 def aggregate_by_item(df: pd.DataFrame, df_fx: pd.DataFrame, brand_code: str, 
                      current_season_code: str, prev_season_code: str) -> pd.DataFrame:
-    """아이템별로 데이터 집계"""
-    
-    # 전년/당년 시즌 필터링
-    df_prev = df[df.iloc[:, 1].apply(normalize_season).isin([prev_season_code, prev_season_code + 'S', prev_season_code + 'SS'])]
-    df_curr = df[df.iloc[:, 1].apply(normalize_season).isin([current_season_code, current_season_code + 'S', current_season_code + 'SS'])]
+    """
+    아이템별로 데이터 집계 ((중분류, 아이템명, 전년/당년)별 groupby 1회)
     
-    # 아이템별 그룹핑 (중분류 + 아이템명)
-    item_map = {}
+    아이템 순서는 전년 데이터 → 당년 데이터에서 처음 나온 순서입니다.
+    TAG USD 환율은 중분류별로 1번만 조회해 행에 붙입니다 (전년/당년 모두 전시즌 환율).
+    """
     
-    # 전년 데이터 집계
-    for idx, row in df_prev.iterrows():
-        category = str(row.iloc[3]).strip() if len(row) > 3 else ''
-        item_name = str(row.iloc[4]).strip() if len(row) > 4 else ''
-        key = f"{category}_{item_name}"
-        
-        if key not in item_map:
-            item_map[key] = {
-                'category': category,
-                'item_name': item_name,
-                'brand': brand_code,
-                'prev_data': [],
-                'curr_data': []
-            }
-        
-        item_map[key]['prev_data'].append(row)
+    # 전년/당년 시즌 필터링
+    season_normalized = normalize_season_column(df[COL_SEASON])
+    df_prev = df[season_normalized.isin([prev_season_code, prev_season_code + 'S', prev_season_code + 'SS'])]
+    df_curr = df[season_normalized.isin([current_season_code, current_season_code + 'S', current_season_code + 'SS'])]
+    df_rows = pd.concat([df_prev, df_curr], ignore_index=True)
+    period = pd.Series([PREV_PERIOD] * len(df_prev) + [CURR_PERIOD] * len(df_curr), name='기간')
+    
+    # 중분류별 환율 (전시즌)
+    fx_by_category = {
+        category: get_exchange_rate(df_fx, brand_code, prev_season_code, category)
+        for category in df_rows[COL_CATEGORY].unique()
+    }
+    fx_rate = df_rows[COL_CATEGORY].map(fx_by_category)
     
-    # 당년 데이터 집계
-    for idx, row in df_curr.iterrows():
-        category = str(row.iloc[3]).strip() if len(row) > 3 else ''
-        item_name = str(row.iloc[4]).strip() if len(row) > 4 else ''
-        key = f"{category}_{item_name}"
-        
-        if key not in item_map:
-            item_map[key] = {
-                'category': category,
-                'item_name': item_name,
-                'brand': brand_code,
-                'prev_data': [],
-                'curr_data': []
-            }
-        
-        item_map[key]['curr_data'].append(row)
+    # 아이템별 그룹핑 (중분류 + 아이템명 + 기간)
+    category = df_rows[COL_CATEGORY].astype(str).str.strip().rename('중분류')
+    item_name = df_rows[COL_ITEM].astype(str).str.strip().rename('아이템명')
+    table = item_measures(df_rows, fx_rate).groupby([category, item_name, period], sort=False).sum()
+    sums_by_key = dict(zip(table.index, table.to_dict('records')))
+    items = table.index.droplevel('기간').unique()
     
     # 아이템별 계산
     results = []
     
-    for key, item_data in item_map.items():
-        prev_rows = item_data['prev_data']
-        curr_rows = item_data['curr_data']
-        
-        # 전년 데이터 계산
-        qty_prev = sum(pd.to_numeric(row.iloc[7], errors='coerce') or 0 for row in prev_rows)
-        
-        # 전년 TAG (KRW)
-        tag_prev_krw_total = sum((pd.to_numeric(row.iloc[6], errors='coerce') or 0) * 
-                                 (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        avg_tag_prev_krw = tag_prev_krw_total / qty_prev if qty_prev > 0 else 0
-        
-        # 전년 TAG (USD) - 전시즌 환율 사용
-        tag_prev_usd_total = 0
-        for row in prev_rows:
-            category = row.iloc[3] if len(row) > 3 else None
-            fx_rate = get_exchange_rate(df_fx, brand_code, prev_season_code, category)
-            tag_krw = pd.to_numeric(row.iloc[6], errors='coerce') or 0
-            qty_row = pd.to_numeric(row.iloc[7], errors='coerce') or 0
-            tag_prev_usd_total += (tag_krw / fx_rate) * qty_row
-        avg_tag_prev_usd = tag_prev_usd_total / qty_prev if qty_prev > 0 else 0
-        
-        # 전년 원가 (USD) - 총금액 컬럼 사용
-        material_prev_total = sum(pd.to_numeric(row.iloc[30], errors='coerce') or 0 for row in prev_rows)
-        artwork_prev_total = sum(pd.to_numeric(row.iloc[31], errors='coerce') or 0 for row in prev_rows)
-        labor_prev_total = sum(pd.to_numeric(row.iloc[32], errors='coerce') or 0 for row in prev_rows)
-        margin_prev_total = sum(pd.to_numeric(row.iloc[33], errors='coerce') or 0 for row in prev_rows)
-        expense_prev_total = sum(pd.to_numeric(row.iloc[34], errors='coerce') or 0 for row in prev_rows)
-        
-        material_prev = material_prev_total / qty_prev if qty_prev > 0 else 0
-        artwork_prev = artwork_prev_total / qty_prev if qty_prev > 0 else 0
-        labor_prev = labor_prev_total / qty_prev if qty_prev > 0 else 0
-        margin_prev = margin_prev_total / qty_prev if qty_prev > 0 else 0
-        expense_prev = expense_prev_total / qty_prev if qty_prev > 0 else 0
-        avg_cost_prev_usd = material_prev + artwork_prev + labor_prev + margin_prev + expense_prev
-        
-        # 전년 원가율 (USD) - 세부 항목별
-        tag_excl_vat_prev_usd = avg_tag_prev_usd / 1.1 if avg_tag_prev_usd > 0 else 0
-        cost_rate_material_prev_usd = (material_prev / tag_excl_vat_prev_usd) * 100 if tag_excl_vat_prev_usd > 0 else 0
-        cost_rate_artwork_prev_usd = (artwork_prev / tag_excl_vat_prev_usd) * 100 if tag_excl_vat_prev_usd > 0 else 0
-        cost_rate_labor_prev_usd = (labor_prev / tag_excl_vat_prev_usd) * 100 if tag_excl_vat_prev_usd > 0 else 0
-        cost_rate_margin_prev_usd = (margin_prev / tag_excl_vat_prev_usd) * 100 if tag_excl_vat_prev_usd > 0 else 0
-        cost_rate_expense_prev_usd = (expense_prev / tag_excl_vat_prev_usd) * 100 if tag_excl_vat_prev_usd > 0 else 0
-        cost_rate_prev_usd = cost_rate_material_prev_usd + cost_rate_artwork_prev_usd + cost_rate_labor_prev_usd + cost_rate_margin_prev_usd + cost_rate_expense_prev_usd
-        
-        # 전년 원가 (KRW)
-        material_prev_krw_total = sum((pd.to_numeric(row.iloc[22], errors='coerce') or 0) * 
-                                     (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        sub_prev_krw_total = sum((pd.to_numeric(row.iloc[24], errors='coerce') or 0) * 
-                                 (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        hq_prev_krw_total = sum((pd.to_numeric(row.iloc[27], errors='coerce') or 0) * 
-                               (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        tag_label_prev_krw_total = sum((pd.to_numeric(row.iloc[25], errors='coerce') or 0) * 
-                                       (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        artwork_prev_krw_total = sum((pd.to_numeric(row.iloc[23], errors='coerce') or 0) * 
-                                     (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        labor_prev_krw_total = sum((pd.to_numeric(row.iloc[26], errors='coerce') or 0) * 
-                                   (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        margin_prev_krw_total = sum((pd.to_numeric(row.iloc[28], errors='coerce') or 0) * 
-                                   (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        expense_prev_krw_total = sum((pd.to_numeric(row.iloc[29], errors='coerce') or 0) * 
-                                     (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in prev_rows)
-        
-        material_prev_krw = (material_prev_krw_total + sub_prev_krw_total + hq_prev_krw_total + tag_label_prev_krw_total) / qty_prev if qty_prev > 0 else 0
-        artwork_prev_krw = artwork_prev_krw_total / qty_prev if qty_prev > 0 else 0
-        labor_prev_krw = labor_prev_krw_total / qty_prev if qty_prev > 0 else 0
-        margin_prev_krw = margin_prev_krw_total / qty_prev if qty_prev > 0 else 0
-        expense_prev_krw = expense_prev_krw_total / qty_prev if qty_prev > 0 else 0
-        avg_cost_prev_krw = material_prev_krw + artwork_prev_krw + labor_prev_krw + margin_prev_krw + expense_prev_krw
-        
-        # 전년 원가율 (KRW) - 세부 항목별
-        tag_excl_vat_prev_krw = avg_tag_prev_krw / 1.1 if avg_tag_prev_krw > 0 else 0
-        cost_rate_material_prev_krw = (material_prev_krw / tag_excl_vat_prev_krw) * 100 if tag_excl_vat_prev_krw > 0 else 0
-        cost_rate_artwork_prev_krw = (artwork_prev_krw / tag_excl_vat_prev_krw) * 100 if tag_excl_vat_prev_krw > 0 else 0
-        cost_rate_labor_prev_krw = (labor_prev_krw / tag_excl_vat_prev_krw) * 100 if tag_excl_vat_prev_krw > 0 else 0
-        cost_rate_margin_prev_krw = (margin_prev_krw / tag_excl_vat_prev_krw) * 100 if tag_excl_vat_prev_krw > 0 else 0
-        cost_rate_expense_prev_krw = (expense_prev_krw / tag_excl_vat_prev_krw) * 100 if tag_excl_vat_prev_krw > 0 else 0
-        cost_rate_prev_krw = cost_rate_material_prev_krw + cost_rate_artwork_prev_krw + cost_rate_labor_prev_krw + cost_rate_margin_prev_krw + cost_rate_expense_prev_krw
-        
-        # 당년 데이터 계산
-        qty_curr = sum(pd.to_numeric(row.iloc[7], errors='coerce') or 0 for row in curr_rows)
-        
-        # 당년 TAG (KRW)
-        tag_curr_krw_total = sum((pd.to_numeric(row.iloc[6], errors='coerce') or 0) * 
-                                 (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        avg_tag_curr_krw = tag_curr_krw_total / qty_curr if qty_curr > 0 else 0
-        
-        # 당년 TAG (USD) - 전시즌 환율 사용
-        tag_curr_usd_total = 0
-        for row in curr_rows:
-            category = row.iloc[3] if len(row) > 3 else None
-            fx_rate = get_exchange_rate(df_fx, brand_code, prev_season_code, category)
-            tag_krw = pd.to_numeric(row.iloc[6], errors='coerce') or 0
-            qty_row = pd.to_numeric(row.iloc[7], errors='coerce') or 0
-            tag_curr_usd_total += (tag_krw / fx_rate) * qty_row
-        avg_tag_curr_usd = tag_curr_usd_total / qty_curr if qty_curr > 0 else 0
-        
-        # 당년 원가 (USD) - 총금액 컬럼 사용
-        material_curr_total = sum(pd.to_numeric(row.iloc[30], errors='coerce') or 0 for row in curr_rows)
-        artwork_curr_total = sum(pd.to_numeric(row.iloc[31], errors='coerce') or 0 for row in curr_rows)
-        labor_curr_total = sum(pd.to_numeric(row.iloc[32], errors='coerce') or 0 for row in curr_rows)
-        margin_curr_total = sum(pd.to_numeric(row.iloc[33], errors='coerce') or 0 for row in curr_rows)
-        expense_curr_total = sum(pd.to_numeric(row.iloc[34], errors='coerce') or 0 for row in curr_rows)
-        
-        material_curr = material_curr_total / qty_curr if qty_curr > 0 else 0
-        artwork_curr = artwork_curr_total / qty_curr if qty_curr > 0 else 0
-        labor_curr = labor_curr_total / qty_curr if qty_curr > 0 else 0
-        margin_curr = margin_curr_total / qty_curr if qty_curr > 0 else 0
-        expense_curr = expense_curr_total / qty_curr if qty_curr > 0 else 0
-        avg_cost_curr_usd = material_curr + artwork_curr + labor_curr + margin_curr + expense_curr
-        
-        # 당년 원가율 (USD) - 세부 항목별
-        tag_excl_vat_curr_usd = avg_tag_curr_usd / 1.1 if avg_tag_curr_usd > 0 else 0
-        cost_rate_material_curr_usd = (material_curr / tag_excl_vat_curr_usd) * 100 if tag_excl_vat_curr_usd > 0 else 0
-        cost_rate_artwork_curr_usd = (artwork_curr / tag_excl_vat_curr_usd) * 100 if tag_excl_vat_curr_usd > 0 else 0
-        cost_rate_labor_curr_usd = (labor_curr / tag_excl_vat_curr_usd) * 100 if tag_excl_vat_curr_usd > 0 else 0
-        cost_rate_margin_curr_usd = (margin_curr / tag_excl_vat_curr_usd) * 100 if tag_excl_vat_curr_usd > 0 else 0
-        cost_rate_expense_curr_usd = (expense_curr / tag_excl_vat_curr_usd) * 100 if tag_excl_vat_curr_usd > 0 else 0
-        cost_rate_curr_usd = cost_rate_material_curr_usd + cost_rate_artwork_curr_usd + cost_rate_labor_curr_usd + cost_rate_margin_curr_usd + cost_rate_expense_curr_usd
-        
-        # 당년 원가 (KRW)
-        material_curr_krw_total = sum((pd.to_numeric(row.iloc[22], errors='coerce') or 0) * 
-                                     (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        sub_curr_krw_total = sum((pd.to_numeric(row.iloc[24], errors='coerce') or 0) * 
-                                 (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        hq_curr_krw_total = sum((pd.to_numeric(row.iloc[27], errors='coerce') or 0) * 
-                               (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        tag_label_curr_krw_total = sum((pd.to_numeric(row.iloc[25], errors='coerce') or 0) * 
-                                       (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        artwork_curr_krw_total = sum((pd.to_numeric(row.iloc[23], errors='coerce') or 0) * 
-                                     (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        labor_curr_krw_total = sum((pd.to_numeric(row.iloc[26], errors='coerce') or 0) * 
-                                   (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        margin_curr_krw_total = sum((pd.to_numeric(row.iloc[28], errors='coerce') or 0) * 
-                                   (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        expense_curr_krw_total = sum((pd.to_numeric(row.iloc[29], errors='coerce') or 0) * 
-                                     (pd.to_numeric(row.iloc[7], errors='coerce') or 0) for row in curr_rows)
-        
-        material_curr_krw = (material_curr_krw_total + sub_curr_krw_total + hq_curr_krw_total + tag_label_curr_krw_total) / qty_curr if qty_curr > 0 else 0
-        artwork_curr_krw = artwork_curr_krw_total / qty_curr if qty_curr > 0 else 0
-        labor_curr_krw = labor_curr_krw_total / qty_curr if qty_curr > 0 else 0
-        margin_curr_krw = margin_curr_krw_total / qty_curr if qty_curr > 0 else 0
-        expense_curr_krw = expense_curr_krw_total / qty_curr if qty_curr > 0 else 0
-        avg_cost_curr_krw = material_curr_krw + artwork_curr_krw + labor_curr_krw + margin_curr_krw + expense_curr_krw
-        
-        # 당년 원가율 (KRW) - 세부 항목별
-        tag_excl_vat_curr_krw = avg_tag_curr_krw / 1.1 if avg_tag_curr_krw > 0 else 0
-        cost_rate_material_curr_krw = (material_curr_krw / tag_excl_vat_curr_krw) * 100 if tag_excl_vat_curr_krw > 0 else 0
-        cost_rate_artwork_curr_krw = (artwork_curr_krw / tag_excl_vat_curr_krw) * 100 if tag_excl_vat_curr_krw > 0 else 0
-        cost_rate_labor_curr_krw = (labor_curr_krw / tag_excl_vat_curr_krw) * 100 if tag_excl_vat_curr_krw > 0 else 0
-        cost_rate_margin_curr_krw = (margin_curr_krw / tag_excl_vat_curr_krw) * 100 if tag_excl_vat_curr_krw > 0 else 0
-        cost_rate_expense_curr_krw = (expense_curr_krw / tag_excl_vat_curr_krw) * 100 if tag_excl_vat_curr_krw > 0 else 0
-        cost_rate_curr_krw = cost_rate_material_curr_krw + cost_rate_artwork_curr_krw + cost_rate_labor_curr_krw + cost_rate_margin_curr_krw + cost_rate_expense_curr_krw
+    for item_category, item in items:
+        prev = period_item_values(sums_by_key.get((item_category, item, PREV_PERIOD), EMPTY_ITEM_SUMS))
+        curr = period_item_values(sums_by_key.get((item_category, item, CURR_PERIOD), EMPTY_ITEM_SUMS))
         
         results.append({
-            '중분류': item_data['category'],
-            '아이템명': item_data['item_name'],
+            '중분류': item_category,
+            '아이템명': item,
             '브랜드': brand_code,
             # USD 원가율 (세부 항목별)
-            'USD원가율_재료계_전년': round(cost_rate_material_prev_usd, 1),
-            'USD원가율_재료계_당년': round(cost_rate_material_curr_usd, 1),
-            'USD원가율_아트웍_전년': round(cost_rate_artwork_prev_usd, 1),
-            'USD원가율_아트웍_당년': round(cost_rate_artwork_curr_usd, 1),
-            'USD원가율_공임_전년': round(cost_rate_labor_prev_usd, 1),
-            'USD원가율_공임_당년': round(cost_rate_labor_curr_usd, 1),
-            'USD원가율_마진_전년': round(cost_rate_margin_prev_usd, 1),
-            'USD원가율_마진_당년': round(cost_rate_margin_curr_usd, 1),
-            'USD원가율_경비_전년': round(cost_rate_expense_prev_usd, 1),
-            'USD원가율_경비_당년': round(cost_rate_expense_curr_usd, 1),
-            'USD원가율_합계_전년': round(cost_rate_prev_usd, 1),
-            'USD원가율_합계_당년': round(cost_rate_curr_usd, 1),
+            'USD원가율_재료계_전년': round(prev['cost_rate_material_usd'], 1),
+            'USD원가율_재료계_당년': round(curr['cost_rate_material_usd'], 1),
+            'USD원가율_아트웍_전년': round(prev['cost_rate_artwork_usd'], 1),
+            'USD원가율_아트웍_당년': round(curr['cost_rate_artwork_usd'], 1),
+            'USD원가율_공임_전년': round(prev['cost_rate_labor_usd'], 1),
+            'USD원가율_공임_당년': round(curr['cost_rate_labor_usd'], 1),
+            'USD원가율_마진_전년': round(prev['cost_rate_margin_usd'], 1),
+            'USD원가율_마진_당년': round(curr['cost_rate_margin_usd'], 1),
+            'USD원가율_경비_전년': round(prev['cost_rate_expense_usd'], 1),
+            'USD원가율_경비_당년': round(curr['cost_rate_expense_usd'], 1),
+            'USD원가율_합계_전년': round(prev['cost_rate_usd'], 1),
+            'USD원가율_합계_당년': round(curr['cost_rate_usd'], 1),
             # USD 평균단가 (세부 항목별)
-            'USD평균단가_재료계_전년': round(material_prev, 2),
-            'USD평균단가_재료계_당년': round(material_curr, 2),
-            'USD평균단가_아트웍_전년': round(artwork_prev, 2),
-            'USD평균단가_아트웍_당년': round(artwork_curr, 2),
-            'USD평균단가_공임_전년': round(labor_prev, 2),
-            'USD평균단가_공임_당년': round(labor_curr, 2),
-            'USD평균단가_마진_전년': round(margin_prev, 2),
-            'USD평균단가_마진_당년': round(margin_curr, 2),
-            'USD평균단가_경비_전년': round(expense_prev, 2),
-            'USD평균단가_경비_당년': round(expense_curr, 2),
-            'USD평균단가_합계_전년': round(avg_cost_prev_usd, 2),
-            'USD평균단가_합계_당년': round(avg_cost_curr_usd, 2),
+            'USD평균단가_재료계_전년': round(prev['material_usd'], 2),
+            'USD평균단가_재료계_당년': round(curr['material_usd'], 2),
+            'USD평균단가_아트웍_전년': round(prev['artwork_usd'], 2),
+            'USD평균단가_아트웍_당년': round(curr['artwork_usd'], 2),
+            'USD평균단가_공임_전년': round(prev['labor_usd'], 2),
+            'USD평균단가_공임_당년': round(curr['labor_usd'], 2),
+            'USD평균단가_마진_전년': round(prev['margin_usd'], 2),
+            'USD평균단가_마진_당년': round(curr['margin_usd'], 2),
+            'USD평균단가_경비_전년': round(prev['expense_usd'], 2),
+            'USD평균단가_경비_당년': round(curr['expense_usd'], 2),
+            'USD평균단가_합계_전년': round(prev['avg_cost_usd'], 2),
+            'USD평균단가_합계_당년': round(curr['avg_cost_usd'], 2),
             # KRW 원가율 (세부 항목별)
-            'KRW원가율_재료계_전년': round(cost_rate_material_prev_krw, 1),
-            'KRW원가율_재료계_당년': round(cost_rate_material_curr_krw, 1),
-            'KRW원가율_아트웍_전년': round(cost_rate_artwork_prev_krw, 1),
-            'KRW원가율_아트웍_당년': round(cost_rate_artwork_curr_krw, 1),
-            'KRW원가율_공임_전년': round(cost_rate_labor_prev_krw, 1),
-            'KRW원가율_공임_당년': round(cost_rate_labor_curr_krw, 1),
-            'KRW원가율_마진_전년': round(cost_rate_margin_prev_krw, 1),
-            'KRW원가율_마진_당년': round(cost_rate_margin_curr_krw, 1),
-            'KRW원가율_경비_전년': round(cost_rate_expense_prev_krw, 1),
-            'KRW원가율_경비_당년': round(cost_rate_expense_curr_krw, 1),
-            'KRW원가율_합계_전년': round(cost_rate_prev_krw, 1),
-            'KRW원가율_합계_당년': round(cost_rate_curr_krw, 1),
+            'KRW원가율_재료계_전년': round(prev['cost_rate_material_krw'], 1),
+            'KRW원가율_재료계_당년': round(curr['cost_rate_material_krw'], 1),
+            'KRW원가율_아트웍_전년': round(prev['cost_rate_artwork_krw'], 1),
+            'KRW원가율_아트웍_당년': round(curr['cost_rate_artwork_krw'], 1),
+            'KRW원가율_공임_전년': round(prev['cost_rate_labor_krw'], 1),
+            'KRW원가율_공임_당년': round(curr['cost_rate_labor_krw'], 1),
+            'KRW원가율_마진_전년': round(prev['cost_rate_margin_krw'], 1),
+            'KRW원가율_마진_당년': round(curr['cost_rate_margin_krw'], 1),
+            'KRW원가율_경비_전년': round(prev['cost_rate_expense_krw'], 1),
+            'KRW원가율_경비_당년': round(curr['cost_rate_expense_krw'], 1),
+            'KRW원가율_합계_전년': round(prev['cost_rate_krw'], 1),
+            'KRW원가율_합계_당년': round(curr['cost_rate_krw'], 1),
             # 기타
-            '수량_전년': int(qty_prev),
-            '수량_당년': int(qty_curr),
-            '평균TAG_KRW_전년': round(avg_tag_prev_krw, 0),
-            '평균TAG_KRW_당년': round(avg_tag_curr_krw, 0),
-            'TAG금액_전년': round(tag_prev_krw_total, 0),
-            'TAG금액_당년': round(tag_curr_krw_total, 0),
+            '수량_전년': int(prev['qty']),
+            '수량_당년': int(curr['qty']),
+            '평균TAG_KRW_전년': round(prev['avg_tag_krw'], 0),
+            '평균TAG_KRW_당년': round(curr['avg_tag_krw'], 0),
+            'TAG금액_전년': round(prev['tag_krw_total'], 0),
+            'TAG금액_당년': round(curr['tag_krw_total'], 0),
         })
     
     return pd.DataFrame(results)
@@ -434,37 +375,70 @@ def calculate_order_share(df_items: pd.DataFrame) -> pd.DataFrame:
     
     return df_items
 
+# Excel 스타일 (워크북에 이름 스타일로 1번 등록하고 셀은 이름만 참조)
+HEADER_STYLE = 'item_header'
+DATA_STYLE = 'item_data'
+SUBTOTAL_STYLE = 'item_subtotal'
+BRAND_TOTAL_STYLE = 'item_brand_total'
+
+# 중분류 순서 정의
+CATEGORY_ORDER = ['Outer', 'Inner', 'Bottom', 'Acc_etc', 'Wear_etc']
+
+def register_styles(wb: Workbook):
+    """헤더/데이터/소계/브랜드 합계 이름 스타일 등록"""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    center = Alignment(horizontal='center', vertical='center')
+    for name, font, fill_color in [
+        (HEADER_STYLE, Font(bold=True, color='FFFFFF'), '366092'),
+        (DATA_STYLE, copy(DEFAULT_FONT), None),
+        (SUBTOTAL_STYLE, Font(bold=True), 'D9E1F2'),
+        (BRAND_TOTAL_STYLE, Font(bold=True), 'FFC000'),
+    ]:
+        style = NamedStyle(name=name, font=font, alignment=center, border=border)
+        if fill_color:
+            style.fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type='solid')
+        wb.add_named_style(style)
+
 # Excel 파일 생성
 def create_excel_file(df_all: pd.DataFrame, output_file: str, period: str):
-    """Excel 파일 생성 (USD 원가율, USD 평균단가, KRW 원가율 시트 분리)"""
-    wb = Workbook()
-    wb.remove(wb.active)  # 기본 시트 제거
+    """
+    Excel 파일 생성 (USD 원가율, USD 평균단가, KRW 원가율 시트 분리)
+    
+    write-only 워크북으로 행을 바로 파일에 쓰므로 셀 객체가 메모리에 쌓이지 않습니다.
+    """
+    wb = Workbook(write_only=True)
+    register_styles(wb)
     
     # 발주비중 계산
     df_all = calculate_order_share(df_all)
     
-    # 중분류 순서 정의
-    category_order = ['Outer', 'Inner', 'Bottom', 'Acc_etc', 'Wear_etc']
+    # 브랜드 → 중분류 순서 → 아이템명 순으로 정렬 (시트 3개 공통)
+    df_sorted = sort_items(df_all)
     
     # 1. USD 원가율 시트
-    create_cost_rate_sheet(wb, df_all, 'USD 원가율', 'USD원가율', category_order)
+    create_cost_rate_sheet(wb, df_sorted, 'USD 원가율', 'USD원가율')
     
     # 2. USD 평균단가 시트
-    create_avg_cost_sheet(wb, df_all, 'USD 평균단가', 'USD평균단가', category_order)
+    create_cost_rate_sheet(wb, df_sorted, 'USD 평균단가', 'USD평균단가')
     
     # 3. KRW 원가율 시트
-    create_cost_rate_sheet(wb, df_all, 'KRW 원가율', 'KRW원가율', category_order, include_tag=True)
+    create_cost_rate_sheet(wb, df_sorted, 'KRW 원가율', 'KRW원가율', include_tag=True)
     
     # 파일 저장
     wb.save(output_file)
     print(f"[OK] Excel 파일 생성 완료: {output_file}")
 
-def create_cost_rate_sheet(wb: Workbook, df_all: pd.DataFrame, sheet_name: str, 
-                           prefix: str, category_order: list, include_tag: bool = False):
-    """원가율 시트 생성"""
-    ws = wb.create_sheet(title=sheet_name)
-    
-    # 컬럼 정의
+def sort_items(df_all: pd.DataFrame) -> pd.DataFrame:
+    """브랜드(BRAND_MAP 순서)별로 중분류 순서, 아이템명 순 정렬 (순서에 없는 중분류는 뒤로)"""
+    brand_rank = df_all['브랜드'].map({brand: rank for rank, brand in enumerate(BRAND_MAP)})
+    category_rank = df_all['중분류'].map({category: rank for rank, category in enumerate(CATEGORY_ORDER)}).fillna(999)
+    order = pd.DataFrame({'브랜드': brand_rank, '중분류': category_rank, '아이템명': df_all['아이템명']})
+    df_sorted = df_all.loc[order.sort_values(['브랜드', '중분류', '아이템명'], kind='stable').index]
+    return df_sorted[brand_rank.loc[df_sorted.index].notna()]
+
+def sheet_columns(prefix: str, include_tag: bool) -> List[str]:
+    """시트 컬럼 정의"""
     columns = [
         '중분류', '아이템명', '브랜드',
         f'{prefix}_재료계_전년', f'{prefix}_재료계_당년',
@@ -476,316 +450,132 @@ def create_cost_rate_sheet(wb: Workbook, df_all: pd.DataFrame, sheet_name: str,
         '발주비중_전년', '발주비중_당년',
         '수량_전년', '수량_당년'
     ]
-    
     if include_tag:
         columns.extend(['평균TAG_KRW_전년', '평균TAG_KRW_당년'])
-    
-    # 헤더 작성
-    for col_idx, header in enumerate(columns, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = Font(bold=True, color='FFFFFF')
-        cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    row_idx = 2
-    brands = ['M', 'I', 'X', 'ST', 'V']
-    
-    for brand_code in brands:
-        df_brand = df_all[df_all['브랜드'] == brand_code].copy()
-        if len(df_brand) == 0:
-            continue
-        
-        # 중분류별로 정렬
-        df_brand['중분류_순서'] = df_brand['중분류'].apply(
-            lambda x: category_order.index(x) if x in category_order else 999
-        )
-        df_brand = df_brand.sort_values(['중분류_순서', '아이템명'])
-        df_brand = df_brand.drop('중분류_순서', axis=1)
-        
-        # 중분류별로 그룹핑하여 처리
-        categories = df_brand['중분류'].unique()
-        
-        for category in categories:
-            df_category = df_brand[df_brand['중분류'] == category].copy()
-            
-            # 데이터 작성
-            for _, row_data in df_category.iterrows():
-                # 데이터 행 작성
-                for col_idx, col_name in enumerate(columns, 1):
-                    value = row_data.get(col_name, '')
-                    cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    cell.border = Border(
-                        left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin')
-                    )
-                
-                row_idx += 1
-            
-            # 중분류 소계 추가
-            add_subtotal_row(ws, row_idx, columns, df_category, prefix, include_tag, df_all)
-            row_idx += 1
-        
-        # 브랜드별 합계
-        add_brand_total_row(ws, row_idx, columns, df_brand, prefix, include_tag, 
-                           BRAND_MAP.get(brand_code, brand_code), df_all)
-        row_idx += 2  # 빈 행 추가
-    
-    # 컬럼 너비 자동 조정
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column].width = adjusted_width
-
-def create_avg_cost_sheet(wb: Workbook, df_all: pd.DataFrame, sheet_name: str, 
-                          prefix: str, category_order: list):
-    """평균단가 시트 생성"""
-    ws = wb.create_sheet(title=sheet_name)
-    
-    # 컬럼 정의
-    columns = [
-        '중분류', '아이템명', '브랜드',
-        f'{prefix}_재료계_전년', f'{prefix}_재료계_당년',
-        f'{prefix}_아트웍_전년', f'{prefix}_아트웍_당년',
-        f'{prefix}_공임_전년', f'{prefix}_공임_당년',
-        f'{prefix}_마진_전년', f'{prefix}_마진_당년',
-        f'{prefix}_경비_전년', f'{prefix}_경비_당년',
-        f'{prefix}_합계_전년', f'{prefix}_합계_당년',
-        '발주비중_전년', '발주비중_당년',
-        '수량_전년', '수량_당년'
-    ]
-    
-    # 헤더 작성
-    for col_idx, header in enumerate(columns, 1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = Font(bold=True, color='FFFFFF')
-        cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    row_idx = 2
-    brands = ['M', 'I', 'X', 'ST', 'V']
-    
-    for brand_code in brands:
-        df_brand = df_all[df_all['브랜드'] == brand_code].copy()
-        if len(df_brand) == 0:
+    return columns
+
+def group_totals(df_sorted: pd.DataFrame, columns: List[str], keys: List[str]) -> pd.DataFrame:
+    """
+    소계/합계 행 계산용 그룹 합계 (groupby 1회)
+    
+    수량 가중 평균 컬럼(원가율/평균단가/평균TAG)은 값 × 수량의 합계, 수량/TAG금액은 합계
+    """
+    sums = {}
+    for col_name in columns[3:]:
+        qty_col = '수량_전년' if '전년' in col_name else '수량_당년'
+        if col_name.startswith('발주비중'):
             continue
-        
-        # 중분류별로 정렬
-        df_brand['중분류_순서'] = df_brand['중분류'].apply(
-            lambda x: category_order.index(x) if x in category_order else 999
-        )
-        df_brand = df_brand.sort_values(['중분류_순서', '아이템명'])
-        df_brand = df_brand.drop('중분류_순서', axis=1)
-        
-        # 중분류별로 그룹핑하여 처리
-        categories = df_brand['중분류'].unique()
-        
-        for category in categories:
-            df_category = df_brand[df_brand['중분류'] == category].copy()
-            
-            # 데이터 작성
-            for _, row_data in df_category.iterrows():
-                # 데이터 행 작성
-                for col_idx, col_name in enumerate(columns, 1):
-                    value = row_data.get(col_name, '')
-                    cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    cell.border = Border(
-                        left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin')
-                    )
-                
-                row_idx += 1
-            
-            # 중분류 소계 추가 (평균단가 시트는 include_tag=False)
-            add_subtotal_row(ws, row_idx, columns, df_category, prefix, False, df_all)
-            row_idx += 1
-        
-        # 브랜드별 합계
-        add_brand_total_row(ws, row_idx, columns, df_brand, prefix, False, 
-                           BRAND_MAP.get(brand_code, brand_code), df_all)
-        row_idx += 2  # 빈 행 추가
-    
-    # 컬럼 너비 자동 조정
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column].width = adjusted_width
-
-def add_subtotal_row(ws, row_idx: int, columns: list, df_subset: pd.DataFrame, 
-                     prefix: str, include_tag: bool, df_all: pd.DataFrame = None):
-    """중분류별 소계 행 추가"""
-    # 소계 행 작성
-    for col_idx, col_name in enumerate(columns, 1):
+        sums[col_name] = df_sorted[col_name] if col_name.startswith('수량') else df_sorted[col_name] * df_sorted[qty_col]
+    sums['TAG금액_전년'] = df_sorted['TAG금액_전년']
+    sums['TAG금액_당년'] = df_sorted['TAG금액_당년']
+    group_keys = [df_sorted[key] for key in keys]
+    return pd.DataFrame(sums).groupby(group_keys, sort=False).sum()
+
+def total_row_values(columns: List[str], prefix: str, include_tag: bool, totals: pd.Series,
+                     label: str, brand_code: str, brand_totals: Optional[pd.Series]) -> List[Any]:
+    """
+    소계/브랜드 합계 행 값
+    
+    Args:
+        totals: group_totals 결과 1행
+        brand_totals: 소계면 같은 브랜드의 합계 행 (발주비중 분모), 브랜드 합계면 None
+    """
+    digits = 2 if '평균단가' in prefix else 1
+    values = []
+    for col_name in columns:
+        qty_col = '수량_전년' if '전년' in col_name else '수량_당년'
+        tag_col = 'TAG금액_전년' if '전년' in col_name else 'TAG금액_당년'
         if col_name == '중분류':
-            value = f"{df_subset.iloc[0]['중분류']} 소계"
+            value = label
         elif col_name == '아이템명':
             value = ''
         elif col_name == '브랜드':
-            value = df_subset.iloc[0]['브랜드']
+            value = brand_code
         elif col_name.startswith(prefix):
-            # 원가율/평균단가는 가중 평균 계산 (수량 기준)
-            if '전년' in col_name:
-                total_qty = df_subset['수량_전년'].sum()
-                if total_qty > 0:
-                    # 가중 평균: (값 × 수량) 합계 / 수량 합계
-                    weighted_sum = (df_subset[col_name] * df_subset['수량_전년']).sum()
-                    value = round(weighted_sum / total_qty, 2) if '평균단가' in prefix else round(weighted_sum / total_qty, 1)
-                else:
-                    value = ''
-            else:  # 당년
-                total_qty = df_subset['수량_당년'].sum()
-                if total_qty > 0:
-                    weighted_sum = (df_subset[col_name] * df_subset['수량_당년']).sum()
-                    value = round(weighted_sum / total_qty, 2) if '평균단가' in prefix else round(weighted_sum / total_qty, 1)
-                else:
-                    value = ''
+            # 원가율/평균단가는 가중 평균 계산 (수량 기준): (값 × 수량) 합계 / 수량 합계
+            total_qty = totals[qty_col]
+            value = round(totals[col_name] / total_qty, digits) if total_qty > 0 else ''
         elif col_name in ['발주비중_전년', '발주비중_당년']:
-            # 발주비중은 브랜드별 TAG 금액 기준으로 재계산
-            brand_code = df_subset.iloc[0]['브랜드']
-            if df_all is not None:
-                # 해당 브랜드의 전체 TAG 금액
-                df_brand = df_all[df_all['브랜드'] == brand_code]
-                brand_total_tag = df_brand['TAG금액_전년'].sum() if '전년' in col_name else df_brand['TAG금액_당년'].sum()
-                # 소계의 TAG 금액
-                subset_tag = df_subset['TAG금액_전년'].sum() if '전년' in col_name else df_subset['TAG금액_당년'].sum()
-                value = round((subset_tag / brand_total_tag * 100), 2) if brand_total_tag > 0 else 0
+            if brand_totals is None:
+                # 브랜드 합계는 항상 100%
+                value = 100.0 if totals[tag_col] > 0 else 0
             else:
-                value = ''
-        elif col_name in ['수량_전년', '수량_당년']:
-            value = int(df_subset[col_name].sum()) if col_name in df_subset.columns else ''
-        elif include_tag and col_name in ['평균TAG_KRW_전년', '평균TAG_KRW_당년']:
-            # 가중 평균 계산
-            qty_col = '수량_전년' if '전년' in col_name else '수량_당년'
-            total_qty = df_subset[qty_col].sum()
-            if total_qty > 0:
-                tag_total = (df_subset[col_name] * df_subset[qty_col]).sum()
-                value = round(tag_total / total_qty, 0) if total_qty > 0 else ''
-            else:
-                value = ''
-        else:
-            value = ''
-        
-        cell = ws.cell(row=row_idx, column=col_idx, value=value)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-
-def add_brand_total_row(ws, row_idx: int, columns: list, df_brand: pd.DataFrame, 
-                        prefix: str, include_tag: bool, brand_name: str, df_all: pd.DataFrame = None):
-    """브랜드별 합계 행 추가"""
-    # 합계 행 작성
-    for col_idx, col_name in enumerate(columns, 1):
-        if col_name == '중분류':
-            value = f"{brand_name} 합계"
-        elif col_name == '아이템명':
-            value = ''
-        elif col_name == '브랜드':
-            value = df_brand.iloc[0]['브랜드']
-        elif col_name.startswith(prefix):
-            # 원가율/평균단가는 가중 평균 계산 (수량 기준)
-            if '전년' in col_name:
-                total_qty = df_brand['수량_전년'].sum()
-                if total_qty > 0:
-                    weighted_sum = (df_brand[col_name] * df_brand['수량_전년']).sum()
-                    value = round(weighted_sum / total_qty, 2) if '평균단가' in prefix else round(weighted_sum / total_qty, 1)
-                else:
-                    value = ''
-            else:  # 당년
-                total_qty = df_brand['수량_당년'].sum()
-                if total_qty > 0:
-                    weighted_sum = (df_brand[col_name] * df_brand['수량_당년']).sum()
-                    value = round(weighted_sum / total_qty, 2) if '평균단가' in prefix else round(weighted_sum / total_qty, 1)
-                else:
-                    value = ''
-        elif col_name in ['발주비중_전년', '발주비중_당년']:
-            # 발주비중은 브랜드별 TAG 금액 기준으로 재계산 (브랜드 합계는 항상 100%)
-            brand_tag = df_brand['TAG금액_전년'].sum() if '전년' in col_name else df_brand['TAG금액_당년'].sum()
-            value = 100.0 if brand_tag > 0 else 0
+                # 소계는 브랜드 전체 TAG 금액 대비 소계 TAG 금액
+                brand_total_tag = brand_totals[tag_col]
+                value = round((totals[tag_col] / brand_total_tag * 100), 2) if brand_total_tag > 0 else 0
         elif col_name in ['수량_전년', '수량_당년']:
-            value = int(df_brand[col_name].sum()) if col_name in df_brand.columns else ''
+            value = int(totals[col_name])
         elif include_tag and col_name in ['평균TAG_KRW_전년', '평균TAG_KRW_당년']:
-            # 가중 평균 계산
-            qty_col = '수량_전년' if '전년' in col_name else '수량_당년'
-            total_qty = df_brand[qty_col].sum()
-            if total_qty > 0:
-                tag_total = (df_brand[col_name] * df_brand[qty_col]).sum()
-                value = round(tag_total / total_qty, 0) if total_qty > 0 else ''
-            else:
-                value = ''
+            total_qty = totals[qty_col]
+            value = round(totals[col_name] / total_qty, 0) if total_qty > 0 else ''
         else:
             value = ''
+        values.append(value)
+    return values
+
+def sheet_rows(df_sorted: pd.DataFrame, columns: List[str], prefix: str, include_tag: bool):
+    """
+    시트 행 (스타일 이름, 값 목록) 순서대로 - 아이템 행, 중분류 소계, 브랜드 합계, 브랜드 사이 빈 행
+    
+    소계/합계는 (브랜드, 중분류)/브랜드별로 미리 합계를 구해 두고 행마다 다시 필터링하지 않습니다.
+    """
+    category_totals = group_totals(df_sorted, columns, ['브랜드', '중분류'])
+    brand_totals = group_totals(df_sorted, columns, ['브랜드'])
+    
+    first = True
+    for brand_code, df_brand in df_sorted.groupby('브랜드', sort=False):
+        if not first:
+            yield None, []
+        first = False
+        
+        for category, df_category in df_brand.groupby('중분류', sort=False):
+            # 데이터 행 작성
+            for values in df_category[columns].itertuples(index=False, name=None):
+                yield DATA_STYLE, list(values)
+            
+            # 중분류 소계 추가
+            yield SUBTOTAL_STYLE, total_row_values(
+                columns, prefix, include_tag, category_totals.loc[(brand_code, category)],
+                f"{category} 소계", brand_code, brand_totals.loc[brand_code])
         
-        cell = ws.cell(row=row_idx, column=col_idx, value=value)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color='FFC000', end_color='FFC000', fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-
-def main():
-    parser = argparse.ArgumentParser(description='아이템별 원가율 Excel 파일 생성')
-    parser.add_argument('--period', type=str, required=True,
-                       help='기간 코드 (예: 26SS, 25SS, 25FW)')
-    args = parser.parse_args()
-    
-    period = args.period.upper()
-    
-    print("F&F Cost Dashboard - 아이템별 원가율 Excel 파일 생성")
-    print("=" * 60)
-    print(f"\n기간: {period}")
-    
-    # 기간 폴더명 결정
-    season_folder = get_season_folder(period)
-    
-    # 시즌 코드 결정
-    if period in ['26SS', '26S']:
-        season_code = '26S'
-        prev_season_code = '25S'
-    elif period in ['25SS', '25S']:
-        season_code = '25S'
-        prev_season_code = '24S'
-    elif period in ['25FW', '25F']:
-        season_code = '25F'
-        prev_season_code = '24F'
-    elif period in ['24SS', '24S']:
-        season_code = '24S'
-        prev_season_code = '23S'
-    elif period in ['24FW', '24F']:
-        season_code = '24F'
-        prev_season_code = '23F'
-    else:
-        season_code = convert_season_format(period)
-        prev_season = get_previous_season(period)
-        prev_season_code = convert_season_format(prev_season) if prev_season else ''
+        # 브랜드별 합계
+        yield BRAND_TOTAL_STYLE, total_row_values(
+            columns, prefix, include_tag, brand_totals.loc[brand_code],
+            f"{BRAND_MAP.get(brand_code, brand_code)} 합계", brand_code, None)
+
+def create_cost_rate_sheet(wb: Workbook, df_sorted: pd.DataFrame, sheet_name: str,
+                           prefix: str, include_tag: bool = False):
+    """원가율/평균단가 시트 생성 (write-only: 컬럼 너비를 먼저 정한 뒤 행을 순서대로 씀)"""
+    ws = wb.create_sheet(title=sheet_name)
+    columns = sheet_columns(prefix, include_tag)
+    rows = [(HEADER_STYLE, columns)] + list(sheet_rows(df_sorted, columns, prefix, include_tag))
+    
+    # 컬럼 너비 자동 조정 (가장 긴 값 + 2, 최대 50)
+    for col_idx in range(len(columns)):
+        max_length = max((len(str(values[col_idx])) for _, values in rows
+                          if col_idx < len(values) and values[col_idx]), default=0)
+        ws.column_dimensions[get_column_letter(col_idx + 1)].width = min(max_length + 2, 50)
+    
+    for style, values in rows:
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            cells.append(cell)
+        ws.append(cells)
+
+def load_item_table(period: str) -> Optional[pd.DataFrame]:
+    """
+    기간의 전체 브랜드 CSV → 아이템별 집계 통합 (Excel 시트 입력)
+    
+    Returns:
+        브랜드별 aggregate_by_item 결과를 합친 DataFrame (FX 파일이나 처리할 데이터가 없으면 None)
+    """
+    # 기간 폴더명, 시즌 코드, 브랜드별 CSV 경로 결정
+    item_period = resolve_item_period(period)
+    season_folder = item_period.season_folder
+    season_code = item_period.season_code
+    prev_season_code = item_period.prev_season_code
     
     print(f"시즌 코드: {season_code}")
     print(f"전년 시즌 코드: {prev_season_code}")
@@ -794,23 +584,19 @@ def main():
     # FX 파일 로드
     if not os.path.exists(FX_FILE):
         print(f"\n[ERROR] {FX_FILE} 파일이 없습니다.")
-        return
+        return None
     
     df_fx = pd.read_csv(FX_FILE, encoding='utf-8-sig')
     print(f"\n[OK] FX 파일 로드 완료: {len(df_fx)}개 환율 데이터")
     
     # 모든 브랜드 데이터 통합
     all_items = []
-    brands = ['M', 'I', 'X', 'ST', 'V']
-    
-    for brand_code in brands:
+    for brand_code in ITEM_BRANDS:
         print(f"\n{'=' * 60}")
         print(f"브랜드 {brand_code} ({BRAND_MAP.get(brand_code, brand_code)}) 처리 중...")
         print(f"{'=' * 60}")
         
-        # 파일명 결정
-        file_season = season_code if season_code in ['25F', '26F', '24F'] else period
-        csv_file = f'public/COST RAW/{season_folder}/{brand_code}_{file_season}.csv'
+        csv_file = item_period.csv_files[brand_code]
         
         print(f"CSV 파일: {csv_file}")
         
@@ -821,33 +607,19 @@ def main():
         
         # CSV 파일 로드
         print(f"[1] CSV 파일 로드 중...")
-        df = pd.read_csv(csv_file, encoding='utf-8-sig')
+        df = read_cost_frame(csv_file, ITEM_COLUMNS)
         
         # 중분류 통합
-        def normalize_category(category):
-            if pd.isna(category):
-                return 'Acc_etc'
-            category_str = str(category).strip()
-            category_upper = category_str.upper()
-            if category_upper in ['SHOES', 'BAG', 'HEADWEAR', 'ACC_ETC', 'ACC']:
-                return 'Acc_etc'
-            return category_str
-        
-        df.iloc[:, 3] = df.iloc[:, 3].apply(normalize_category)
-        
-        # 수량 컬럼 클렌징
-        df.iloc[:, 7] = pd.to_numeric(df.iloc[:, 7].astype(str).str.replace(',', '').str.strip(), errors='coerce').fillna(0)
+        df[COL_CATEGORY] = merge_acc_categories(df[COL_CATEGORY])
         
-        # USD/KRW 단가 컬럼도 숫자로 변환
-        for col_idx in range(14, 35):
-            if col_idx < len(df.columns):
-                df.iloc[:, col_idx] = pd.to_numeric(df.iloc[:, col_idx], errors='coerce').fillna(0)
+        # 수량/단가 숫자 변환과 결측치 처리는 read_cost_frame에서 완료
         
         print(f"   > 총 {len(df)}개 레코드 로드")
         
         # 아이템별 집계
         print(f"[2] 아이템별 집계 계산 중...")
-        df_items = aggregate_by_item(df, df_fx, brand_code, season_code, prev_season_code)
+        with span('item.aggregate', season=period, brand=brand_code):
+            df_items = aggregate_by_item(df, df_fx, brand_code, season_code, prev_season_code)
         print(f"   > {len(df_items)}개 아이템 집계 완료")
         
         all_items.append(df_items)
@@ -855,15 +627,34 @@ def main():
     # 모든 브랜드 데이터 통합
     if len(all_items) == 0:
         print("\n[ERROR] 처리할 데이터가 없습니다.")
-        return
+        return None
     
     df_all = pd.concat(all_items, ignore_index=True)
     print(f"\n[OK] 전체 {len(df_all)}개 아이템 데이터 통합 완료")
+    return df_all
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='아이템별 원가율 Excel 파일 생성')
+    parser.add_argument('--period', type=str, required=True,
+                       help='기간 코드 (예: 26SS, 25SS, 25FW)')
+    args = parser.parse_args(argv)
+    
+    period = args.period.upper()
+    
+    print("F&F Cost Dashboard - 아이템별 원가율 Excel 파일 생성")
+    print("=" * 60)
+    print(f"\n기간: {period}")
+    
+    df_all = load_item_table(period)
+    if df_all is None:
+        return
     
     # Excel 파일 생성
-    output_file = f'public/COST RAW/{season_folder}/item_cost_rate_{period}.xlsx'
+    output_file = resolve_item_period(period).output_file
     print(f"\n[3] Excel 파일 생성 중: {output_file}")
-    create_excel_file(df_all, output_file, period)
+    with span('item.excel', season=period):
+        create_excel_file(df_all, output_file, period)
+        record_file(output_file)
     
     print("\n" + "=" * 60)
     print("모든 작업이 완료되었습니다!")
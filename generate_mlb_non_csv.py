@@ -13,12 +13,21 @@ MLB Non 시즌 데이터 추출 및 CSV 생성 스크립트
 - 브랜드별 CSV 파일 생성
 """
 
+import numpy as np
 import pandas as pd
-import snowflake.connector
 import os
+import sys
 import argparse
 from datetime import datetime, date
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Tuple
+
+from artifact_writer import write_csv, write_label
+from fx_rates import load_fx_non_table
+from cost_raw_store import sync_parquet
+from non_extract import calculate_periods, derive_delivery_period_frame, load_non_extract
+from query_pool import DEFAULT_MAX_WORKERS
+from snowflake_query import fetch_dataframe
+from warehouse import connect_warehouse, describe_warehouse
 
 # ============================================
 # Snowflake 연결 설정
@@ -33,55 +42,13 @@ SNOWFLAKE_CONFIG = {
     'role': 'PUBLIC'
 }
 
-# ============================================
-# 기간 계산 함수
-# ============================================
-def calculate_periods(season: str) -> Tuple[date, date, date, date]:
-    """
-    시즌에 따른 전년/당년 기간 계산
-    
-    Args:
-        season: 시즌 코드 (예: '25FW', '26SS')
-    
-    Returns:
-        (prev_start, prev_end, curr_start, curr_end) 튜플
-    """
-    # 시즌 파싱
-    season_upper = season.upper()
-    
-    if 'FW' in season_upper or (season_upper.endswith('F') and len(season) == 3):
-        # FW: 6/1 ~ 11/30 (항상 시즌 전체 기간)
-        year_2digit = int(season[:2])
-        # 2자리 연도를 4자리로 변환 (25 -> 2025)
-        year = 2000 + year_2digit
-        prev_year = year - 1
-        curr_year = year
-        
-        prev_start = date(prev_year, 6, 1)
-        prev_end = date(prev_year, 11, 30)
-        curr_start = date(curr_year, 6, 1)
-        curr_end = date(curr_year, 11, 30)  # 항상 시즌 끝까지
-            
-    elif 'SS' in season_upper or (season_upper.endswith('S') and len(season) == 3):
-        # SS: 12/1 ~ 다음해 5/31 (항상 시즌 전체 기간)
-        # 예: 26S 당년 = 2025-12-01 ~ 2026-05-31, 전년 = 2024-12-01 ~ 2025-05-31
-        year_2digit = int(season[:2])
-        # 2자리 연도를 4자리로 변환 (25 -> 2025)
-        year = 2000 + year_2digit
-        
-        # 당년: (year-1)년 12/1 ~ year년 5/31
-        curr_start = date(year - 1, 12, 1)
-        curr_end = date(year, 5, 31)  # 항상 시즌 끝까지
-        
-        # 전년: (year-2)년 12/1 ~ (year-1)년 5/31
-        prev_start = date(year - 2, 12, 1)
-        prev_end = date(year - 1, 5, 31)
-    else:
-        raise ValueError(f"지원하지 않는 시즌 형식: {season}")
-    
-    return prev_start, prev_end, curr_start, curr_end
+# 조회 결과에서 category로 변환할 코드 컬럼 (NULL이 없는 코드 컬럼만)
+CATEGORY_COLUMNS = ['기간', '브랜드', '시즌', '발주통화']
 
 
+# ============================================
+# SQL 쿼리 생성 (단일 시즌 직접 조회용)
+# ============================================
 def build_sql_query(prev_start: date, prev_end: date, curr_start: date, curr_end: date) -> str:
     """
     SQL 쿼리 생성 (합의납기일 기준)
@@ -213,20 +180,13 @@ order by period_label desc, brd_cd, sesn desc, part_cd, po_no
 # Snowflake 연결
 # ============================================
 def connect_to_database():
-    """Snowflake에 연결"""
+    """Snowflake(또는 COST_WAREHOUSE로 선택한 웨어하우스)에 연결"""
     try:
-        conn = snowflake.connector.connect(
-            account=SNOWFLAKE_CONFIG['account'],
-            user=SNOWFLAKE_CONFIG['username'],
-            password=SNOWFLAKE_CONFIG['password'],
-            warehouse=SNOWFLAKE_CONFIG['warehouse'],
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-        )
-        print(f"[OK] Snowflake 연결 성공: {SNOWFLAKE_CONFIG['database']}.{SNOWFLAKE_CONFIG['schema']}")
+        conn = connect_warehouse(SNOWFLAKE_CONFIG)
+        print(f"[OK] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 성공")
         return conn
     except Exception as e:
-        print(f"[ERROR] Snowflake 연결 실패: {e}")
+        print(f"[ERROR] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 실패: {e}")
         return None
 
 
@@ -237,14 +197,8 @@ def execute_query(conn, query: str) -> Optional[pd.DataFrame]:
     """SQL 쿼리 실행 및 결과를 DataFrame으로 반환"""
     try:
         print("\n[INFO] SQL 쿼리 실행 중...")
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        
-        df = pd.DataFrame(rows, columns=columns)
-        cursor.close()
+        # Arrow 배치로 조회해 타입이 정해진 컬럼으로 바로 변환
+        df = fetch_dataframe(conn, query, category_columns=CATEGORY_COLUMNS)
         
         print(f"[OK] {len(df)}개 행 추출 완료")
         return df
@@ -288,24 +242,8 @@ def load_fx_non_prev_rate(brand: str, season_code: str) -> float:
     Returns:
         전년환율 (float), 없으면 0.0
     """
-    fx_file = 'public/COST RAW/FX_NON.csv'
-    try:
-        if not os.path.exists(fx_file):
-            return 0.0
-        
-        df_fx = pd.read_csv(fx_file, encoding='utf-8-sig')
-        
-        # 전년 환율 조회 (기간='전년', 브랜드, 시즌 매칭)
-        mask = (df_fx['브랜드'] == brand) & (df_fx['기간'] == '전년') & (df_fx['시즌'] == season_code)
-        matched = df_fx[mask]
-        
-        if len(matched) > 0:
-            rate = float(matched.iloc[0]['환율'])
-            return rate
-        else:
-            return 0.0
-    except Exception as e:
-        return 0.0
+    # 파일은 한 번만 읽고 (브랜드, 기간, 시즌) 인덱스에서 조회
+    return load_fx_non_table().get_rate(brand, '전년', season_code)
 
 
 def load_fx_non_rate(brand: str, period: str, season_code: str) -> float:
@@ -320,24 +258,8 @@ def load_fx_non_rate(brand: str, period: str, season_code: str) -> float:
     Returns:
         환율 (float), 없으면 0.0
     """
-    fx_file = 'public/COST RAW/FX_NON.csv'
-    try:
-        if not os.path.exists(fx_file):
-            return 0.0
-        
-        df_fx = pd.read_csv(fx_file, encoding='utf-8-sig')
-        
-        # 환율 조회 (기간, 브랜드, 시즌 매칭)
-        mask = (df_fx['브랜드'] == brand) & (df_fx['기간'] == period) & (df_fx['시즌'] == season_code)
-        matched = df_fx[mask]
-        
-        if len(matched) > 0:
-            rate = float(matched.iloc[0]['환율'])
-            return rate
-        else:
-            return 0.0
-    except Exception as e:
-        return 0.0
+    # 파일은 한 번만 읽고 (브랜드, 기간, 시즌) 인덱스에서 조회
+    return load_fx_non_table().get_rate(brand, period, season_code)
 
 
 def get_fx_rate(df_fx: pd.DataFrame, brand: str, season_code: str, category: str = '의류') -> float:
@@ -573,52 +495,49 @@ def apply_exchange_rates(df: pd.DataFrame, exchange_rates: Dict[str, float], sea
         else:
             return base_season_code
     
-    for idx, row in df_result.iterrows():
-        period = row['기간']
-        brand = row['브랜드']
-        currency = row['발주통화']
-        
+    # (기간, 브랜드) 조합별로 환율을 한 번만 결정
+    fx_non_table = load_fx_non_table()
+    periods = df_result['기간'].to_numpy(dtype=object)
+    brands = df_result['브랜드'].to_numpy(dtype=object)
+    
+    pair_rates = {}
+    for period, brand in set(zip(periods, brands)):
         # period에 따라 시즌 코드 결정
         lookup_season_code = get_season_code_for_period(period, fx_season_code) if fx_season_code else None
         
-        # 모든 발주(USD/KRW)에 대해 KRW 컬럼을 환율로 나눠서 USD 컬럼에 계산
         # FX_NON.csv에서 환율 조회
-        rate = load_fx_non_rate(brand, period, lookup_season_code) if lookup_season_code else 0.0
+        rate = fx_non_table.get_rate(brand, period, lookup_season_code)
         
         if rate == 0:
             # FX_NON.csv에서 조회 실패 시 exchange_rates에서 조회 (fallback)
             rate_key = f"{period}_{brand}"
             rate = exchange_rates.get(rate_key, 0.0)
         
-        if rate == 0:
-            continue  # 환율이 0이면 변환하지 않음
-        
-        # 모든 발주에 대해 SQL에서 계산된 USD 단가 컬럼을 먼저 0으로 초기화
-        for usd_col in krw_to_usd_mapping.values():
-            if usd_col in df_result.columns:
-                df_result.at[idx, usd_col] = 0.0
-        
-        # KRW 값을 USD로 변환 (모든 발주에 대해)
-        for krw_col, usd_col in krw_to_usd_mapping.items():
-            if krw_col in df_result.columns and usd_col in df_result.columns:
-                krw_value = pd.to_numeric(row[krw_col], errors='coerce')
-                if pd.notna(krw_value) and krw_value != 0:
-                    usd_value = krw_value / rate
-                    df_result.at[idx, usd_col] = usd_value
-        
-        # 모든 발주에 대해 SQL에서 계산된 USD 총금액 컬럼을 먼저 0으로 초기화
-        for usd_col in krw_total_to_usd_mapping.values():
+        pair_rates[(period, brand)] = rate
+    
+    rates = np.array([pair_rates[key] for key in zip(periods, brands)], dtype=float)
+    
+    # 환율이 0이면 변환하지 않음
+    rate_mask = rates != 0
+    if not rate_mask.any():
+        return df_result
+    
+    # 모든 발주(USD/KRW)에 대해 KRW 컬럼을 환율로 나눠서 USD 컬럼에 계산 (단가 → 총금액 순)
+    for mapping in [krw_to_usd_mapping, krw_total_to_usd_mapping]:
+        # SQL에서 계산된 USD 컬럼을 먼저 0으로 초기화
+        for usd_col in mapping.values():
             if usd_col in df_result.columns:
-                df_result.at[idx, usd_col] = 0.0
+                if pd.api.types.is_integer_dtype(df_result[usd_col]):
+                    df_result[usd_col] = df_result[usd_col].astype(float)
+                df_result.loc[rate_mask, usd_col] = 0.0
         
-        # 총금액도 변환 (모든 발주에 대해)
-        for krw_col, usd_col in krw_total_to_usd_mapping.items():
+        # KRW 값을 USD로 변환
+        for krw_col, usd_col in mapping.items():
             if krw_col in df_result.columns and usd_col in df_result.columns:
-                krw_value = pd.to_numeric(row[krw_col], errors='coerce')
-                if pd.notna(krw_value) and krw_value != 0:
-                    usd_value = krw_value / rate
-                    df_result.at[idx, usd_col] = usd_value
-        
+                krw_values = pd.to_numeric(df_result[krw_col], errors='coerce').to_numpy(dtype=float)
+                convert_mask = rate_mask & ~np.isnan(krw_values) & (krw_values != 0)
+                if convert_mask.any():
+                    df_result.loc[convert_mask, usd_col] = krw_values[convert_mask] / rates[convert_mask]
     
     return df_result
 
@@ -699,20 +618,21 @@ def map_to_m24s_format(df: pd.DataFrame, season: str, exchange_rates: Dict[str,
     # TAG_USD금액(전년환율) 계산 - FX_NON.csv에서 전년환율 사용
     df_result['TAG_USD금액(전년환율)'] = 0.0
     
-    for idx, row in df_result.iterrows():
-        brand = row['브랜드']
-        
-        # FX_NON.csv에서 전년환율 조회 (당년 시즌의 전년환율)
-        prev_rate = load_fx_non_prev_rate(brand, fx_season_code) if fx_season_code else 0.0
-        
-        if prev_rate > 0:
-            tag_krw = pd.to_numeric(row['TAG'], errors='coerce')
-            if pd.notna(tag_krw) and tag_krw > 0:
-                qty = pd.to_numeric(row['수량'], errors='coerce')
-                if pd.notna(qty) and qty > 0:
-                    tag_total_krw = tag_krw * qty
-                    tag_usd = tag_total_krw / prev_rate
-                    df_result.at[idx, 'TAG_USD금액(전년환율)'] = tag_usd
+    # 브랜드별 전년환율은 한 번만 조회 (당년 시즌의 전년환율)
+    brands = df_result['브랜드'].to_numpy(dtype=object)
+    brand_prev_rates = {
+        brand: load_fx_non_prev_rate(brand, fx_season_code) if fx_season_code else 0.0
+        for brand in set(brands)
+    }
+    prev_rates = np.array([brand_prev_rates[brand] for brand in brands], dtype=float)
+    
+    tag_krw = pd.to_numeric(df_result['TAG'], errors='coerce').to_numpy(dtype=float)
+    qty = pd.to_numeric(df_result['수량'], errors='coerce').to_numpy(dtype=float)
+    
+    # 환율/TAG/수량이 모두 0보다 큰 행만 계산 (NaN은 비교 결과 False)
+    tag_mask = (prev_rates > 0) & (tag_krw > 0) & (qty > 0)
+    if tag_mask.any():
+        df_result.loc[tag_mask, 'TAG_USD금액(전년환율)'] = tag_krw[tag_mask] * qty[tag_mask] / prev_rates[tag_mask]
     
     # M_25F.csv 컬럼 순서 정의 (합의납기일 추가, 입고 관련 컬럼 제거)
     base_columns = [
@@ -811,21 +731,25 @@ def save_csv_by_brand(df: pd.DataFrame, season: str, output_dir: str):
         filename = f"{brand}_{file_season}_NON.csv"
         output_path = os.path.join(output_dir, filename)
         
-        # CSV 저장
-        df_brand.to_csv(output_path, index=False, encoding='utf-8-sig')
-        print(f"[OK] {output_path} 저장 완료 ({len(df_brand)}행)")
+        # CSV 저장 (내용이 같으면 기존 파일 유지)
+        changed = write_csv(df_brand, output_path)
+        sync_parquet(output_path)
+        print(f"[OK] {output_path} {write_label(changed)} ({len(df_brand)}행)")
 
 
 # ============================================
 # 메인 함수
 # ============================================
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     메인 실행 함수
     """
     parser = argparse.ArgumentParser(description='MLB Non 시즌 CSV 생성')
     parser.add_argument('--season', type=str, required=True, help='시즌 코드 (예: 25FW, 26SS)')
-    args = parser.parse_args()
+    parser.add_argument('--refresh', action='store_true', help='NON 공용 추출 캐시를 무시하고 다시 조회')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'동시에 실행할 Snowflake 쿼리 수 (기본: {DEFAULT_MAX_WORKERS})')
+    args = parser.parse_args(argv)
     
     season = args.season
     print(f"\n[INFO] MLB Non 시즌 CSV 생성 시작: {season}")
@@ -842,48 +766,44 @@ def main():
         sys.exit(1)
     
     try:
-        # 브랜드별로 데이터 추출 및 저장
-        for brand in ['M', 'I', 'X']:
-            print(f"\n[INFO] {brand} 브랜드 데이터 추출 중...")
-            
-            # SQL 쿼리 생성
-            sql_query = build_sql_query(prev_start, prev_end, curr_start, curr_end)
-            
-            # 쿼리 실행
-            df = execute_query(conn, sql_query)
-            
-            if len(df) == 0:
-                print(f"[WARN] {brand} 브랜드 데이터가 없습니다.")
-                # 빈 CSV 파일 생성
-                output_dir = os.path.join('public', 'COST RAW', season.replace('FW', 'FW').replace('SS', 'SS'))
-                os.makedirs(output_dir, exist_ok=True)
-                season_upper = season.upper()
-                if 'FW' in season_upper or (season_upper.endswith('F') and len(season) == 3):
-                    file_season = season_upper.replace('FW', 'F')
-                elif 'SS' in season_upper or (season_upper.endswith('S') and len(season) == 3):
-                    file_season = season_upper.replace('SS', 'S')
-                else:
-                    file_season = season_upper
-                filename = f"{brand}_{file_season}_NON.csv"
-                filepath = os.path.join(output_dir, filename)
-                empty_df = pd.DataFrame()
-                empty_df.to_csv(filepath, index=False, encoding='utf-8-sig', lineterminator='\n')
+        # NON 공용 추출(generate_fx_non_csv.py와 공유)에서 합의납기일 기준으로 기간 구분
+        # 쿼리 결과에 M/I/X가 모두 들어 있으므로 한 번만 처리하고 브랜드별로 나눠 저장
+        extract = load_non_extract(conn, [season], refresh=args.refresh,
+                                   connect=connect_to_database, max_workers=args.max_concurrency)
+        df = derive_delivery_period_frame(extract, prev_start, prev_end, curr_start, curr_end)
+        print(f"[OK] 데이터 추출 완료: {len(df)}행")
+        
+        output_dir = os.path.join('public', 'COST RAW', season)
+        
+        if len(df) == 0:
+            # 빈 CSV 파일 생성
+            os.makedirs(output_dir, exist_ok=True)
+            season_upper = season.upper()
+            if 'FW' in season_upper or (season_upper.endswith('F') and len(season) == 3):
+                file_season = season_upper.replace('FW', 'F')
+            elif 'SS' in season_upper or (season_upper.endswith('S') and len(season) == 3):
+                file_season = season_upper.replace('SS', 'S')
+            else:
+                file_season = season_upper
+            for brand in ['M', 'I', 'X']:
+                filepath = os.path.join(output_dir, f"{brand}_{file_season}_NON.csv")
+                write_csv(pd.DataFrame(), filepath, lineterminator='\n')
+                sync_parquet(filepath)  # 이전 Parquet 제거
                 print(f"[WARN] 브랜드 {brand}에 대한 데이터가 없습니다. 빈 파일 생성: {filepath}")
-                continue
-            
-            # 환율 계산
-            exchange_rates = calculate_exchange_rates(df, season)
-            print(f"[INFO] 환율 계산 완료: {exchange_rates}")
-            
-            # 환율 적용 (KRW 발주는 FX_NON.csv에서 환율 조회)
-            df = apply_exchange_rates(df, exchange_rates, season)
-            
-            # CSV 형식으로 변환
-            df = map_to_m24s_format(df, season, exchange_rates)
-            
-            # CSV 저장
-            output_dir = os.path.join('public', 'COST RAW', season.replace('FW', 'FW').replace('SS', 'SS'))
-            save_csv_by_brand(df, season, output_dir)
+            return
+        
+        # 환율 계산
+        exchange_rates = calculate_exchange_rates(df, season)
+        print(f"[INFO] 환율 계산 완료: {exchange_rates}")
+        
+        # 환율 적용 (KRW 발주는 FX_NON.csv에서 환율 조회)
+        df = apply_exchange_rates(df, exchange_rates, season)
+        
+        # CSV 형식으로 변환
+        df = map_to_m24s_format(df, season, exchange_rates)
+        
+        # CSV 저장
+        save_csv_by_brand(df, season, output_dir)
         
         print("\n[OK] 모든 작업 완료!")
         
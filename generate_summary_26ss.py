@@ -4,6 +4,8 @@
 F&F 원가 대시보드 - Summary JSON 생성 스크립트 (26SS용)
 
 사용 방법:
+    python generate_summary_26ss.py --season 26SS --brand M I X ST V
+    python generate_summary_26ss.py --season 25FW 25SS 26SS --brand M I X ST V --jobs 8
     python generate_summary_26ss.py --brand M
     python generate_summary_26ss.py --brand I
     python generate_summary_26ss.py --brand X
@@ -23,10 +25,24 @@ summary_26ss_{brand}.json 파일을 생성합니다.
 """
 
 import pandas as pd
-import json
+import contextlib
+import io
 import argparse
 import os
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from artifact_writer import write_json
+from fx_rates import load_fx_frame
+from kpi_engine import kpi_table, summary_from_table
+from run_metrics import record_file
+from cost_schema import (
+    COL_CATEGORY, COL_KRW_ARTWORK, COL_KRW_EXPENSE, COL_KRW_HQ_SUPPLY, COL_KRW_LABOR,
+    COL_KRW_MARGIN, COL_KRW_MATERIAL, COL_KRW_SUB_MATERIAL, COL_KRW_TAG_LABEL, COL_QTY,
+    COL_SEASON, COL_TAG, COL_TAG_USD, COL_USD_ARTWORK_TOTAL, COL_USD_EXPENSE_TOTAL,
+    COL_USD_LABOR_TOTAL, COL_USD_MARGIN_TOTAL, COL_USD_MATERIAL_TOTAL, SUMMARY_COLUMNS,
+    merge_acc_categories, normalize_season_column, read_cost_frame,
+)
 
 # 카테고리 순서 (중분류 통합 후: SHOES/BAG/HEADWEAR → Acc_etc)
 CATEGORY_ORDER = ['Outer', 'Inner', 'Bottom', 'Acc_etc', 'Wear_etc']
@@ -47,74 +63,8 @@ def normalize_season_for_filename(season: str) -> str:
 # FX 파일 경로
 FX_FILE = 'public/COST RAW/FX.csv'
 
-# 카테고리 → FX 카테고리 매핑
-def map_category_to_fx_category(category: str) -> str:
-    """중분류 카테고리를 의류/슈즈/용품으로 매핑"""
-    category_upper = category.strip().upper()
-    
-    # 의류: Outer, Inner, Bottom, Wear_etc
-    if category_upper in ['OUTER', 'INNER', 'BOTTOM', 'WEAR_ETC']:
-        return '의류'
-    
-    # 슈즈: Shoes
-    if category_upper == 'SHOES':
-        return '슈즈'
-    
-    # 용품: Bag, Headwear, Acc_etc
-    if category_upper in ['BAG', 'HEADWEAR', 'ACC_ETC']:
-        return '용품'
-    
-    # 기본값: 의류
-    return '의류'
-
-# FX.csv에서 환율 조회
-def get_exchange_rate(df_fx: pd.DataFrame, brand_code: str, season_code: str, category: str = None) -> float:
-    """
-    FX.csv에서 특정 브랜드/시즌/카테고리의 환율 조회
-    
-    Args:
-        df_fx: FX.csv DataFrame
-        brand_code: 브랜드 코드 (M, I, X, V, ST)
-        season_code: 시즌 코드 (26S, 25S, 24S 등)
-        category: 중분류 카테고리 (선택사항)
-    
-    Returns:
-        환율 값 (float)
-    """
-    if df_fx is None or df_fx.empty:
-        print(f"[WARN] FX 데이터가 없습니다. 기본 환율 1300.0 사용")
-        return 1300.0
-    
-    # 카테고리 매핑
-    fx_category = map_category_to_fx_category(category) if category else '의류'
-    
-    # FX.csv에서 해당 브랜드, 시즌, 카테고리의 환율 찾기
-    filtered = df_fx[
-        (df_fx['브랜드'] == brand_code) &
-        (df_fx['시즌'] == season_code) &
-        (df_fx['카테고리'] == fx_category)
-    ]
-    
-    if len(filtered) > 0:
-        rate = float(filtered.iloc[0]['환율'])
-        if rate > 0:  # 0인 경우 제외
-            return rate
-    
-    # 기본값: 의류 환율 사용
-    if category and fx_category != '의류':
-        default = df_fx[
-            (df_fx['브랜드'] == brand_code) &
-            (df_fx['시즌'] == season_code) &
-            (df_fx['카테고리'] == '의류')
-        ]
-        if len(default) > 0:
-            rate = float(default.iloc[0]['환율'])
-            if rate > 0:
-                return rate
-    
-    # 최종 기본값
-    print(f"[WARN] 환율을 찾을 수 없습니다. 브랜드={brand_code}, 시즌={season_code}, 카테고리={fx_category}. 기본값 1300.0 사용")
-    return 1300.0
+# 결과에 영향을 주는 코드 파일 (바뀌면 증분 생성에서 다시 생성)
+SOURCE_FILES = ['generate_summary_26ss.py', 'cost_schema.py', 'cost_raw_store.py', 'fx_rates.py', 'kpi_engine.py']
 
 # 전시즌 코드 계산
 def get_previous_season(season: str) -> str:
@@ -133,413 +83,162 @@ def get_previous_season(season: str) -> str:
     }
     return season_map.get(season, '')
 
-# 시즌 코드 변환 (26SS → 26S, 25SS → 25S)
-def convert_season_format(season: str) -> str:
-    """시즌 형식 변환"""
-    if season.endswith('SS'):
-        return season.replace('SS', 'S')
-    if season.endswith('FW'):
-        return season.replace('FW', 'F')
-    return season
-
-def calculate_season_kpi(
-    df_season: pd.DataFrame,
-    season: str,
-    currency: str,
-    df_fx: pd.DataFrame,
-    brand_code: str,
-    current_season_code: str
-) -> Dict[str, float]:
+def kpi_measures(df: pd.DataFrame) -> pd.DataFrame:
     """
-    시즌별 KPI 계산
-    
-    Args:
-        df_season: 시즌별 데이터프레임
-        season: 시즌명 (전년, 당년)
-        currency: 통화 (USD, KRW)
-        df_fx: FX.csv DataFrame
-        brand_code: 브랜드 코드
-        current_season_code: 현재 시즌 코드 (26S, 25S 등)
+    행 단위 수량 가중 금액 (kpi_engine 측정값)
     
-    Returns:
-        KPI 딕셔너리
+    - TAG (USD): sql_to_csv_with_fx.py에서 분석기간 기준 환율로 계산된 TAG_USD금액(전년환율) 컬럼
+    - 원가 (USD): USD 총금액 컬럼 직접 사용
+    - 원가 (KRW): 단가 × 수량, 원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨
     """
-    if len(df_season) == 0:
-        return {
-            f'qty_{season}': 0,
-            f'avgTag_{season}': 0,
-            f'avgCost_{season}': 0,
-            f'costRate_{season}': 0,
-            f'material_{season}': 0,
-            f'artwork_{season}': 0,
-            f'labor_{season}': 0,
-            f'margin_{season}': 0,
-            f'expense_{season}': 0,
-            f'materialRate_{season}': 0,
-            f'artworkRate_{season}': 0,
-            f'laborRate_{season}': 0,
-            f'marginRate_{season}': 0,
-            f'expenseRate_{season}': 0,
-        }
-    
-    qty = df_season.iloc[:, 7].sum()  # 수량
-    
-    if currency == 'USD':
-        # TAG (USD) - CSV에 이미 계산된 TAG_USD금액(전년환율) 컬럼 사용
-        # 컬럼 9: TAG_USD금액(전년환율) - sql_to_csv_with_fx.py에서 분석기간 기준 환율로 계산됨
-        tag_total = 0
-        for idx, row in df_season.iterrows():
-            tag_usd = pd.to_numeric(row.iloc[9], errors='coerce') or 0  # TAG_USD금액(전년환율)
-            tag_total += tag_usd
-        
-        avg_tag = tag_total / qty if qty > 0 else 0
-        
-        # 원가 항목 계산 (USD 총금액 컬럼 직접 사용)
-        # 컬럼 30: USD_재료계(원/부/택/본공)_총금액(단가×수량)
-        # 컬럼 31: USD_아트웍_총금액(단가×수량)
-        # 컬럼 32: USD_공임_총금액(단가×수량)
-        # 컬럼 33: USD_정상마진_총금액(단가×수량)
-        # 컬럼 34: USD_경비_총금액(단가×수량)
-        material_total = df_season.iloc[:, 30].astype(float).sum()  # USD_재료계 총금액
-        artwork_total = df_season.iloc[:, 31].astype(float).sum()   # USD_아트웍 총금액
-        labor_total = df_season.iloc[:, 32].astype(float).sum()     # USD_공임 총금액
-        margin_total = df_season.iloc[:, 33].astype(float).sum()    # USD_정상마진 총금액
-        expense_total = df_season.iloc[:, 34].astype(float).sum()  # USD_경비 총금액
-        
-        material = material_total / qty if qty > 0 else 0
-        artwork = artwork_total / qty if qty > 0 else 0
-        labor = labor_total / qty if qty > 0 else 0
-        margin = margin_total / qty if qty > 0 else 0
-        expense = expense_total / qty if qty > 0 else 0
-        
-    else:  # KRW
-        # TAG (KRW)
-        tag_total = (df_season.iloc[:, 6] * df_season.iloc[:, 7]).sum()
-        avg_tag = tag_total / qty if qty > 0 else 0
-        
-        # 원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨
-        mat_total = (df_season.iloc[:, 22] * df_season.iloc[:, 7]).sum()
-        sub_total = (df_season.iloc[:, 24] * df_season.iloc[:, 7]).sum()
-        hq_total = (df_season.iloc[:, 27] * df_season.iloc[:, 7]).sum()
-        tag_label_total = (df_season.iloc[:, 25] * df_season.iloc[:, 7]).sum()
-        material = (mat_total + sub_total + hq_total + tag_label_total) / qty if qty > 0 else 0
-        
-        # 아트웍
-        art_total = (df_season.iloc[:, 23] * df_season.iloc[:, 7]).sum()
-        artwork = art_total / qty if qty > 0 else 0
-        
-        # 공임
-        labor_total = (df_season.iloc[:, 26] * df_season.iloc[:, 7]).sum()
-        labor = labor_total / qty if qty > 0 else 0
-        
-        # 마진
-        margin_total = (df_season.iloc[:, 28] * df_season.iloc[:, 7]).sum()
-        margin = margin_total / qty if qty > 0 else 0
-        
-        # 경비
-        expense_total = (df_season.iloc[:, 29] * df_season.iloc[:, 7]).sum()
-        expense = expense_total / qty if qty > 0 else 0
-    
-    # 총 원가
-    avg_cost = material + artwork + labor + margin + expense
-    
-    # 원가율 = (평균원가 ÷ (평균TAG / 1.1)) × 100
-    cost_rate = (avg_cost / (avg_tag / 1.1)) * 100 if avg_tag > 0 else 0
-    
-    # 항목별 원가율
-    tag_excl_vat = avg_tag / 1.1 if avg_tag > 0 else 0
-    material_rate = (material / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    artwork_rate = (artwork / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    labor_rate = (labor / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    margin_rate = (margin / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    expense_rate = (expense / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    
-    return {
-        f'qty_{season}': int(qty),
-        f'avgTag_{season}': round(avg_tag, 2),
-        f'avgCost_{season}': round(avg_cost, 2),
-        f'costRate_{season}': round(cost_rate, 1),
-        f'material_{season}': round(material, 2),
-        f'artwork_{season}': round(artwork, 2),
-        f'labor_{season}': round(labor, 2),
-        f'margin_{season}': round(margin, 2),
-        f'expense_{season}': round(expense, 2),
-        f'materialRate_{season}': round(material_rate, 1),
-        f'artworkRate_{season}': round(artwork_rate, 1),
-        f'laborRate_{season}': round(labor_rate, 1),
-        f'marginRate_{season}': round(margin_rate, 1),
-        f'expenseRate_{season}': round(expense_rate, 1),
-    }
+    qty = df[COL_QTY]
+    return pd.DataFrame({
+        'qty': qty,
+        'usd_tag': df[COL_TAG_USD],
+        'usd_material': df[COL_USD_MATERIAL_TOTAL],
+        'usd_artwork': df[COL_USD_ARTWORK_TOTAL],
+        'usd_labor': df[COL_USD_LABOR_TOTAL],
+        'usd_margin': df[COL_USD_MARGIN_TOTAL],
+        'usd_expense': df[COL_USD_EXPENSE_TOTAL],
+        'krw_tag': df[COL_TAG] * qty,
+        'krw_material.원자재': df[COL_KRW_MATERIAL] * qty,
+        'krw_material.부자재': df[COL_KRW_SUB_MATERIAL] * qty,
+        'krw_material.본사공급자재': df[COL_KRW_HQ_SUPPLY] * qty,
+        'krw_material.택/라벨': df[COL_KRW_TAG_LABEL] * qty,
+        'krw_artwork': df[COL_KRW_ARTWORK] * qty,
+        'krw_labor': df[COL_KRW_LABOR] * qty,
+        'krw_margin': df[COL_KRW_MARGIN] * qty,
+        'krw_expense': df[COL_KRW_EXPENSE] * qty,
+    })
 
-def calculate_total_stats(df: pd.DataFrame, df_fx: pd.DataFrame, brand_code: str, current_season_code: str, prev_season_code: str) -> Dict[str, Any]:
-    """전체 통계 계산"""
-    # 전년/당년 시즌 필터링 (동적)
-    # 시즌 형식 변환 (25SS → 25S, 26SS → 26S)
-    def normalize_season(season_str):
-        if pd.isna(season_str):
-            return ''
-        s = str(season_str).strip().upper()
-        if s.endswith('SS'):
-            return s[:-1]  # 25SS → 25S
-        if s.endswith('FW'):
-            return s[:-1]  # 25FW → 25F
-        return s
-    
-    # 전년 시즌 필터 (24S, 25S 등) - SS/S, FW/F 모두 포함
-    # normalize_season이 '25SS' → '25S', '25S' → '25S'로 변환하므로
-    # prev_season_variants에는 정규화된 값만 포함
-    prev_season_variants = [prev_season_code]
-    # normalize_season 결과와 매칭되므로 추가 변형 불필요
-    
-    # 당년 시즌 필터 (25S, 26S 등) - SS/S, FW/F 모두 포함
-    # normalize_season이 '26SS' → '26S', '26S' → '26S'로 변환하므로
-    # curr_season_variants에는 정규화된 값과 원본 값 모두 포함
-    curr_season_variants = [current_season_code]
-    if current_season_code.endswith('S'):
-        # '26S'인 경우: '26S', '26SS' 모두 매칭되도록
-        # normalize_season이 '26SS' → '26S', '26S' → '26S'로 변환하므로
-        # '26S'만 포함하면 됨 (normalize_season 결과와 매칭)
-        pass  # current_season_code가 이미 '26S' 형식이므로 추가 변형 불필요
-    elif current_season_code.endswith('F'):
-        # '26F'인 경우: '26F', '26FW' 모두 매칭되도록
-        pass  # current_season_code가 이미 '26F' 형식이므로 추가 변형 불필요
-    
-    # 시즌 컬럼을 문자열로 변환하고 정규화
-    df_season_normalized = df.iloc[:, 1].astype(str).apply(normalize_season)
-    
-    # 디버깅: 필터링 전 데이터 확인
-    print(f"   [DEBUG] 필터링 전 전체 데이터 행 수: {len(df)}")
-    print(f"   [DEBUG] 필터링 전 시즌 고유 값: {df.iloc[:, 1].unique()}")
-    print(f"   [DEBUG] 필터링 전 정규화된 시즌 고유 값: {df_season_normalized.unique()}")
-    
-    # 필터링 적용
-    df_prev = df[df_season_normalized.isin(prev_season_variants)]
-    df_curr = df[df_season_normalized.isin(curr_season_variants)]
-    
-    # 디버깅: 필터링 결과 확인
-    print(f"   [DEBUG] 전년 시즌 필터: {prev_season_code} -> variants: {prev_season_variants}")
-    print(f"   [DEBUG] 전년 데이터 행 수: {len(df_prev)}")
-    if len(df_prev) > 0:
-        print(f"   [DEBUG] 전년 시즌 샘플 값: {df_prev.iloc[:, 1].unique()[:5]}")
-    print(f"   [DEBUG] 당년 시즌 필터: {current_season_code} -> variants: {curr_season_variants}")
-    print(f"   [DEBUG] 당년 데이터 행 수: {len(df_curr)}")
-    if len(df_curr) > 0:
-        print(f"   [DEBUG] 당년 시즌 샘플 값: {df_curr.iloc[:, 1].unique()[:5]}")
-    else:
-        # 필터링 실패 원인 분석
-        print(f"   [DEBUG] 원본 시즌 고유 값: {df.iloc[:, 1].unique()}")
-        print(f"   [DEBUG] 정규화된 시즌 고유 값: {df_season_normalized.unique()}")
-        print(f"   [DEBUG] 매칭 시도 variants: {curr_season_variants}")
-    
-    # 수량 계산
-    qty_prev = df_prev.iloc[:, 7].sum()
-    qty_curr = df_curr.iloc[:, 7].sum()
-    qty_yoy = (qty_curr / qty_prev) * 100 if qty_prev > 0 else 0
-    
-    # USD 기준
-    kpi_prev_usd = calculate_season_kpi(df_prev, '전년', 'USD', df_fx, brand_code, prev_season_code)
-    kpi_curr_usd = calculate_season_kpi(df_curr, '당년', 'USD', df_fx, brand_code, current_season_code)
-    
-    # KRW 기준
-    kpi_prev_krw = calculate_season_kpi(df_prev, '전년', 'KRW', df_fx, brand_code, prev_season_code)
-    kpi_curr_krw = calculate_season_kpi(df_curr, '당년', 'KRW', df_fx, brand_code, current_season_code)
-    
-    # YOY 계산
-    tag_yoy_usd = (kpi_curr_usd['avgTag_당년'] / kpi_prev_usd['avgTag_전년']) * 100 if kpi_prev_usd['avgTag_전년'] > 0 else 0
-    cost_yoy_usd = (kpi_curr_usd['avgCost_당년'] / kpi_prev_usd['avgCost_전년']) * 100 if kpi_prev_usd['avgCost_전년'] > 0 else 0
-    cost_rate_change_usd = kpi_curr_usd['costRate_당년'] - kpi_prev_usd['costRate_전년']
-    
-    tag_yoy_krw = (kpi_curr_krw['avgTag_당년'] / kpi_prev_krw['avgTag_전년']) * 100 if kpi_prev_krw['avgTag_전년'] > 0 else 0
-    cost_yoy_krw = (kpi_curr_krw['avgCost_당년'] / kpi_prev_krw['avgCost_전년']) * 100 if kpi_prev_krw['avgCost_전년'] > 0 else 0
-    cost_rate_change_krw = kpi_curr_krw['costRate_당년'] - kpi_prev_krw['costRate_전년']
-    
-    return {
-        # 수량 정보
-        'qty24F': int(qty_prev),
-        'qty25F': int(qty_curr),
-        'qtyYoY': round(qty_yoy, 1),
-        # USD 기준
-        'costRate24F_usd': kpi_prev_usd['costRate_전년'],
-        'costRate25F_usd': kpi_curr_usd['costRate_당년'],
-        'costRateChange_usd': round(cost_rate_change_usd, 1),
-        'avgTag24F_usd': kpi_prev_usd['avgTag_전년'],
-        'avgTag25F_usd': kpi_curr_usd['avgTag_당년'],
-        'tagYoY_usd': round(tag_yoy_usd, 1),
-        'avgCost24F_usd': kpi_prev_usd['avgCost_전년'],
-        'avgCost25F_usd': kpi_curr_usd['avgCost_당년'],
-        'costYoY_usd': round(cost_yoy_usd, 1),
-        'material24F_usd': kpi_prev_usd['material_전년'],
-        'material25F_usd': kpi_curr_usd['material_당년'],
-        'artwork24F_usd': kpi_prev_usd['artwork_전년'],
-        'artwork25F_usd': kpi_curr_usd['artwork_당년'],
-        'labor24F_usd': kpi_prev_usd['labor_전년'],
-        'labor25F_usd': kpi_curr_usd['labor_당년'],
-        'margin24F_usd': kpi_prev_usd['margin_전년'],
-        'margin25F_usd': kpi_curr_usd['margin_당년'],
-        'expense24F_usd': kpi_prev_usd['expense_전년'],
-        'expense25F_usd': kpi_curr_usd['expense_당년'],
-        'materialRate24F_usd': kpi_prev_usd['materialRate_전년'],
-        'materialRate25F_usd': kpi_curr_usd['materialRate_당년'],
-        'artworkRate24F_usd': kpi_prev_usd['artworkRate_전년'],
-        'artworkRate25F_usd': kpi_curr_usd['artworkRate_당년'],
-        'laborRate24F_usd': kpi_prev_usd['laborRate_전년'],
-        'laborRate25F_usd': kpi_curr_usd['laborRate_당년'],
-        'marginRate24F_usd': kpi_prev_usd['marginRate_전년'],
-        'marginRate25F_usd': kpi_curr_usd['marginRate_당년'],
-        'expenseRate24F_usd': kpi_prev_usd['expenseRate_전년'],
-        'expenseRate25F_usd': kpi_curr_usd['expenseRate_당년'],
-        
-        # KRW 기준
-        'costRate24F_krw': kpi_prev_krw['costRate_전년'],
-        'costRate25F_krw': kpi_curr_krw['costRate_당년'],
-        'costRateChange_krw': round(cost_rate_change_krw, 1),
-        'avgTag24F_krw': kpi_prev_krw['avgTag_전년'],
-        'avgTag25F_krw': kpi_curr_krw['avgTag_당년'],
-        'tagYoY_krw': round(tag_yoy_krw, 1),
-        'avgCost24F_krw': kpi_prev_krw['avgCost_전년'],
-        'avgCost25F_krw': kpi_curr_krw['avgCost_당년'],
-        'costYoY_krw': round(cost_yoy_krw, 1),
-    }
 
-def calculate_category_stats(df: pd.DataFrame, df_fx: pd.DataFrame, brand_code: str, current_season_code: str, prev_season_code: str) -> list:
-    """카테고리별 통계 계산"""
-    categories = []
-    
-    # 시즌 형식 변환 함수
-    def normalize_season(season_str):
-        if pd.isna(season_str):
-            return ''
-        s = str(season_str).strip().upper()
-        if s.endswith('SS'):
-            return s[:-1]  # 25SS → 25S
-        if s.endswith('FW'):
-            return s[:-1]  # 25FW → 25F
-        return s
-    
-    # 전년/당년 시즌 variants 생성
-    # normalize_season이 '25SS' → '25S', '25S' → '25S'로 변환하므로
-    # variants에는 정규화된 값만 포함
-    prev_season_variants = [prev_season_code]
-    curr_season_variants = [current_season_code]
+def calculate_summary(df: pd.DataFrame, current_season_code: str, prev_season_code: str) -> Dict[str, Any]:
+    """
+    전체 및 카테고리별 통계 계산 ((시즌, 카테고리)별 groupby 1회)
     
-    for category in CATEGORY_ORDER:
-        df_cat = df[df.iloc[:, 3] == category]
-        
-        if len(df_cat) == 0:
-            continue
-        
-        # 시즌 컬럼을 문자열로 변환하고 정규화
-        df_cat_season_normalized = df_cat.iloc[:, 1].astype(str).apply(normalize_season)
-        
-        # 전년/당년 시즌 필터링 (동적)
-        df_prev = df_cat[df_cat_season_normalized.isin(prev_season_variants)]
-        df_curr = df_cat[df_cat_season_normalized.isin(curr_season_variants)]
-        
-        # USD 기준
-        kpi_prev_usd = calculate_season_kpi(df_prev, '전년', 'USD', df_fx, brand_code, prev_season_code)
-        kpi_curr_usd = calculate_season_kpi(df_curr, '당년', 'USD', df_fx, brand_code, current_season_code)
-        
-        # KRW 기준
-        kpi_prev_krw = calculate_season_kpi(df_prev, '전년', 'KRW', df_fx, brand_code, prev_season_code)
-        kpi_curr_krw = calculate_season_kpi(df_curr, '당년', 'KRW', df_fx, brand_code, current_season_code)
-        
-        # YOY 계산
-        qty_yoy = (kpi_curr_usd['qty_당년'] / kpi_prev_usd['qty_전년']) * 100 if kpi_prev_usd['qty_전년'] > 0 else 0
-        tag_yoy_usd = (kpi_curr_usd['avgTag_당년'] / kpi_prev_usd['avgTag_전년']) * 100 if kpi_prev_usd['avgTag_전년'] > 0 else 0
-        cost_yoy_usd = (kpi_curr_usd['avgCost_당년'] / kpi_prev_usd['avgCost_전년']) * 100 if kpi_prev_usd['avgCost_전년'] > 0 else 0
-        cost_rate_change_usd = kpi_curr_usd['costRate_당년'] - kpi_prev_usd['costRate_전년']
-        
-        tag_yoy_krw = (kpi_curr_krw['avgTag_당년'] / kpi_prev_krw['avgTag_전년']) * 100 if kpi_prev_krw['avgTag_전년'] > 0 else 0
-        cost_yoy_krw = (kpi_curr_krw['avgCost_당년'] / kpi_prev_krw['avgCost_전년']) * 100 if kpi_prev_krw['avgCost_전년'] > 0 else 0
-        cost_rate_change_krw = kpi_curr_krw['costRate_당년'] - kpi_prev_krw['costRate_전년']
-        
-        categories.append({
-            'category': category,
-            'qty24F': kpi_prev_usd['qty_전년'],
-            'qty25F': kpi_curr_usd['qty_당년'],
-            'qtyYoY': round(qty_yoy, 1),
-            
-            # USD 기준
-            'costRate24F_usd': kpi_prev_usd['costRate_전년'],
-            'costRate25F_usd': kpi_curr_usd['costRate_당년'],
-            'costRateChange_usd': round(cost_rate_change_usd, 1),
-            'avgTag24F_usd': kpi_prev_usd['avgTag_전년'],
-            'avgTag25F_usd': kpi_curr_usd['avgTag_당년'],
-            'tagYoY_usd': round(tag_yoy_usd, 1),
-            'avgCost24F_usd': kpi_prev_usd['avgCost_전년'],
-            'avgCost25F_usd': kpi_curr_usd['avgCost_당년'],
-            'costYoY_usd': round(cost_yoy_usd, 1),
-            'material24F_usd': kpi_prev_usd['material_전년'],
-            'material25F_usd': kpi_curr_usd['material_당년'],
-            'artwork24F_usd': kpi_prev_usd['artwork_전년'],
-            'artwork25F_usd': kpi_curr_usd['artwork_당년'],
-            'labor24F_usd': kpi_prev_usd['labor_전년'],
-            'labor25F_usd': kpi_curr_usd['labor_당년'],
-            'margin24F_usd': kpi_prev_usd['margin_전년'],
-            'margin25F_usd': kpi_curr_usd['margin_당년'],
-            'expense24F_usd': kpi_prev_usd['expense_전년'],
-            'expense25F_usd': kpi_curr_usd['expense_당년'],
-            'materialRate24F_usd': kpi_prev_usd['materialRate_전년'],
-            'materialRate25F_usd': kpi_curr_usd['materialRate_당년'],
-            'artworkRate24F_usd': kpi_prev_usd['artworkRate_전년'],
-            'artworkRate25F_usd': kpi_curr_usd['artworkRate_당년'],
-            'laborRate24F_usd': kpi_prev_usd['laborRate_전년'],
-            'laborRate25F_usd': kpi_curr_usd['laborRate_당년'],
-            'marginRate24F_usd': kpi_prev_usd['marginRate_전년'],
-            'marginRate25F_usd': kpi_curr_usd['marginRate_당년'],
-            'expenseRate24F_usd': kpi_prev_usd['expenseRate_전년'],
-            'expenseRate25F_usd': kpi_curr_usd['expenseRate_당년'],
-            
-            # KRW 기준
-            'costRate24F_krw': kpi_prev_krw['costRate_전년'],
-            'costRate25F_krw': kpi_curr_krw['costRate_당년'],
-            'costRateChange_krw': round(cost_rate_change_krw, 1),
-            'avgTag24F_krw': kpi_prev_krw['avgTag_전년'],
-            'avgTag25F_krw': kpi_curr_krw['avgTag_당년'],
-            'tagYoY_krw': round(tag_yoy_krw, 1),
-            'avgCost24F_krw': kpi_prev_krw['avgCost_전년'],
-            'avgCost25F_krw': kpi_curr_krw['avgCost_당년'],
-            'costYoY_krw': round(cost_yoy_krw, 1),
-        })
+    시즌 컬럼은 정규화(25SS → 25S)한 값으로 전년(prev_season_code)/당년(current_season_code)을 구분합니다.
+    """
+    df_season_normalized = normalize_season_column(df[COL_SEASON])
+    
+    # 디버깅: 시즌 필터 확인
+    season_counts = df_season_normalized.value_counts()
+    print(f"   [DEBUG] 전체 데이터 행 수: {len(df)}")
+    print(f"   [DEBUG] 시즌 고유 값: {df[COL_SEASON].unique()}")
+    print(f"   [DEBUG] 정규화된 시즌 고유 값: {df_season_normalized.unique()}")
+    print(f"   [DEBUG] 전년 시즌 {prev_season_code} 데이터 행 수: {season_counts.get(prev_season_code, 0)}")
+    print(f"   [DEBUG] 당년 시즌 {current_season_code} 데이터 행 수: {season_counts.get(current_season_code, 0)}")
+    
+    table = kpi_table(kpi_measures(df), df_season_normalized, df[COL_CATEGORY])
+    return summary_from_table(table, prev_season_code, current_season_code, CATEGORY_ORDER)
+
+def resolve_season(season: str) -> Tuple[str, str, str]:
+    """시즌 코드 → (시즌 폴더, 파일용 시즌 코드, 전년 시즌 코드)"""
+    season = season.upper()
+    if season in ['26SS', '26S']:
+        return '26SS', '26S', '25S'
+    elif season in ['25SS', '25S']:
+        return '25S', '25S', '24S'
+    elif season in ['24SS', '24S']:
+        return '24S', '24S', '23S'
+    elif season in ['26FW', '26F']:
+        return '26FW', '26F', '25F'
+    elif season in ['25FW', '25F']:
+        return '25FW', '25F', '24F'
+    return season, season, get_previous_season(season)
+
+
+def summary_targets(season: str, brand_code: str) -> Tuple[List[str], List[str]]:
+    """
+    브랜드 Summary JSON의 (입력 파일, 출력 파일) 목록 (build_manifest 증분 생성용)
     
-    return categories
+    입력에는 원가 CSV, FX.csv와 결과에 영향을 주는 코드 파일이 포함됩니다.
+    X 브랜드는 DISCOVERY/DISCOVERY-KIDS 두 파일을 만듭니다.
+    """
+    season = season.upper()
+    season_folder, season_code, _ = resolve_season(season)
+    base_dir = f'public/COST RAW/{season_folder}'
+    output_prefix = f'{base_dir}/summary_{normalize_season_for_filename(season)}_{brand_code.lower()}'
+    
+    inputs = [f'{base_dir}/{brand_code}_{season_code}.csv']
+    outputs = [f'{output_prefix}.json']
+    if brand_code == 'X':
+        inputs.append(f'{base_dir}/X_{season_code}_kids.csv')
+        outputs.append(f'{output_prefix}_kids.json')
+    
+    code_dir = os.path.dirname(os.path.abspath(__file__))
+    code_files = [os.path.join(code_dir, name) for name in SOURCE_FILES]
+    return inputs + [FX_FILE] + code_files, outputs
 
-def main():
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description='Summary JSON 생성 스크립트')
-    parser.add_argument('--season', type=str, required=True, 
-                       help='시즌 코드 (예: 26SS, 25S, 24S)')
+    parser.add_argument('--season', type=str, nargs='+', required=True, 
+                       help='시즌 코드 리스트 (예: 26SS, 25S 25FW 26SS)')
     parser.add_argument('--brand', type=str, nargs='+', required=True, choices=['M', 'I', 'X', 'ST', 'V'],
                        help='브랜드 코드 리스트 (예: M I X ST V)')
-    args = parser.parse_args()
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='동시에 처리할 (시즌, 브랜드) 프로세스 수 (기본: 1, 0이면 CPU 코어 수)')
+    args = parser.parse_args(argv)
     
-    season = args.season.upper()
     brands = args.brand if isinstance(args.brand, list) else [args.brand]
+    seasons = args.season if isinstance(args.season, list) else [args.season]
+    generate_summaries(seasons, brands, jobs=args.jobs)
+
+
+def generate_summaries(seasons: List[str], brands: List[str], jobs: int = 1):
+    """
+    여러 시즌/브랜드 Summary JSON 생성
     
-    # 시즌 폴더명 결정
-    if season in ['26SS', '26S']:
-        season_folder = '26SS'
-        season_code = '26S'
-        prev_season_code = '25S'
-    elif season in ['25SS', '25S']:
-        season_folder = '25S'
-        season_code = '25S'
-        prev_season_code = '24S'
-    elif season in ['24SS', '24S']:
-        season_folder = '24S'
-        season_code = '24S'
-        prev_season_code = '23S'
-    elif season in ['26FW', '26F']:
-        season_folder = '26FW'
-        season_code = '26F'
-        prev_season_code = '25F'
-    elif season in ['25FW', '25F']:
-        season_folder = '25FW'
-        season_code = '25F'
-        prev_season_code = '24F'
-    else:
-        season_folder = season
-        season_code = season
-        prev_season_code = get_previous_season(season_code)
+    jobs가 2 이상이면 (시즌, 브랜드) 단위를 프로세스 풀에 나눠 실행합니다.
+    FX.csv는 부모 프로세스에서 한 번 읽어 워커 초기화 때 전달하고,
+    각 단위의 출력은 모아 두었다가 직렬 실행과 같은 (시즌, 브랜드) 순서로 출력합니다.
+    단위마다 출력 JSON 파일이 달라 결과 파일은 직렬 실행과 같습니다.
+    """
+    if not os.path.exists(FX_FILE):
+        print(f"\n[ERROR] {FX_FILE} 파일이 없습니다.")
+        return
+    df_fx = load_fx_frame(FX_FILE)
+    
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    units = [(season, brand_code) for season in seasons for brand_code in brands]
+    if jobs <= 1 or len(units) <= 1:
+        for season in seasons:
+            generate_summary(season, brands, df_fx)
+        return
+    
+    print(f"[INFO] {len(units)}개 (시즌, 브랜드) 단위를 프로세스 {min(jobs, len(units))}개로 처리")
+    with ProcessPoolExecutor(max_workers=min(jobs, len(units)),
+                             initializer=_init_worker, initargs=(df_fx,)) as executor:
+        for output in executor.map(_generate_unit, units):
+            print(output, end='')
+
+
+# 워커 프로세스에서 공유하는 FX DataFrame (_init_worker에서 설정)
+_WORKER_FX: Optional[pd.DataFrame] = None
+
+
+def _init_worker(df_fx: pd.DataFrame):
+    global _WORKER_FX
+    _WORKER_FX = df_fx
+
+
+def _generate_unit(unit: Tuple[str, str]) -> str:
+    """워커 프로세스에서 (시즌, 브랜드) 1개 처리 후 출력 문자열 반환"""
+    season, brand_code = unit
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        generate_summary(season, [brand_code], _WORKER_FX)
+    return buffer.getvalue()
+
+
+def generate_summary(season: str, brands: List[str], df_fx: Optional[pd.DataFrame] = None):
+    """
+    시즌/브랜드별 Summary JSON 생성 (auto_update_dashboard.py에서 직접 호출)
+    
+    FX.csv는 load_fx_frame으로 읽어 같은 프로세스의 여러 호출이 환율 인덱스를 공유합니다.
+    """
+    season = season.upper()
+    season_folder, season_code, prev_season_code = resolve_season(season)
     
     print(f"F&F Cost Dashboard - Summary JSON Generation ({season})")
     print("=" * 60)
@@ -547,11 +246,11 @@ def main():
     print(f"브랜드: {', '.join(brands)}")
     
     # FX 파일 로드
-    if not os.path.exists(FX_FILE):
-        print(f"\n[ERROR] {FX_FILE} 파일이 없습니다.")
-        return
-    
-    df_fx = pd.read_csv(FX_FILE, encoding='utf-8-sig')
+    if df_fx is None:
+        if not os.path.exists(FX_FILE):
+            print(f"\n[ERROR] {FX_FILE} 파일이 없습니다.")
+            return
+        df_fx = load_fx_frame(FX_FILE)
     print(f"\n[OK] FX 파일 로드 완료: {len(df_fx)}개 환율 데이터")
     
     # 각 브랜드별로 처리
@@ -580,7 +279,7 @@ def main():
             # DISCOVERY Summary 생성
             if os.path.exists(csv_file_discovery):
                 print(f"\n[1-1] DISCOVERY CSV 파일 로드: {csv_file_discovery}")
-                df_discovery = pd.read_csv(csv_file_discovery, encoding='utf-8-sig')
+                df_discovery = read_cost_frame(csv_file_discovery, SUMMARY_COLUMNS)
                 print(f"     DISCOVERY 데이터: {len(df_discovery)}개 레코드")
                 process_brand_data(df_discovery, df_fx, brand_code, season_code, prev_season_code, 
                                  season_folder, season, f'summary_{normalize_season_for_filename(season)}_{brand_code.lower()}.json')
@@ -590,7 +289,7 @@ def main():
             # DISCOVERY-KIDS Summary 생성
             if os.path.exists(csv_file_kids):
                 print(f"\n[1-2] DISCOVERY-KIDS CSV 파일 로드: {csv_file_kids}")
-                df_kids = pd.read_csv(csv_file_kids, encoding='utf-8-sig')
+                df_kids = read_cost_frame(csv_file_kids, SUMMARY_COLUMNS)
                 print(f"     DISCOVERY-KIDS 데이터: {len(df_kids)}개 레코드")
                 process_brand_data(df_kids, df_fx, brand_code, season_code, prev_season_code, 
                                  season_folder, season, f'summary_{normalize_season_for_filename(season)}_{brand_code.lower()}_kids.json')
@@ -600,7 +299,7 @@ def main():
             continue
         
         print(f"\n[1] CSV 파일 로드: {csv_file}")
-        df = pd.read_csv(csv_file, encoding='utf-8-sig')
+        df = read_cost_frame(csv_file, SUMMARY_COLUMNS)
         
         # X 브랜드가 아닌 경우 기존 로직 사용
         output_file = f'public/COST RAW/{season_folder}/summary_{normalize_season_for_filename(season)}_{brand_code.lower()}.json'
@@ -622,52 +321,31 @@ def process_brand_data(df: pd.DataFrame, df_fx: pd.DataFrame, brand_code: str,
     print(f"출력 파일: {output_file}")
     
     # 중분류 통합: SHOES, BAG, HEADWEAR, Acc_etc → Acc_etc
-    # 컬럼 인덱스 3이 중분류
-    def normalize_category(category):
-        if pd.isna(category):
-            return 'Acc_etc'
-        category_str = str(category).strip()
-        category_upper = category_str.upper()
-        if category_upper in ['SHOES', 'BAG', 'HEADWEAR', 'ACC_ETC', 'ACC']:
-            return 'Acc_etc'
-        return category_str
-    
-    df.iloc[:, 3] = df.iloc[:, 3].apply(normalize_category)
+    df[COL_CATEGORY] = merge_acc_categories(df[COL_CATEGORY])
     print(f"   > 중분류 통합 완료: SHOES/BAG/HEADWEAR/Acc_etc → Acc_etc")
     
-    # 수량 컬럼 클렌징
-    df.iloc[:, 7] = pd.to_numeric(df.iloc[:, 7].astype(str).str.replace(',', '').str.strip(), errors='coerce').fillna(0)
-    
-    # USD/KRW 단가 컬럼도 숫자로 변환
-    for col_idx in range(14, 30):
-        df.iloc[:, col_idx] = pd.to_numeric(df.iloc[:, col_idx], errors='coerce').fillna(0)
-    
+    # 수량/단가 숫자 변환과 결측치 처리는 read_cost_frame에서 완료
     print(f"   > 총 {len(df)}개 레코드 로드")
     
-    # 전체 통계 계산
+    # 전체/카테고리별 통계 계산
     print("\n[2] 전체 통계 계산 중...")
-    total_stats = calculate_total_stats(df, df_fx, brand_code, season_code, prev_season_code)
+    summary = calculate_summary(df, season_code, prev_season_code)
+    total_stats = summary['total']
     print(f"   > 전년 Cost Rate (USD): {total_stats['costRate24F_usd']:.1f}%")
     print(f"   > 당년 Cost Rate (USD): {total_stats['costRate25F_usd']:.1f}%")
     print(f"   > Cost Rate Change: {total_stats['costRateChange_usd']:+.1f}%p")
     
-    # 카테고리별 통계 계산
     print("\n[3] 카테고리별 통계 계산 중...")
-    category_stats = calculate_category_stats(df, df_fx, brand_code, season_code, prev_season_code)
-    for cat in category_stats:
+    for cat in summary['categories']:
         print(f"   > {cat['category']}: {cat['costRate25F_usd']:.1f}%")
     
     # JSON 저장
     print(f"\n[4] JSON 저장: {output_file}")
-    summary = {
-        'total': total_stats,
-        'categories': category_stats,
-    }
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
-    
-    print(f"   > {output_filename} 생성 완료!")
+    if write_json(summary, output_file):
+        record_file(output_file)
+        print(f"   > {output_filename} 생성 완료!")
+    else:
+        print(f"   > {output_filename} 변경 없음 (기존 파일 유지)")
     
     print("\n" + "=" * 60)
     print("All tasks completed.")
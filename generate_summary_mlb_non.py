@@ -14,14 +14,21 @@ MLB Non 시즌 Summary JSON 생성 스크립트
 """
 
 import pandas as pd
-import json
 import argparse
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+from artifact_writer import write_json
+from cost_schema import read_cost_frame
+from kpi_engine import kpi_table, summary_from_table
+from run_metrics import record_file
 
 # 카테고리 순서
 CATEGORY_ORDER = ['Outer', 'Inner', 'Bottom', 'Shoes', 'Bag', 'Headwear', 'Acc_etc', 'Wear_etc']
 
+# 결과에 영향을 주는 코드 파일 (바뀌면 증분 생성에서 다시 생성)
+SOURCE_FILES = ['generate_summary_mlb_non.py', 'cost_schema.py', 'cost_raw_store.py', 'kpi_engine.py']
+
 def normalize_season_for_filename(season: str) -> str:
     """
     시즌 코드를 파일명용으로 정규화
@@ -36,417 +43,119 @@ def normalize_season_for_filename(season: str) -> str:
         return season.lower()
 
 
-def calculate_season_kpi(df_season: pd.DataFrame, season: str, currency: str = 'USD') -> Dict[str, float]:
+def _numeric(df: pd.DataFrame, column: Optional[str], fallback_index: int) -> pd.Series:
+    """컬럼명으로 숫자 변환 (컬럼이 없으면 인덱스 위치, 그것도 없으면 0)"""
+    if column is not None and column in df.columns:
+        return pd.to_numeric(df[column], errors='coerce')
+    if len(df.columns) > fallback_index:
+        return pd.to_numeric(df.iloc[:, fallback_index], errors='coerce')
+    return pd.Series(0.0, index=df.index)
+
+
+def kpi_measures(df: pd.DataFrame) -> pd.DataFrame:
     """
-    시즌별 KPI 계산
+    행 단위 수량 가중 금액 (kpi_engine 측정값)
     
-    Args:
-        df_season: 시즌별 데이터프레임
-        season: 시즌명 (전년, 당년)
-        currency: 통화 (USD, KRW)
-    
-    Returns:
-        KPI 딕셔너리
+    - 수량: 발주수량 또는 수량 컬럼
+    - TAG (USD): TAG_USD금액(전년환율) (이미 총금액), 없으면 TAG KRW ÷ 1300 × 수량
+    - 원가: USD/KRW 총금액(단가×수량) 컬럼, 없으면 단가 컬럼(인덱스) × 수량
+    - 원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨
     """
-    if len(df_season) == 0:
-        return {
-            f'qty_{season}': 0,
-            f'avgTag_{season}': 0,
-            f'avgCost_{season}': 0,
-            f'costRate_{season}': 0,
-            f'material_{season}': 0,
-            f'artwork_{season}': 0,
-            f'labor_{season}': 0,
-            f'margin_{season}': 0,
-            f'expense_{season}': 0,
-            f'materialRate_{season}': 0,
-            f'artworkRate_{season}': 0,
-            f'laborRate_{season}': 0,
-            f'marginRate_{season}': 0,
-            f'expenseRate_{season}': 0,
-        }
-    
     # 수량 컬럼 찾기 (발주수량 또는 수량)
-    if '발주수량' in df_season.columns:
-        qty_col = pd.to_numeric(df_season['발주수량'], errors='coerce')
-    elif '수량' in df_season.columns:
-        qty_col = pd.to_numeric(df_season['수량'], errors='coerce')
+    if '발주수량' in df.columns:
+        qty = pd.to_numeric(df['발주수량'], errors='coerce')
     else:
-        qty_col = pd.to_numeric(df_season.iloc[:, 8], errors='coerce')  # 발주수량 (인덱스 8)
-    
-    qty = qty_col.sum()
+        qty = _numeric(df, '수량', 8)  # 발주수량 (인덱스 8)
     
-    if currency == 'USD':
-        # TAG (USD) - TAG_USD금액(전년환율) 컬럼 사용 (있는 경우)
-        # TAG_USD금액(전년환율)은 이미 총금액이므로 그냥 합산
-        if 'TAG_USD금액(전년환율)' in df_season.columns:
-            tag_usd_col = pd.to_numeric(df_season['TAG_USD금액(전년환율)'], errors='coerce')
-            tag_total = tag_usd_col.sum()  # 이미 총금액이므로 합산만
-            avg_tag = tag_total / qty if qty > 0 else 0
+    tag = _numeric(df, 'TAG', 7)  # TAG (인덱스 7)
+    measures = {'qty': qty}
+    if 'TAG_USD금액(전년환율)' in df.columns:
+        measures['usd_tag'] = pd.to_numeric(df['TAG_USD금액(전년환율)'], errors='coerce')
+    else:
+        exchange_rate = 1300.0  # 기본값
+        measures['usd_tag'] = tag / exchange_rate * qty
+    measures['krw_tag'] = tag * qty
+    
+    # (통화, 총금액 컬럼 접두어, 단가 컬럼 시작 인덱스)
+    for currency, prefix, start in [('usd', 'USD', 16), ('krw', 'KRW', 24)]:
+        material_total = f'{prefix}_재료계(원/부/택/본공)_총금액(단가×수량)'
+        if material_total in df.columns:
+            measures[f'{currency}_material'] = pd.to_numeric(df[material_total], errors='coerce')
         else:
-            # TAG_USD금액(전년환율) 컬럼이 없으면 TAG KRW를 환율로 나눠서 계산
-            exchange_rate = 1300.0  # 기본값
-            if 'TAG' in df_season.columns:
-                tag_col = pd.to_numeric(df_season['TAG'], errors='coerce')
+            # 컬럼명이 없으면 인덱스 사용 (원자재, 부자재, 본사공급자재, 택/라벨)
+            for part, offset in [('원자재', 0), ('부자재', 2), ('본사공급자재', 5), ('택/라벨', 3)]:
+                measures[f'{currency}_material.{part}'] = _numeric(df, None, start + offset) * qty
+        for item, name, offset in [('artwork', '아트웍', 1), ('labor', '공임', 4),
+                                   ('margin', '정상마진', 6), ('expense', '경비', 7)]:
+            total_column = f'{prefix}_{name}_총금액(단가×수량)'
+            if total_column in df.columns:
+                measures[f'{currency}_{item}'] = pd.to_numeric(df[total_column], errors='coerce')
             else:
-                tag_col = pd.to_numeric(df_season.iloc[:, 7], errors='coerce')  # TAG (인덱스 7)
-            tag_total = (tag_col / exchange_rate * qty_col).sum()
-            avg_tag = tag_total / qty if qty > 0 else 0
-        
-        # 원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨
-        # USD 총금액 컬럼 사용 (단가×수량이 이미 계산된 값)
-        if 'USD_재료계(원/부/택/본공)_총금액(단가×수량)' in df_season.columns:
-            material_total = pd.to_numeric(df_season['USD_재료계(원/부/택/본공)_총금액(단가×수량)'], errors='coerce').sum()
-            material = material_total / qty if qty > 0 else 0
-        else:
-            # 컬럼명이 없으면 인덱스 사용 (fallback)
-            mat_col = pd.to_numeric(df_season.iloc[:, 16], errors='coerce') if len(df_season.columns) > 16 else pd.Series([0])
-            sub_col = pd.to_numeric(df_season.iloc[:, 18], errors='coerce') if len(df_season.columns) > 18 else pd.Series([0])
-            hq_col = pd.to_numeric(df_season.iloc[:, 21], errors='coerce') if len(df_season.columns) > 21 else pd.Series([0])
-            tag_label_col = pd.to_numeric(df_season.iloc[:, 19], errors='coerce') if len(df_season.columns) > 19 else pd.Series([0])
-            mat_total = (mat_col * qty_col).sum()
-            sub_total = (sub_col * qty_col).sum()
-            hq_total = (hq_col * qty_col).sum()
-            tag_label_total = (tag_label_col * qty_col).sum()
-            material = (mat_total + sub_total + hq_total + tag_label_total) / qty if qty > 0 else 0
-        
-        # 아트웍
-        if 'USD_아트웍_총금액(단가×수량)' in df_season.columns:
-            artwork_total = pd.to_numeric(df_season['USD_아트웍_총금액(단가×수량)'], errors='coerce').sum()
-            artwork = artwork_total / qty if qty > 0 else 0
-        else:
-            art_col = pd.to_numeric(df_season.iloc[:, 17], errors='coerce') if len(df_season.columns) > 17 else pd.Series([0])
-            art_total = (art_col * qty_col).sum()
-            artwork = art_total / qty if qty > 0 else 0
-        
-        # 공임
-        if 'USD_공임_총금액(단가×수량)' in df_season.columns:
-            labor_total = pd.to_numeric(df_season['USD_공임_총금액(단가×수량)'], errors='coerce').sum()
-            labor = labor_total / qty if qty > 0 else 0
-        else:
-            labor_col = pd.to_numeric(df_season.iloc[:, 20], errors='coerce') if len(df_season.columns) > 20 else pd.Series([0])
-            labor_total = (labor_col * qty_col).sum()
-            labor = labor_total / qty if qty > 0 else 0
-        
-        # 마진
-        if 'USD_정상마진_총금액(단가×수량)' in df_season.columns:
-            margin_total = pd.to_numeric(df_season['USD_정상마진_총금액(단가×수량)'], errors='coerce').sum()
-            margin = margin_total / qty if qty > 0 else 0
-        else:
-            margin_col = pd.to_numeric(df_season.iloc[:, 22], errors='coerce') if len(df_season.columns) > 22 else pd.Series([0])
-            margin_total = (margin_col * qty_col).sum()
-            margin = margin_total / qty if qty > 0 else 0
-        
-        # 경비
-        if 'USD_경비_총금액(단가×수량)' in df_season.columns:
-            expense_total = pd.to_numeric(df_season['USD_경비_총금액(단가×수량)'], errors='coerce').sum()
-            expense = expense_total / qty if qty > 0 else 0
-        else:
-            expense_col = pd.to_numeric(df_season.iloc[:, 23], errors='coerce') if len(df_season.columns) > 23 else pd.Series([0])
-            expense_total = (expense_col * qty_col).sum()
-            expense = expense_total / qty if qty > 0 else 0
-        
-    else:  # KRW
-        # TAG (KRW)
-        if 'TAG' in df_season.columns:
-            tag_col = pd.to_numeric(df_season['TAG'], errors='coerce')
-        else:
-            tag_col = pd.to_numeric(df_season.iloc[:, 7], errors='coerce')  # TAG (인덱스 7)
-        tag_total = (tag_col * qty_col).sum()
-        avg_tag = tag_total / qty if qty > 0 else 0
-        
-        # 원부자재
-        if 'KRW_재료계(원/부/택/본공)_총금액(단가×수량)' in df_season.columns:
-            material_total = pd.to_numeric(df_season['KRW_재료계(원/부/택/본공)_총금액(단가×수량)'], errors='coerce').sum()
-            material = material_total / qty if qty > 0 else 0
-        else:
-            mat_col = pd.to_numeric(df_season.iloc[:, 24], errors='coerce') if len(df_season.columns) > 24 else pd.Series([0])
-            sub_col = pd.to_numeric(df_season.iloc[:, 26], errors='coerce') if len(df_season.columns) > 26 else pd.Series([0])
-            hq_col = pd.to_numeric(df_season.iloc[:, 29], errors='coerce') if len(df_season.columns) > 29 else pd.Series([0])
-            tag_label_col = pd.to_numeric(df_season.iloc[:, 27], errors='coerce') if len(df_season.columns) > 27 else pd.Series([0])
-            mat_total = (mat_col * qty_col).sum()
-            sub_total = (sub_col * qty_col).sum()
-            hq_total = (hq_col * qty_col).sum()
-            tag_label_total = (tag_label_col * qty_col).sum()
-            material = (mat_total + sub_total + hq_total + tag_label_total) / qty if qty > 0 else 0
-        
-        # 아트웍
-        if 'KRW_아트웍_총금액(단가×수량)' in df_season.columns:
-            artwork_total = pd.to_numeric(df_season['KRW_아트웍_총금액(단가×수량)'], errors='coerce').sum()
-            artwork = artwork_total / qty if qty > 0 else 0
-        else:
-            art_col = pd.to_numeric(df_season.iloc[:, 25], errors='coerce') if len(df_season.columns) > 25 else pd.Series([0])
-            art_total = (art_col * qty_col).sum()
-            artwork = art_total / qty if qty > 0 else 0
-        
-        # 공임
-        if 'KRW_공임_총금액(단가×수량)' in df_season.columns:
-            labor_total = pd.to_numeric(df_season['KRW_공임_총금액(단가×수량)'], errors='coerce').sum()
-            labor = labor_total / qty if qty > 0 else 0
-        else:
-            labor_col = pd.to_numeric(df_season.iloc[:, 28], errors='coerce') if len(df_season.columns) > 28 else pd.Series([0])
-            labor_total = (labor_col * qty_col).sum()
-            labor = labor_total / qty if qty > 0 else 0
-        
-        # 마진
-        if 'KRW_정상마진_총금액(단가×수량)' in df_season.columns:
-            margin_total = pd.to_numeric(df_season['KRW_정상마진_총금액(단가×수량)'], errors='coerce').sum()
-            margin = margin_total / qty if qty > 0 else 0
-        else:
-            margin_col = pd.to_numeric(df_season.iloc[:, 30], errors='coerce') if len(df_season.columns) > 30 else pd.Series([0])
-            margin_total = (margin_col * qty_col).sum()
-            margin = margin_total / qty if qty > 0 else 0
-        
-        # 경비
-        if 'KRW_경비_총금액(단가×수량)' in df_season.columns:
-            expense_total = pd.to_numeric(df_season['KRW_경비_총금액(단가×수량)'], errors='coerce').sum()
-            expense = expense_total / qty if qty > 0 else 0
-        else:
-            expense_col = pd.to_numeric(df_season.iloc[:, 31], errors='coerce') if len(df_season.columns) > 31 else pd.Series([0])
-            expense_total = (expense_col * qty_col).sum()
-            expense = expense_total / qty if qty > 0 else 0
-    
-    # 총 원가
-    avg_cost = material + artwork + labor + margin + expense
-    
-    # 원가율 = (평균원가 ÷ (평균TAG / 1.1)) × 100
-    cost_rate = (avg_cost / (avg_tag / 1.1)) * 100 if avg_tag > 0 else 0
-    
-    # 항목별 원가율
-    tag_excl_vat = avg_tag / 1.1 if avg_tag > 0 else 0
-    material_rate = (material / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    artwork_rate = (artwork / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    labor_rate = (labor / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    margin_rate = (margin / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    expense_rate = (expense / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0
-    
-    return {
-        f'qty_{season}': int(qty),
-        f'avgTag_{season}': round(avg_tag, 2),
-        f'avgCost_{season}': round(avg_cost, 2),
-        f'costRate_{season}': round(cost_rate, 1),
-        f'material_{season}': round(material, 2),
-        f'artwork_{season}': round(artwork, 2),
-        f'labor_{season}': round(labor, 2),
-        f'margin_{season}': round(margin, 2),
-        f'expense_{season}': round(expense, 2),
-        f'materialRate_{season}': round(material_rate, 1),
-        f'artworkRate_{season}': round(artwork_rate, 1),
-        f'laborRate_{season}': round(labor_rate, 1),
-        f'marginRate_{season}': round(margin_rate, 1),
-        f'expenseRate_{season}': round(expense_rate, 1),
-    }
+                measures[f'{currency}_{item}'] = _numeric(df, None, start + offset) * qty
+    return pd.DataFrame(measures)
 
 
-def extract_period_from_season(season_str: str) -> str:
+def extract_period_column(seasons: pd.Series) -> pd.Series:
     """
-    시즌 컬럼에서 기간 추출
-    예: "전년(24N)" -> "전년", "당년(25N)" -> "당년"
+    시즌 컬럼에서 기간 추출 (컬럼 단위 문자열 연산)
+    예: "전년(24N)" -> "전년", "당년(25N)" -> "당년", 결측 -> ""
     """
-    if pd.isna(season_str):
-        return ''
-    
-    season_str = str(season_str).strip()
-    if season_str.startswith('전년'):
-        return '전년'
-    elif season_str.startswith('당년'):
-        return '당년'
-    return season_str
+    stripped = seasons.astype(str).str.strip()
+    period = stripped.mask(stripped.str.startswith('전년', na=False), '전년')
+    period = period.mask(stripped.str.startswith('당년', na=False), '당년')
+    return period.where(seasons.notna(), '')
 
 
-def calculate_total_stats(df: pd.DataFrame) -> Dict[str, Any]:
-    """전체 통계 계산"""
-    # 시즌 컬럼에서 기간 추출
-    df['기간'] = df['시즌'].apply(extract_period_from_season)
-    
-    df_prev = df[df['기간'] == '전년']
-    df_curr = df[df['기간'] == '당년']
-    
-    # 수량 계산
-    qty_prev = df_prev.iloc[:, 7].sum()
-    qty_curr = df_curr.iloc[:, 7].sum()
-    qty_yoy = (qty_curr / qty_prev) * 100 if qty_prev > 0 else 0
-    
-    # USD 기준
-    kpi_prev_usd = calculate_season_kpi(df_prev, '전년', 'USD')
-    kpi_curr_usd = calculate_season_kpi(df_curr, '당년', 'USD')
-    
-    # KRW 기준
-    kpi_prev_krw = calculate_season_kpi(df_prev, '전년', 'KRW')
-    kpi_curr_krw = calculate_season_kpi(df_curr, '당년', 'KRW')
-    
-    # YOY 계산
-    tag_yoy_usd = (kpi_curr_usd['avgTag_당년'] / kpi_prev_usd['avgTag_전년']) * 100 if kpi_prev_usd['avgTag_전년'] > 0 else 0
-    cost_yoy_usd = (kpi_curr_usd['avgCost_당년'] / kpi_prev_usd['avgCost_전년']) * 100 if kpi_prev_usd['avgCost_전년'] > 0 else 0
-    cost_rate_change_usd = kpi_curr_usd['costRate_당년'] - kpi_prev_usd['costRate_전년']
-    
-    tag_yoy_krw = (kpi_curr_krw['avgTag_당년'] / kpi_prev_krw['avgTag_전년']) * 100 if kpi_prev_krw['avgTag_전년'] > 0 else 0
-    cost_yoy_krw = (kpi_curr_krw['avgCost_당년'] / kpi_prev_krw['avgCost_전년']) * 100 if kpi_prev_krw['avgCost_전년'] > 0 else 0
-    cost_rate_change_krw = kpi_curr_krw['costRate_당년'] - kpi_prev_krw['costRate_전년']
-    
-    return {
-        'qty24F': int(qty_prev),
-        'qty25F': int(qty_curr),
-        'qtyYoY': round(qty_yoy, 1),
-        # USD 기준
-        'costRate24F_usd': kpi_prev_usd['costRate_전년'],
-        'costRate25F_usd': kpi_curr_usd['costRate_당년'],
-        'costRateChange_usd': round(cost_rate_change_usd, 1),
-        'avgTag24F_usd': kpi_prev_usd['avgTag_전년'],
-        'avgTag25F_usd': kpi_curr_usd['avgTag_당년'],
-        'tagYoY_usd': round(tag_yoy_usd, 1),
-        'avgCost24F_usd': kpi_prev_usd['avgCost_전년'],
-        'avgCost25F_usd': kpi_curr_usd['avgCost_당년'],
-        'costYoY_usd': round(cost_yoy_usd, 1),
-        'material24F_usd': kpi_prev_usd['material_전년'],
-        'material25F_usd': kpi_curr_usd['material_당년'],
-        'artwork24F_usd': kpi_prev_usd['artwork_전년'],
-        'artwork25F_usd': kpi_curr_usd['artwork_당년'],
-        'labor24F_usd': kpi_prev_usd['labor_전년'],
-        'labor25F_usd': kpi_curr_usd['labor_당년'],
-        'margin24F_usd': kpi_prev_usd['margin_전년'],
-        'margin25F_usd': kpi_curr_usd['margin_당년'],
-        'expense24F_usd': kpi_prev_usd['expense_전년'],
-        'expense25F_usd': kpi_curr_usd['expense_당년'],
-        'materialRate24F_usd': kpi_prev_usd['materialRate_전년'],
-        'materialRate25F_usd': kpi_curr_usd['materialRate_당년'],
-        'artworkRate24F_usd': kpi_prev_usd['artworkRate_전년'],
-        'artworkRate25F_usd': kpi_curr_usd['artworkRate_당년'],
-        'laborRate24F_usd': kpi_prev_usd['laborRate_전년'],
-        'laborRate25F_usd': kpi_curr_usd['laborRate_당년'],
-        'marginRate24F_usd': kpi_prev_usd['marginRate_전년'],
-        'marginRate25F_usd': kpi_curr_usd['marginRate_당년'],
-        'expenseRate24F_usd': kpi_prev_usd['expenseRate_전년'],
-        'expenseRate25F_usd': kpi_curr_usd['expenseRate_당년'],
-        # KRW 기준
-        'costRate24F_krw': kpi_prev_krw['costRate_전년'],
-        'costRate25F_krw': kpi_curr_krw['costRate_당년'],
-        'costRateChange_krw': round(cost_rate_change_krw, 1),
-        'avgTag24F_krw': kpi_prev_krw['avgTag_전년'],
-        'avgTag25F_krw': kpi_curr_krw['avgTag_당년'],
-        'tagYoY_krw': round(tag_yoy_krw, 1),
-        'avgCost24F_krw': kpi_prev_krw['avgCost_전년'],
-        'avgCost25F_krw': kpi_curr_krw['avgCost_당년'],
-        'costYoY_krw': round(cost_yoy_krw, 1),
-    }
+def calculate_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """전체 및 카테고리별 통계 계산 ((기간, 카테고리)별 groupby 1회)"""
+    # 시즌 컬럼에서 기간 추출 (전년(24N) → 전년)
+    period = extract_period_column(df['시즌'])
+    table = kpi_table(kpi_measures(df), period, df.iloc[:, 3])
+    return summary_from_table(table, '전년', '당년', CATEGORY_ORDER)
 
 
-def calculate_category_stats(df: pd.DataFrame) -> list:
-    """카테고리별 통계 계산"""
-    categories = []
-    
-    # 시즌 컬럼에서 기간 추출
-    df['기간'] = df['시즌'].apply(extract_period_from_season)
-    
-    for category in CATEGORY_ORDER:
-        df_cat = df[df.iloc[:, 3] == category]
-        
-        if len(df_cat) == 0:
-            continue
-        
-        df_prev = df_cat[df_cat['기간'] == '전년']
-        df_curr = df_cat[df_cat['기간'] == '당년']
-        
-        # USD 기준
-        kpi_prev_usd = calculate_season_kpi(df_prev, '전년', 'USD')
-        kpi_curr_usd = calculate_season_kpi(df_curr, '당년', 'USD')
-        
-        # KRW 기준
-        kpi_prev_krw = calculate_season_kpi(df_prev, '전년', 'KRW')
-        kpi_curr_krw = calculate_season_kpi(df_curr, '당년', 'KRW')
-        
-        # YOY 계산
-        qty_yoy = (kpi_curr_usd['qty_당년'] / kpi_prev_usd['qty_전년']) * 100 if kpi_prev_usd['qty_전년'] > 0 else 0
-        tag_yoy_usd = (kpi_curr_usd['avgTag_당년'] / kpi_prev_usd['avgTag_전년']) * 100 if kpi_prev_usd['avgTag_전년'] > 0 else 0
-        cost_yoy_usd = (kpi_curr_usd['avgCost_당년'] / kpi_prev_usd['avgCost_전년']) * 100 if kpi_prev_usd['avgCost_전년'] > 0 else 0
-        cost_rate_change_usd = kpi_curr_usd['costRate_당년'] - kpi_prev_usd['costRate_전년']
-        
-        tag_yoy_krw = (kpi_curr_krw['avgTag_당년'] / kpi_prev_krw['avgTag_전년']) * 100 if kpi_prev_krw['avgTag_전년'] > 0 else 0
-        cost_yoy_krw = (kpi_curr_krw['avgCost_당년'] / kpi_prev_krw['avgCost_전년']) * 100 if kpi_prev_krw['avgCost_전년'] > 0 else 0
-        cost_rate_change_krw = kpi_curr_krw['costRate_당년'] - kpi_prev_krw['costRate_전년']
-        
-        categories.append({
-            'category': category,
-            'qty24F': kpi_prev_usd['qty_전년'],
-            'qty25F': kpi_curr_usd['qty_당년'],
-            'qtyYoY': round(qty_yoy, 1),
-            # USD 기준
-            'costRate24F_usd': kpi_prev_usd['costRate_전년'],
-            'costRate25F_usd': kpi_curr_usd['costRate_당년'],
-            'costRateChange_usd': round(cost_rate_change_usd, 1),
-            'avgTag24F_usd': kpi_prev_usd['avgTag_전년'],
-            'avgTag25F_usd': kpi_curr_usd['avgTag_당년'],
-            'tagYoY_usd': round(tag_yoy_usd, 1),
-            'avgCost24F_usd': kpi_prev_usd['avgCost_전년'],
-            'avgCost25F_usd': kpi_curr_usd['avgCost_당년'],
-            'costYoY_usd': round(cost_yoy_usd, 1),
-            'material24F_usd': kpi_prev_usd['material_전년'],
-            'material25F_usd': kpi_curr_usd['material_당년'],
-            'artwork24F_usd': kpi_prev_usd['artwork_전년'],
-            'artwork25F_usd': kpi_curr_usd['artwork_당년'],
-            'labor24F_usd': kpi_prev_usd['labor_전년'],
-            'labor25F_usd': kpi_curr_usd['labor_당년'],
-            'margin24F_usd': kpi_prev_usd['margin_전년'],
-            'margin25F_usd': kpi_curr_usd['margin_당년'],
-            'expense24F_usd': kpi_prev_usd['expense_전년'],
-            'expense25F_usd': kpi_curr_usd['expense_당년'],
-            'materialRate24F_usd': kpi_prev_usd['materialRate_전년'],
-            'materialRate25F_usd': kpi_curr_usd['materialRate_당년'],
-            'artworkRate24F_usd': kpi_prev_usd['artworkRate_전년'],
-            'artworkRate25F_usd': kpi_curr_usd['artworkRate_당년'],
-            'laborRate24F_usd': kpi_prev_usd['laborRate_전년'],
-            'laborRate25F_usd': kpi_curr_usd['laborRate_당년'],
-            'marginRate24F_usd': kpi_prev_usd['marginRate_전년'],
-            'marginRate25F_usd': kpi_curr_usd['marginRate_당년'],
-            'expenseRate24F_usd': kpi_prev_usd['expenseRate_전년'],
-            'expenseRate25F_usd': kpi_curr_usd['expenseRate_당년'],
-            # KRW 기준
-            'costRate24F_krw': kpi_prev_krw['costRate_전년'],
-            'costRate25F_krw': kpi_curr_krw['costRate_당년'],
-            'costRateChange_krw': round(cost_rate_change_krw, 1),
-            'avgTag24F_krw': kpi_prev_krw['avgTag_전년'],
-            'avgTag25F_krw': kpi_curr_krw['avgTag_당년'],
-            'tagYoY_krw': round(tag_yoy_krw, 1),
-            'avgCost24F_krw': kpi_prev_krw['avgCost_전년'],
-            'avgCost25F_krw': kpi_curr_krw['avgCost_당년'],
-            'costYoY_krw': round(cost_yoy_krw, 1),
-        })
-    
-    return categories
+def resolve_season(season: str) -> Tuple[str, str]:
+    """시즌 코드 → (시즌 폴더, 파일용 시즌 코드)"""
+    season_upper = season.upper()
+    if season_upper in ['25FW', '25F']:
+        return '25FW', '25F'
+    elif season_upper in ['25SS', '25S']:
+        return '25S', '25S'
+    elif season_upper in ['26SS', '26S']:
+        return '26SS', '26S'
+    elif season_upper in ['26FW', '26F']:
+        return '26FW', '26F'
+    return season, season
+
+
+def summary_targets(season: str, brand: str) -> Tuple[List[str], List[str]]:
+    """NON 시즌 Summary JSON의 (입력 파일, 출력 파일) 목록 (build_manifest 증분 생성용)"""
+    season_folder, file_season = resolve_season(season)
+    base_dir = f'public/COST RAW/{season_folder}'
+    code_dir = os.path.dirname(os.path.abspath(__file__))
+    inputs = [f'{base_dir}/{brand}_{file_season}_NON.csv'] + [os.path.join(code_dir, name) for name in SOURCE_FILES]
+    outputs = [f'{base_dir}/summary_{normalize_season_for_filename(season)}_{brand.lower()}_non.json']
+    return inputs, outputs
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description='MLB Non 시즌 Summary JSON 생성')
     parser.add_argument('--season', type=str, required=True, help='시즌 코드 (예: 25FW, 26SS)')
     parser.add_argument('--brand', type=str, required=True, help='브랜드 코드 (M, I, X)')
     
-    args = parser.parse_args()
-    season = args.season
-    brand = args.brand
-    
+    args = parser.parse_args(argv)
+    generate_summary(args.season, args.brand)
+
+
+def generate_summary(season: str, brand: str):
+    """NON 시즌 브랜드 Summary JSON 생성 (auto_update_dashboard.py에서 직접 호출)"""
     print("=" * 60)
     print(f"MLB Non 시즌 Summary JSON 생성")
     print(f"시즌: {season}, 브랜드: {brand}")
     print("=" * 60)
     
     # 파일 경로 결정 (기존 폴더 구조에 맞게)
-    season_upper = season.upper()
-    if season_upper in ['25FW', '25F']:
-        season_folder = '25FW'
-        file_season = '25F'
-    elif season_upper in ['25SS', '25S']:
-        season_folder = '25S'
-        file_season = '25S'
-    elif season_upper in ['26SS', '26S']:
-        season_folder = '26SS'
-        file_season = '26S'
-    elif season_upper in ['26FW', '26F']:
-        season_folder = '26FW'
-        file_season = '26F'
-    else:
-        season_folder = season
-        file_season = season
-    
+    season_folder, file_season = resolve_season(season)
     csv_file = f'public/COST RAW/{season_folder}/{brand}_{file_season}_NON.csv'
     
     if not os.path.exists(csv_file):
@@ -455,40 +164,33 @@ def main():
     
     # CSV 파일 로드
     print(f"\n[1] CSV 파일 로드: {csv_file}")
-    df = pd.read_csv(csv_file, encoding='utf-8-sig')
+    df = read_cost_frame(csv_file)
     
-    # 수량 컬럼 클렌징
-    df.iloc[:, 7] = pd.to_numeric(df.iloc[:, 7].astype(str).str.replace(',', '').str.strip(), errors='coerce').fillna(0)
+    # 수량/단가/총금액 숫자 변환(float64)과 결측치 처리는 read_cost_frame에서 완료
     
     print(f"   > {len(df)}개 행 로드 완료")
     
-    # 전체 통계 계산
+    # 전체/카테고리별 통계 계산
     print("\n[2] 전체 통계 계산 중...")
-    total_stats = calculate_total_stats(df)
+    summary = calculate_summary(df)
+    total_stats = summary['total']
     print(f"   > 전년 Cost Rate (USD): {total_stats['costRate24F_usd']:.1f}%")
     print(f"   > 당년 Cost Rate (USD): {total_stats['costRate25F_usd']:.1f}%")
     print(f"   > Cost Rate Change: {total_stats['costRateChange_usd']:+.1f}%p")
     
-    # 카테고리별 통계 계산
     print("\n[3] 카테고리별 통계 계산 중...")
-    category_stats = calculate_category_stats(df)
-    for cat in category_stats:
+    for cat in summary['categories']:
         print(f"   > {cat['category']}: {cat['costRate25F_usd']:.1f}%")
     
     # JSON 저장
     output_file = f'public/COST RAW/{season_folder}/summary_{normalize_season_for_filename(season)}_{brand.lower()}_non.json'
     print(f"\n[4] JSON 파일 저장: {output_file}")
     
-    summary = {
-        'total': total_stats,
-        'categories': category_stats,
-    }
-    
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
-    
-    print(f"   > summary JSON 생성 완료!")
+    if write_json(summary, output_file):
+        record_file(output_file)
+        print(f"   > summary JSON 생성 완료!")
+    else:
+        print(f"   > summary JSON 변경 없음 (기존 파일 유지)")
     print("\n" + "=" * 60)
     print("모든 작업 완료.")
     print("=" * 60)
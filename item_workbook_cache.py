@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+아이템별 원가율 Excel(item_cost_rate_<기간>.xlsx) 캐시 모듈
+
+/api/generate-item-cost-rate-csv 요청마다 전체 브랜드 CSV를 다시 읽고 워크북을 새로 만들지 않도록,
+만든 워크북을 입력 내용 해시로 찾는 캐시(content-addressed)에 보관하고 입력이 그대로면 그 파일을 돌려줍니다.
+
+캐시 키 = sha256(기간, 브랜드 원가 CSV 해시, FX.csv 해시, 생성 코드 해시)
+    cache/item_workbooks/<기간>_<키>.xlsx
+
+- 조회는 입력 파일 해시만 계산 (캐시에 있으면 원가 CSV를 읽거나 워크북을 만들지 않음)
+- 없으면 generate_item_cost_rate_csv로 생성해 캐시에 넣고, public/COST RAW/<기간 폴더>/item_cost_rate_<기간>.xlsx에도 반영
+  (내용이 같으면 다시 쓰지 않음)
+- 같은 기간을 동시에 요청하면 기간별 잠금 파일로 1번만 생성하고, 기다린 요청은 그 결과를 그대로 사용
+- 기간별로 최근에 사용한 MAX_CACHED_PER_PERIOD개만 보관 (캐시 적중 시 mtime 갱신)
+
+기간 코드 → 원가 CSV 경로 규칙은 generate_item_cost_rate_csv.resolve_item_period를 그대로 사용합니다
+(생성 스크립트가 읽는 파일과 캐시 키의 입력이 항상 같도록).
+
+사용 예:
+    python item_workbook_cache.py --period 25FW       # 마지막 줄에 결과 JSON 출력 (Next.js API route)
+
+    from item_workbook_cache import lookup_or_build
+    result = lookup_or_build('25FW')    # {'period': ..., 'output_file': ..., 'cache_file': ..., 'cached': True, ...}
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from typing import Dict, List, Optional
+
+from build_manifest import file_digest, input_fingerprint
+from generate_item_cost_rate_csv import FX_FILE, ItemPeriod, create_excel_file, load_item_table, \
+    resolve_item_period
+
+# ============================================
+# 입력 파일
+# ============================================
+# 워크북 내용을 결정하는 코드 (바뀌면 캐시 키가 바뀜)
+SOURCE_FILES = ['generate_item_cost_rate_csv.py', 'item_workbook_cache.py', 'cost_schema.py',
+                'cost_raw_store.py', 'fx_rates.py']
+
+
+# ============================================
+# 캐시 키 / 조회
+# ============================================
+CACHE_DIR = os.path.join('cache', 'item_workbooks')
+MAX_CACHED_PER_PERIOD = 3
+
+# 동시 생성 잠금 (기간별)
+LOCK_POLL_SECONDS = 0.2
+LOCK_STALE_SECONDS = 600        # 이보다 오래된 잠금 파일은 비정상 종료로 보고 제거
+
+
+def cache_key(item_period: ItemPeriod) -> str:
+    """(기간, 원가 CSV 해시, FX 해시, 코드 해시) → sha256"""
+    key = {
+        'period': item_period.period,
+        'csv': input_fingerprint(list(item_period.csv_files.values())),
+        'fx': input_fingerprint([FX_FILE]),
+        'code': input_fingerprint(SOURCE_FILES),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def cache_path(period: str, key: str, cache_dir: str = CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f'{period}_{key}.xlsx')
+
+
+def lookup(period: str, cache_dir: str = CACHE_DIR) -> Optional[str]:
+    """입력이 그대로인 캐시 워크북 경로 (없으면 None)"""
+    item_period = resolve_item_period(period)
+    path = cache_path(item_period.period, cache_key(item_period), cache_dir)
+    if not os.path.exists(path):
+        return None
+    _touch(path)
+    return path
+
+
+def _touch(path: str):
+    """캐시 적중 시 mtime 갱신 - _prune이 생성 시각이 아닌 마지막 사용 시각 기준으로 정리하도록"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+# ============================================
+# 생성 (기간별 잠금)
+# ============================================
+def _acquire_lock(lock_path: str):
+    """잠금 파일 생성 (O_EXCL) - 다른 프로세스가 생성 중이면 끝날 때까지 대기"""
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                    print(f"[WARN] 오래된 잠금 파일 제거: {lock_path}")
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(LOCK_POLL_SECONDS)
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(str(os.getpid()))
+        return
+
+
+def _publish(cache_file: str, output_file: str) -> bool:
+    """캐시 워크북을 public 출력 경로에 복사 (내용이 같으면 건너뜀, 임시 파일 → os.replace)"""
+    if file_digest(cache_file) == file_digest(output_file):
+        return False
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    tmp_path = output_file + '.tmp'
+    shutil.copyfile(cache_file, tmp_path)
+    os.replace(tmp_path, output_file)
+    return True
+
+
+def _prune(period: str, keep: str, cache_dir: str):
+    """기간별 최근 사용한 MAX_CACHED_PER_PERIOD개만 남기고 삭제 (mtime = 마지막 사용 시각)"""
+    prefix = f'{period}_'
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+               if name.startswith(prefix) and name.endswith('.xlsx')]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[MAX_CACHED_PER_PERIOD:]:
+        if path != keep:
+            os.remove(path)
+
+
+def build(item_period: ItemPeriod, path: str) -> bool:
+    """워크북 생성 후 캐시 경로에 원자적으로 저장 (처리할 데이터가 없으면 False)"""
+    from run_metrics import record_file, span
+
+    df_all = load_item_table(item_period.period)
+    if df_all is None:
+        return False
+
+    tmp_path = path + '.tmp.xlsx'
+    try:
+        with span('item.excel', season=item_period.period):
+            create_excel_file(df_all, tmp_path, item_period.period)
+            os.replace(tmp_path, path)
+            record_file(path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+def lookup_or_build(period: str, cache_dir: str = CACHE_DIR) -> Optional[Dict[str, object]]:
+    """
+    입력이 그대로면 캐시 워크북을, 아니면 새로 만들어 반환
+
+    Returns:
+        {'period', 'key', 'cache_file', 'output_file', 'cached'} (처리할 데이터가 없으면 None)
+        cached는 이번 호출에서 생성하지 않았으면 True (다른 요청이 만든 결과를 기다린 경우 포함)
+    """
+    item_period = resolve_item_period(period)
+    key = cache_key(item_period)
+    path = cache_path(item_period.period, key, cache_dir)
+    cached = os.path.exists(path)
+
+    if not cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        lock_path = os.path.join(cache_dir, f'.{item_period.period}.lock')
+        _acquire_lock(lock_path)
+        try:
+            # 잠금을 기다리는 동안 다른 요청이 같은 입력으로 만들었으면 그대로 사용
+            cached = os.path.exists(path)
+            if not cached:
+                print(f"[INFO] 캐시 없음 - {item_period.period} 워크북 생성 (키 {key[:12]})")
+                if not build(item_period, path):
+                    return None
+                _prune(item_period.period, path, cache_dir)
+        finally:
+            os.remove(lock_path)
+
+    if cached:
+        _touch(path)
+    _publish(path, item_period.output_file)
+    if cached:
+        print(f"[OK] 캐시 사용: {path}")
+    return {
+        'period': item_period.period,
+        'key': key,
+        'cache_file': path.replace(os.sep, '/'),
+        'output_file': item_period.output_file,
+        'cached': cached,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='아이템별 원가율 Excel 캐시 조회/생성')
+    parser.add_argument('--period', type=str, required=True, help='기간 코드 (예: 26SS, 25SS, 25FW)')
+    args = parser.parse_args(argv)
+
+    result = lookup_or_build(args.period)
+    if result is None:
+        return 1
+    # 마지막 줄: API route가 읽는 결과 JSON
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Summary KPI 집계 공용 모듈
+
+generate_summary.py, generate_summary_25fw.py, generate_summary_kids.py, generate_summary_discovery.py,
+generate_summary_mlb_non.py, generate_summary_26ss.py, run_kids_summary.py 에서 복사해 쓰던
+calculate_season_kpi / calculate_total_stats / calculate_category_stats 를 한 곳으로 모은 모듈입니다.
+
+기존에는 (전체 + 카테고리별) × (전년/당년) × (USD/KRW) 조합마다 DataFrame을 다시 필터링해
+브랜드당 20번 넘게 전체를 훑었는데, 여기서는
+1. 스크립트가 행 단위 수량 가중 금액(측정값)을 컬럼 연산으로 만들고
+2. (기간, 카테고리)별 합계를 groupby 1회로 구한 뒤
+3. 전체/카테고리 JSON은 그 작은 합계 표에서 만듭니다 (전체 = 카테고리 합계의 합).
+
+측정값 컬럼 이름:
+    qty                     수량
+    usd_tag, krw_tag        TAG 총금액 (TAG × 수량)
+    usd_material, ...       원가 항목 총금액 (material/artwork/labor/margin/expense)
+    krw_material.원자재      '.' 뒤는 부분합 - 집계 후 앞에서부터 순서대로 더함
+                            (원부자재 = 원자재 + 부자재 + 본사공급자재 + 택/라벨, 기존 계산 순서와 동일)
+
+계산 규칙 (기존 calculate_season_kpi와 동일):
+- 평균 = 총금액 ÷ 수량 (수량 가중 평균), 원가율 = (평균원가 ÷ (평균TAG / 1.1)) × 100
+- 금액은 소수 2자리, 비율은 소수 1자리 반올림
+- YoY/증감은 반올림한 값으로 계산
+- 전체 qtyYoY는 수량 합계, 카테고리 qtyYoY는 정수로 바꾼 수량으로 계산
+
+사용 예:
+    from kpi_engine import kpi_table, summary_from_table
+
+    measures = pd.DataFrame({'qty': qty, 'usd_tag': ..., 'krw_material.원자재': ..., ...})
+    table = kpi_table(measures, period, category)
+    summary = summary_from_table(table, '전년', '당년', CATEGORY_ORDER)   # {'total': {...}, 'categories': [...]}
+"""
+
+from functools import reduce
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+# ============================================
+# 측정값 / 키 설정
+# ============================================
+QTY = 'qty'
+ROWS = 'rows'
+CURRENCIES = ['usd', 'krw']
+COST_ITEMS = ['material', 'artwork', 'labor', 'margin', 'expense']
+PART_SEPARATOR = '.'
+
+# 기간/카테고리 키 이름 (kpi_table 결과 인덱스)
+PERIOD_KEY = '기간'
+CATEGORY_KEY = '카테고리'
+
+# 항목별 금액/원가율까지 JSON에 넣는 통화 (KRW는 원가율/평균 TAG/평균 원가만)
+DETAIL_CURRENCIES = ['usd']
+
+# JSON 키의 시즌 표기 (대시보드 호환: 전년 = 24F, 당년 = 25F)
+PREV_LABEL = '24F'
+CURR_LABEL = '25F'
+
+# MLB FW 형식 CSV의 단가 컬럼 위치 (USD 14-21, KRW 22-29)와 측정값 이름
+USD_UNIT_START = 14
+KRW_UNIT_START = 22
+UNIT_COST_OFFSETS = [
+    ('material.원자재', 0),
+    ('material.부자재', 2),
+    ('material.본사공급자재', 5),
+    ('material.택/라벨', 3),
+    ('artwork', 1),
+    ('labor', 4),
+    ('margin', 6),
+    ('expense', 7),
+]
+
+
+# ============================================
+# 측정값
+# ============================================
+def positional_unit_measures(df: pd.DataFrame, qty: pd.Series, currency: str,
+                             unit_currency: Optional[str] = None,
+                             divisor: Optional[float] = None) -> Dict[str, pd.Series]:
+    """
+    MLB FW 형식 CSV의 위치 기반 단가 컬럼 → 원가 항목 총금액 측정값
+
+    Args:
+        currency: 측정값 통화 ('usd' 또는 'krw')
+        unit_currency: 읽을 단가 컬럼 통화 ('usd' 14-21, 'krw' 22-29, 기본은 currency와 같음)
+        divisor: 단가를 나눌 환율 (KRW 단가로 USD 금액을 만들 때)
+    """
+    start = USD_UNIT_START if (unit_currency or currency) == 'usd' else KRW_UNIT_START
+    measures = {}
+    for name, offset in UNIT_COST_OFFSETS:
+        unit = df.iloc[:, start + offset]
+        if divisor is not None:
+            unit = unit / divisor
+        measures[f'{currency}_{name}'] = unit * qty
+    return measures
+
+
+# ============================================
+# 집계
+# ============================================
+def kpi_table(measures: pd.DataFrame, period: pd.Series, category: pd.Series) -> pd.DataFrame:
+    """
+    (기간, 카테고리)별 측정값 합계 - groupby 1회
+
+    Args:
+        measures: 행 단위 측정값 (이름 규칙은 모듈 설명 참고)
+        period: 행별 기간 (전년/당년 또는 시즌 코드, 다른 값/결측도 그대로 그룹)
+        category: 행별 카테고리
+
+    Returns:
+        (기간, 카테고리) 인덱스, 측정값 + 'rows'(행 수) 컬럼 (부분합은 하나로 합침)
+    """
+    # float64 컬럼으로 합계 (object 컬럼이면 groupby 합계가 행마다 파이썬 덧셈으로 처리됨)
+    measures = measures.astype('float64')
+    keys = [period.rename(PERIOD_KEY), category.rename(CATEGORY_KEY)]
+    grouped = measures.groupby(keys, sort=False, dropna=False)
+    sums = grouped.sum()
+
+    table = pd.DataFrame(index=sums.index)
+    parts: Dict[str, List[str]] = {}
+    for column in sums.columns:
+        parts.setdefault(column.split(PART_SEPARATOR, 1)[0], []).append(column)
+    for name, columns in parts.items():
+        table[name] = reduce(lambda total, column: total + sums[column], columns[1:], sums[columns[0]])
+    table[ROWS] = grouped.size()
+    return table
+
+
+def period_kpi(sums: Optional[pd.Series], currency: str) -> Dict[str, float]:
+    """
+    기간 합계 1행 → 평균 TAG/원가, 원가율, 항목별 금액/원가율
+
+    Args:
+        sums: kpi_table 행 (해당 기간 데이터가 없으면 None)
+        currency: 'usd' 또는 'krw'
+    """
+    if sums is None or sums[ROWS] == 0:
+        kpi = {'qty': 0, 'avgTag': 0, 'avgCost': 0, 'costRate': 0}
+        kpi.update({item: 0 for item in COST_ITEMS})
+        kpi.update({f'{item}Rate': 0 for item in COST_ITEMS})
+        return kpi
+
+    qty = sums[QTY]
+    avg_tag = sums[f'{currency}_tag'] / qty if qty > 0 else 0
+    costs = {item: sums[f'{currency}_{item}'] / qty if qty > 0 else 0 for item in COST_ITEMS}
+
+    # 총 원가 = 원부자재 + 아트웍 + 공임 + 마진 + 경비
+    avg_cost = costs['material'] + costs['artwork'] + costs['labor'] + costs['margin'] + costs['expense']
+
+    # 원가율 = (평균원가 ÷ (평균TAG / 1.1)) × 100
+    cost_rate = (avg_cost / (avg_tag / 1.1)) * 100 if avg_tag > 0 else 0
+    tag_excl_vat = avg_tag / 1.1 if avg_tag > 0 else 0
+
+    kpi = {
+        'qty': int(qty),
+        'avgTag': round(avg_tag, 2),
+        'avgCost': round(avg_cost, 2),
+        'costRate': round(cost_rate, 1),
+    }
+    kpi.update({item: round(value, 2) for item, value in costs.items()})
+    kpi.update({
+        f'{item}Rate': round((value / tag_excl_vat) * 100 if tag_excl_vat > 0 else 0, 1)
+        for item, value in costs.items()
+    })
+    return kpi
+
+
+def _yoy(curr: float, prev: float) -> float:
+    return (curr / prev) * 100 if prev > 0 else 0
+
+
+def stats_entry(prev_sums: Optional[pd.Series], curr_sums: Optional[pd.Series],
+                qty_prev: float, qty_curr: float) -> Dict[str, Any]:
+    """전년/당년 합계 → JSON 통계 1개 (전체 또는 카테고리)"""
+    entry = {
+        f'qty{PREV_LABEL}': int(qty_prev),
+        f'qty{CURR_LABEL}': int(qty_curr),
+        'qtyYoY': round(_yoy(qty_curr, qty_prev), 1),
+    }
+    for currency in CURRENCIES:
+        prev = period_kpi(prev_sums, currency)
+        curr = period_kpi(curr_sums, currency)
+
+        def pair(name: str):
+            entry[f'{name}{PREV_LABEL}_{currency}'] = prev[name]
+            entry[f'{name}{CURR_LABEL}_{currency}'] = curr[name]
+
+        pair('costRate')
+        entry[f'costRateChange_{currency}'] = round(curr['costRate'] - prev['costRate'], 1)
+        pair('avgTag')
+        entry[f'tagYoY_{currency}'] = round(_yoy(curr['avgTag'], prev['avgTag']), 1)
+        pair('avgCost')
+        entry[f'costYoY_{currency}'] = round(_yoy(curr['avgCost'], prev['avgCost']), 1)
+        if currency in DETAIL_CURRENCIES:
+            for item in COST_ITEMS:
+                pair(item)
+            for item in COST_ITEMS:
+                pair(f'{item}Rate')
+    return entry
+
+
+def _row(table: pd.DataFrame, key) -> Optional[pd.Series]:
+    return table.loc[key] if key in table.index else None
+
+
+def summary_from_table(table: pd.DataFrame, prev_period: str, curr_period: str,
+                       category_order: Sequence[str]) -> Dict[str, Any]:
+    """
+    kpi_table 결과 → {'total': {...}, 'categories': [...]}
+
+    카테고리는 category_order 순서로, 데이터가 한 행도 없는 카테고리는 제외합니다.
+    """
+    totals = table.groupby(level=PERIOD_KEY, sort=False, dropna=False).sum()
+    total_prev = _row(totals, prev_period)
+    total_curr = _row(totals, curr_period)
+    total = stats_entry(
+        total_prev, total_curr,
+        total_prev[QTY] if total_prev is not None else 0,
+        total_curr[QTY] if total_curr is not None else 0,
+    )
+
+    present = set(table.index.get_level_values(CATEGORY_KEY))
+    categories = []
+    for category in category_order:
+        if category not in present:
+            continue
+        prev_sums = _row(table, (prev_period, category))
+        curr_sums = _row(table, (curr_period, category))
+        entry = stats_entry(
+            prev_sums, curr_sums,
+            period_kpi(prev_sums, 'usd')['qty'],
+            period_kpi(curr_sums, 'usd')['qty'],
+        )
+        categories.append({'category': category, **entry})
+
+    return {'total': total, 'categories': categories}
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MLB Non 시즌 공용 추출 모듈
+
+generate_fx_non_csv.py(FX_NON.csv 환율 산출)와 generate_mlb_non_csv.py(브랜드별 *_NON.csv)가
+시즌마다 거의 같은 쿼리를 따로 실행하던 것을, 전체 NON 시즌 기간을 합친 범위로 한 번만 조회해
+로컬(cache/non_extract/)에 저장하고 두 스크립트가 같은 스냅샷을 나눠 쓰도록 한 모듈입니다.
+
+저장하는 데이터:
+- base: 원가견적 단위 집계 (기간 구분 없음, 합의납기일 포함)
+- stor: PO × 입고일별 입고수량 (dw_stor)
+
+시즌별 기간 구분은 로컬에서 계산합니다.
+- derive_delivery_period_frame: 합의납기일 기준 (generate_mlb_non_csv 쿼리와 동일한 결과)
+- derive_stor_period_frame: 입고일 기준 (FX_NON.csv 환율 산출, 당년 기간은 calculate_stor_periods로 오늘까지)
+
+사용 예:
+    from non_extract import load_non_extract, derive_delivery_period_frame
+
+    extract = load_non_extract(conn, ['25FW'])
+    df = derive_delivery_period_frame(extract, *calculate_periods('25FW'))
+"""
+
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from query_pool import DEFAULT_MAX_WORKERS, run_queries
+from snowflake_query import arrow_to_frame
+
+# ============================================
+# 저장 설정
+# ============================================
+NON_EXTRACT_DIR = os.path.join('cache', 'non_extract')
+
+# FX_NON.csv 대상 시즌 (기본 조회 범위)
+NON_EXTRACT_SEASONS = ['25S', '25F', '26S', '26F']
+
+# 이 시간 안에 만든 스냅샷은 다시 조회하지 않고 재사용
+NON_EXTRACT_MAX_AGE_HOURS = 6
+
+# 결과 DataFrame에서 category로 변환할 코드 컬럼
+CATEGORY_COLUMNS = ['기간', '브랜드', '시즌', '발주통화']
+
+# 두 원본 쿼리의 order by (period_label desc, brd_cd, sesn desc, part_cd, po_no)
+SORT_COLUMNS = ['기간', '브랜드', '시즌', '스타일', 'PO']
+SORT_ASCENDING = [False, True, False, True, True]
+
+# 기간 구분 뒤 컬럼 순서 (원본 쿼리 select 순서)
+BASE_INFO_COLUMNS = ['브랜드', '시즌', '스타일', '중분류', '아이템명', 'PO', 'TAG', '발주수량']
+QUOTE_INFO_COLUMNS = ['원가견적번호', '발주통화', '제조업체', '견적서제출일자']
+STOR_COLUMNS = ['입고수량', '최초입고일', '최종입고일']
+DELIVERY_DATE_COLUMN = '합의납기일'
+
+
+class NonExtract(NamedTuple):
+    """NON 시즌 공용 추출 스냅샷"""
+    base: pd.DataFrame
+    stor: pd.DataFrame
+    start: date
+    end: date
+    created_at: datetime
+
+
+# ============================================
+# 기간 계산
+# ============================================
+def calculate_periods(season: str) -> Tuple[date, date, date, date]:
+    """
+    시즌에 따른 전년/당년 기간 계산 (항상 시즌 전체 기간)
+
+    Args:
+        season: 시즌 코드 (예: '25FW', '26SS', '25F', '26S')
+
+    Returns:
+        (prev_start, prev_end, curr_start, curr_end) 튜플
+    """
+    season_upper = season.upper()
+
+    if 'FW' in season_upper or (season_upper.endswith('F') and len(season) == 3):
+        # FW: 6/1 ~ 11/30
+        year = 2000 + int(season[:2])
+        prev_start = date(year - 1, 6, 1)
+        prev_end = date(year - 1, 11, 30)
+        curr_start = date(year, 6, 1)
+        curr_end = date(year, 11, 30)
+    elif 'SS' in season_upper or (season_upper.endswith('S') and len(season) == 3):
+        # SS: 12/1 ~ 다음해 5/31
+        # 예: 26S 당년 = 2025-12-01 ~ 2026-05-31, 전년 = 2024-12-01 ~ 2025-05-31
+        year = 2000 + int(season[:2])
+        curr_start = date(year - 1, 12, 1)
+        curr_end = date(year, 5, 31)
+        prev_start = date(year - 2, 12, 1)
+        prev_end = date(year - 1, 5, 31)
+    else:
+        raise ValueError(f"지원하지 않는 시즌 형식: {season}")
+
+    return prev_start, prev_end, curr_start, curr_end
+
+
+def calculate_stor_periods(season: str, today: Optional[date] = None) -> Tuple[date, date, date, date]:
+    """
+    입고일 기준 전년/당년 기간 (FX_NON.csv 환율 산출용) - calculate_periods에서 당년 종료일만 오늘로 제한
+
+    Args:
+        season: 시즌 코드 (예: '25FW', '26SS', '25F', '26S')
+        today: 기준일 (None이면 date.today())
+    """
+    prev_start, prev_end, curr_start, curr_end = calculate_periods(season)
+    return prev_start, prev_end, curr_start, min(curr_end, today or date.today())
+
+
+def calculate_union_window(seasons: Iterable[str]) -> Tuple[date, date]:
+    """여러 시즌의 전년~당년 기간을 모두 포함하는 조회 범위"""
+    periods = [calculate_periods(season) for season in seasons]
+    return min(p[0] for p in periods), max(p[3] for p in periods)
+
+
+# ============================================
+# SQL 쿼리 생성
+# ============================================
+def build_base_query(start: date, end: date) -> str:
+    """
+    원가견적 단위 집계 쿼리 (기간 구분 없음)
+
+    조회 범위 안에 합의납기일이 있거나 입고 실적이 있는 PO를 모두 포함합니다.
+    그룹 키는 두 원본 쿼리의 그룹 키에서 기간/입고 컬럼을 뺀 것과 같습니다
+    (합의납기일과 입고 집계는 PO당 하나이므로 그룹이 더 나뉘지 않음).
+    """
+    start_str = start.strftime('%Y-%m-%d')
+    end_str = end.strftime('%Y-%m-%d')
+
+    return f"""
+with main as (
+    select
+        a.brd_cd,
+        a.sesn,
+        a.part_cd,
+        a.po_no,
+        a.cost_quotation_no,
+        a.quotation_submit_dt,
+        b.type1,
+        b.type2,
+        a.mfac_compy_nm,
+        b.currency,
+        b.mfac_offer_cost_amt_curr,
+        b.mfac_nego_cost_amt,
+        p.item_nm as item_nm,
+        s.vtext2 as vtext2,
+        o1.tag_price as tag_price,
+        o2.po_qty_sum as po_qty_sum,
+        o2.indc_dt_cnfm as indc_dt_cnfm
+    from prcs.db_cost_mst a
+    join prcs.db_cost_dtl b on a.po_no = b.po_no
+        and a.quotation_seq = b.quotation_seq
+        and a.quotation_apv_stat_nm = '확정'
+    left join prcs.db_prdt p on p.prdt_cd = a.brd_cd || a.sesn || a.part_cd
+    left join sap_fnf.mst_prdt s on s.prdt_cd = p.prdt_cd
+    -- TAG (대표 TAG)
+    left join (
+        select prdt_cd, min(tag_price) as tag_price
+        from prcs.dw_ord
+        where tag_price is not null
+        group by prdt_cd
+    ) o1 on o1.prdt_cd = p.prdt_cd
+    -- PO별 수량 + 합의납기일
+    left join (
+        select po_no, sum(ord_qty) as po_qty_sum, max(indc_dt_cnfm) as indc_dt_cnfm
+        from prcs.dw_ord
+        group by po_no
+    ) o2 on o2.po_no = a.po_no
+    where a.sesn like '%N%'
+      and a.brd_cd in ('M', 'I', 'X')
+      and b.currency in ('USD', 'KRW')
+      and (
+          o2.indc_dt_cnfm between date '{start_str}' and date '{end_str}'
+          or a.po_no in (
+              select po_no
+              from prcs.dw_stor
+              where stor_dt between date '{start_str}' and date '{end_str}'
+          )
+      )
+)
+select
+    brd_cd as "브랜드",
+    sesn as "시즌",
+    part_cd as "스타일",
+    vtext2 as "중분류",
+    item_nm as "아이템명",
+    po_no as "PO",
+    tag_price as "TAG",
+    po_qty_sum as "발주수량",
+    cost_quotation_no as "원가견적번호",
+    currency as "발주통화",
+    mfac_compy_nm as "제조업체",
+    quotation_submit_dt as "견적서제출일자",
+    indc_dt_cnfm as "합의납기일",
+    -- USD 단가
+    sum(case when type1 = 100 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_원자재",
+    sum(case when type1 = 200 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_아트웍",
+    sum(case when type1 = 300 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_부자재",
+    sum(case when type1 = 350 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_택/라벨",
+    sum(case when type1 = 400 then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_공임",
+    sum(case when type1 = 700 then mfac_offer_cost_amt_curr else 0 end) as "(USD)본사공급자재",
+    sum(case when type1 = 500 and type2 = 'AAA' then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_정상마진",
+    sum(case when type1 = 500 and type2 <> 'AAA' then mfac_offer_cost_amt_curr else 0 end) as "본사협의단가_금액(USD)_기타마진/경비",
+    -- KRW 단가
+    sum(case when type1 = 100 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_원자재",
+    sum(case when type1 = 200 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_아트웍",
+    sum(case when type1 = 300 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_부자재",
+    sum(case when type1 = 350 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_택/라벨",
+    sum(case when type1 = 400 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_공임",
+    sum(case when type1 = 700 then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_본사공급자재",
+    sum(case when type1 = 500 and type2 = 'AAA' then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_정상마진",
+    sum(case when type1 = 500 and type2 <> 'AAA' then mfac_nego_cost_amt else 0 end) as "본사협의단가_T_금액(KRW)_기타마진/경비",
+    -- USD 총금액
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 in (100,300,350,700) then mfac_offer_cost_amt_curr else 0 end),0) as "USD_재료계(원/부/택/본공)_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 200 then mfac_offer_cost_amt_curr else 0 end),0) as "USD_아트웍_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 400 then mfac_offer_cost_amt_curr else 0 end),0) as "USD_공임_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and type2 = 'AAA' then mfac_offer_cost_amt_curr else 0 end),0) as "USD_정상마진_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and (type2 <> 'AAA' or type2 is null) then mfac_offer_cost_amt_curr else 0 end),0) as "USD_경비_총금액(단가×수량)",
+    -- KRW 총금액
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 in (100,300,350,700) then mfac_nego_cost_amt else 0 end),0) as "KRW_재료계(원/부/택/본공)_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 200 then mfac_nego_cost_amt else 0 end),0) as "KRW_아트웍_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 400 then mfac_nego_cost_amt else 0 end),0) as "KRW_공임_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and type2 = 'AAA' then mfac_nego_cost_amt else 0 end),0) as "KRW_정상마진_총금액(단가×수량)",
+    coalesce(po_qty_sum,0) * coalesce(sum(case when type1 = 500 and (type2 <> 'AAA' or type2 is null) then mfac_nego_cost_amt else 0 end),0) as "KRW_경비_총금액(단가×수량)"
+from main
+group by
+    brd_cd, sesn, part_cd, vtext2, item_nm, po_no, tag_price,
+    po_qty_sum, cost_quotation_no, currency, mfac_compy_nm, quotation_submit_dt, indc_dt_cnfm
+order by brd_cd, sesn desc, part_cd, po_no
+"""
+
+
+def build_stor_query(start: date, end: date) -> str:
+    """PO × 입고일별 입고수량 쿼리 (입고일 기준 기간 구분용)"""
+    start_str = start.strftime('%Y-%m-%d')
+    end_str = end.strftime('%Y-%m-%d')
+
+    return f"""
+select
+    po_no as "PO",
+    stor_dt as "입고일",
+    sum(qty) as "입고수량"
+from prcs.dw_stor
+where stor_dt between date '{start_str}' and date '{end_str}'
+group by po_no, stor_dt
+"""
+
+
+# ============================================
+# 스냅샷 저장/조회
+# ============================================
+def _query_hash(start: date, end: date) -> str:
+    text = build_base_query(start, end) + build_stor_query(start, end)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _meta_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, 'meta.json')
+
+
+def _load_cached(cache_dir: str, start: date, end: date) -> Optional[NonExtract]:
+    """조회 범위를 포함하고 만료되지 않은 스냅샷이 있으면 반환"""
+    try:
+        with open(_meta_path(cache_dir), encoding='utf-8') as f:
+            meta = json.load(f)
+        cached_start = date.fromisoformat(meta['start'])
+        cached_end = date.fromisoformat(meta['end'])
+        created_at = datetime.fromisoformat(meta['created_at'])
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if cached_start > start or cached_end < end:
+        return None
+    if datetime.now() - created_at > timedelta(hours=NON_EXTRACT_MAX_AGE_HOURS):
+        return None
+    if meta.get('query_hash') != _query_hash(cached_start, cached_end):
+        return None
+
+    base = arrow_to_frame(feather.read_table(os.path.join(cache_dir, 'base.arrow')))
+    stor = arrow_to_frame(feather.read_table(os.path.join(cache_dir, 'stor.arrow')))
+    return NonExtract(base, stor, cached_start, cached_end, created_at)
+
+
+def _save(cache_dir: str, base: pa.Table, stor: pa.Table, start: date, end: date, created_at: datetime):
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, table in [('base.arrow', base), ('stor.arrow', stor)]:
+        tmp_path = os.path.join(cache_dir, name + '.tmp')
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, os.path.join(cache_dir, name))
+
+    meta = {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'query_hash': _query_hash(start, end),
+        'base_rows': base.num_rows,
+        'stor_rows': stor.num_rows,
+    }
+    # 메타 파일은 데이터 파일 교체 후 마지막에 기록
+    tmp_path = _meta_path(cache_dir) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, _meta_path(cache_dir))
+
+
+def load_non_extract(conn, seasons: Optional[List[str]] = None, refresh: bool = False,
+                     cache_dir: str = NON_EXTRACT_DIR, connect: Optional[Callable] = None,
+                     max_workers: int = DEFAULT_MAX_WORKERS) -> NonExtract:
+    """
+    NON 시즌 공용 추출 스냅샷 조회 (필요할 때만 Snowflake 조회)
+
+    Args:
+        conn: Snowflake 연결 (캐시를 쓰는 경우 사용하지 않음)
+        seasons: 반드시 포함해야 하는 시즌 목록 (기본: NON_EXTRACT_SEASONS)
+        refresh: True면 캐시를 무시하고 다시 조회
+        cache_dir: 스냅샷 저장 경로
+        connect: 추가 연결을 만드는 함수 (있으면 원가/입고 쿼리를 동시에 실행)
+        max_workers: 최대 동시 실행 쿼리 수
+
+    Returns:
+        NonExtract (실패 시 예외 발생)
+    """
+    seasons = list(seasons or NON_EXTRACT_SEASONS)
+    start, end = calculate_union_window(seasons)
+
+    if not refresh:
+        cached = _load_cached(cache_dir, start, end)
+        if cached is not None:
+            print(f"[INFO] NON 공용 추출 캐시 사용: {cached.start} ~ {cached.end} "
+                  f"({cached.created_at.strftime('%Y-%m-%d %H:%M')} 조회, {len(cached.base)}행)")
+            return cached
+
+    # 다음 실행에서도 재사용할 수 있도록 기본 시즌 범위까지 합쳐서 조회
+    start, end = calculate_union_window(seasons + NON_EXTRACT_SEASONS)
+    print(f"\n[INFO] NON 공용 추출 조회 중... ({start} ~ {end})")
+    created_at = datetime.now()
+    base, stor = run_queries(
+        conn,
+        [('원가', build_base_query(start, end)), ('입고', build_stor_query(start, end))],
+        connect=connect,
+        max_workers=max_workers,
+    )
+    _save(cache_dir, base, stor, start, end, created_at)
+    print(f"[OK] NON 공용 추출 완료: 원가 {base.num_rows}행, 입고 {stor.num_rows}행 → {cache_dir}")
+
+    return NonExtract(arrow_to_frame(base), arrow_to_frame(stor), start, end, created_at)
+
+
+# ============================================
+# 시즌별 기간 구분
+# ============================================
+def _period_labels(dates: pd.Series, prev_start: date, prev_end: date,
+                   curr_start: date, curr_end: date) -> np.ndarray:
+    """날짜를 '전년'/'당년'/None으로 구분 (SQL case when between 과 동일, 전년 우선)"""
+    values = pd.to_datetime(dates)
+    in_prev = (values >= pd.Timestamp(prev_start)) & (values <= pd.Timestamp(prev_end))
+    in_curr = (values >= pd.Timestamp(curr_start)) & (values <= pd.Timestamp(curr_end))
+    return np.select([in_prev.to_numpy(), in_curr.to_numpy()], ['전년', '당년'], default=None)
+
+
+def _finalize(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """원본 쿼리와 같은 컬럼 순서/정렬/타입으로 정리"""
+    df = df[columns].sort_values(SORT_COLUMNS, ascending=SORT_ASCENDING, kind='stable')
+    df = df.reset_index(drop=True)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _cost_columns(base: pd.DataFrame) -> List[str]:
+    info = set(BASE_INFO_COLUMNS + QUOTE_INFO_COLUMNS + [DELIVERY_DATE_COLUMN])
+    return [col for col in base.columns if col not in info]
+
+
+def derive_delivery_period_frame(extract: NonExtract, prev_start: date, prev_end: date,
+                                 curr_start: date, curr_end: date) -> pd.DataFrame:
+    """
+    합의납기일 기준 기간 구분 (generate_mlb_non_csv.build_sql_query 결과와 동일)
+
+    합의납기일이 전년/당년 기간에 속하는 견적만 남기고 '기간' 컬럼을 붙입니다.
+    """
+    base = extract.base.copy()
+    base['기간'] = _period_labels(base[DELIVERY_DATE_COLUMN], prev_start, prev_end, curr_start, curr_end)
+    base = base[base['기간'].notna()]
+
+    columns = (['기간'] + BASE_INFO_COLUMNS + QUOTE_INFO_COLUMNS + [DELIVERY_DATE_COLUMN]
+               + _cost_columns(extract.base))
+    return _finalize(base, columns)
+
+
+def derive_stor_period_frame(extract: NonExtract, prev_start: date, prev_end: date,
+                             curr_start: date, curr_end: date) -> pd.DataFrame:
+    """
+    입고일 기준 기간 구분 (generate_fx_non_csv.py FX_NON.csv 환율 산출용, 기간은 calculate_stor_periods)
+
+    기간 안에 입고 실적이 있는 PO의 견적을 (견적 × 기간) 단위로 펼치고
+    기간별 입고수량/최초입고일/최종입고일을 붙입니다.
+    """
+    stor = extract.stor.copy()
+    stor['기간'] = _period_labels(stor['입고일'], prev_start, prev_end, curr_start, curr_end)
+    stor = stor[stor['기간'].notna()]
+    stor_sum = stor.groupby(['PO', '기간'], sort=False).agg(
+        입고수량=('입고수량', 'sum'),
+        최초입고일=('입고일', 'min'),
+        최종입고일=('입고일', 'max'),
+    ).reset_index()
+
+    base = extract.base.drop(columns=[DELIVERY_DATE_COLUMN])
+    df = base.merge(stor_sum, on='PO', how='inner')
+
+    columns = (['기간'] + BASE_INFO_COLUMNS + STOR_COLUMNS + QUOTE_INFO_COLUMNS
+               + _cost_columns(extract.base))
+    return _finalize(df, columns)
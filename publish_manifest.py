@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+게시(배포) 파일 매니페스트 모듈
+
+auto_update_dashboard.py가 마지막으로 Git 푸시 + Vercel 배포에 성공했을 때의 대시보드 데이터 파일
+(public/COST RAW 아래 CSV/JSON) 내용 해시를 기록해 두고, 이번 실행의 파일과 비교해
+바뀐 파일이 없으면 푸시/배포를 건너뛰고, 바뀌었으면 어떤 시즌/브랜드가 바뀌었는지 알려주는 모듈입니다.
+
+artifact_writer.py의 변경 집계는 "이번 실행에서 바뀐 파일"이라, 지난번 푸시/배포가 실패했으면
+다음 실행에서 파일이 그대로여도 배포해야 합니다. 이 매니페스트는 "배포된 것과 다른 파일"을 봅니다.
+
+저장 위치:
+    cache/published_artifacts.json
+    {
+        "published_at": "2025-11-20 11:05:12",
+        "build_rev": "<로컬 빌드(vercel build)에 쓴 코드 커밋, data_only 모드>",
+        "artifacts": {"public/COST RAW/26SS/M_26S.csv": "<sha256>", ...}
+    }
+
+- 숨김 파일과 임시 파일은 제외
+- 기록이 없으면 모든 파일이 바뀐 것으로 봄 (첫 실행은 항상 배포)
+
+사용 예:
+    from publish_manifest import current_artifacts, diff_artifacts, load_published, record_published
+
+    current = current_artifacts()
+    changes = diff_artifacts(current, load_published().get('artifacts', {}))
+    if changes['added'] or changes['modified'] or changes['removed']:
+        ... 푸시/배포 ...
+        record_published(current)
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from build_manifest import file_digest
+
+# ============================================
+# 저장 설정
+# ============================================
+PUBLIC_DIR = 'public'
+ARTIFACT_ROOT = os.path.join(PUBLIC_DIR, 'COST RAW')
+MANIFEST_FILE = os.path.join('cache', 'published_artifacts.json')
+ARTIFACT_EXTENSIONS = ('.csv', '.json')
+
+# 파일명에서 브랜드 추출: M_26S.csv, X_25F_kids.csv, M_25F_NON.csv, M_insight_26ss.csv, summary_26s_x_kids.json
+BRAND_FILE_PATTERN = re.compile(r'^(?P<brand>[A-Z]+)_(?:(?P<season>\d{2}[A-Z]+)|insight_)')
+SUMMARY_FILE_PATTERN = re.compile(r'^summary_[0-9a-z]+_(?P<brand>[a-z]+)(?P<suffix>_kids|_non)?\.json$')
+
+# 시즌 폴더 밖의 공통 파일 (FX.csv, FX_NON.csv 등)
+COMMON_SCOPE = '공통'
+
+
+# ============================================
+# 현재 파일 / 비교
+# ============================================
+def _display_path(path: str) -> str:
+    return os.path.relpath(path).replace(os.sep, '/')
+
+
+def current_artifacts(root: str = ARTIFACT_ROOT) -> Dict[str, str]:
+    """게시 대상 파일 경로 → 내용 해시"""
+    artifacts = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if not name.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.startswith('.') or not filename.lower().endswith(ARTIFACT_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            artifacts[_display_path(path)] = file_digest(path)
+    return artifacts
+
+
+def diff_artifacts(current: Dict[str, str], published: Dict[str, str]) -> Dict[str, List[str]]:
+    """게시된 기록과 비교: {'added': [...], 'modified': [...], 'removed': [...]}"""
+    return {
+        'added': sorted(set(current) - set(published)),
+        'modified': sorted(path for path in set(current) & set(published) if current[path] != published[path]),
+        'removed': sorted(set(published) - set(current)),
+    }
+
+
+def changed_paths(changes: Dict[str, List[str]]) -> List[str]:
+    """추가/수정/삭제된 전체 경로"""
+    return sorted(changes['added'] + changes['modified'] + changes['removed'])
+
+
+def changed_scopes(paths: List[str], root: str = ARTIFACT_ROOT) -> Dict[str, List[str]]:
+    """
+    바뀐 파일을 시즌 폴더별 브랜드로 묶기
+
+    Returns:
+        {'26SS': ['M', 'X-KIDS'], '공통': ['FX.csv']}
+        (시즌 폴더 밖의 원가 CSV는 파일명의 시즌, 브랜드를 알 수 없는 파일은 파일명)
+    """
+    root_prefix = _display_path(root) + '/'
+    scopes: Dict[str, set] = {}
+    for path in paths:
+        relative = path[len(root_prefix):] if path.startswith(root_prefix) else path
+        folder, _, filename = relative.rpartition('/')
+        scope = folder or COMMON_SCOPE
+
+        summary = SUMMARY_FILE_PATTERN.match(filename)
+        brand_file = BRAND_FILE_PATTERN.match(filename)
+        if summary:
+            label = summary.group('brand').upper() + ('-KIDS' if summary.group('suffix') == '_kids' else '')
+        elif brand_file:
+            label = brand_file.group('brand') + ('-KIDS' if '_kids' in filename else '')
+            scope = folder or brand_file.group('season') or COMMON_SCOPE
+        else:
+            label = filename
+        scopes.setdefault(scope, set()).add(label)
+    return {scope: sorted(labels) for scope, labels in sorted(scopes.items())}
+
+
+def format_scopes(scopes: Dict[str, List[str]]) -> str:
+    """'26SS: M, X / 공통: FX.csv' 형식"""
+    return ' / '.join(f"{scope}: {', '.join(labels)}" for scope, labels in scopes.items())
+
+
+# ============================================
+# 매니페스트 읽기/쓰기
+# ============================================
+def load_published(manifest_file: str = MANIFEST_FILE) -> dict:
+    """마지막 게시 기록 (없으면 빈 dict)"""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def record_published(artifacts: Dict[str, str], build_rev: Optional[str] = None,
+                     manifest_file: str = MANIFEST_FILE):
+    """
+    푸시/배포에 성공한 파일 해시 기록
+
+    Args:
+        build_rev: 로컬 빌드에 쓴 코드 커밋 (None이면 이전 기록 유지)
+    """
+    manifest = load_published(manifest_file)
+    manifest['published_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if build_rev is not None:
+        manifest['build_rev'] = build_rev
+    manifest['artifacts'] = dict(sorted(artifacts.items()))
+
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    tmp_path = manifest_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_file)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snowflake 쿼리 병렬 실행 모듈
+
+서로 독립적인 기간/시즌 쿼리를 하나의 연결에서 순서대로 실행하던 것을,
+작은 연결 풀로 동시에 실행하도록 한 모듈입니다.
+
+- 동시 실행 수(max_workers) 만큼만 연결을 만들어 재사용 (기존 연결 1개 포함)
+- 쿼리별 타임아웃 (Snowflake cursor.execute(timeout=...))
+- 일시적인 오류(연결 끊김, 타임아웃 취소 등)는 지수 백오프로 재시도
+- 결과는 완료 순서와 관계없이 입력한 순서대로 반환
+
+사용 예:
+    from query_pool import run_queries
+
+    tables = run_queries(conn, [('base', base_query), ('stor', stor_query)],
+                         connect=connect_to_database, max_workers=2)
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+from snowflake.connector.errors import InterfaceError, OperationalError, ProgrammingError
+
+from snowflake_query import fetch_arrow_table
+
+# ============================================
+# 실행 설정
+# ============================================
+DEFAULT_MAX_WORKERS = 4          # 동시 실행 쿼리 수 (= 최대 연결 수)
+DEFAULT_QUERY_TIMEOUT = 600      # 쿼리별 타임아웃 (초)
+DEFAULT_RETRIES = 2              # 실패 시 재시도 횟수
+DEFAULT_BACKOFF = 2.0            # 첫 재시도 대기 시간 (초), 이후 2배씩 증가
+
+# Snowflake가 타임아웃으로 쿼리를 취소했을 때의 오류 번호
+QUERY_CANCELLED_ERRNO = 604
+
+
+def is_retryable(error: Exception) -> bool:
+    """재시도할 만한 일시적 오류인지 판단 (SQL 오류 등은 재시도하지 않음)"""
+    if isinstance(error, (OperationalError, InterfaceError, ConnectionError, TimeoutError)):
+        return True
+    return isinstance(error, ProgrammingError) and getattr(error, 'errno', None) == QUERY_CANCELLED_ERRNO
+
+
+# ============================================
+# 연결 풀
+# ============================================
+class ConnectionPool:
+    """
+    최대 size개의 Snowflake 연결을 빌려주는 풀
+
+    처음 받은 연결(base_conn)을 먼저 사용하고, 모자라면 connect()로 새 연결을 만듭니다.
+    close()는 풀이 직접 만든 연결만 닫습니다 (base_conn은 호출한 쪽에서 닫음).
+    """
+
+    def __init__(self, base_conn, connect: Optional[Callable] = None, size: int = DEFAULT_MAX_WORKERS):
+        self.connect = connect
+        self.size = max(1, size if connect else 1)
+        self._idle = queue.LifoQueue()
+        self._created = []
+        self._lock = threading.Lock()
+        self._count = 1
+        self._idle.put(base_conn)
+
+    def acquire(self):
+        """쉬는 연결을 꺼내고, 없으면 (한도 안에서) 새로 연결하거나 반납을 기다림"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._count < self.size
+            if can_create:
+                self._count += 1
+        if can_create:
+            try:
+                conn = self.connect()
+                if conn is None:
+                    raise OperationalError(msg="Snowflake 연결 실패")
+            except Exception:
+                with self._lock:
+                    self._count -= 1
+                raise
+            self._created.append(conn)
+            return conn
+        return self._idle.get()
+
+    def release(self, conn, broken: bool = False):
+        """연결 반납 (오류로 끊긴 연결은 닫고 다음에 새로 만들 수 있게 자리만 반환)"""
+        if broken and conn in self._created:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._created.remove(conn)
+            self._count -= 1
+
+    def close(self):
+        for conn in list(self._created):
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._created.clear()
+
+
+# ============================================
+# 병렬 실행
+# ============================================
+def _run_one(pool: ConnectionPool, key: str, query: str, timeout: Optional[int],
+             retries: int, backoff: float) -> pa.Table:
+    """쿼리 1개 실행 (일시적 오류는 재시도)"""
+    attempt = 0
+    while True:
+        conn = pool.acquire()
+        started = time.perf_counter()
+        try:
+            table = fetch_arrow_table(conn, query, timeout=timeout)
+        except Exception as e:
+            broken = isinstance(e, (OperationalError, InterfaceError, ConnectionError))
+            pool.release(conn, broken=broken)
+            if attempt >= retries or not is_retryable(e):
+                raise
+            wait = backoff * (2 ** attempt)
+            attempt += 1
+            print(f"[WARN] 쿼리 실패 ({key}): {e} → {wait:.0f}초 후 재시도 ({attempt}/{retries})")
+            time.sleep(wait)
+            continue
+        pool.release(conn)
+        print(f"[OK] 쿼리 완료 ({key}): {table.num_rows}행, {time.perf_counter() - started:.1f}초")
+        return table
+
+
+def run_queries(conn, queries: Sequence[Tuple[str, str]], connect: Optional[Callable] = None,
+                max_workers: int = DEFAULT_MAX_WORKERS, timeout: Optional[int] = DEFAULT_QUERY_TIMEOUT,
+                retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF) -> List[pa.Table]:
+    """
+    독립적인 쿼리들을 연결 풀로 동시에 실행
+
+    Args:
+        conn: 기존 Snowflake 연결 (풀의 첫 번째 연결로 사용)
+        queries: (이름, SQL) 목록 - 이름은 로그 표시용
+        connect: 새 연결을 만드는 함수 (없으면 conn 하나로 순서대로 실행)
+        max_workers: 최대 동시 실행 수 (= 최대 연결 수)
+        timeout: 쿼리별 타임아웃 (초, None이면 제한 없음)
+        retries: 일시적 오류 재시도 횟수
+        backoff: 첫 재시도 대기 시간 (초), 재시도마다 2배
+
+    Returns:
+        queries와 같은 순서의 Arrow 테이블 목록 (하나라도 실패하면 예외 발생)
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+
+    pool = ConnectionPool(conn, connect, min(max_workers, len(queries)))
+    try:
+        if pool.size == 1:
+            return [_run_one(pool, key, query, timeout, retries, backoff) for key, query in queries]
+
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            futures = [
+                executor.submit(_run_one, pool, key, query, timeout, retries, backoff)
+                for key, query in queries
+            ]
+            try:
+                # 입력 순서대로 결과 수집 (실패하면 아직 시작하지 않은 쿼리는 취소)
+                return [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        pool.close()
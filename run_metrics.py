@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+실행 계측(span) 모듈
+
+auto_update_dashboard.py와 생성 스크립트의 단계별 소요 시간/자원 사용량을 구조화해 기록하는 모듈입니다.
+단계(span)마다 실제 경과 시간, CPU 시간, 최대 메모리(RSS), 입력/출력 행 수, 기록한 파일 크기를
+브랜드/시즌 속성과 함께 남기고, 실행이 끝나면 JSON 보고서와 실행 이력을 logs/ 아래에 저장합니다.
+
+- span은 스레드별로 중첩 (작업 그래프의 작업 안에서 호출한 생성 스크립트의 span은 그 작업의 하위 span)
+- record/record_file은 현재 스레드에서 가장 안쪽 span에 행 수/파일 크기를 더함 (span 밖이면 무시)
+- CPU 시간은 span을 연 스레드 기준 (내부에서 만든 스레드의 CPU 시간은 포함되지 않음)
+- 최대 RSS는 span이 끝난 시점까지의 프로세스 최대값 (MB)
+
+저장 위치:
+    logs/run_reports/run_YYYYMMDD_HHMMSS.json   실행 1회의 전체 span 목록과 단계별 합계
+    logs/run_history.jsonl                      실행마다 단계별 합계 1줄 (날짜별 비교용)
+
+사용 예:
+    from run_metrics import span, record, record_file
+
+    with span('summary', season='26SS', brand='M'):
+        df = read_cost_frame(csv_file)
+        record(rows_in=len(df))
+        ...
+        record_file(output_file)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# ============================================
+# 저장 설정
+# ============================================
+REPORT_DIR = os.path.join('logs', 'run_reports')
+HISTORY_FILE = os.path.join('logs', 'run_history.jsonl')
+
+# 이전 실행 대비 느려진 단계 표시 기준
+REGRESSION_RATIO = 1.5           # 이전 실행의 1.5배 이상
+REGRESSION_MIN_SECONDS = 5.0     # 그리고 5초 이상 늘어난 경우 (짧은 단계의 흔들림 제외)
+
+_lock = threading.Lock()
+_local = threading.local()
+_spans: List[dict] = []
+_run_start = time.perf_counter()
+_run_started_at = datetime.now()
+
+
+# ============================================
+# 메모리
+# ============================================
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB, 확인할 수 없으면 None)"""
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize / (1024 * 1024)
+        except (AttributeError, OSError):
+            pass
+        return None
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ============================================
+# span 기록
+# ============================================
+class Span:
+    """진행 중인 단계 1개 (span 컨텍스트에서 반환)"""
+
+    def __init__(self, name: str, attrs: Dict[str, object], parent: Optional[str]):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bytes_written = 0
+        self.status = 'ok'
+        self.error = ''
+
+    def add(self, rows_in: int = 0, rows_out: int = 0, bytes_written: int = 0):
+        self.rows_in += int(rows_in)
+        self.rows_out += int(rows_out)
+        self.bytes_written += int(bytes_written)
+
+    def fail(self, error: str = ''):
+        """예외 없이 실패한 단계 표시 (생성 함수가 False를 반환한 경우 등)"""
+        self.status = 'failed'
+        self.error = error
+
+
+def _stack() -> List[Span]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def start_run():
+    """새 실행 시작 (이전에 기록한 span을 비우고 시작 시각을 다시 잡음)"""
+    global _run_start, _run_started_at
+    with _lock:
+        _spans.clear()
+        _run_start = time.perf_counter()
+        _run_started_at = datetime.now()
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """
+    단계 1개 계측
+
+    Args:
+        name: 단계 이름 (예: sql_to_csv.write_csv, summary) - 보고서는 이름별로 합계
+        attrs: 브랜드/시즌 등 구분 속성 (None인 값은 제외)
+    """
+    stack = _stack()
+    current = Span(name, {key: value for key, value in attrs.items() if value is not None},
+                   stack[-1].name if stack else None)
+    stack.append(current)
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        yield current
+    except BaseException as e:
+        current.fail(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        stack.pop()
+        finished = time.perf_counter()
+        peak = peak_rss_mb()
+        entry = {
+            'name': current.name,
+            'attrs': current.attrs,
+            'parent': current.parent,
+            'thread': threading.current_thread().name,
+            'started': round(started - _run_start, 3),
+            'wall': round(finished - started, 3),
+            'cpu': round(time.thread_time() - cpu_started, 3),
+            'peak_rss_mb': round(peak, 1) if peak is not None else None,
+            'rows_in': current.rows_in,
+            'rows_out': current.rows_out,
+            'bytes_written': current.bytes_written,
+            'status': current.status,
+        }
+        if current.error:
+            entry['error'] = current.error
+        with _lock:
+            _spans.append(entry)
+
+
+def current_span() -> Optional[Span]:
+    """현재 스레드에서 가장 안쪽 span (없으면 None)"""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def record(rows_in: int = 0, rows_out: int = 0, bytes_written: int = 0):
+    """현재 span에 입력/출력 행 수, 기록 바이트 추가 (span 밖이면 무시)"""
+    current = current_span()
+    if current is not None:
+        current.add(rows_in, rows_out, bytes_written)
+
+
+def record_file(*paths: str):
+    """방금 저장한 파일 크기를 현재 span의 기록 바이트에 추가"""
+    current = current_span()
+    if current is None:
+        return
+    for path in paths:
+        try:
+            current.add(bytes_written=os.path.getsize(path))
+        except OSError:
+            pass
+
+
+def annotate(**attrs):
+    """현재 span에 속성 추가 (예: 입력 변경이 없어 건너뜀)"""
+    current = current_span()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def finished_spans() -> List[dict]:
+    """지금까지 끝난 span 목록 (종료 순서)"""
+    with _lock:
+        return list(_spans)
+
+
+# ============================================
+# 보고서
+# ============================================
+def summarize(spans: List[dict]) -> Dict[str, dict]:
+    """단계 이름별 합계 (여러 브랜드/시즌 span을 합산, 최대 RSS는 최대값)"""
+    steps: Dict[str, dict] = {}
+    for entry in spans:
+        step = steps.setdefault(entry['name'], {
+            'count': 0, 'failed': 0, 'wall': 0.0, 'cpu': 0.0, 'peak_rss_mb': None,
+            'rows_in': 0, 'rows_out': 0, 'bytes_written': 0,
+        })
+        step['count'] += 1
+        step['failed'] += entry['status'] != 'ok'
+        step['wall'] = round(step['wall'] + entry['wall'], 3)
+        step['cpu'] = round(step['cpu'] + entry['cpu'], 3)
+        for key in ('rows_in', 'rows_out', 'bytes_written'):
+            step[key] += entry[key]
+        if entry['peak_rss_mb'] is not None:
+            step['peak_rss_mb'] = max(step['peak_rss_mb'] or 0.0, entry['peak_rss_mb'])
+    return steps
+
+
+def load_history(history_file: str = HISTORY_FILE, limit: Optional[int] = None) -> List[dict]:
+    """이전 실행 이력 (오래된 순, limit이면 최근 limit개)"""
+    try:
+        with open(history_file, 'r', encoding='utf-8') as f:
+            lines = [line for line in f if line.strip()]
+    except OSError:
+        return []
+
+    history = []
+    for line in lines[-limit:] if limit else lines:
+        try:
+            history.append(json.loads(line))
+        except ValueError:
+            continue
+    return history
+
+
+def find_regressions(steps: Dict[str, dict], previous: Optional[dict]) -> List[str]:
+    """이전 실행보다 크게 느려진 단계 이름"""
+    if not previous:
+        return []
+    prev_steps = previous.get('steps', {})
+    regressions = []
+    for name, step in steps.items():
+        prev = prev_steps.get(name)
+        if not prev or not prev.get('wall'):
+            continue
+        if step['wall'] >= prev['wall'] * REGRESSION_RATIO and step['wall'] - prev['wall'] >= REGRESSION_MIN_SECONDS:
+            regressions.append(name)
+    return regressions
+
+
+def write_run_report(status: str, extra: Optional[dict] = None, report_dir: str = REPORT_DIR,
+                     history_file: str = HISTORY_FILE) -> str:
+    """
+    이번 실행의 JSON 보고서 저장 및 실행 이력 1줄 추가
+
+    Args:
+        status: 실행 결과 (success/failed)
+        extra: 보고서에 함께 저장할 값 (예: 오류 메시지)
+
+    Returns:
+        저장한 보고서 경로
+    """
+    spans = finished_spans()
+    steps = summarize(spans)
+    finished_at = datetime.now()
+    peak = peak_rss_mb()
+    report = {
+        'started_at': _run_started_at.isoformat(timespec='seconds'),
+        'finished_at': finished_at.isoformat(timespec='seconds'),
+        'wall_time': round(time.perf_counter() - _run_start, 3),
+        'status': status,
+        'peak_rss_mb': round(peak, 1) if peak is not None else None,
+        'steps': steps,
+        'spans': spans,
+    }
+    if extra:
+        report.update(extra)
+
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, f"run_{_run_started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    history_dir = os.path.dirname(history_file)
+    if history_dir:
+        os.makedirs(history_dir, exist_ok=True)
+    history_entry = {key: report[key] for key in ('started_at', 'wall_time', 'status', 'peak_rss_mb', 'steps')}
+    with open(history_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(history_entry, ensure_ascii=False) + '\n')
+    return report_path
+
+
+def display_width(text: str) -> int:
+    """고정폭 글꼴 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in text)
+
+
+def format_step_table(steps: Dict[str, dict], previous: Optional[dict] = None,
+                      markdown: bool = False, limit: int = 15) -> List[str]:
+    """
+    단계별 합계 표 (소요 시간 순, 알림 메시지용)
+
+    Args:
+        steps: summarize 결과
+        previous: 이전 실행 이력 1개 (있으면 '이전 대비' 열 표시, 크게 느려진 단계는 ▲)
+        markdown: True면 Teams용 마크다운 표, False면 이메일용 고정폭 표
+        limit: 표시할 최대 단계 수
+    """
+    prev_steps = (previous or {}).get('steps', {})
+    regressions = set(find_regressions(steps, previous))
+    headers = ['단계', '횟수', '소요(초)', 'CPU(초)', '입력행', '출력행', '기록(MB)', '최대RSS(MB)', '이전 대비']
+
+    rows = []
+    for name, step in sorted(steps.items(), key=lambda item: item[1]['wall'], reverse=True)[:limit]:
+        prev = prev_steps.get(name)
+        if prev and prev.get('wall') is not None:
+            delta = f"{step['wall'] - prev['wall']:+.1f}초" + (' ▲' if name in regressions else '')
+        else:
+            delta = '-'
+        failed = f" (실패 {step['failed']})" if step['failed'] else ''
+        rows.append([
+            name,
+            f"{step['count']}{failed}",
+            f"{step['wall']:.1f}",
+            f"{step['cpu']:.1f}",
+            f"{step['rows_in']:,}",
+            f"{step['rows_out']:,}",
+            f"{step['bytes_written'] / (1024 * 1024):.1f}",
+            f"{step['peak_rss_mb']:.0f}" if step['peak_rss_mb'] is not None else '-',
+            delta,
+        ])
+
+    if markdown:
+        lines = ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(headers)]
+        lines.extend('| ' + ' | '.join(row) + ' |' for row in rows)
+        return lines
+
+    widths = [max(display_width(cell) for cell in column) for column in zip(headers, *rows)]
+    return ['  '.join(cell + ' ' * (width - display_width(cell)) for cell, width in zip(row, widths)).rstrip()
+            for row in [headers] + rows]
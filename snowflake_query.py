@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Snowflake 쿼리 결과 Arrow 조회 공용 모듈
+
+각 스크립트의 execute_query가 cursor.fetchall()로 모든 행을 파이썬 튜플로 만든 뒤
+다시 DataFrame으로 변환하던 부분을 Arrow 배치 조회로 바꾼 모듈입니다.
+
+- cursor.fetch_arrow_all()로 결과를 Arrow 테이블로 바로 받음
+- 숫자(NUMBER) 컬럼: 소수 자릿수가 있으면 float64, 정수면 int64 (NULL이 있으면 nullable Int64)
+  → 수량/TAG 같은 정수 컬럼은 NULL 유무와 관계없이 CSV에 1412로 기록 (1412.0이 되지 않음)
+- 날짜 컬럼: datetime64
+- 지정한 코드 컬럼(브랜드, 시즌, 발주통화 등): category
+- 큰 결과는 iter_query_frames로 배치 단위 스트리밍 조회
+- Arrow 결과를 쓸 수 없는 연결이면 fetchall 결과를 Arrow 테이블로 변환해 같은 타입으로 반환
+
+필요 패키지: pip install "snowflake-connector-python[pandas]" (pyarrow 포함)
+
+사용 예:
+    from snowflake_query import fetch_dataframe, iter_query_frames
+
+    df = fetch_dataframe(conn, query, category_columns=['브랜드', '시즌'])
+    for df_batch in iter_query_frames(conn, query):
+        ...
+"""
+
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
+
+from run_metrics import span
+
+# fetchall 대체 경로에서 한 번에 가져올 행 수
+FALLBACK_BATCH_ROWS = 50000
+
+
+# ============================================
+# Arrow → pandas 타입 변환
+# ============================================
+def _decimal_to_numpy(arr: pa.Array, as_integer: bool) -> Union[np.ndarray, pd.arrays.IntegerArray]:
+    """
+    decimal128 배열을 float64(또는 정수) 배열로 정확하게 변환
+
+    as_integer이고 스케일이 0이면 int64 (NULL이 있으면 nullable Int64) - 소수 자릿수가 없는
+    NUMBER 컬럼이 배치/증분 구간에 NULL이 있는지에 따라 float64가 되지 않도록.
+
+    pyarrow의 decimal → float64 캐스트는 가장 가까운 값으로 반올림되지 않는 경우가 있어
+    (Decimal → float 변환과 1ulp 차이), 스케일 없는 정수값을 10**scale로 직접 나눕니다.
+    두 값이 모두 float64로 정확히 표현되는 범위에서는 나눗셈 결과가 float(Decimal)과 같습니다.
+    """
+    scale = arr.type.scale
+    n = len(arr)
+    nulls = arr.is_null().to_numpy(zero_copy_only=False) if arr.null_count else np.zeros(n, dtype=bool)
+
+    if pa.types.is_decimal128(arr.type) and 0 <= scale <= 22:
+        words = np.frombuffer(arr.buffers()[1], dtype='<i8')[2 * arr.offset: 2 * (arr.offset + n)]
+        low = words[0::2]
+        high = words[1::2]
+        # 상위 64비트가 부호 확장이면 하위 64비트가 곧 정수값
+        exact = (high == (low >> 63)) & (low > -2 ** 53) & (low < 2 ** 53) & ~nulls
+    else:
+        low = np.zeros(n, dtype=np.int64)
+        exact = np.zeros(n, dtype=bool)
+
+    if as_integer and scale == 0 and (exact | nulls).all():
+        if not nulls.any():
+            return low.astype(np.int64)
+        return pd.arrays.IntegerArray(np.where(nulls, 0, low).astype(np.int64), nulls)
+
+    values = np.full(n, np.nan, dtype=np.float64)
+    values[exact] = low[exact].astype(np.float64) / (10.0 ** scale)
+
+    # 범위를 벗어난 값은 Decimal을 거쳐 변환 (드묾)
+    for i in np.flatnonzero(~exact & ~nulls):
+        values[i] = float(Decimal(arr[i].as_py()))
+    return values
+
+
+def arrow_to_frame(table: pa.Table, category_columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Arrow 테이블을 타입이 정해진 DataFrame으로 변환
+
+    Args:
+        table: 쿼리 결과 Arrow 테이블
+        category_columns: category로 변환할 코드 컬럼명 목록 (테이블에 없는 컬럼은 무시)
+
+    Returns:
+        DataFrame (숫자: float64/int64/Int64, 날짜: datetime64, 코드: category)
+    """
+    category_set = set(category_columns or [])
+    data = {}
+
+    for name, column in zip(table.column_names, table.columns):
+        arr = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        col_type = arr.type
+
+        if pa.types.is_decimal(col_type):
+            data[name] = _decimal_to_numpy(arr, as_integer=True)
+        elif pa.types.is_integer(col_type):
+            # 결과 배치마다 int8/int16 등으로 줄어든 정수 컬럼을 int64로 통일 (곱셈 오버플로 방지)
+            # NULL이 있으면 nullable Int64 (float64로 바뀌면 CSV에 1412.0으로 기록됨)
+            if arr.null_count:
+                data[name] = arr.cast(pa.int64()).to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+            else:
+                data[name] = arr.cast(pa.int64()).to_numpy(zero_copy_only=False)
+        elif pa.types.is_floating(col_type):
+            data[name] = arr.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        elif pa.types.is_date(col_type):
+            data[name] = pd.to_datetime(arr.cast(pa.timestamp('ms')).to_pandas())
+        elif name in category_set and (pa.types.is_string(col_type) or pa.types.is_large_string(col_type)):
+            data[name] = arr.dictionary_encode().to_pandas()
+        else:
+            data[name] = arr.to_pandas()
+
+    df = pd.DataFrame({name: pd.Series(values).reset_index(drop=True) for name, values in data.items()})
+    return df[table.column_names] if table.num_columns else df
+
+
+# ============================================
+# 조회
+# ============================================
+def rows_to_arrow(columns: Sequence[str], rows: Sequence[tuple]) -> pa.Table:
+    """fetchall 결과(파이썬 튜플)를 Arrow 테이블로 변환 (Arrow 조회를 쓸 수 없는 경우)"""
+    arrays = []
+    for i in range(len(columns)):
+        values = [row[i] for row in rows]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # 타입이 섞인 컬럼은 문자열로 보관
+            arrays.append(pa.array([None if v is None else str(v) for v in values], type=pa.string()))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def _empty_table(cursor) -> pa.Table:
+    columns = [desc[0] for desc in cursor.description]
+    return pa.Table.from_arrays([pa.array([], type=pa.null()) for _ in columns], names=columns)
+
+
+def fetch_arrow_table(conn, query: str, timeout: Optional[int] = None) -> pa.Table:
+    """
+    쿼리를 실행하고 결과 전체를 Arrow 테이블로 반환 (timeout: 초, 실패 시 예외 발생)
+
+    실행/조회 시간은 snowflake.query span으로 계측 (Snowflake 대기 시간)
+    """
+    with span('snowflake.query') as current:
+        table = _fetch_arrow_table(conn, query, timeout)
+        current.add(rows_out=table.num_rows)
+    return table
+
+
+def _fetch_arrow_table(conn, query: str, timeout: Optional[int]) -> pa.Table:
+    cursor = conn.cursor()
+    try:
+        if timeout:
+            cursor.execute(query, timeout=timeout)
+        else:
+            cursor.execute(query)
+        try:
+            table = cursor.fetch_arrow_all(force_return_table=True)
+        except (NotSupportedError, ProgrammingError, AttributeError):
+            columns = [desc[0] for desc in cursor.description]
+            return rows_to_arrow(columns, cursor.fetchall())
+        return table if table is not None else _empty_table(cursor)
+    finally:
+        cursor.close()
+
+
+def fetch_dataframe(conn, query: str, category_columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """쿼리를 실행하고 결과를 타입이 정해진 DataFrame으로 반환 (실패 시 예외 발생)"""
+    return arrow_to_frame(fetch_arrow_table(conn, query), category_columns)
+
+
+def iter_query_frames(conn, query: str, category_columns: Optional[Iterable[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    쿼리 결과를 배치 단위 DataFrame으로 스트리밍 (전체 결과를 메모리에 올리지 않음)
+
+    배치마다 Snowflake가 정수 폭을 다르게 줄 수 있으므로 arrow_to_frame에서 int64/Int64/float64로 통일합니다.
+    """
+    category_columns = list(category_columns or [])
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query)
+        try:
+            batches = cursor.fetch_arrow_batches()
+            for table in batches:
+                yield arrow_to_frame(table, category_columns)
+        except (NotSupportedError, ProgrammingError, AttributeError):
+            columns: List[str] = [desc[0] for desc in cursor.description]
+            while True:
+                rows = cursor.fetchmany(FALLBACK_BATCH_ROWS)
+                if not rows:
+                    break
+                yield arrow_to_frame(rows_to_arrow(columns, rows), category_columns)
+    finally:
+        cursor.close()
@@ -13,11 +13,14 @@ SQL 쿼리를 실행하여 데이터를 추출하고, 발주통화에 따라 환
 """
 
 import pandas as pd
-import snowflake.connector
 import os
 import argparse
 from typing import Optional, Dict, List
 
+from fx_rates import fx_table_for
+from snowflake_query import fetch_dataframe
+from warehouse import connect_warehouse, describe_warehouse
+
 # ============================================
 # Snowflake 연결 설정
 # ============================================
@@ -31,6 +34,9 @@ SNOWFLAKE_CONFIG = {
     'role': 'PUBLIC'  # PU_SQL 역할이 없으면 PUBLIC 사용
 }
 
+# 조회 결과에서 category로 변환할 코드 컬럼 (NULL이 없는 코드 컬럼만)
+CATEGORY_COLUMNS = ['브랜드', '시즌', '발주통화']
+
 # ============================================
 # SQL 쿼리 템플릿 (ORIGIN_NM, po_cls_nm 포함)
 # ============================================
@@ -227,41 +233,11 @@ def get_exchange_rate(
     Returns:
         환율 값 (float)
     """
-    if df_fx is None or df_fx.empty:
-        print(f"[WARN] FX 데이터가 없습니다. 기본 환율 1300.0 사용")
-        return 1300.0
-    
     # 카테고리 매핑
     fx_category = map_category_to_fx_category(category) if category else '의류'
     
-    # FX.csv에서 해당 브랜드, 시즌, 카테고리의 환율 찾기
-    filtered = df_fx[
-        (df_fx['브랜드'] == brand_code) &
-        (df_fx['시즌'] == season_code) &
-        (df_fx['카테고리'] == fx_category)
-    ]
-    
-    if len(filtered) > 0:
-        rate = float(filtered.iloc[0]['환율'])
-        if rate > 0:  # 0인 경우 제외
-            return rate
-    
-    # 기본값: 의류 환율 사용
-    if category and fx_category != '의류':
-        default = df_fx[
-            (df_fx['브랜드'] == brand_code) &
-            (df_fx['시즌'] == season_code) &
-            (df_fx['카테고리'] == '의류')
-        ]
-        if len(default) > 0:
-            rate = float(default.iloc[0]['환율'])
-            if rate > 0:
-                print(f"[INFO] 카테고리 '{category}'에 대한 환율을 찾지 못해 의류 환율 사용: {rate}")
-                return rate
-    
-    # 최종 기본값
-    print(f"[WARN] 환율을 찾을 수 없습니다. 브랜드={brand_code}, 시즌={season_code}, 카테고리={fx_category}. 기본값 1300.0 사용")
-    return 1300.0
+    # FX.csv 해시 인덱스에서 조회 (의류 대체/기본값 포함, DataFrame당 1회 인덱싱)
+    return fx_table_for(df_fx).get_rate(brand_code, season_code, fx_category)
 
 # ============================================
 # 환율 변환 로직
@@ -347,21 +323,13 @@ def process_currency_conversion(
 # Snowflake 연결
 # ============================================
 def connect_to_database():
-    """Snowflake에 연결"""
+    """Snowflake(또는 COST_WAREHOUSE로 선택한 웨어하우스)에 연결"""
     try:
-        conn = snowflake.connector.connect(
-            account=SNOWFLAKE_CONFIG['account'],
-            user=SNOWFLAKE_CONFIG['username'],
-            password=SNOWFLAKE_CONFIG['password'],
-            warehouse=SNOWFLAKE_CONFIG['warehouse'],
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-            # role은 선택사항, 필요시 추가
-        )
-        print(f"[OK] Snowflake 연결 성공: {SNOWFLAKE_CONFIG['database']}.{SNOWFLAKE_CONFIG['schema']}")
+        conn = connect_warehouse(SNOWFLAKE_CONFIG)
+        print(f"[OK] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 성공")
         return conn
     except Exception as e:
-        print(f"[ERROR] Snowflake 연결 실패: {e}")
+        print(f"[ERROR] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 실패: {e}")
         print("\n[INFO] snowflake-connector-python 설치 필요: pip install snowflake-connector-python")
         return None
 
@@ -372,18 +340,8 @@ def execute_query(conn, query: str) -> Optional[pd.DataFrame]:
     """SQL 쿼리 실행 및 결과를 DataFrame으로 반환"""
     try:
         print("\n[INFO] SQL 쿼리 실행 중...")
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        # 컬럼명 가져오기
-        columns = [desc[0] for desc in cursor.description]
-        
-        # 데이터 가져오기
-        rows = cursor.fetchall()
-        
-        # DataFrame 생성
-        df = pd.DataFrame(rows, columns=columns)
-        cursor.close()
+        # Arrow 배치로 조회해 타입이 정해진 컬럼으로 바로 변환
+        df = fetch_dataframe(conn, query, category_columns=CATEGORY_COLUMNS)
         
         print(f"[OK] {len(df)}개 행 추출 완료")
         return df
@@ -700,7 +658,7 @@ def main():
         # 연결 종료
         if conn:
             conn.close()
-            print("\n[INFO] Snowflake 연결 종료")
+            print("\n[INFO] 데이터베이스 연결 종료")
 
 if __name__ == '__main__':
     main()
@@ -10,12 +10,24 @@ SQL 쿼리를 실행하여 데이터를 추출하고, 발주통화에 따라 환
 1. 데이터베이스 연결 정보 설정 (DB_CONFIG)
 2. SQL 쿼리 확인 (사용자 제공 쿼리 사용)
 3. 스크립트 실행
+    python sql_to_csv_with_fx.py          # 증분 추출 (변경된 견적만 재조회)
+    python sql_to_csv_with_fx.py --full   # 전체 재추출
+    python sql_to_csv_with_fx.py --pushdown   # 환율 변환/총금액을 쿼리에서 계산
 """
 
+import numpy as np
 import pandas as pd
-import snowflake.connector
 import os
-from typing import Optional, Dict
+import argparse
+from typing import Optional, Dict, List
+
+from artifact_writer import write_csv, write_label
+from cost_extract_store import extract_with_store
+from cost_raw_store import sync_parquet
+from fx_rates import fx_table_for
+from run_metrics import record, span
+from snowflake_query import fetch_dataframe
+from warehouse import connect_warehouse, describe_warehouse
 
 # ============================================
 # Snowflake 연결 설정
@@ -30,6 +42,15 @@ SNOWFLAKE_CONFIG = {
     'role': 'PUBLIC'  # PU_SQL 역할이 없으면 PUBLIC 사용
 }
 
+# 조회 결과에서 category로 변환할 코드 컬럼 (NULL이 없는 코드 컬럼만)
+CATEGORY_COLUMNS = ['브랜드', '시즌', '발주통화']
+
+# ============================================
+# 추출 대상 (SQL_QUERY의 where 조건과 동일하게 유지)
+# ============================================
+EXTRACT_BRANDS = ['M', 'I', 'X', 'V', 'ST']
+EXTRACT_SEASONS = ['26SS', '26S', '25SS', '25S', '24SS', '24S', '25FW', '25F', '24FW', '24F']
+
 # ============================================
 # SQL 쿼리 (사용자 제공 쿼리)
 # ============================================
@@ -130,6 +151,21 @@ order by brd_cd, sesn desc, part_cd, po_no
 OUTPUT_DIR = 'public/COST RAW'
 FX_FILE = 'public/COST RAW/FX.csv'
 
+# MLB FW 형식 컬럼 순서 (format_data_like_mlb_fw 결과, --pushdown 쿼리 결과)
+MLB_FW_COLUMNS = [
+    '브랜드', '시즌', '스타일', '중분류', '아이템명', 'PO', 'TAG', '수량',
+    'TAG_총금액', 'TAG_USD금액(전년환율)',
+    '원가견적번호', '발주통화', '제조업체', '견적서제출일자',
+    '(USD)_원자재', '(USD)_아트웍', '(USD)_부자재', '(USD)_택/라벨',
+    '(USD) 공임', '(USD)본사공급자재', '(USD)_정상마진', '(USD)_경비',
+    '(KRW)_원자재', '(KRW)_아트웍', '(KRW)_부자재', '(KRW)_택/라벨',
+    '(KRW)_공임', '(KRW)본사공급자재', '(KRW)_정상마진', '(KRW)_경비',
+    'USD_재료계(원/부/택/본공)_총금액(단가×수량)', 'USD_아트웍_총금액(단가×수량)',
+    'USD_공임_총금액(단가×수량)', 'USD_정상마진_총금액(단가×수량)', 'USD_경비_총금액(단가×수량)',
+    'KRW_재료계(원/부/택/본공)_총금액(단가×수량)', 'KRW_아트웍_총금액(단가×수량)',
+    'KRW_공임_총금액(단가×수량)', 'KRW_정상마진_총금액(단가×수량)', 'KRW_경비_총금액(단가×수량)'
+]
+
 # ============================================
 # 카테고리 → 의류/슈즈/용품 매핑
 # ============================================
@@ -214,41 +250,11 @@ def get_exchange_rate(
     Returns:
         환율 값 (float)
     """
-    if df_fx is None or df_fx.empty:
-        print(f"[WARN] FX 데이터가 없습니다. 기본 환율 1300.0 사용")
-        return 1300.0
-    
     # 카테고리 매핑
     fx_category = map_category_to_fx_category(category) if category else '의류'
     
-    # FX.csv에서 해당 브랜드, 시즌, 카테고리의 환율 찾기
-    filtered = df_fx[
-        (df_fx['브랜드'] == brand_code) &
-        (df_fx['시즌'] == season_code) &
-        (df_fx['카테고리'] == fx_category)
-    ]
-    
-    if len(filtered) > 0:
-        rate = float(filtered.iloc[0]['환율'])
-        if rate > 0:  # 0인 경우 제외
-            return rate
-    
-    # 기본값: 의류 환율 사용
-    if category and fx_category != '의류':
-        default = df_fx[
-            (df_fx['브랜드'] == brand_code) &
-            (df_fx['시즌'] == season_code) &
-            (df_fx['카테고리'] == '의류')
-        ]
-        if len(default) > 0:
-            rate = float(default.iloc[0]['환율'])
-            if rate > 0:
-                print(f"[INFO] 카테고리 '{category}'에 대한 환율을 찾지 못해 의류 환율 사용: {rate}")
-                return rate
-    
-    # 최종 기본값
-    print(f"[WARN] 환율을 찾을 수 없습니다. 브랜드={brand_code}, 시즌={season_code}, 카테고리={fx_category}. 기본값 1300.0 사용")
-    return 1300.0
+    # FX.csv 해시 인덱스에서 조회 (의류 대체/기본값 포함, DataFrame당 1회 인덱싱)
+    return fx_table_for(df_fx).get_rate(brand_code, season_code, fx_category)
 
 # ============================================
 # 환율 변환 로직
@@ -263,6 +269,9 @@ def process_currency_conversion(
     - 발주통화가 KRW인 경우: (USD)_컬럼들을 (KRW)_컬럼 / 환율로 변환
     - 발주통화가 USD인 경우: 그대로 사용
     - 브랜드 M 특수 처리: (KRW)_본사공급자재를 환율로 나눠서 (USD)_본사공급자재에 추가
+    
+    행 단위 루프 대신 (브랜드, 시즌, FX카테고리) 고유 조합별로 환율을 한 번만 조회하여
+    각 행에 붙인 뒤, 8개 KRW 컬럼을 컬럼 단위 연산으로 한 번에 나눕니다.
     """
     df_result = df.copy()
     
@@ -292,63 +301,69 @@ def process_currency_conversion(
     
     print("\n[INFO] 환율 변환 처리 시작...")
     
-    # 각 행에 대해 환율 변환 처리
-    for idx, row in df_result.iterrows():
-        brand_code = str(row['브랜드']).strip()
-        sesn = str(row['시즌']).strip()
-        currency = str(row['발주통화']).strip().upper()
-        category = row['중분류'] if '중분류' in row else None
-        
-        # 시즌 형식 변환
-        season_code = convert_season_format(sesn)
-        
-        # 환율 조회
-        fx_rate = get_exchange_rate(df_fx, brand_code, season_code, category)
-        
-        # 발주통화가 KRW 또는 USD인 경우 모두 KRW 컬럼 / 환율로 USD 컬럼 계산
-        if currency == 'KRW' or currency == 'USD':
-            # 각 USD 컬럼을 KRW 컬럼 / 환율로 변환
-            for usd_col, krw_col in zip(usd_columns, krw_columns):
-                if usd_col in df_result.columns and krw_col in df_result.columns:
-                    krw_value = pd.to_numeric(row[krw_col], errors='coerce')
-                    if pd.notna(krw_value) and krw_value != 0:
-                        usd_value = krw_value / fx_rate
-                        df_result.at[idx, usd_col] = usd_value
-        
-        # 브랜드 M 특수 처리: (KRW)_본사공급자재를 환율로 나눠서 (USD)_본사공급자재에 추가
-        if brand_code == 'M' and '(KRW)_본사공급자재' in df_result.columns:
-            krw_supply = pd.to_numeric(row['(KRW)_본사공급자재'], errors='coerce')
-            if pd.notna(krw_supply) and krw_supply != 0:
-                usd_supply_from_krw = krw_supply / fx_rate
-                # 기존 (USD)_본사공급자재에 추가
-                if '(USD)_본사공급자재' in df_result.columns:
-                    existing_usd = pd.to_numeric(row['(USD)_본사공급자재'], errors='coerce')
-                    if pd.isna(existing_usd):
-                        existing_usd = 0
-                    df_result.at[idx, '(USD)_본사공급자재'] = existing_usd + usd_supply_from_krw
+    if df_result.empty:
+        print("[OK] 환율 변환 처리 완료")
+        return df_result
+    
+    brand_codes = df_result['브랜드'].astype(str).str.strip()
+    currencies = df_result['발주통화'].astype(str).str.strip().str.upper()
+    
+    # 행별 환율 (고유 조합별 1회 조회 후 조인)
+    fx_rates = resolve_row_exchange_rates(df_result, df_fx)
+    
+    # 발주통화가 KRW 또는 USD인 경우 모두 KRW 컬럼 / 환율로 USD 컬럼 계산
+    currency_mask = currencies.isin(['KRW', 'USD']).to_numpy()
+    
+    for usd_col, krw_col in zip(usd_columns, krw_columns):
+        if usd_col in df_result.columns and krw_col in df_result.columns:
+            krw_values = pd.to_numeric(df_result[krw_col], errors='coerce').to_numpy(dtype=float)
+            convert_mask = currency_mask & ~np.isnan(krw_values) & (krw_values != 0)
+            if convert_mask.any():
+                if pd.api.types.is_integer_dtype(df_result[usd_col]):
+                    df_result[usd_col] = df_result[usd_col].astype(float)
+                df_result.loc[convert_mask, usd_col] = krw_values[convert_mask] / fx_rates[convert_mask]
+    
+    # 브랜드 M 특수 처리: (KRW)_본사공급자재를 환율로 나눠서 (USD)_본사공급자재에 추가
+    # 기존 (USD)_본사공급자재는 변환 전 원본 값을 기준으로 더함
+    if '(KRW)_본사공급자재' in df_result.columns:
+        krw_supply = pd.to_numeric(df_result['(KRW)_본사공급자재'], errors='coerce').to_numpy(dtype=float)
+        supply_mask = (brand_codes == 'M').to_numpy() & ~np.isnan(krw_supply) & (krw_supply != 0)
+        if supply_mask.any() and '(USD)_본사공급자재' in df_result.columns:
+            existing_usd = pd.to_numeric(df['(USD)_본사공급자재'], errors='coerce').to_numpy(dtype=float)
+            existing_usd = np.where(np.isnan(existing_usd), 0, existing_usd)
+            df_result.loc[supply_mask, '(USD)_본사공급자재'] = (
+                existing_usd[supply_mask] + krw_supply[supply_mask] / fx_rates[supply_mask]
+            )
     
     print("[OK] 환율 변환 처리 완료")
     return df_result
 
+def resolve_row_exchange_rates(df: pd.DataFrame, df_fx: pd.DataFrame) -> np.ndarray:
+    """
+    각 행의 (브랜드, 시즌, 중분류)에 해당하는 환율 배열 반환
+    
+    FX 인덱스의 배열 조회를 사용하므로 고유 (브랜드, FX 시즌, FX 카테고리) 조합별로
+    한 번만 조회하고 결과를 원래 행에 펼칩니다.
+    """
+    categories = df['중분류'] if '중분류' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    
+    return fx_table_for(df_fx).get_rates(
+        df['브랜드'].astype(str).str.strip(),
+        df['시즌'].astype(str).str.strip().map(convert_season_format),
+        categories.map(map_category_to_fx_category),
+    )
+
 # ============================================
 # Snowflake 연결
 # ============================================
 def connect_to_database():
-    """Snowflake에 연결"""
+    """Snowflake(또는 COST_WAREHOUSE로 선택한 웨어하우스)에 연결"""
     try:
-        conn = snowflake.connector.connect(
-            account=SNOWFLAKE_CONFIG['account'],
-            user=SNOWFLAKE_CONFIG['username'],
-            password=SNOWFLAKE_CONFIG['password'],
-            warehouse=SNOWFLAKE_CONFIG['warehouse'],
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-            # role은 선택사항, 필요시 추가
-        )
-        print(f"[OK] Snowflake 연결 성공: {SNOWFLAKE_CONFIG['database']}.{SNOWFLAKE_CONFIG['schema']}")
+        conn = connect_warehouse(SNOWFLAKE_CONFIG)
+        print(f"[OK] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 성공")
         return conn
     except Exception as e:
-        print(f"[ERROR] Snowflake 연결 실패: {e}")
+        print(f"[ERROR] {describe_warehouse(SNOWFLAKE_CONFIG)} 연결 실패: {e}")
         print("\n[INFO] snowflake-connector-python 설치 필요: pip install snowflake-connector-python")
         return None
 
@@ -359,18 +374,8 @@ def execute_query(conn, query: str) -> Optional[pd.DataFrame]:
     """SQL 쿼리 실행 및 결과를 DataFrame으로 반환"""
     try:
         print("\n[INFO] SQL 쿼리 실행 중...")
-        cursor = conn.cursor()
-        cursor.execute(query)
-        
-        # 컬럼명 가져오기
-        columns = [desc[0] for desc in cursor.description]
-        
-        # 데이터 가져오기
-        rows = cursor.fetchall()
-        
-        # DataFrame 생성
-        df = pd.DataFrame(rows, columns=columns)
-        cursor.close()
+        # Arrow 배치로 조회해 타입이 정해진 컬럼으로 바로 변환
+        df = fetch_dataframe(conn, query, category_columns=CATEGORY_COLUMNS)
         
         print(f"[OK] {len(df)}개 행 추출 완료")
         return df
@@ -472,7 +477,7 @@ def format_data_like_mlb_fw(df: pd.DataFrame, df_fx: pd.DataFrame) -> pd.DataFra
     """
     MLB FW.csv 형식에 맞게 데이터 변환
     - TAG_총금액 추가 (TAG × 수량)
-    - TAG_USD금액(전년환율) 추가 (TAG_총금액 / 전년 환율)
+    - TAG_USD금액(전년환율) 컬럼 추가 (값은 저장할 때 파일별로 계산)
     - 각 항목별 총금액 컬럼 추가 (단가 × 수량)
     """
     df_result = df.copy()
@@ -484,41 +489,11 @@ def format_data_like_mlb_fw(df: pd.DataFrame, df_fx: pd.DataFrame) -> pd.DataFra
     # 1. TAG_총금액 계산 (TAG × 수량)
     df_result['TAG_총금액'] = df_result['TAG'] * df_result['수량']
     
-    # 2. TAG_USD금액 계산 (분석기간 기준 환율 사용)
-    # 데이터의 최신 시즌을 분석 기간으로 간주하고, 분석기간-1년 환율을 모든 행에 적용
+    # 2. TAG_USD금액 컬럼 (값은 save_csv_by_brand_season에서 파일별 분석기간의 전년 환율로 계산)
+    # 같은 행이 당년 파일과 다음 시즌 파일(전년 데이터)에 서로 다른 환율로 들어가므로
+    # 여기서 최신 시즌 기준으로 미리 계산해 두면 저장할 때 모두 다시 계산하게 됨
     df_result['TAG_USD금액(전년환율)'] = 0.0  # 초기화
     
-    # 2-1. 데이터에서 최신 시즌 감지 (분석 기간)
-    seasons = df_result['시즌'].unique()
-    current_period = get_latest_season(seasons)
-    
-    if not current_period:
-        print("[WARN] 시즌 정보를 찾을 수 없습니다. TAG_USD금액 계산을 건너뜁니다.")
-    else:
-        # 2-2. 기준 환율 시즌 계산 (분석기간 - 1년)
-        ref_fx_season = get_previous_season(current_period)
-        ref_fx_season_code = convert_season_format(ref_fx_season) if ref_fx_season else current_period
-        
-        print(f"\n[INFO] TAG_USD금액 계산 중...")
-        print(f"[INFO] 분석기간: {current_period}, 기준환율시즌: {ref_fx_season_code}")
-        print(f"[INFO] 모든 행(당년/전년)에 대해 {ref_fx_season_code} 환율 적용")
-        
-        # 2-3. 모든 행에 동일한 기준 환율 시즌 적용 (카테고리별로 조회)
-        for idx, row in df_result.iterrows():
-            brand_code = str(row['브랜드']).strip()
-            category = row['중분류'] if '중분류' in row else None
-            
-            # 모든 행이 동일한 기준 환율 시즌 사용
-            # 카테고리에 따라 의류/슈즈/용품 환율이 다르게 조회됨
-            fx_rate = get_exchange_rate(df_fx, brand_code, ref_fx_season_code, category)
-            
-            # TAG_USD금액 계산 (TAG_총금액 / 기준 환율)
-            tag_total = pd.to_numeric(row['TAG_총금액'], errors='coerce')
-            if pd.notna(tag_total) and fx_rate > 0:
-                df_result.at[idx, 'TAG_USD금액(전년환율)'] = tag_total / fx_rate
-        
-        print("[OK] TAG_USD금액 계산 완료")
-    
     # 3. 컬럼명 수정 (MLB FW 형식에 맞게)
     # "TAG_USD금액(24F환율)" → "TAG_USD금액(전년환율)" (기존 파일 호환성)
     if 'TAG_USD금액(24F환율)' in df_result.columns:
@@ -600,19 +575,7 @@ def format_data_like_mlb_fw(df: pd.DataFrame, df_fx: pd.DataFrame) -> pd.DataFra
             df_result['KRW_경비_총금액(단가×수량)'] = total
     
     # 6. 컬럼 순서를 MLB FW 형식에 맞게 재정렬
-    column_order = [
-        '브랜드', '시즌', '스타일', '중분류', '아이템명', 'PO', 'TAG', '수량',
-        'TAG_총금액', 'TAG_USD금액(전년환율)',
-        '원가견적번호', '발주통화', '제조업체', '견적서제출일자',
-        '(USD)_원자재', '(USD)_아트웍', '(USD)_부자재', '(USD)_택/라벨', 
-        '(USD) 공임', '(USD)본사공급자재', '(USD)_정상마진', '(USD)_경비',
-        '(KRW)_원자재', '(KRW)_아트웍', '(KRW)_부자재', '(KRW)_택/라벨',
-        '(KRW)_공임', '(KRW)본사공급자재', '(KRW)_정상마진', '(KRW)_경비',
-        'USD_재료계(원/부/택/본공)_총금액(단가×수량)', 'USD_아트웍_총금액(단가×수량)',
-        'USD_공임_총금액(단가×수량)', 'USD_정상마진_총금액(단가×수량)', 'USD_경비_총금액(단가×수량)',
-        'KRW_재료계(원/부/택/본공)_총금액(단가×수량)', 'KRW_아트웍_총금액(단가×수량)',
-        'KRW_공임_총금액(단가×수량)', 'KRW_정상마진_총금액(단가×수량)', 'KRW_경비_총금액(단가×수량)'
-    ]
+    column_order = MLB_FW_COLUMNS
     
     # 존재하는 컬럼만 선택
     existing_columns = [col for col in column_order if col in df_result.columns]
@@ -623,6 +586,33 @@ def format_data_like_mlb_fw(df: pd.DataFrame, df_fx: pd.DataFrame) -> pd.DataFra
     
     return df_result
 
+# ============================================
+# TAG_USD금액 계산
+# ============================================
+def compute_tag_usd(df: pd.DataFrame, df_fx: pd.DataFrame, ref_fx_season_code: str) -> pd.Series:
+    """
+    TAG_총금액 / 기준 환율 시즌의 (브랜드, FX카테고리) 환율을 컬럼 단위로 계산
+
+    고유 (브랜드, FX카테고리) 조합별로 환율을 한 번만 조회해 행에 펼친 뒤 한 번에 나눕니다.
+    TAG_총금액이 없거나 환율이 0 이하인 행은 기존 TAG_USD금액(전년환율) 값을 유지합니다.
+    """
+    categories = df['중분류'] if '중분류' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    fx_rates = fx_table_for(df_fx).get_rates(
+        df['브랜드'].astype(str).str.strip(),
+        np.full(len(df), ref_fx_season_code, dtype=object),
+        categories.map(map_category_to_fx_category),
+    )
+    
+    tag_total = pd.to_numeric(df['TAG_총금액'], errors='coerce').to_numpy(dtype=float)
+    if 'TAG_USD금액(전년환율)' in df.columns:
+        current = pd.to_numeric(df['TAG_USD금액(전년환율)'], errors='coerce').to_numpy(dtype=float)
+    else:
+        current = np.zeros(len(df))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tag_usd = np.where(~np.isnan(tag_total) & (fx_rates > 0), tag_total / fx_rates, current)
+    return pd.Series(tag_usd, index=df.index)
+
 # ============================================
 # CSV 파일 저장 (브랜드별로 분리, 전년 시즌 포함)
 # ============================================
@@ -647,19 +637,160 @@ def recalculate_tag_usd(df: pd.DataFrame, df_fx: pd.DataFrame, analysis_season:
     
     print(f"  [FX] 분석기간: {analysis_season}, 적용환율: {ref_fx_season_code}")
     
-    # TAG_USD금액(전년환율) 재계산
-    for idx, row in df.iterrows():
-        brand_code = str(row['브랜드']).strip()
-        category = row['중분류'] if '중분류' in row else None
-        
-        fx_rate = get_exchange_rate(df_fx, brand_code, ref_fx_season_code, category)
-        
-        tag_total = pd.to_numeric(row['TAG_총금액'], errors='coerce')
-        if pd.notna(tag_total) and fx_rate > 0:
-            df.at[idx, 'TAG_USD금액(전년환율)'] = tag_total / fx_rate
+    # TAG_USD금액(전년환율) 재계산 (컬럼 단위 1회)
+    if not df.empty:
+        df['TAG_USD금액(전년환율)'] = compute_tag_usd(df, df_fx, ref_fx_season_code)
     
     return df
 
+# ============================================
+# 집계 푸시다운 (--pushdown)
+# ============================================
+# 다음 시즌 파일에 전년 데이터로 들어갈 때의 TAG_USD금액 (자기 시즌 환율, 저장할 때 사용 후 제거)
+PUSHDOWN_NEXT_TAG_USD_COLUMN = 'TAG_USD금액(당시즌환율)'
+
+FX_CATEGORIES = ['의류', '슈즈', '용품']
+
+# 원가 항목별 (SQL_QUERY USD 컬럼, SQL_QUERY KRW 컬럼, MLB FW USD 컬럼, MLB FW KRW 컬럼)
+PUSHDOWN_COST_PARTS = {
+    '원자재': ('(USD)_원자재', '(KRW)_원자재', '(USD)_원자재', '(KRW)_원자재'),
+    '아트웍': ('(USD)_아트웍', '(KRW)_아트웍', '(USD)_아트웍', '(KRW)_아트웍'),
+    '부자재': ('(USD)_부자재', '(KRW)_부자재', '(USD)_부자재', '(KRW)_부자재'),
+    '택/라벨': ('(USD)_택/라벨', '(KRW)_택/라벨', '(USD)_택/라벨', '(KRW)_택/라벨'),
+    '공임': ('(USD)_공임', '(KRW)_공임', '(USD) 공임', '(KRW)_공임'),
+    '본사공급자재': ('(USD)_본사공급자재', '(KRW)_본사공급자재', '(USD)본사공급자재', '(KRW)본사공급자재'),
+    '정상마진': ('(USD)_정상마진', '(KRW)_정상마진', '(USD)_정상마진', '(KRW)_정상마진'),
+    '기타마진/경비': ('(USD)_기타마진/경비', '(KRW)_기타마진/경비', '(USD)_경비', '(KRW)_경비'),
+}
+
+# 총금액 컬럼 → 더할 원가 항목 (format_data_like_mlb_fw와 같은 순서로 더해 같은 값을 만듦)
+PUSHDOWN_TOTAL_GROUPS = {
+    '재료계(원/부/택/본공)': ['원자재', '부자재', '택/라벨', '본사공급자재'],
+    '아트웍': ['아트웍'],
+    '공임': ['공임'],
+    '정상마진': ['정상마진'],
+    '경비': ['기타마진/경비'],
+}
+
+
+def _sql_str(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_double(value: float) -> str:
+    """파이썬 float과 같은 double 리터럴 (숫자 리터럴은 DECIMAL로 해석되므로 문자열에서 변환)"""
+    return f"cast('{float(value)!r}' as double)"
+
+
+def build_fx_dimension(df_fx: pd.DataFrame, brands: List[str], seasons: List[str]) -> pd.DataFrame:
+    """
+    (브랜드, 시즌, FX카테고리)별 환율 차원 (FxRateTable의 의류 대체/기본 환율 규칙을 미리 적용)
+
+    - row_rate: 자기 시즌 환율 (발주통화 환율 변환, 다음 시즌 파일의 전년 데이터 TAG_USD금액)
+    - prev_rate: 전년 시즌 환율 (자기 시즌 파일의 TAG_USD금액, recalculate_tag_usd와 동일)
+    """
+    table = fx_table_for(df_fx)
+    rows = []
+    for brand in brands:
+        for season in seasons:
+            own_code = convert_season_format(season)
+            prev_season = get_previous_season(own_code)
+            prev_code = convert_season_format(prev_season) if prev_season else own_code
+            for category in FX_CATEGORIES:
+                rows.append((brand, season, category,
+                             table.get_rate(brand, own_code, category, verbose=False),
+                             table.get_rate(brand, prev_code, category, verbose=False)))
+    return pd.DataFrame(rows, columns=['brd_cd', 'sesn', 'fx_category', 'row_rate', 'prev_rate'])
+
+
+def build_pushdown_query(df_fx: pd.DataFrame, base_query: str = SQL_QUERY,
+                         brands: List[str] = EXTRACT_BRANDS, seasons: List[str] = EXTRACT_SEASONS) -> str:
+    """
+    SQL_QUERY 결과에 환율 차원을 조인해 MLB FW 형식 최종 컬럼까지 쿼리에서 계산하는 쿼리
+
+    process_currency_conversion → format_data_like_mlb_fw → 파일별 TAG_USD금액 재계산과 같은 값을
+    반환합니다 (TAG/수량/TAG_총금액은 정수 NUMBER, 나머지 숫자 컬럼은 double, 결측은 0). 환율 차원은 values 절로 쿼리에 넣으므로 FX.csv가
+    바뀌면 쿼리 문구가 바뀌어 증분 저장소(cost_extract_store)가 전체 재추출하고,
+    SQL_QUERY의 바깥 where 절은 그대로 두므로 변경 PO 재조회(build_delta_query)도 그대로 동작합니다.
+    """
+    df_dim = build_fx_dimension(df_fx, brands, seasons)
+    fx_values = ',\n        '.join(
+        f"({_sql_str(brand)}, {_sql_str(season)}, {_sql_str(category)}, "
+        f"{_sql_double(row_rate)}, {_sql_double(prev_rate)})"
+        for brand, season, category, row_rate, prev_rate in df_dim.itertuples(index=False)
+    )
+    base_body = base_query.rsplit('\norder by ', 1)[0]
+
+    # 환율 변환: USD/KRW 발주는 KRW 단가 / 자기 시즌 환율, M 브랜드 본사공급자재는 USD 원본에 가산
+    converted = []
+    for part, (usd_in, krw_in, usd_out, krw_out) in PUSHDOWN_COST_PARTS.items():
+        usd = f'cast(b."{usd_in}" as double)'
+        krw = f'cast(b."{krw_in}" as double)'
+        krw_valid = f"{krw} is not null and {krw} <> 0"
+        usd_expr = f"case when b.currency_ok and {krw_valid} then {krw} / f.row_rate else {usd} end"
+        if part == '본사공급자재':
+            usd_expr = (f"case when b.\"브랜드\" = 'M' and {krw_valid} "
+                        f"then coalesce({usd}, 0) + {krw} / f.row_rate else {usd_expr} end")
+        converted.append(f'coalesce({usd_expr}, 0) as "{usd_out}"')
+        converted.append(f'coalesce({krw}, 0) as "{krw_out}"')
+
+    # 총금액 (단가 × 수량), pandas와 같은 덧셈 순서
+    computed = {
+        'TAG_총금액': '"TAG" * "수량"',
+        'TAG_USD금액(전년환율)': '"TAG" * "수량" / prev_rate',
+    }
+    for index, currency in enumerate(['USD', 'KRW']):
+        for group, parts in PUSHDOWN_TOTAL_GROUPS.items():
+            terms = ' + '.join(f'"{PUSHDOWN_COST_PARTS[part][2 + index]}" * "수량"' for part in parts)
+            computed[f'{currency}_{group}_총금액(단가×수량)'] = f"0.0 + {terms}"
+
+    final = [f'{computed[col]} as "{col}"' if col in computed else f'"{col}"' for col in MLB_FW_COLUMNS]
+    final.append(f'"TAG" * "수량" / row_rate as "{PUSHDOWN_NEXT_TAG_USD_COLUMN}"')
+
+    converted_sql = ',\n        '.join(converted)
+    final_sql = ',\n    '.join(final)
+    return f"""
+with fx (brd_cd, sesn, fx_category, row_rate, prev_rate) as (
+    select * from (values
+        {fx_values}
+    ) as v (brd_cd, sesn, fx_category, row_rate, prev_rate)
+),
+base as (
+    select
+        b.*,
+        upper(trim(b."발주통화")) in ('KRW', 'USD') as currency_ok,
+        case
+            when upper(trim(b."중분류")) = 'SHOES' then '슈즈'
+            when upper(trim(b."중분류")) in ('BAG', 'HEADWEAR', 'ACC_ETC') then '용품'
+            else '의류'
+        end as fx_category
+    from ({base_body}) b
+),
+converted as (
+    select
+        b."브랜드", b."시즌", b."스타일", b."중분류", b."아이템명", b."PO",
+        coalesce(b."TAG", 0) as "TAG",
+        coalesce(b."수량", 0) as "수량",
+        b."원가견적번호", b."발주통화", b."제조업체", b."견적서제출일자",
+        {converted_sql},
+        f.row_rate,
+        f.prev_rate
+    from base b
+    left join fx f on f.brd_cd = b."브랜드" and f.sesn = b."시즌" and f.fx_category = b.fx_category
+)
+select
+    {final_sql}
+from converted
+order by "브랜드", "시즌" desc, "스타일", "PO"
+"""
+
+
+def apply_pushdown_tag_usd(df: pd.DataFrame, season: str) -> pd.DataFrame:
+    """--pushdown 결과: 전년 시즌 행(다음 시즌 파일에 포함된 행)은 자기 시즌 환율 TAG_USD금액으로 교체"""
+    is_prev = (df['시즌'].astype(str) != str(season)).to_numpy()
+    df['TAG_USD금액(전년환율)'] = np.where(is_prev, df[PUSHDOWN_NEXT_TAG_USD_COLUMN], df['TAG_USD금액(전년환율)'])
+    return df.drop(columns=[PUSHDOWN_NEXT_TAG_USD_COLUMN])
+
 def save_csv_by_brand_season(df: pd.DataFrame, df_fx: pd.DataFrame = None):
     """
     브랜드와 시즌별로 CSV 파일 저장
@@ -684,130 +815,141 @@ def save_csv_by_brand_season(df: pd.DataFrame, df_fx: pd.DataFrame = None):
     brand_groups = df.groupby('브랜드')
     
     saved_files = []
+    changed_files = 0
     
     for brand, brand_df in brand_groups:
         # 해당 브랜드의 고유 시즌 목록
         unique_seasons = sorted(brand_df['시즌'].unique(), reverse=True)
         
         for season in unique_seasons:
-            # 전년 시즌 계산
-            prev_season = get_previous_season(season)
-            
-            # 현재 시즌 데이터
-            current_season_df = brand_df[brand_df['시즌'] == season].copy()
-            
-            # 시즌 코드 정규화 (파일명용: SS/S, FW/F는 동일하므로 항상 S/F 형식으로 통일)
-            normalized_season = season
-            if season in ['26SS', '26S']:
-                normalized_season = '26S'  # 26SS → 26S로 통일
-            elif season in ['25SS', '25S']:
-                normalized_season = '25S'  # 25SS → 25S로 통일
-            elif season in ['24SS', '24S']:
-                normalized_season = '24S'  # 24SS → 24S로 통일
-            elif season in ['26FW', '26F']:
-                normalized_season = '26F'  # 26FW → 26F로 통일
-            elif season in ['25FW', '25F']:
-                normalized_season = '25F'  # 25FW → 25F로 통일
-            elif season in ['24FW', '24F']:
-                normalized_season = '24F'  # 24FW → 24F로 통일
-            # 이미 S/F 형식이면 그대로 사용
-            
-            # 전년 시즌 데이터 (있는 경우)
-            if prev_season:
-                prev_season_df = brand_df[brand_df['시즌'] == prev_season].copy()
-                # 두 시즌 데이터 합치기
-                combined_df = pd.concat([current_season_df, prev_season_df], ignore_index=True)
-                print(f"[INFO] {brand}_{normalized_season}.csv: {season} ({len(current_season_df)}행) + {prev_season} ({len(prev_season_df)}행) = 총 {len(combined_df)}행")
-            else:
-                combined_df = current_season_df
-                print(f"[INFO] {brand}_{normalized_season}.csv: {season} ({len(combined_df)}행) (전년 시즌 없음)")
-            
-            # ★ 핵심: 해당 분석기간에 맞는 전년 환율로 TAG_USD금액 재계산
-            if df_fx is not None and not df_fx.empty:
-                combined_df = recalculate_tag_usd(combined_df, df_fx, normalized_season)
-            
-            # X 브랜드인 경우 DISCOVERY와 DISCOVERY KIDS 분리
-            if brand == 'X':
-                # 스타일 컬럼을 대문자로 변환하여 확인
-                combined_df['스타일_upper'] = combined_df['스타일'].astype(str).str.upper().str.strip()
+            with span('sql_to_csv.write_csv', brand=brand, season=season):
+                # 전년 시즌 계산
+                prev_season = get_previous_season(season)
                 
-                # DISCOVERY (DK로 시작하지 않는 것)
-                df_discovery = combined_df[~combined_df['스타일_upper'].str.startswith('DK', na=False)].copy()
-                df_discovery = df_discovery.drop(columns=['스타일_upper'])
+                # 현재 시즌 데이터
+                current_season_df = brand_df[brand_df['시즌'] == season].copy()
                 
-                # DISCOVERY KIDS (DK로 시작하는 것)
-                df_kids = combined_df[combined_df['스타일_upper'].str.startswith('DK', na=False)].copy()
-                df_kids = df_kids.drop(columns=['스타일_upper'])
+                # 시즌 코드 정규화 (파일명용: SS/S, FW/F는 동일하므로 항상 S/F 형식으로 통일)
+                normalized_season = season
+                if season in ['26SS', '26S']:
+                    normalized_season = '26S'  # 26SS → 26S로 통일
+                elif season in ['25SS', '25S']:
+                    normalized_season = '25S'  # 25SS → 25S로 통일
+                elif season in ['24SS', '24S']:
+                    normalized_season = '24S'  # 24SS → 24S로 통일
+                elif season in ['26FW', '26F']:
+                    normalized_season = '26F'  # 26FW → 26F로 통일
+                elif season in ['25FW', '25F']:
+                    normalized_season = '25F'  # 25FW → 25F로 통일
+                elif season in ['24FW', '24F']:
+                    normalized_season = '24F'  # 24FW → 24F로 통일
+                # 이미 S/F 형식이면 그대로 사용
                 
-                # 시즌 폴더 결정
-                if season in ['26SS', '26S', '25SS', '25S', '24SS', '24S', '26FW', '26F', '25FW', '25F']:
-                    if season in ['26SS', '26S']:
-                        season_folder = '26SS'
-                    elif season in ['25SS', '25S']:
-                        season_folder = '25S'
-                    elif season in ['24SS', '24S']:
-                        season_folder = '24S'
-                    elif season in ['26FW', '26F']:
-                        season_folder = '26FW'
-                    elif season in ['25FW', '25F']:
-                        season_folder = '25FW'
-                    else:
-                        season_folder = season
-                    
-                    season_dir = os.path.join(OUTPUT_DIR, season_folder)
-                    os.makedirs(season_dir, exist_ok=True)
+                # 전년 시즌 데이터 (있는 경우)
+                if prev_season:
+                    prev_season_df = brand_df[brand_df['시즌'] == prev_season].copy()
+                    # 두 시즌 데이터 합치기
+                    combined_df = pd.concat([current_season_df, prev_season_df], ignore_index=True)
+                    print(f"[INFO] {brand}_{normalized_season}.csv: {season} ({len(current_season_df)}행) + {prev_season} ({len(prev_season_df)}행) = 총 {len(combined_df)}행")
                 else:
-                    season_dir = OUTPUT_DIR
-                    os.makedirs(season_dir, exist_ok=True)
-                
-                # DISCOVERY 파일 저장
-                filename_discovery = f"X_{normalized_season}.csv"
-                filepath_discovery = os.path.join(season_dir, filename_discovery)
-                df_discovery.to_csv(filepath_discovery, index=False, encoding='utf-8-sig', lineterminator='\n')
-                saved_files.append(filepath_discovery)
-                print(f"[OK] {filename_discovery} 저장 완료 (DISCOVERY, DK 제외: {len(df_discovery)}개 행)")
+                    combined_df = current_season_df
+                    print(f"[INFO] {brand}_{normalized_season}.csv: {season} ({len(combined_df)}행) (전년 시즌 없음)")
                 
-                # DISCOVERY KIDS 파일 저장 (데이터가 있는 경우만)
-                if len(df_kids) > 0:
-                    filename_kids = f"X_{normalized_season}_kids.csv"
-                    filepath_kids = os.path.join(season_dir, filename_kids)
-                    df_kids.to_csv(filepath_kids, index=False, encoding='utf-8-sig', lineterminator='\n')
-                    saved_files.append(filepath_kids)
-                    print(f"[OK] {filename_kids} 저장 완료 (DISCOVERY KIDS, DK만: {len(df_kids)}개 행)")
-                else:
-                    print(f"[INFO] DISCOVERY KIDS 데이터 없음 (DK로 시작하는 스타일 없음)")
-            else:
-                # 다른 브랜드는 기존 방식대로
-                filename = f"{brand}_{normalized_season}.csv"
+                # ★ 핵심: 해당 분석기간에 맞는 전년 환율로 TAG_USD금액 재계산
+                # (--pushdown 결과는 두 환율 기준 값이 쿼리에서 계산되어 있으므로 행별로 선택만 함)
+                if PUSHDOWN_NEXT_TAG_USD_COLUMN in combined_df.columns:
+                    combined_df = apply_pushdown_tag_usd(combined_df, season)
+                elif df_fx is not None and not df_fx.empty:
+                    combined_df = recalculate_tag_usd(combined_df, df_fx, normalized_season)
                 
-                # 시즌별 폴더에 저장
-                if season in ['26SS', '26S', '25SS', '25S', '24SS', '24S', '26FW', '26F', '25FW', '25F']:
-                    if season in ['26SS', '26S']:
-                        season_folder = '26SS'
-                    elif season in ['25SS', '25S']:
-                        season_folder = '25S'
-                    elif season in ['24SS', '24S']:
-                        season_folder = '24S'
-                    elif season in ['26FW', '26F']:
-                        season_folder = '26FW'
-                    elif season in ['25FW', '25F']:
-                        season_folder = '25FW'
+                # X 브랜드인 경우 DISCOVERY와 DISCOVERY KIDS 분리
+                if brand == 'X':
+                    # 스타일 컬럼을 대문자로 변환하여 확인
+                    combined_df['스타일_upper'] = combined_df['스타일'].astype(str).str.upper().str.strip()
+                    
+                    # DISCOVERY (DK로 시작하지 않는 것)
+                    df_discovery = combined_df[~combined_df['스타일_upper'].str.startswith('DK', na=False)].copy()
+                    df_discovery = df_discovery.drop(columns=['스타일_upper'])
+                    
+                    # DISCOVERY KIDS (DK로 시작하는 것)
+                    df_kids = combined_df[combined_df['스타일_upper'].str.startswith('DK', na=False)].copy()
+                    df_kids = df_kids.drop(columns=['스타일_upper'])
+                    
+                    # 시즌 폴더 결정
+                    if season in ['26SS', '26S', '25SS', '25S', '24SS', '24S', '26FW', '26F', '25FW', '25F']:
+                        if season in ['26SS', '26S']:
+                            season_folder = '26SS'
+                        elif season in ['25SS', '25S']:
+                            season_folder = '25S'
+                        elif season in ['24SS', '24S']:
+                            season_folder = '24S'
+                        elif season in ['26FW', '26F']:
+                            season_folder = '26FW'
+                        elif season in ['25FW', '25F']:
+                            season_folder = '25FW'
+                        else:
+                            season_folder = season
+                        
+                        season_dir = os.path.join(OUTPUT_DIR, season_folder)
+                        os.makedirs(season_dir, exist_ok=True)
                     else:
-                        season_folder = season
+                        season_dir = OUTPUT_DIR
+                        os.makedirs(season_dir, exist_ok=True)
                     
-                    season_dir = os.path.join(OUTPUT_DIR, season_folder)
-                    os.makedirs(season_dir, exist_ok=True)
-                    filepath = os.path.join(season_dir, filename)
+                    # DISCOVERY 파일 저장
+                    filename_discovery = f"X_{normalized_season}.csv"
+                    filepath_discovery = os.path.join(season_dir, filename_discovery)
+                    changed = write_csv(df_discovery, filepath_discovery, lineterminator='\n')
+                    sync_parquet(filepath_discovery)
+                    saved_files.append(filepath_discovery)
+                    changed_files += changed
+                    print(f"[OK] {filename_discovery} {write_label(changed)} (DISCOVERY, DK 제외: {len(df_discovery)}개 행)")
+                    
+                    # DISCOVERY KIDS 파일 저장 (데이터가 있는 경우만)
+                    if len(df_kids) > 0:
+                        filename_kids = f"X_{normalized_season}_kids.csv"
+                        filepath_kids = os.path.join(season_dir, filename_kids)
+                        changed = write_csv(df_kids, filepath_kids, lineterminator='\n')
+                        sync_parquet(filepath_kids)
+                        saved_files.append(filepath_kids)
+                        changed_files += changed
+                        print(f"[OK] {filename_kids} {write_label(changed)} (DISCOVERY KIDS, DK만: {len(df_kids)}개 행)")
+                    else:
+                        print(f"[INFO] DISCOVERY KIDS 데이터 없음 (DK로 시작하는 스타일 없음)")
                 else:
-                    filepath = os.path.join(OUTPUT_DIR, filename)
-                
-                # UTF-8 BOM 인코딩으로 저장 (Excel 호환성)
-                combined_df.to_csv(filepath, index=False, encoding='utf-8-sig', lineterminator='\n')
-                saved_files.append(filepath)
-                print(f"[OK] {filename} 저장 완료 ({len(combined_df)}개 행)")
+                    # 다른 브랜드는 기존 방식대로
+                    filename = f"{brand}_{normalized_season}.csv"
+                    
+                    # 시즌별 폴더에 저장
+                    if season in ['26SS', '26S', '25SS', '25S', '24SS', '24S', '26FW', '26F', '25FW', '25F']:
+                        if season in ['26SS', '26S']:
+                            season_folder = '26SS'
+                        elif season in ['25SS', '25S']:
+                            season_folder = '25S'
+                        elif season in ['24SS', '24S']:
+                            season_folder = '24S'
+                        elif season in ['26FW', '26F']:
+                            season_folder = '26FW'
+                        elif season in ['25FW', '25F']:
+                            season_folder = '25FW'
+                        else:
+                            season_folder = season
+                        
+                        season_dir = os.path.join(OUTPUT_DIR, season_folder)
+                        os.makedirs(season_dir, exist_ok=True)
+                        filepath = os.path.join(season_dir, filename)
+                    else:
+                        filepath = os.path.join(OUTPUT_DIR, filename)
+                    
+                    # UTF-8 BOM 인코딩으로 저장 (Excel 호환성, 내용이 같으면 기존 파일 유지)
+                    changed = write_csv(combined_df, filepath, lineterminator='\n')
+                    sync_parquet(filepath)
+                    saved_files.append(filepath)
+                    changed_files += changed
+                    print(f"[OK] {filename} {write_label(changed)} ({len(combined_df)}개 행)")
     
     print("\n" + "=" * 60)
-    print(f"[완료] 총 {len(saved_files)}개 파일 생성 완료!")
+    print(f"[완료] 총 {len(saved_files)}개 파일 생성 완료! (내용 변경 {changed_files}개)")
     for filepath in saved_files:
         print(f"  - {filepath}")
     print("=" * 60)
@@ -815,8 +957,15 @@ def save_csv_by_brand_season(df: pd.DataFrame, df_fx: pd.DataFrame = None):
 # ============================================
 # 메인 함수
 # ============================================
-def main():
+def main(argv: Optional[List[str]] = None):
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='SQL 데이터 연결 및 환율 변환')
+    parser.add_argument('--full', action='store_true',
+                        help='로컬 저장소(cache/)를 무시하고 전체 재추출')
+    parser.add_argument('--pushdown', action='store_true',
+                        help='환율 변환/총금액/TAG_USD금액을 쿼리에서 계산 (FX.csv 필요)')
+    args = parser.parse_args(argv)
+    
     print("SQL 데이터 연결 및 환율 변환 스크립트")
     print("=" * 60)
     
@@ -832,24 +981,37 @@ def main():
         print("\n[WARN] FX 파일을 로드할 수 없습니다. 환율 변환 없이 진행합니다.")
         df_fx = pd.DataFrame()
     
+    pushdown = args.pushdown and not df_fx.empty
+    if args.pushdown and not pushdown:
+        print("[WARN] FX 파일이 없어 --pushdown 없이 진행합니다.")
+    
     try:
-        # 3. SQL 쿼리 실행
-        df = execute_query(conn, SQL_QUERY)
+        # 3. SQL 쿼리 실행 (로컬 저장소 기준 증분 추출, --full이면 전체 재추출)
+        query = build_pushdown_query(df_fx) if pushdown else SQL_QUERY
+        with span('sql_to_csv.extract', pushdown=pushdown):
+            df = extract_with_store(conn, query, EXTRACT_BRANDS, EXTRACT_SEASONS, full=args.full,
+                                    category_columns=CATEGORY_COLUMNS)
+            record(rows_out=0 if df is None else len(df))
         if df is None or df.empty:
             print("\n[WARN] 추출된 데이터가 없습니다.")
             return
         
-        # 4. 환율 변환 처리
-        if not df_fx.empty:
-            df = process_currency_conversion(df, df_fx)
-        else:
-            print("[WARN] FX 파일이 없어 환율 변환을 건너뜁니다.")
-        
-        # 5. MLB FW 형식으로 데이터 변환
-        if not df_fx.empty:
-            df = format_data_like_mlb_fw(df, df_fx)
+        # 4~5. 환율 변환 처리 및 MLB FW 형식으로 데이터 변환 (--pushdown이면 쿼리에서 완료)
+        if pushdown:
+            print("\n[INFO] 환율 변환/총금액은 쿼리에서 계산되었습니다.")
         else:
-            print("[WARN] FX 파일이 없어 MLB FW 형식 변환을 건너뜁니다.")
+            with span('sql_to_csv.fx_convert'):
+                record(rows_in=len(df))
+                if not df_fx.empty:
+                    df = process_currency_conversion(df, df_fx)
+                else:
+                    print("[WARN] FX 파일이 없어 환율 변환을 건너뜁니다.")
+            
+                if not df_fx.empty:
+                    df = format_data_like_mlb_fw(df, df_fx)
+                else:
+                    print("[WARN] FX 파일이 없어 MLB FW 형식 변환을 건너뜁니다.")
+                record(rows_out=len(df))
         
         # 6. CSV 파일 저장 (브랜드_시즌 형식, 각 분석기간별 전년 환율 적용)
         save_csv_by_brand_season(df, df_fx)
@@ -865,7 +1027,7 @@ def main():
         # 연결 종료
         if conn:
             conn.close()
-            print("\n[INFO] Snowflake 연결 종료")
+            print("\n[INFO] 데이터베이스 연결 종료")
 
 if __name__ == '__main__':
     main()
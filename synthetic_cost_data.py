@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+합성(synthetic) 원가 데이터 생성 모듈
+
+Snowflake 없이 파이프라인 성능을 측정할 수 있도록, SQL_QUERY 조회 결과와 같은 모양의 DataFrame과
+FX.csv를 정해진 시드로 만들어 주는 모듈입니다. 같은 행 수/시즌/시드면 항상 같은 데이터가 나와
+커밋 간 벤치마크 결과를 비교할 수 있습니다.
+
+- 브랜드 5개 (M, I, X, ST, V), 시즌은 지정한 목록 (기본: 26S, 25S, 25F, 24F)
+- 발주통화 USD/KRW/CNY 비율, 중분류/아이템 구성, TAG 가격대는 실제 COST RAW 분포를 단순화해 반영
+- X 브랜드 스타일의 일부는 DK로 시작 (DISCOVERY-KIDS 분리 경로 포함)
+- TAG/수량/단가 일부 결측치 포함
+- COST RAW CSV는 sql_to_csv_with_fx.py의 변환/저장 함수로 만들어 실제 출력과 같은 형식
+- 같은 분포로 prcs.*/sap_fnf.mst_prdt 원천 테이블도 생성 (warehouse.py 로컬 웨어하우스 적재용)
+
+사용 방법:
+    python synthetic_cost_data.py --rows 100000 --workdir tmp/synthetic
+    (tmp/synthetic/public/COST RAW/ 아래에 FX.csv와 브랜드/시즌별 CSV 생성)
+"""
+
+import argparse
+import contextlib
+import io
+import os
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# ============================================
+# 생성 설정
+# ============================================
+DEFAULT_SEED = 20250101
+DEFAULT_SEASONS = ['26S', '25S', '25F', '24F']
+
+BRANDS = ['M', 'I', 'X', 'ST', 'V']
+BRAND_WEIGHTS = [0.40, 0.20, 0.25, 0.08, 0.07]
+
+CURRENCIES = ['USD', 'KRW', 'CNY']
+CURRENCY_WEIGHTS = [0.85, 0.12, 0.03]
+
+# 중분류 → (비율, 아이템명 목록), None은 중분류 결측
+CATEGORIES = {
+    'Inner': (0.40, ['티셔츠', '맨투맨', '후드티', '셔츠', '니트']),
+    'Bottom': (0.22, ['데님팬츠', '트레이닝팬츠', '반바지', '스커트']),
+    'Outer': (0.12, ['점퍼', '다운', '바람막이', '코트']),
+    'Shoes': (0.06, ['스니커즈', '샌들', '슬라이드']),
+    'Headwear': (0.07, ['볼캡', '비니', '버킷햇']),
+    'Bag': (0.04, ['백팩', '크로스백', '토트백']),
+    'Acc_etc': (0.04, ['양말', '벨트', '머플러']),
+    'Wear_etc': (0.02, ['기타의류']),
+    None: (0.03, ['기타']),
+}
+
+# 원가 구성 비율 (원자재, 아트웍, 부자재, 택/라벨, 공임, 본사공급자재, 정상마진, 기타마진/경비)
+COST_PARTS = ['원자재', '아트웍', '부자재', '택/라벨', '공임', '본사공급자재', '정상마진', '기타마진/경비']
+COST_SHARES = np.array([0.45, 0.04, 0.08, 0.02, 0.25, 0.03, 0.09, 0.04])
+
+TAG_PRICES = np.arange(19000, 400000, 10000)
+BASE_FX_RATE = 1350.0
+NULL_TAG_RATIO = 0.01
+NULL_QTY_RATIO = 0.02
+NULL_COST_RATIO = 0.02
+ZERO_PART_RATIO = 0.2
+KIDS_STYLE_RATIO = 0.15           # X 브랜드 중 DK 스타일 비율
+
+# 로컬 웨어하우스 원천 테이블 (make_warehouse_tables)
+DEFAULT_NON_SEASONS = ['24N', '25N', '26N']
+NON_ROW_DIVISOR = 10              # NON 시즌 견적 수 = rows // 10
+COST_TYPES = [(100, None), (200, None), (300, None), (350, None), (400, None), (700, None),
+              (500, 'AAA'), (500, 'BBB')]   # COST_PARTS 순서의 (type1, type2)
+REVISED_RATIO = 0.1               # 취소된 이전 차수 견적이 있는 비율
+SPLIT_ORDER_RATIO = 0.3           # 발주가 2개 라인으로 나뉜 PO 비율
+UNSTORED_RATIO = 0.1              # 입고 실적이 없는 PO 비율
+
+
+# ============================================
+# 시즌
+# ============================================
+def previous_season(season: str) -> str:
+    """26S → 25S, 25F → 24F"""
+    return f"{int(season[:2]) - 1:02d}{season[2:]}"
+
+
+def fx_seasons(seasons: Sequence[str]) -> List[str]:
+    """환율이 필요한 시즌 (대상 시즌과 각 전년 시즌)"""
+    codes = []
+    for season in seasons:
+        for code in (season, previous_season(season)):
+            if code not in codes:
+                codes.append(code)
+    return codes
+
+
+# ============================================
+# 생성
+# ============================================
+def make_fx_frame(seasons: Sequence[str] = DEFAULT_SEASONS, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """FX.csv와 같은 형식의 환율표 (브랜드 × 시즌 × 의류/용품/슈즈)"""
+    rng = np.random.default_rng(seed + 1)
+    rows = []
+    for brand in BRANDS:
+        for season in fx_seasons(seasons):
+            base = BASE_FX_RATE + rng.normal(0, 40)
+            for category in ['의류', '용품', '슈즈']:
+                rows.append({
+                    'No': len(rows) + 1,
+                    '브랜드': brand,
+                    '시즌': season,
+                    '통화(FROM)': 'USD',
+                    '통화(TO)': 'KRW',
+                    '카테고리': category,
+                    '환율': round(base + rng.normal(0, 5), 2),
+                })
+    return pd.DataFrame(rows)
+
+
+def make_query_frame(rows: int, seasons: Sequence[str] = DEFAULT_SEASONS,
+                     seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """
+    SQL_QUERY 조회 결과(fetch_dataframe)와 같은 컬럼/타입의 DataFrame
+
+    브랜드/시즌/발주통화는 category, 금액은 float64, TAG/수량은 결측치가 있어 float64,
+    견적서제출일자는 datetime64입니다.
+    """
+    rng = np.random.default_rng(seed)
+    brands = rng.choice(BRANDS, rows, p=BRAND_WEIGHTS)
+    season_values = rng.choice(list(seasons), rows)
+
+    category_names = list(CATEGORIES)
+    category_weights = np.array([weight for weight, _ in CATEGORIES.values()])
+    category_idx = rng.choice(len(category_names), rows, p=category_weights / category_weights.sum())
+    categories = np.array(category_names, dtype=object)[category_idx]
+    items = np.empty(rows, dtype=object)
+    for idx, (_, names) in enumerate(CATEGORIES.values()):
+        mask = category_idx == idx
+        items[mask] = rng.choice(names, int(mask.sum()))
+
+    # 스타일: 브랜드 + 시즌 + 일련번호 (X 브랜드 일부는 DK로 시작)
+    style_no = rng.integers(0, max(rows // 4, 1), rows)
+    prefixes = np.where((brands == 'X') & (rng.random(rows) < KIDS_STYLE_RATIO), 'DK', brands)
+    styles = pd.Series(prefixes).str.cat([pd.Series(season_values), pd.Series(style_no).map('{:05d}'.format)])
+    row_no = pd.Series(np.arange(rows)).map('{:08d}'.format)
+
+    tag = rng.choice(TAG_PRICES, rows).astype(float)
+    tag[rng.random(rows) < NULL_TAG_RATIO] = np.nan
+    qty = rng.integers(1, 4000, rows).astype(float)
+    qty[rng.random(rows) < NULL_QTY_RATIO] = np.nan
+
+    df = pd.DataFrame({
+        '브랜드': pd.Categorical(brands, categories=BRANDS),
+        '시즌': pd.Categorical(season_values, categories=list(seasons)),
+        '스타일': styles.to_numpy(),
+        '중분류': categories,
+        '아이템명': items,
+        'PO': ('PO' + row_no).to_numpy(),
+        'TAG': tag,
+        '수량': qty,
+        '원가견적번호': ('CQ' + row_no).to_numpy(),
+        '발주통화': pd.Categorical(rng.choice(CURRENCIES, rows, p=CURRENCY_WEIGHTS), categories=CURRENCIES),
+        '제조업체': rng.choice(['A상사', 'B어패럴', 'C인터내셔널', 'D글로벌'], rows),
+        '견적서제출일자': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+    })
+
+    # 원가: TAG/1.1의 18~32%를 구성 비율로 나눔 (구성 항목 일부는 0, 일부는 결측)
+    cost_krw = np.nan_to_num(tag, nan=100000.0) / 1.1 * rng.uniform(0.18, 0.32, rows)
+    fx_rate = BASE_FX_RATE + rng.normal(0, 30, rows)
+    usd_parts, krw_parts = {}, {}
+    for part, share in zip(COST_PARTS, COST_SHARES):
+        krw = np.round(cost_krw * share * rng.uniform(0.7, 1.3, rows))
+        krw[rng.random(rows) < ZERO_PART_RATIO] = 0
+        usd = np.round(krw / fx_rate, 2)
+        usd[rng.random(rows) < NULL_COST_RATIO] = np.nan
+        krw[rng.random(rows) < NULL_COST_RATIO] = np.nan
+        usd_parts[f'(USD)_{part}'] = usd
+        krw_parts[f'(KRW)_{part}'] = krw
+    return df.assign(**usd_parts, **krw_parts)
+
+
+# ============================================
+# 원천 테이블 생성 (로컬 웨어하우스용)
+# ============================================
+def _delivery_dates(season_values: np.ndarray, rng: np.random.Generator) -> pd.Series:
+    """시즌별 합의납기일 (F: 6~11월, S: 전년 12월~5월, N: 전년 6월부터 2년)"""
+    seasons = pd.Series(season_values)
+    years = 2000 + seasons.str[:2].astype(int)
+    kinds = seasons.str[2:]
+    start_year = np.where(kinds == 'F', years, years - 1)
+    start_month = np.where(kinds == 'S', 12, 6)
+    starts = pd.to_datetime(pd.DataFrame({'year': start_year, 'month': start_month, 'day': 1}))
+    spans = np.select([kinds == 'S', kinds == 'N'], [181, 729], 182)
+    offsets = (rng.random(len(seasons)) * (spans + 1)).astype(int)
+    return starts + pd.to_timedelta(offsets, unit='D')
+
+
+def make_warehouse_tables(rows: int, seasons: Sequence[str] = DEFAULT_SEASONS, seed: int = DEFAULT_SEED,
+                          non_seasons: Sequence[str] = DEFAULT_NON_SEASONS) -> Dict[str, pd.DataFrame]:
+    """
+    SQL_QUERY/NON 쿼리가 읽는 원천 테이블 (prcs.*, sap_fnf.mst_prdt)
+
+    make_query_frame의 행 하나를 확정 견적 하나로 보고 견적 마스터/상세, 발주, 입고, 상품 테이블로
+    나눕니다. SQL_QUERY로 다시 조회하면 원가 구성 금액은 같고, 중분류/아이템명/TAG는 스타일 단위
+    대표값(db_prdt, mst_prdt, dw_ord 최소 TAG)으로 바뀝니다 (결측 원가는 0으로 합산).
+
+    - NON 시즌 견적 rows // NON_ROW_DIVISOR건 추가 (합의납기일/입고일 기간 구분용)
+    - 견적 일부(REVISED_RATIO)는 취소된 이전 차수 견적이 함께 있음 (승인상태 조건 확인용)
+    - 발주 일부는 2개 라인으로 나뉘고, 입고 실적이 없는 PO도 포함
+
+    Returns:
+        {'prcs.db_cost_mst': DataFrame, ...}
+    """
+    rng = np.random.default_rng(seed + 3)
+    quotes = make_query_frame(rows, seasons, seed)
+    non = make_query_frame(max(rows // NON_ROW_DIVISOR, 1), non_seasons, seed + 2)
+    non['PO'] = 'N' + non['PO']
+    non['원가견적번호'] = 'N' + non['원가견적번호']
+    q = pd.concat([quotes.astype({'브랜드': str, '시즌': str, '발주통화': str}),
+                   non.astype({'브랜드': str, '시즌': str, '발주통화': str})], ignore_index=True)
+    n = len(q)
+
+    season_values = q['시즌'].to_numpy(dtype=object)
+    prdt_cd = q['브랜드'] + q['시즌'] + q['스타일']
+    delivery = _delivery_dates(season_values, rng)
+    revised = rng.random(n) < REVISED_RATIO
+
+    # 견적 마스터: 확정 견적 + 일부 취소된 이전 차수
+    mst = pd.DataFrame({
+        'brd_cd': q['브랜드'],
+        'sesn': q['시즌'],
+        'part_cd': q['스타일'],
+        'po_no': q['PO'],
+        'cost_quotation_no': q['원가견적번호'],
+        'quotation_seq': np.where(revised, 2, 1),
+        'quotation_apv_stat_nm': '확정',
+        'tag_amt': q['TAG'],
+        'quotation_submit_dt': q['견적서제출일자'].dt.date,
+        'mfac_compy_nm': q['제조업체'],
+    })
+    cancelled = mst[revised].assign(quotation_seq=1, quotation_apv_stat_nm='취소')
+    mst = pd.concat([mst, cancelled], ignore_index=True)
+
+    # 견적 상세: 원가 구성 항목별 1라인 (USD/KRW 모두 0인 항목은 라인 없음)
+    details = []
+    for part, (type1, type2) in zip(COST_PARTS, COST_TYPES):
+        usd = q[f'(USD)_{part}'].to_numpy()
+        krw = q[f'(KRW)_{part}'].to_numpy()
+        mask = ~((usd == 0) & (krw == 0))
+        details.append(pd.DataFrame({
+            'po_no': q['PO'].to_numpy()[mask],
+            'quotation_seq': np.where(revised, 2, 1)[mask],
+            'type1': type1,
+            'type1_nm': part,
+            'type2': type2,
+            'currency': q['발주통화'].to_numpy()[mask],
+            'mfac_offer_cost_amt_curr': usd[mask],
+            'mfac_nego_cost_amt': krw[mask],
+        }))
+    dtl = pd.concat(details, ignore_index=True)
+    dtl_cancelled = dtl[dtl['po_no'].isin(cancelled['po_no']) & (dtl['type1'] == 100)]
+    dtl = pd.concat([dtl, dtl_cancelled.assign(quotation_seq=1)], ignore_index=True)
+
+    # 발주: 일부 PO는 2개 라인으로 분할
+    qty = q['수량'].to_numpy()
+    split = rng.random(n) < SPLIT_ORDER_RATIO
+    first_qty = np.where(split, np.floor(qty / 2), qty)
+    orders = pd.DataFrame({
+        'prdt_cd': pd.concat([prdt_cd, prdt_cd[split]], ignore_index=True),
+        'po_no': pd.concat([q['PO'], q['PO'][split]], ignore_index=True),
+        'tag_price': np.concatenate([q['TAG'].to_numpy(), q['TAG'].to_numpy()[split]]),
+        'ord_qty': np.concatenate([first_qty, (qty - first_qty)[split]]),
+        'indc_dt_cnfm': pd.concat([delivery, delivery[split]], ignore_index=True).dt.date,
+    })
+
+    # 입고: 합의납기일 -20일 ~ +30일, 일부 PO는 입고 실적 없음
+    stored = rng.random(n) >= UNSTORED_RATIO
+    stor = pd.DataFrame({
+        'po_no': q['PO'][stored].to_numpy(),
+        'stor_dt': (delivery[stored] + pd.to_timedelta(rng.integers(-20, 31, int(stored.sum())), unit='D')).dt.date,
+        'qty': np.nan_to_num(qty[stored]),
+    })
+
+    products = pd.DataFrame({'prdt_cd': prdt_cd, 'item_nm': q['아이템명'], 'vtext2': q['중분류']})
+    products = products.drop_duplicates('prdt_cd')
+    return {
+        'prcs.db_cost_mst': mst,
+        'prcs.db_cost_dtl': dtl,
+        'prcs.db_prdt': products[['prdt_cd', 'item_nm']].reset_index(drop=True),
+        'sap_fnf.mst_prdt': products.loc[products['vtext2'].notna(), ['prdt_cd', 'vtext2']].reset_index(drop=True),
+        'prcs.dw_ord': orders,
+        'prcs.dw_stor': stor,
+    }
+
+
+# ============================================
+# COST RAW 파일 생성
+# ============================================
+@contextlib.contextmanager
+def working_directory(path: str) -> Iterator[str]:
+    """생성 스크립트의 상대 경로(public/COST RAW/...)가 path 아래를 가리키도록 작업 폴더 변경"""
+    previous = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+
+
+def write_fx_file(df_fx: pd.DataFrame, fx_file: str = 'public/COST RAW/FX.csv'):
+    os.makedirs(os.path.dirname(fx_file), exist_ok=True)
+    df_fx.to_csv(fx_file, index=False, encoding='utf-8-sig')
+
+
+def write_cost_raw(workdir: str, rows: int, seasons: Sequence[str] = DEFAULT_SEASONS,
+                   seed: int = DEFAULT_SEED, quiet: bool = True) -> List[str]:
+    """
+    workdir/public/COST RAW/ 아래에 FX.csv와 COST RAW CSV 생성
+
+    sql_to_csv_with_fx.py와 같은 순서(환율 변환 → MLB FW 형식 → 브랜드/시즌별 저장)로 만듭니다.
+
+    Returns:
+        생성한 CSV 경로 목록 (workdir 기준)
+    """
+    from sql_to_csv_with_fx import format_data_like_mlb_fw, process_currency_conversion, \
+        save_csv_by_brand_season
+
+    df_fx = make_fx_frame(seasons, seed)
+    raw = make_query_frame(rows, seasons, seed)
+    with working_directory(workdir):
+        write_fx_file(df_fx)
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            df = format_data_like_mlb_fw(process_currency_conversion(raw, df_fx), df_fx)
+            save_csv_by_brand_season(df, df_fx)
+        return sorted(
+            os.path.join(dirpath, filename).replace(os.sep, '/')
+            for dirpath, _, filenames in os.walk('public')
+            for filename in filenames if filename.endswith('.csv') and filename != 'FX.csv'
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='합성 원가 데이터 생성')
+    parser.add_argument('--rows', type=int, default=100000, help='생성할 조회 결과 행 수 (기본: 100000)')
+    parser.add_argument('--seasons', nargs='+', default=DEFAULT_SEASONS,
+                        help=f"시즌 코드 목록 (기본: {' '.join(DEFAULT_SEASONS)})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='난수 시드')
+    parser.add_argument('--workdir', type=str, required=True, help='출력 폴더 (public/COST RAW/ 생성)')
+    args = parser.parse_args(argv)
+
+    paths = write_cost_raw(args.workdir, args.rows, args.seasons, args.seed)
+    print(f"[OK] 합성 COST RAW CSV {len(paths)}개 생성: {args.workdir}")
+    for path in paths:
+        print(f"  - {path}")
+
+
+if __name__ == '__main__':
+    main()
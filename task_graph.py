@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+작업 그래프(DAG) 병렬 실행 모듈
+
+auto_update_dashboard.py의 일일 업데이트 단계를 (이름, 함수, 선행 작업) 목록으로 선언하고,
+선행 작업이 끝난 작업부터 스레드 풀에서 동시에 실행하는 모듈입니다.
+
+- 작업 함수는 성공 여부(bool)를 반환 (예외도 실패로 처리)
+- 선행 작업이 실패하거나 건너뛰어진 작업은 실행하지 않고 건너뜀 (나머지 작업은 계속 실행)
+- 실행이 끝나면 작업별 소요 시간과 임계 경로(가장 오래 걸린 의존 경로)를 보고
+- run_in_process: 생성 스크립트 함수를 현재 스레드에서 실행하고 출력을 스레드별로 수집
+
+사용 예:
+    from task_graph import Task, run_task_graph, format_report
+
+    tasks = [
+        Task('sql_to_csv', 'SQL → CSV 생성', run_sql_to_csv),
+        Task('summary:26SS:M', '26SS 브랜드 M SUMMARY 생성', lambda: ..., deps=('sql_to_csv',)),
+    ]
+    results = run_task_graph(tasks, max_workers=4)
+    for line in format_report(tasks, results):
+        print(line)
+"""
+
+import io
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# ============================================
+# 실행 설정
+# ============================================
+DEFAULT_MAX_WORKERS = 4          # 동시에 실행할 작업 수
+
+# 작업 상태
+STATUS_SUCCESS = 'success'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+STATUS_LABELS = {
+    STATUS_SUCCESS: '성공',
+    STATUS_FAILED: '실패',
+    STATUS_SKIPPED: '건너뜀',
+}
+
+
+class Task(NamedTuple):
+    """작업 그래프의 작업 1개"""
+    name: str                          # 고유 이름 (예: summary:26SS:M)
+    label: str                         # 로그/오류 메시지용 설명
+    func: Callable[[], bool]           # 실행 함수 (성공 여부 반환)
+    deps: Tuple[str, ...] = ()         # 선행 작업 이름
+
+
+class TaskResult(NamedTuple):
+    """작업 실행 결과"""
+    name: str
+    status: str
+    started: float                     # 그래프 시작 기준 초 (건너뛴 작업은 0)
+    duration: float                    # 소요 시간 (초)
+    error: str = ''
+
+
+# ============================================
+# 스레드별 출력 수집
+# ============================================
+class _ThreadLocalStream:
+    """sys.stdout/sys.stderr 대체 스트림 (스레드마다 출력 대상을 따로 지정)"""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def _target(self):
+        target = getattr(self._local, 'target', None)
+        return self._default if target is None else target
+
+    def redirect(self, target) -> Optional[object]:
+        """현재 스레드의 출력 대상을 바꾸고 이전 대상을 반환"""
+        previous = getattr(self._local, 'target', None)
+        self._local.target = target
+        return previous
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+_install_lock = threading.Lock()
+
+
+def _thread_local_streams() -> Tuple[_ThreadLocalStream, _ThreadLocalStream]:
+    """sys.stdout/sys.stderr를 스레드별 스트림으로 한 번만 교체"""
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStream):
+            sys.stdout = _ThreadLocalStream(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadLocalStream):
+            sys.stderr = _ThreadLocalStream(sys.stderr)
+    return sys.stdout, sys.stderr
+
+
+def run_in_process(func: Callable, *args, **kwargs) -> Tuple[bool, str, str]:
+    """
+    생성 스크립트 함수를 현재 프로세스(현재 스레드)에서 실행 (subprocess.run 대체)
+
+    표준 출력/오류는 capture_output처럼 모아서 반환하고, 예외나 sys.exit(0이 아닌 코드)는
+    실패로 돌려줘 한 단계가 실패해도 다음 단계는 계속 실행됩니다.
+    출력은 스레드별로 수집하므로 여러 작업을 동시에 실행해도 섞이지 않습니다.
+    (작업 함수가 내부에서 만든 스레드의 출력은 수집되지 않고 콘솔로 나감)
+
+    Returns:
+        (성공 여부, 표준 출력, 표준 오류 + 예외 내용)
+    """
+    out_stream, err_stream = _thread_local_streams()
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    previous_out = out_stream.redirect(stdout)
+    previous_err = err_stream.redirect(stderr)
+    try:
+        func(*args, **kwargs)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            return False, stdout.getvalue(), stderr.getvalue() + f"종료 코드: {e.code}"
+    except Exception:
+        return False, stdout.getvalue(), stderr.getvalue() + traceback.format_exc()
+    finally:
+        out_stream.redirect(previous_out)
+        err_stream.redirect(previous_err)
+    return True, stdout.getvalue(), stderr.getvalue()
+
+
+# ============================================
+# 그래프 검증
+# ============================================
+def topological_order(tasks: Sequence[Task]) -> List[str]:
+    """
+    선언 순서를 유지한 위상 정렬
+
+    Raises:
+        ValueError: 이름 중복, 없는 선행 작업, 순환 의존이 있는 경우
+    """
+    by_name: Dict[str, Task] = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"작업 이름 중복: {task.name}")
+        by_name[task.name] = task
+
+    for task in tasks:
+        missing = [dep for dep in task.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"작업 {task.name}의 선행 작업이 없습니다: {', '.join(missing)}")
+
+    order: List[str] = []
+    done = set()
+    remaining = [task.name for task in tasks]
+    while remaining:
+        ready = [name for name in remaining if all(dep in done for dep in by_name[name].deps)]
+        if not ready:
+            raise ValueError(f"순환 의존이 있습니다: {', '.join(remaining)}")
+        order.extend(ready)
+        done.update(ready)
+        remaining = [name for name in remaining if name not in done]
+    return order
+
+
+# ============================================
+# 실행
+# ============================================
+def _run_task(task: Task, graph_start: float) -> TaskResult:
+    started = time.perf_counter()
+    try:
+        ok = bool(task.func())
+        error = '' if ok else f"{task.label} 실패"
+    except Exception:
+        ok = False
+        error = traceback.format_exc()
+    finished = time.perf_counter()
+    return TaskResult(task.name, STATUS_SUCCESS if ok else STATUS_FAILED,
+                      started - graph_start, finished - started, error)
+
+
+def run_task_graph(tasks: Sequence[Task], max_workers: int = DEFAULT_MAX_WORKERS,
+                   on_finish: Optional[Callable[[Task, TaskResult], None]] = None) -> Dict[str, TaskResult]:
+    """
+    작업 그래프를 스레드 풀에서 실행
+
+    Args:
+        tasks: 작업 목록 (선행 작업이 모두 성공한 작업부터 선언 순서대로 시작)
+        max_workers: 최대 동시 실행 작업 수
+        on_finish: 작업이 끝나거나 건너뛰어질 때마다 호출 (로그 출력용)
+
+    Returns:
+        작업 이름 → 실행 결과 (선언 순서)
+    """
+    topological_order(tasks)
+    by_name = {task.name: task for task in tasks}
+    results: Dict[str, TaskResult] = {}
+    pending = [task.name for task in tasks]
+    running = {}
+    graph_start = time.perf_counter()
+
+    def finish(task: Task, result: TaskResult):
+        results[task.name] = result
+        if on_finish is not None:
+            on_finish(task, result)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while pending or running:
+            # 선행 작업이 실패/건너뜀이면 건너뛰고, 모두 성공했으면 시작
+            progressed = True
+            while progressed:
+                progressed = False
+                for name in list(pending):
+                    task = by_name[name]
+                    dep_results = [results.get(dep) for dep in task.deps]
+                    if any(r is not None and r.status != STATUS_SUCCESS for r in dep_results):
+                        failed_deps = [r.name for r in dep_results if r is not None and r.status != STATUS_SUCCESS]
+                        pending.remove(name)
+                        finish(task, TaskResult(name, STATUS_SKIPPED, 0.0, 0.0,
+                                                f"선행 작업 실패: {', '.join(failed_deps)}"))
+                        progressed = True
+                    elif all(r is not None for r in dep_results):
+                        pending.remove(name)
+                        running[executor.submit(_run_task, task, graph_start)] = task
+
+            if not running:
+                break
+            completed, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in completed:
+                task = running.pop(future)
+                finish(task, future.result())
+
+    return {task.name: results[task.name] for task in tasks}
+
+
+# ============================================
+# 보고
+# ============================================
+def critical_path(tasks: Sequence[Task], results: Dict[str, TaskResult]) -> Tuple[List[str], float]:
+    """
+    소요 시간 기준으로 가장 긴 의존 경로 (이 경로의 작업이 빨라져야 전체 시간이 줄어듦)
+
+    Returns:
+        (작업 이름 목록, 경로 합계 초)
+    """
+    by_name = {task.name: task for task in tasks}
+    length: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for name in topological_order(tasks):
+        best_dep = max(by_name[name].deps, key=lambda dep: length[dep], default=None)
+        length[name] = results[name].duration + (length[best_dep] if best_dep else 0.0)
+        previous[name] = best_dep
+
+    if not length:
+        return [], 0.0
+    end = max(length, key=length.get)
+    path = []
+    node: Optional[str] = end
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return path[::-1], length[end]
+
+
+def format_report(tasks: Sequence[Task], results: Dict[str, TaskResult],
+                  wall_time: Optional[float] = None) -> List[str]:
+    """작업별 소요 시간과 임계 경로 보고 문자열"""
+    width = max((len(task.name) for task in tasks), default=0)
+    lines = ["[작업별 소요 시간]"]
+    for task in tasks:
+        result = results[task.name]
+        lines.append(f"  {task.name:<{width}}  {STATUS_LABELS[result.status]:<3}  "
+                     f"시작 {result.started:6.1f}초  소요 {result.duration:6.1f}초")
+
+    path, path_time = critical_path(tasks, results)
+    if path:
+        lines.append(f"[임계 경로] {' → '.join(path)} (합계 {path_time:.1f}초)")
+
+    total = sum(result.duration for result in results.values())
+    summary = f"[작업 합계] {total:.1f}초"
+    if wall_time is not None:
+        summary += f", 실제 경과 {wall_time:.1f}초"
+    lines.append(summary)
+    return lines
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터 웨어하우스 연결 모듈 (Snowflake / 로컬 DuckDB)
+
+추출 스크립트마다 snowflake.connector.connect를 직접 호출하던 부분을 connect_warehouse()로 모은 모듈입니다.
+환경 변수 COST_WAREHOUSE로 연결할 백엔드를 고릅니다.
+
+    COST_WAREHOUSE=snowflake (기본)  SNOWFLAKE_CONFIG로 Snowflake 연결
+    COST_WAREHOUSE=local             로컬 DuckDB 파일(COST_WAREHOUSE_PATH, 기본 cache/local_warehouse.duckdb)
+
+로컬 웨어하우스:
+- 합성 데이터(synthetic_cost_data.make_warehouse_tables)로 prcs.db_cost_mst, db_cost_dtl, db_prdt,
+  dw_ord, dw_stor, sap_fnf.mst_prdt 테이블을 만들어 SQL_QUERY / build_sql_query / NON 쿼리를
+  고치지 않고 그대로 실행 (Snowflake 없이 추출 단계 실행/벤치마크용)
+- 연결 객체는 snowflake_query/query_pool이 쓰는 커서 API(execute(timeout=), fetch_arrow_all,
+  fetch_arrow_batches, fetchall/fetchmany, description)를 제공
+- Snowflake 방언 보정
+    * 따옴표 없는 결과 컬럼명은 대문자로 반환 (Snowflake 식별자 규칙)
+    * iff, nvl, zeroifnull, div0, to_date 함수를 매크로로 제공
+    * 금액/수량 컬럼은 Snowflake NUMBER처럼 DECIMAL로 저장해 Arrow 결과 타입을 맞춤
+    * 쿼리 타임아웃은 DuckDB 쿼리 중단 후 Snowflake와 같은 오류 번호(604)로 변환 (query_pool 재시도 동일)
+
+필요 패키지 (로컬 웨어하우스): pip install duckdb
+
+사용 방법:
+    python warehouse.py seed --rows 100000               # 로컬 웨어하우스 생성 (기존 파일 교체)
+    set COST_WAREHOUSE=local                             # (Windows) 이후 추출 스크립트가 로컬 연결 사용
+    python sql_to_csv_with_fx.py --full
+
+    from warehouse import connect_warehouse
+    conn = connect_warehouse(SNOWFLAKE_CONFIG)
+"""
+
+import argparse
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+from snowflake.connector.errors import ProgrammingError
+
+from query_pool import QUERY_CANCELLED_ERRNO
+
+# ============================================
+# 백엔드 설정
+# ============================================
+WAREHOUSE_ENV = 'COST_WAREHOUSE'
+LOCAL_PATH_ENV = 'COST_WAREHOUSE_PATH'
+DEFAULT_BACKEND = 'snowflake'
+DEFAULT_LOCAL_PATH = os.path.join('cache', 'local_warehouse.duckdb')
+
+# 로컬 웨어하우스 테이블 정의 (Snowflake 원천 테이블 중 추출 쿼리가 읽는 컬럼)
+LOCAL_TABLES = {
+    'prcs.db_cost_mst': [
+        ('brd_cd', 'varchar'), ('sesn', 'varchar'), ('part_cd', 'varchar'), ('po_no', 'varchar'),
+        ('cost_quotation_no', 'varchar'), ('quotation_seq', 'integer'), ('quotation_apv_stat_nm', 'varchar'),
+        ('tag_amt', 'decimal(18,0)'), ('quotation_submit_dt', 'date'), ('mfac_compy_nm', 'varchar'),
+    ],
+    'prcs.db_cost_dtl': [
+        ('po_no', 'varchar'), ('quotation_seq', 'integer'), ('type1', 'integer'), ('type1_nm', 'varchar'),
+        ('type2', 'varchar'), ('type2_nm', 'varchar'), ('type3', 'varchar'), ('unit', 'varchar'),
+        ('width', 'varchar'), ('currency', 'varchar'), ('mfac_offer_cons', 'decimal(18,4)'),
+        ('mfac_offer_cost', 'decimal(18,4)'), ('mfac_offer_cost_amt', 'decimal(18,2)'),
+        ('mfac_offer_cost_amt_curr', 'decimal(18,2)'), ('mfac_nego_cost', 'decimal(18,4)'),
+        ('mfac_nego_cost_amt', 'decimal(18,2)'), ('mfac_nego_cost_amt_curr', 'decimal(18,2)'),
+    ],
+    'prcs.db_prdt': [('prdt_cd', 'varchar'), ('item_nm', 'varchar')],
+    'sap_fnf.mst_prdt': [('prdt_cd', 'varchar'), ('vtext2', 'varchar')],
+    'prcs.dw_ord': [
+        ('prdt_cd', 'varchar'), ('po_no', 'varchar'), ('tag_price', 'decimal(18,0)'),
+        ('ord_qty', 'decimal(18,0)'), ('indc_dt_cnfm', 'date'),
+    ],
+    'prcs.dw_stor': [('po_no', 'varchar'), ('stor_dt', 'date'), ('qty', 'decimal(18,0)')],
+}
+
+# Snowflake 함수 보정 (DuckDB에 없는 함수)
+DIALECT_MACROS = [
+    "create or replace macro iff(cond, a, b) as case when cond then a else b end",
+    "create or replace macro nvl(a, b) as coalesce(a, b)",
+    "create or replace macro zeroifnull(a) as coalesce(a, 0)",
+    "create or replace macro div0(a, b) as case when b = 0 then 0 else a / b end",
+    "create or replace macro to_date(s) as cast(s as date)",
+]
+
+# Snowflake가 대문자로 바꾸는 (따옴표 없는) 식별자 형태
+_UNQUOTED_NAME = re.compile(r'[a-z_][a-z0-9_$]*')
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        print("[ERROR] 로컬 웨어하우스를 쓰려면 duckdb 패키지가 필요합니다.")
+        print("[INFO] 설치: pip install duckdb")
+        raise
+    return duckdb
+
+
+def snowflake_name(name: str) -> str:
+    """결과 컬럼명을 Snowflake 규칙으로 변환 (따옴표 없는 소문자 식별자 → 대문자)"""
+    return name.upper() if _UNQUOTED_NAME.fullmatch(name) else name
+
+
+# ============================================
+# 로컬 연결 (Snowflake 커서 API 호환)
+# ============================================
+class LocalCursor:
+    """DuckDB 커서를 Snowflake 커서처럼 쓰기 위한 래퍼"""
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+        self.description = None
+
+    def execute(self, query: str, timeout: Optional[int] = None):
+        duckdb = _import_duckdb()
+        timer = threading.Timer(timeout, self._cursor.interrupt) if timeout else None
+        if timer:
+            timer.daemon = True
+            timer.start()
+        try:
+            self._cursor.execute(query)
+        except duckdb.InterruptException as e:
+            raise ProgrammingError(msg=f"쿼리 타임아웃({timeout}초)으로 취소됨: {e}",
+                                   errno=QUERY_CANCELLED_ERRNO) from e
+        finally:
+            if timer:
+                timer.cancel()
+        self.description = [(snowflake_name(desc[0]),) + tuple(desc[1:])
+                            for desc in (self._cursor.description or [])]
+        return self
+
+    def _rename(self, table: pa.Table) -> pa.Table:
+        return table.rename_columns([snowflake_name(name) for name in table.column_names])
+
+    def fetch_arrow_all(self, force_return_table: bool = False) -> pa.Table:
+        fetch = getattr(self._cursor, 'to_arrow_table', None) or self._cursor.fetch_arrow_table
+        return self._rename(fetch())
+
+    def fetch_arrow_batches(self):
+        reader_fn = getattr(self._cursor, 'to_arrow_reader', None) or self._cursor.fetch_record_batch
+        for batch in reader_fn():
+            yield self._rename(pa.Table.from_batches([batch]))
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size: int = 1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class LocalConnection:
+    """로컬 DuckDB 웨어하우스 연결 (읽기 전용)"""
+
+    def __init__(self, path: str):
+        duckdb = _import_duckdb()
+        self.path = path
+        self._conn = duckdb.connect(path, read_only=True)
+
+    def cursor(self) -> LocalCursor:
+        return LocalCursor(self._conn)
+
+    def close(self):
+        self._conn.close()
+
+
+# ============================================
+# 백엔드 선택
+# ============================================
+def _connect_snowflake(config: Dict[str, str]):
+    import snowflake.connector
+
+    return snowflake.connector.connect(
+        account=config['account'],
+        user=config['username'],
+        password=config['password'],
+        warehouse=config['warehouse'],
+        database=config['database'],
+        schema=config['schema']
+        # role은 선택사항, 필요시 추가
+    )
+
+
+def local_path() -> str:
+    return os.environ.get(LOCAL_PATH_ENV) or DEFAULT_LOCAL_PATH
+
+
+def _connect_local(config: Dict[str, str]) -> LocalConnection:
+    path = local_path()
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"로컬 웨어하우스 파일이 없습니다: {path} (python warehouse.py seed 로 생성)")
+    return LocalConnection(path)
+
+
+# 백엔드 이름 → 연결 함수 (config: 각 스크립트의 SNOWFLAKE_CONFIG)
+BACKENDS: Dict[str, Callable] = {
+    'snowflake': _connect_snowflake,
+    'local': _connect_local,
+}
+
+
+def register_backend(name: str, connect_fn: Callable):
+    """연결 백엔드 추가 (connect_fn(config)는 Snowflake 커서 API를 제공하는 연결 반환)"""
+    BACKENDS[name] = connect_fn
+
+
+def backend_name() -> str:
+    """COST_WAREHOUSE 환경 변수로 선택한 백엔드 (기본: snowflake)"""
+    name = (os.environ.get(WAREHOUSE_ENV) or DEFAULT_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 {WAREHOUSE_ENV} 값: {name} (가능: {', '.join(BACKENDS)})")
+    return name
+
+
+def connect_warehouse(config: Dict[str, str]):
+    """선택한 백엔드로 연결 (실패 시 예외 발생)"""
+    return BACKENDS[backend_name()](config)
+
+
+def describe_warehouse(config: Dict[str, str]) -> str:
+    """연결 로그용 대상 이름 (잘못된 백엔드 이름이어도 예외 없이 반환)"""
+    name = (os.environ.get(WAREHOUSE_ENV) or DEFAULT_BACKEND).strip().lower()
+    if name == 'snowflake':
+        return f"Snowflake {config['database']}.{config['schema']}"
+    if name == 'local':
+        return f"로컬 웨어하우스 {local_path()}"
+    return name
+
+
+# ============================================
+# 로컬 웨어하우스 생성
+# ============================================
+def seed_local_warehouse(path: str, rows: int, seasons: Optional[Sequence[str]] = None,
+                         seed: Optional[int] = None) -> Dict[str, int]:
+    """
+    합성 원천 테이블로 로컬 웨어하우스 파일 생성 (기존 파일은 교체)
+
+    Returns:
+        테이블별 행 수
+    """
+    from synthetic_cost_data import DEFAULT_SEASONS, DEFAULT_SEED, make_warehouse_tables
+
+    duckdb = _import_duckdb()
+    tables = make_warehouse_tables(rows, seasons or DEFAULT_SEASONS, DEFAULT_SEED if seed is None else seed)
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    counts = {}
+    conn = duckdb.connect(tmp_path)
+    try:
+        for schema in sorted({name.split('.')[0] for name in LOCAL_TABLES}):
+            conn.execute(f"create schema if not exists {schema}")
+        for macro in DIALECT_MACROS:
+            conn.execute(macro)
+        for name, columns in LOCAL_TABLES.items():
+            conn.execute(f"create table {name} ({', '.join(f'{col} {typ}' for col, typ in columns)})")
+            frame = tables[name]
+            select = ', '.join(col if col in frame.columns else f"null as {col}" for col, _ in columns)
+            conn.register('seed_frame', frame)
+            conn.execute(f"insert into {name} select {select} from seed_frame")
+            conn.unregister('seed_frame')
+            counts[name] = len(frame)
+        conn.execute("checkpoint")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='로컬 웨어하우스 (DuckDB) 관리')
+    sub = parser.add_subparsers(dest='command', required=True)
+    seed_parser = sub.add_parser('seed', help='합성 데이터로 로컬 웨어하우스 생성')
+    seed_parser.add_argument('--rows', type=int, default=100000, help='확정 견적 수 (기본: 100000)')
+    seed_parser.add_argument('--seasons', nargs='+', default=None, help='시즌 코드 목록 (기본: 26S 25S 25F 24F)')
+    seed_parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+    seed_parser.add_argument('--path', type=str, default=None, help=f'파일 경로 (기본: {DEFAULT_LOCAL_PATH})')
+    args = parser.parse_args(argv)
+
+    path = args.path or local_path()
+    counts = seed_local_warehouse(path, args.rows, args.seasons, args.seed)
+    print(f"[OK] 로컬 웨어하우스 생성: {path}")
+    for name, count in counts.items():
+        print(f"  - {name}: {count:,}행")
+    print(f"[INFO] 사용: {WAREHOUSE_ENV}=local" + (f", {LOCAL_PATH_ENV}={path}" if args.path else ''))
+
+
+if __name__ == '__main__':
+    main()